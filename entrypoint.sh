@@ -19,11 +19,13 @@ else
 fi
 
 # Start Gunicorn
+# Live job/event streams and image downloads each hold a thread; SSE_MAX_STREAMS and
+# IMAGE_SERVE_* cap them per worker below GUNICORN_THREADS (see settings.py)
 echo "Starting Gunicorn..."
 exec gunicorn swim_backend.wsgi:application \
     --bind 0.0.0.0:8000 \
-    --workers 4 \
-    --threads 2 \
+    --workers ${GUNICORN_WORKERS:-4} \
+    --threads ${GUNICORN_THREADS:-16} \
     --timeout 120 \
     --access-logfile - \
     --error-logfile - \
@@ -10,7 +10,8 @@ from swim_backend.devices.views import (
     DeviceViewSet, DeviceModelViewSet, SiteViewSet, 
     RegionViewSet, GlobalCredentialViewSet
 )
-from swim_backend.images.views import ImageViewSet, FileServerViewSet
+from swim_backend.images.views import ImageViewSet, ImageUploadViewSet, FileServerViewSet
+from swim_backend.images.serve_views import serve_image
 from swim_backend.core.views import (
     JobViewSet, GoldenImageViewSet, ValidationCheckViewSet, 
     CheckRunViewSet, DashboardViewSet, WorkflowViewSet, WorkflowStepViewSet,
@@ -23,6 +24,8 @@ from swim_backend.core.user_views import UserViewSet, GroupViewSet, PermissionVi
 from swim_backend.core.rbac_views import PermissionBundleViewSet
 from swim_backend.core.token_views import APITokenViewSet
 from swim_backend.core.activity_views import ActivityLogViewSet
+from swim_backend.core.change_feed_views import ChangeFeedViewSet
+from swim_backend.core.event_views import EventViewSet
 from swim_backend.core.reports import ReportViewSet
 
 
@@ -34,8 +37,10 @@ from swim_backend.core.reports import ReportViewSet
 def system_status(request, format=None):
     """System health status including scheduler"""
     from swim_backend.core.scheduler import get_scheduler_status
+    from swim_backend.core.services.transfer_planner import transfer_planner
     return Response({
         'scheduler': get_scheduler_status(),
+        'active_transfers': transfer_planner.snapshot(),
     })
 
 
@@ -76,6 +81,7 @@ def images_api_root(request, format=None):
     """Software Image Management endpoints"""
     return Response({
         'images': request.build_absolute_uri(reverse('images-image-list')),
+        'uploads': request.build_absolute_uri(reverse('images-upload-list')),
         'file-servers': request.build_absolute_uri(reverse('images-fileserver-list')),
         'golden-images': request.build_absolute_uri(reverse('images-goldenimage-list')),
     })
@@ -137,6 +143,7 @@ dcim_router.register(r'global-credentials', GlobalCredentialViewSet, basename='d
 # Images Router - Software Image Management
 images_router = routers.DefaultRouter()
 images_router.register(r'images', ImageViewSet, basename='images-image')
+images_router.register(r'uploads', ImageUploadViewSet, basename='images-upload')
 images_router.register(r'file-servers', FileServerViewSet, basename='images-fileserver')
 images_router.register(r'golden-images', GoldenImageViewSet, basename='images-goldenimage')
 
@@ -151,6 +158,8 @@ core_router.register(r'dashboard', DashboardViewSet, basename='core-dashboard')
 core_router.register(r'activity-logs', ActivityLogViewSet, basename='core-activitylog')
 core_router.register(r'reports', ReportViewSet, basename='core-report')
 core_router.register(r'ztp-workflows', ZTPWorkflowViewSet, basename='core-ztpworkflow')
+core_router.register(r'changes', ChangeFeedViewSet, basename='core-changes')
+core_router.register(r'events', EventViewSet, basename='core-events')
 
 # Users Router - Authentication & Authorization
 users_router = routers.DefaultRouter()
@@ -180,6 +189,7 @@ urlpatterns = [
     path('dcim/', include(dcim_router.urls)),
     
     path('images/', images_api_root, name='images-api-root'),
+    path('images/serve/<str:token>/<str:filename>', serve_image, name='images-serve'),
     path('images/', include(images_router.urls)),
     
     path('core/', core_api_root, name='core-api-root'),
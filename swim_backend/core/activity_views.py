@@ -68,6 +68,16 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(logs, many=True)
         return Response(serializer.data)
     
+    def _cached(self, name, compute):
+        """Superusers share one cache entry; other users see only their own logs"""
+        from swim_backend.core.services.aggregate_cache import cached_aggregate
+
+        scope = 'all' if self.request.user.is_superuser else f'user:{self.request.user.pk}'
+        data, hit = cached_aggregate(name, scope, compute)
+        response = Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """Get activity summary"""
@@ -75,19 +85,22 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         
         queryset = ActivityLog.objects.all() if request.user.is_superuser else ActivityLog.objects.filter(user=request.user)
         
-        # Get date range for last 30 days
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_queryset = queryset.filter(timestamp__gte=thirty_days_ago)
-        
-        summary = {
-            'total_actions': queryset.count(),
-            'recent_actions': recent_queryset.count(),
-            'by_action': dict(queryset.values_list('action').annotate(count=Count('action'))),
-            'by_user': dict(queryset.values_list('user__username').annotate(count=Count('user'))) if request.user.is_superuser else {},
-            'recent_activity': ActivityLogSerializer(queryset[:10], many=True).data
-        }
+        def compute():
+            # Get date range for last 30 days
+            thirty_days_ago = datetime.now() - timedelta(days=30)
+            recent_queryset = queryset.filter(timestamp__gte=thirty_days_ago)
+
+            return {
+                'total_actions': queryset.count(),
+                'recent_actions': recent_queryset.count(),
+                'by_action': dict(queryset.values_list('action').annotate(count=Count('action'))),
+                'by_user': dict(queryset.values_list('user__username').annotate(count=Count('user'))) if request.user.is_superuser else {},
+                'recent_activity': ActivityLogSerializer(
+                    queryset.select_related('user', 'content_type')[:10], many=True
+                ).data
+            }
         
-        return Response(summary)
+        return self._cached('activity.summary', compute)
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
@@ -97,16 +110,19 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         
         queryset = ActivityLog.objects.all() if request.user.is_superuser else ActivityLog.objects.filter(user=request.user)
         
-        # Last 7 days activity
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        daily_stats = queryset.filter(timestamp__gte=seven_days_ago).annotate(
-            date=TruncDate('timestamp')
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
+        def compute():
+            # Last 7 days activity
+            seven_days_ago = datetime.now() - timedelta(days=7)
+            daily_stats = queryset.filter(timestamp__gte=seven_days_ago).annotate(
+                date=TruncDate('timestamp')
+            ).values('date').annotate(
+                count=Count('id')
+            ).order_by('date')
+
+            return {
+                'daily_activity': list(daily_stats),
+                'total_logs': queryset.count(),
+                'action_breakdown': dict(queryset.values_list('action').annotate(count=Count('action')))
+            }
         
-        return Response({
-            'daily_activity': list(daily_stats),
-            'total_logs': queryset.count(),
-            'action_breakdown': dict(queryset.values_list('action').annotate(count=Count('action')))
-        })
+        return self._cached('activity.stats', compute)
@@ -7,6 +7,18 @@ class CoreConfig(AppConfig):
     def ready(self):
         # Import activity logger signals
         import swim_backend.core.activity_logger
+
+        # Keep stored device compliance in step with golden images
+        import swim_backend.core.services.compliance_service
+
+        # Record changes of polled objects for the change feed
+        import swim_backend.core.services.change_feed
+
+        # Publish job, device and ZTP transitions on the event bus
+        import swim_backend.core.services.event_bus
+
+        # Invalidate cached dashboard and report aggregates on writes
+        import swim_backend.core.services.aggregate_cache
         
         # Import LDAP signals if LDAP is enabled (always import - signals need to be registered)
         from django.conf import settings
@@ -31,3 +43,9 @@ class CoreConfig(AppConfig):
         if run_main == 'true' or run_main is None:
             from .scheduler import start_scheduler
             start_scheduler()
+
+            from .services.file_server_selector import start_probe_loop
+            start_probe_loop()
+
+            from .services.file_catalog_service import start_catalog_refresh_loop
+            start_catalog_refresh_loop()
@@ -0,0 +1,109 @@
+import hashlib
+from django.conf import settings
+from django.utils.http import quote_etag
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .services.change_feed import (
+    FEED_MODELS, changes_since, committed_sequence, latest_sequence, wait_for_changes,
+)
+
+# Permission needed to follow each type of the feed
+FEED_PERMISSIONS = {
+    'job': 'core.view_job',
+    'checkrun': 'core.view_checkrun',
+    'device': 'devices.view_device',
+    'devicemodel': 'devices.view_devicemodel',
+    'site': 'devices.view_site',
+    'image': 'images.view_image',
+}
+
+DEFAULT_TYPES = ['job', 'device', 'checkrun']
+
+
+def _serializers():
+    """Serializers of the list endpoints, so feed objects look like list rows"""
+    from swim_backend.devices.views import DeviceSerializer
+    from .views import CheckRunSerializer, JobListSerializer
+
+    return {
+        'job': (JobListSerializer, ('device', 'image', 'workflow', 'file_server'), ('log',)),
+        'checkrun': (CheckRunSerializer, ('device', 'validation_check'), ()),
+        'device': (DeviceSerializer, ('site', 'model__default_image'), ()),
+    }
+
+
+class ChangeFeedETagMixin:
+    """
+    list() carries an ETag versioned by the change feed, and answers a matching
+    If-None-Match with 304 without querying the list, while none of
+    `etag_types` has changed. While an entry may still be committing below the
+    newest one, the list is served without an ETag: its commit would not
+    change the newest sequence.
+    """
+    etag_types = ()
+
+    def list(self, request, *args, **kwargs):
+        if committed_sequence() < latest_sequence():
+            response = super().list(request, *args, **kwargs)
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        sequence = latest_sequence(self.etag_types)
+        key = f'{sequence}:{request.user.pk}:{request.get_full_path()}'
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = Response(status=304)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ChangeFeedViewSet(viewsets.ViewSet):
+    """
+    Objects changed since a cursor.
+
+    GET /api/core/changes/?since=<cursor>&types=job,device&wait=25
+    returns {"cursor", "reset", "more", "changes": {type: {"updated": [...], "deleted": [ids]}}}.
+    Updated jobs, devices and check runs are serialized like their list rows;
+    other types list ids. Without `since` only the current cursor is returned,
+    to start from after loading the lists. `wait` holds the request until
+    something changes (at most CHANGE_FEED_MAX_WAIT seconds). `reset` means the
+    cursor is too old and the lists must be reloaded; `more` means ask again.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        types = request.query_params.get('types')
+        types = [t.strip() for t in types.split(',')] if types else DEFAULT_TYPES
+        unknown = [t for t in types if t not in FEED_MODELS]
+        if unknown:
+            return Response({'error': f"Unknown types: {', '.join(unknown)}"}, status=400)
+        types = [t for t in types if request.user.has_perm(FEED_PERMISSIONS[t])]
+
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'cursor': committed_sequence(), 'reset': False, 'more': False, 'changes': {}})
+        try:
+            since = int(since)
+            wait = min(float(request.query_params.get('wait', 0)), getattr(settings, 'CHANGE_FEED_MAX_WAIT', 25))
+        except ValueError:
+            return Response({'error': 'since must be an integer and wait a number of seconds'}, status=400)
+
+        result = wait_for_changes(since, types, wait) if wait > 0 else changes_since(since, types)
+
+        serializers = _serializers()
+        for object_type, changes in result['changes'].items():
+            if object_type not in serializers or not changes['updated']:
+                continue
+            serializer_class, related, deferred = serializers[object_type]
+            objects = (
+                FEED_MODELS[object_type].objects.filter(id__in=changes['updated'])
+                .select_related(*related)
+                .defer(*deferred)
+            )
+            changes['updated'] = serializer_class(objects, many=True, context={'request': request}).data
+        return Response(result)
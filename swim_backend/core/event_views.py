@@ -0,0 +1,100 @@
+import json
+from django.conf import settings
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from .renderers import EventStreamRenderer
+from .services.event_bus import committed_event_id, events_since, wait_for_events
+from .services.stream_slots import RETRY_AFTER, event_stream_response
+
+# Permission needed to follow each event category
+EVENT_PERMISSIONS = {
+    'job': 'core.view_job',
+    'scheduler': 'core.view_job',
+    'device': 'devices.view_device',
+    'sync': 'devices.view_device',
+    'ztp': 'core.can_view_ztp',
+}
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+class EventViewSet(viewsets.ViewSet):
+    """
+    The fleet-wide event bus (core.services.event_bus).
+
+    GET /api/core/events/?since=<id>&types=job,device.reachability&wait=25
+    returns {"cursor", "reset", "more", "events": [{"id", "type", "payload", "created_at"}]}.
+    A type without a dot is a whole category. Without `since` only the current
+    cursor is returned. `wait` holds the request until an event is published
+    (at most CHANGE_FEED_MAX_WAIT seconds).
+
+    GET /api/core/events/stream/?types=... is the same as one multiplexed
+    server-sent event stream: each event is a message whose data is the event
+    and whose id is its sequence, so EventSource resumes with Last-Event-ID.
+    A `reset` event means events were missed and views should reload. When the
+    process already holds SSE_MAX_STREAMS streams it answers 503 and clients
+    poll instead.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _types(self, request):
+        """Requested types the user may follow, or None when a requested type is unknown."""
+        types = request.query_params.get('types')
+        types = [t.strip() for t in types.split(',') if t.strip()] if types else list(EVENT_PERMISSIONS)
+        if any(t.split('.')[0] not in EVENT_PERMISSIONS for t in types):
+            return None
+        return [t for t in types if request.user.has_perm(EVENT_PERMISSIONS[t.split('.')[0]])]
+
+    def list(self, request):
+        types = self._types(request)
+        if types is None:
+            return Response({'error': f"types must be among: {', '.join(EVENT_PERMISSIONS)}"}, status=400)
+
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'cursor': committed_event_id(), 'reset': False, 'more': False, 'events': []})
+        try:
+            since = int(since)
+            wait = min(float(request.query_params.get('wait', 0)), getattr(settings, 'CHANGE_FEED_MAX_WAIT', 25))
+        except ValueError:
+            return Response({'error': 'since must be an integer and wait a number of seconds'}, status=400)
+        if not types:
+            return Response({'cursor': since, 'reset': False, 'more': False, 'events': []})
+
+        return Response(wait_for_events(since, types, wait) if wait > 0 else events_since(since, types))
+
+    @action(detail=False, methods=['get'], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def stream(self, request):
+        types = self._types(request)
+        if types is None:
+            return Response({'error': f"types must be among: {', '.join(EVENT_PERMISSIONS)}"}, status=400)
+        if not types:
+            return Response({'error': 'No permission for the requested types'}, status=403)
+
+        since = request.headers.get('Last-Event-ID') or request.query_params.get('since')
+        since = int(since) if since and since.isdigit() else committed_event_id()
+
+        response = event_stream_response(self._events(since, types))
+        if response is None:
+            return Response(
+                {'error': 'Too many open streams, poll the event list instead'},
+                status=503, headers={'Retry-After': str(RETRY_AFTER)},
+            )
+        return response
+
+    @staticmethod
+    def _events(since, types):
+        yield 'retry: 3000\n\n'
+        while True:
+            result = wait_for_events(since, types, HEARTBEAT_INTERVAL)
+            if result['reset']:
+                yield f"event: reset\nid: {result['cursor']}\ndata: {{}}\n\n"
+            for event in result['events']:
+                yield f"id: {event['id']}\ndata: {json.dumps(event)}\n\n"
+            if not result['events'] and not result['reset']:
+                yield ': keep-alive\n\n'
+            since = result['cursor']
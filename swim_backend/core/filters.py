@@ -0,0 +1,15 @@
+import django_filters
+from django_filters.constants import EMPTY_VALUES
+from swim_backend.core.services.version_parser import version_key
+
+
+class VersionKeyFilter(django_filters.CharFilter):
+    """Compares versions through a stored version key, e.g. ?version__lt=17.9.4a"""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        # Rows without a known version are neither older nor newer
+        return qs.exclude(**{self.field_name: ""}).filter(
+            **{f"{self.field_name}__{self.lookup_expr}": version_key(value)}
+        )
@@ -0,0 +1,42 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Measures download throughput of image URLs (e.g. SWIM built-in serving vs nginx)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Image URLs to download')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel downloads per URL')
+        parser.add_argument('--requests', type=int, default=8, help='Total downloads per URL')
+        parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification')
+
+    def download(self, url, verify):
+        start = time.monotonic()
+        size = 0
+        with requests.get(url, stream=True, verify=verify, timeout=60) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                size += len(chunk)
+        return size, time.monotonic() - start
+
+    def handle(self, *args, **options):
+        verify = not options['insecure']
+
+        for url in options['urls']:
+            self.stdout.write(f"Benchmarking {url} ({options['requests']} downloads, {options['concurrency']} parallel)")
+
+            start = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                results = list(executor.map(lambda _: self.download(url, verify), range(options['requests'])))
+            elapsed = time.monotonic() - start
+
+            total_bytes = sum(size for size, _ in results)
+            durations = sorted(duration for _, duration in results)
+            self.stdout.write(self.style.SUCCESS(
+                f"  {total_bytes / 1024 / 1024:,.1f} MB in {elapsed:.2f}s -> "
+                f"{total_bytes / 1024 / 1024 / elapsed:,.1f} MB/s aggregate, "
+                f"per download min/median/max {durations[0]:.2f}/{durations[len(durations) // 2]:.2f}/{durations[-1]:.2f}s"
+            ))
@@ -0,0 +1,46 @@
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from swim_backend.core.services.show_version_parser import parse_show_version_text
+
+CORPUS = Path(__file__).resolve().parents[2] / 'tests' / 'fixtures' / 'show_version'
+
+
+class Command(BaseCommand):
+    help = 'Compares show version parse time of the fast parser and genie on the test corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Parses per sample and parser')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent parsing threads')
+        parser.add_argument('--skip-genie', action='store_true', help='Only time the fast parser')
+
+    def genie_parser(self, os_name):
+        from genie.conf.base import Device
+
+        device = Device('benchmark', os=os_name)
+        device.custom.setdefault('abstraction', {})['order'] = ['os']
+        return lambda text: device.parse('show version', output=text)
+
+    def run(self, parse, text, iterations, threads):
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: parse(text), range(iterations)))
+        return (time.monotonic() - start) / iterations * 1000
+
+    def handle(self, *args, **options):
+        iterations, threads = options['iterations'], options['threads']
+        self.stdout.write(f"{iterations} parses per sample, {threads} threads")
+
+        for sample in sorted(CORPUS.glob('*.txt')):
+            text = sample.read_text()
+            fast_ms = self.run(parse_show_version_text, text, iterations, threads)
+            line = f"  {sample.stem:<28} fast {fast_ms:8.3f} ms/parse"
+
+            if not options['skip_genie']:
+                genie = self.genie_parser(sample.stem.split('_')[0])
+                genie(text)  # first call loads the parser classes
+                genie_ms = self.run(genie, text, iterations, threads)
+                line += f"   genie {genie_ms:8.3f} ms/parse   ({genie_ms / fast_ms:,.0f}x)"
+
+            self.stdout.write(self.style.SUCCESS(line))
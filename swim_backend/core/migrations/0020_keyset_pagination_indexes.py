@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0019_job_remarks'),
+        ('devices', '0020_version_keys'),
+        ('images', '0013_version_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-timestamp', '-id'], name='activitylog_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='checkrun',
+            index=models.Index(fields=['-created_at', '-id'], name='checkrun_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_event_bus'),
+        ('devices', '0020_version_keys'),
+        ('images', '0013_version_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['batch_id', 'status'], name='job_batch_status_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_job_batch_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregateGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_type', models.CharField(max_length=20, unique=True)),
+                ('generation', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
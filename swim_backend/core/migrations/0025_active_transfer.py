@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_aggregate_generation'),
+        ('devices', '0021_sync_claim'),
+        ('images', '0015_server_wide_stats_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveTransfer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rate_bps', models.FloatField(help_text='Expected throughput in bytes/sec')),
+                ('size_bytes', models.BigIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('file_server', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='images.fileserver')),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='active_transfer', to='core.job')),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='devices.site')),
+            ],
+        ),
+    ]
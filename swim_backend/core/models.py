@@ -119,6 +119,14 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination order (core.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+            # Batch status summaries (GET /api/upgrade/status/?batch_id=)
+            models.Index(fields=['batch_id', 'status'], name='job_batch_status_idx'),
+        ]
+
     def __str__(self):
         return f"Job {self.id} - {self.device.hostname}"
 
@@ -161,6 +169,12 @@ class CheckRun(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination order (core.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='checkrun_created_id_idx'),
+        ]
+
     def __str__(self):
         return f"CheckRun: {self.validation_check.name} on {self.device.hostname}"
 
@@ -248,6 +262,7 @@ class ActivityLog(models.Model):
             models.Index(fields=['-timestamp']),
             models.Index(fields=['user', '-timestamp']),
             models.Index(fields=['action', '-timestamp']),
+            models.Index(fields=['-timestamp', '-id'], name='activitylog_timestamp_id_idx'),
         ]
     
     def __str__(self):
@@ -255,6 +270,81 @@ class ActivityLog(models.Model):
         return f"{user_name} - {self.action} - {self.object_repr or 'N/A'} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
 
 
+class ChangeLogEntry(models.Model):
+    """
+    One change to a polled object (job, device, check run, ...). The id is the
+    change feed's monotonic sequence: clients poll for entries after the last id
+    they saw (core.services.change_feed).
+    """
+    ACTION_CHOICES = [
+        ('updated', 'Created or updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    object_type = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='updated')
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.object_type} {self.object_id} {self.action}"
+
+
+class Event(models.Model):
+    """
+    One event on the fleet-wide event bus (job status transitions, device
+    reachability, scheduler launches, sync and ZTP progress). The id is the
+    bus sequence: subscribers read events after the last id they saw
+    (core.services.event_bus).
+    """
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_type', 'id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.event_type}"
+
+
+class AggregateGeneration(models.Model):
+    """
+    Change counter of data outside the change feed (activity logs, ZTP).
+    Cached aggregates are versioned by it (core.services.aggregate_cache).
+    """
+    data_type = models.CharField(max_length=20, unique=True)
+    generation = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.data_type} @ {self.generation}"
+
+
+class ActiveTransfer(models.Model):
+    """
+    An image transfer admitted by the transfer planner, in any worker process.
+    Site and file server bandwidth budgets are checked against these rows.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='active_transfer')
+    site = models.ForeignKey('devices.Site', on_delete=models.CASCADE, null=True, blank=True)
+    file_server = models.ForeignKey(FileServer, on_delete=models.CASCADE, null=True, blank=True)
+    rate_bps = models.FloatField(help_text="Expected throughput in bytes/sec")
+    size_bytes = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    # After this the transfer no longer counts (its worker may have died)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Transfer for job {self.job_id}"
+
+
 class DashboardProxy(models.Model):
     """
     Proxy model that doesn't create a database table but provides custom permissions.
@@ -1,9 +1,89 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
 
 
-class ActivityLogPagination(PageNumberPagination):
+def estimated_count(queryset):
+    """
+    Row count from the PostgreSQL planner estimate, falling back to an exact
+    COUNT(*) on other databases or when the estimate is small enough that
+    counting is cheap (APPROXIMATE_COUNT_THRESHOLD).
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+
+    if estimate < getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', 10000):
+        return queryset.count()
+    return estimate
+
+
+class ApproximateCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination by default, with two opt-ins for large tables:
+
+    - ?cursor=<token> or ?pagination=cursor: keyset (cursor) pagination on the
+      indexed `cursor_ordering`, so deep pages and infinite scroll cost the same
+      as the first page and never run COUNT(*). Responses have next/previous
+      links only.
+    - ?count=approx: the count is the planner's estimate instead of COUNT(*),
+      in either mode.
+    """
+    cursor_ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.approximate = request.query_params.get('count') == 'approx'
+        self.cursor = None
+        if 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor':
+            self.cursor = CursorPagination()
+            self.cursor.ordering = self.cursor_ordering
+            self.cursor.page_size = self.get_page_size(request)
+            self.estimate = estimated_count(queryset) if self.approximate else None
+            return self.cursor.paginate_queryset(queryset, request, view)
+
+        if self.approximate:
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor is None:
+            return super().get_paginated_response(data)
+        body = {'next': self.cursor.get_next_link(), 'previous': self.cursor.get_previous_link()}
+        if self.estimate is not None:
+            body['count'] = self.estimate
+        body['results'] = data
+        return Response(body)
+
+
+class ActivityLogPagination(KeysetPagination):
     """Custom pagination for activity logs with configurable page size"""
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 1000
     page_query_param = 'page'
+    cursor_ordering = ('-timestamp', '-id')
+
+
+class DevicePagination(KeysetPagination):
+    cursor_ordering = ('hostname',)
@@ -8,12 +8,6 @@ def check_readiness(device, job):
     from swim_backend.core.services.workflow.readiness_strategies import (
         ReadinessStrategyRegistry,
     )
-    from swim_backend.core.services.workflow.readiness_strategies.catalyst9300_strategy import (
-        Catalyst9300ReadinessStrategy,
-    )
-    from swim_backend.core.services.workflow.readiness_strategies.lab_device_strategy import (
-        LabDeviceReadinessStrategy,
-    )
     from swim_backend.core.services.workflow.readiness_strategies.default_strategy import (
         DefaultReadinessStrategy,
     )
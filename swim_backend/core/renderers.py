@@ -0,0 +1,17 @@
+import json
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets EventSource requests (Accept: text/event-stream) through content
+    negotiation. Streams are StreamingHttpResponses and skip rendering; this
+    only renders the JSON errors returned before a stream starts.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() if data is not None else b""
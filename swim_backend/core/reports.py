@@ -33,16 +33,29 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        qs = self.get_queryset()
-        total = qs.count()
-        success = qs.filter(status='success').count()
-        failed = qs.filter(status='failed').count()
-        
-        return Response({
-            "total_jobs": total,
-            "success_rate": f"{(success/total)*100:.1f}%" if total > 0 else "0%",
-            "failed": failed
-        })
+        from django.db.models import Count, Q
+        from .services.aggregate_cache import cached_aggregate
+
+        def compute():
+            counts = self.get_queryset().aggregate(
+                total=Count('id'),
+                success=Count('id', filter=Q(status='success')),
+                failed=Count('id', filter=Q(status='failed')),
+            )
+            total = counts['total']
+            return {
+                "total_jobs": total,
+                "success_rate": f"{(counts['success']/total)*100:.1f}%" if total > 0 else "0%",
+                "failed": counts['failed']
+            }
+
+        # Everyone allowed to see reports sees the same figures for the same filters
+        params = request.query_params
+        scope = '|'.join(params.get(p, '') for p in ('start_date', 'end_date', 'user_id'))
+        data, hit = cached_aggregate('reports.summary', scope, compute)
+        response = Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
 
     @action(detail=False, methods=['get'])
     def export_csv(self, request):
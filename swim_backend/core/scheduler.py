@@ -6,6 +6,8 @@ from django.utils import timezone
 from django.db import transaction
 from .models import Job
 from .logic import run_swim_job
+from .services.change_feed import record_changes
+from .services.event_bus import publish, publish_job_statuses
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +100,8 @@ def scheduler_tick():
                 logger.info(
                     f"[Scheduler] Updated {updated_count} jobs to pending status"
                 )
+                record_changes("job", job_ids_to_execute)
+                publish_job_statuses(job_ids_to_execute, "pending")
 
                 # Execute the jobs
                 for job_id in job_ids_to_execute:
@@ -112,6 +116,7 @@ def scheduler_tick():
                         t = threading.Thread(target=run_swim_job, args=(job.id,))
                         t.daemon = True
                         t.start()
+                        publish("scheduler.launch", {"job": job.id, "device": job.device_id})
 
                     except Job.DoesNotExist:
                         logger.warning(f"[Scheduler] Job {job_id} no longer exists")
@@ -0,0 +1,143 @@
+"""
+Cache for aggregate endpoints (dashboard stats, activity and report
+summaries, device compliance).
+
+Each aggregate depends on a few data types ("device", "job", ...), and each
+type has a generation read from the database, so every gunicorn worker sees
+the same value as soon as the change commits:
+    - change-feed types use their latest change sequence (which bulk writes
+      advance too, through record_changes());
+    - activity logs and ZTP workflows bump an AggregateGeneration row from
+      model signals.
+The generations are part of the cache key, so a change invalidates every
+dependent entry at once and stale entries simply expire. While a change-feed
+entry may still be committing (core.services.commit_horizon), aggregates
+depending on the feed are computed without the cache. Only the entries
+live in the Django cache: with the local-memory default each worker computes
+its own, but none serves one computed before a change it can see.
+
+Entries are keyed by permission scope, so users who see the same data share
+them. AGGREGATE_CACHE_TTL bounds drift of time-window figures such as
+"failed in the last 24h".
+"""
+import hashlib
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from swim_backend.core.models import ActivityLog, AggregateGeneration, ChangeLogEntry, ZTPWorkflow
+from .change_feed import FEED_MODELS, changes_pending
+
+logger = logging.getLogger(__name__)
+
+# Data types each aggregate is computed from
+AGGREGATES = {
+    "dashboard.stats": ("device", "site", "devicemodel", "job", "ztp"),
+    "dashboard.device_compliance": ("device", "devicemodel"),
+    "activity.summary": ("activitylog",),
+    "activity.stats": ("activitylog",),
+    "reports.summary": ("job",),
+}
+
+_PREFIX = "aggcache"
+
+
+def _counter_key(name, outcome):
+    return f"{_PREFIX}:{outcome}:{name}"
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing (never set or evicted): counters never expire
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key)
+
+
+def invalidate(*data_types):
+    """
+    Bumps the generation of `data_types` outside the change feed, invalidating
+    every aggregate computed from them. Change-feed types need no call.
+    """
+    for data_type in data_types:
+        if AggregateGeneration.objects.filter(data_type=data_type).update(generation=F("generation") + 1):
+            continue
+        try:
+            with transaction.atomic():
+                AggregateGeneration.objects.create(data_type=data_type, generation=1)
+        except IntegrityError:
+            # Created concurrently
+            AggregateGeneration.objects.filter(data_type=data_type).update(generation=F("generation") + 1)
+
+
+def _generations(data_types):
+    feed_types = [t for t in data_types if t in FEED_MODELS]
+    generations = {}
+    if feed_types:
+        generations.update(
+            ChangeLogEntry.objects.filter(object_type__in=feed_types)
+            .order_by().values_list("object_type").annotate(latest=Max("id"))
+        )
+    other_types = [t for t in data_types if t not in FEED_MODELS]
+    if other_types:
+        generations.update(
+            AggregateGeneration.objects.filter(data_type__in=other_types).values_list("data_type", "generation")
+        )
+    return [generations.get(data_type, 0) for data_type in data_types]
+
+
+def cached_aggregate(name, scope, compute):
+    """
+    Returns (value, hit): the cached value of aggregate `name` for permission
+    `scope` (any string, e.g. "devices+jobs" or "user:12"), or compute() stored
+    until a dependency changes or AGGREGATE_CACHE_TTL passes.
+    """
+    ttl = getattr(settings, "AGGREGATE_CACHE_TTL", 60)
+    data_types = AGGREGATES[name]
+    # A change still committing would not advance its type's sequence
+    if not ttl or (any(t in FEED_MODELS for t in data_types) and changes_pending()):
+        return compute(), False
+
+    generations = ".".join(str(g) for g in _generations(data_types))
+    key = f"{_PREFIX}:{name}:{hashlib.md5(f'{scope}|{generations}'.encode()).hexdigest()}"
+    value = cache.get(key)
+    hit = value is not None
+    if not hit:
+        value = compute()
+        cache.set(key, value, ttl)
+    _incr(_counter_key(name, "hits" if hit else "misses"))
+    return value, hit
+
+
+def cache_stats():
+    """{aggregate: {hits, misses, hit_rate}} since the counters were created."""
+    counters = cache.get_many(
+        [_counter_key(name, outcome) for name in AGGREGATES for outcome in ("hits", "misses")]
+    )
+    stats = {}
+    for name in AGGREGATES:
+        hits = counters.get(_counter_key(name, "hits"), 0)
+        misses = counters.get(_counter_key(name, "misses"), 0)
+        total = hits + misses
+        stats[name] = {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else None}
+    return stats
+
+
+def _activity_logged(sender, **kwargs):
+    invalidate("activitylog")
+
+
+def _ztp_changed(sender, **kwargs):
+    invalidate("ztp")
+
+
+post_save.connect(_activity_logged, sender=ActivityLog, dispatch_uid="aggregate_cache_activitylog")
+post_delete.connect(_activity_logged, sender=ActivityLog, dispatch_uid="aggregate_cache_activitylog_delete")
+post_save.connect(_ztp_changed, sender=ZTPWorkflow, dispatch_uid="aggregate_cache_ztp")
+post_delete.connect(_ztp_changed, sender=ZTPWorkflow, dispatch_uid="aggregate_cache_ztp_delete")
+m2m_changed.connect(
+    _ztp_changed, sender=ZTPWorkflow.devices_provisioned.through, dispatch_uid="aggregate_cache_ztp_devices"
+)
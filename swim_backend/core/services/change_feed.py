@@ -0,0 +1,163 @@
+"""
+Change feed for polling clients.
+
+Every save or delete of a polled model (jobs, devices, check runs and the
+models their list payloads embed) appends a ChangeLogEntry; bulk writes that
+bypass signals call record_changes() themselves. The entry id is a monotonic
+sequence, so a client that remembers the last id it saw asks only for what
+changed after it, optionally long-polling until something does.
+
+The latest sequence per type also versions list endpoints: it feeds the ETags
+of ChangeFeedETagMixin, so an unchanged list is answered with a 304.
+
+Saves that only append to a job's log record no entry: they change no list
+row, and there is one per log line. They only wake the job streams
+(wait_for_record). Cursors never move past an entry whose transaction may
+still commit (core.services.commit_horizon).
+"""
+import time
+import threading
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Max, Min
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from swim_backend.core.models import ChangeLogEntry, CheckRun, Job
+from swim_backend.devices.models import Device, DeviceModel, Site
+from swim_backend.images.models import Image
+from .commit_horizon import committed_through, pending
+
+logger = logging.getLogger(__name__)
+
+FEED_MODELS = {
+    "job": Job,
+    "checkrun": CheckRun,
+    "device": Device,
+    "devicemodel": DeviceModel,
+    "site": Site,
+    "image": Image,
+}
+_TYPE_BY_MODEL = {model: object_type for object_type, model in FEED_MODELS.items()}
+
+# Entries returned by one feed response; clients ask again when `more` is set
+MAX_ENTRIES = 1000
+# How often a waiting long-poll re-checks the database for other processes' changes (seconds)
+POLL_INTERVAL = 1.0
+PRUNE_INTERVAL = 600
+
+# Wakes long-polls waiting in this process
+_changed = threading.Condition()
+_last_prune = 0.0
+
+
+def record_changes(object_type, ids, action="updated"):
+    """Appends change entries for `ids` of `object_type` and wakes waiting long-polls."""
+    ids = list(ids)
+    if not ids:
+        return
+    ChangeLogEntry.objects.bulk_create(
+        [ChangeLogEntry(object_type=object_type, object_id=object_id, action=action) for object_id in ids]
+    )
+    _notify()
+    _prune()
+
+
+def _notify():
+    with _changed:
+        _changed.notify_all()
+
+
+def _prune():
+    """Drops entries older than CHANGE_FEED_RETENTION_HOURS, at most every PRUNE_INTERVAL seconds."""
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    hours = getattr(settings, "CHANGE_FEED_RETENTION_HOURS", 24)
+    ChangeLogEntry.objects.filter(changed_at__lt=timezone.now() - timedelta(hours=hours)).delete()
+
+
+def _saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if sender is Job and update_fields is not None and set(update_fields) <= {"log"}:
+        # A log line (log_update): wake the job streams only
+        _notify()
+        return
+    record_changes(_TYPE_BY_MODEL[sender], [instance.pk])
+
+
+def _deleted(sender, instance, **kwargs):
+    record_changes(_TYPE_BY_MODEL[sender], [instance.pk], action="deleted")
+
+
+for _model in FEED_MODELS.values():
+    post_save.connect(_saved, sender=_model, dispatch_uid=f"change_feed_save_{_model.__name__}")
+    post_delete.connect(_deleted, sender=_model, dispatch_uid=f"change_feed_delete_{_model.__name__}")
+
+
+def wait_for_record(timeout):
+    """Blocks until a change (or a job log line) is saved in this process or `timeout` seconds pass."""
+    with _changed:
+        _changed.wait(timeout)
+
+
+def latest_sequence(types=None):
+    """Id of the newest entry (of `types`, if given); 0 when there is none."""
+    entries = ChangeLogEntry.objects.all()
+    if types is not None:
+        entries = entries.filter(object_type__in=types)
+    return entries.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def committed_sequence():
+    """The newest sequence a client can start from without missing an entry still being committed."""
+    return committed_through(ChangeLogEntry, "changed_at")[0]
+
+
+def changes_pending():
+    """Whether an entry below the newest may still commit, so versions taken now could go stale."""
+    return pending(ChangeLogEntry, "changed_at")
+
+
+def changes_since(since, types):
+    """
+    Changes after sequence `since` for `types`:
+    {'cursor', 'reset', 'more', 'changes': {type: {'updated': [ids], 'deleted': [ids]}}}.
+    `reset` means entries after `since` were already pruned, so the client must
+    reload its lists.
+    """
+    oldest = ChangeLogEntry.objects.aggregate(oldest=Min("id"))["oldest"]
+    reset = oldest is not None and since < oldest - 1
+
+    horizon, truncated = committed_through(ChangeLogEntry, "changed_at", since)
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=since, id__lte=horizon, object_type__in=types)
+        .order_by("id")
+        .values_list("id", "object_type", "object_id", "action")[:MAX_ENTRIES]
+    )
+    more = len(entries) == MAX_ENTRIES or truncated
+
+    # The last action per object wins
+    actions = {}
+    for _, object_type, object_id, action in entries:
+        actions[(object_type, object_id)] = action
+    changes = {}
+    for (object_type, object_id), action in actions.items():
+        changes.setdefault(object_type, {"updated": [], "deleted": []})[action].append(object_id)
+
+    cursor = entries[-1][0] if len(entries) == MAX_ENTRIES else horizon
+    return {"cursor": cursor, "reset": reset, "more": more, "changes": changes}
+
+
+def wait_for_changes(since, types, timeout):
+    """Like changes_since(), but waits up to `timeout` seconds for a change to happen."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = changes_since(since, types)
+        remaining = deadline - time.monotonic()
+        if result["changes"] or result["reset"] or remaining <= 0:
+            return result
+        wait_for_record(min(POLL_INTERVAL, remaining))
@@ -0,0 +1,83 @@
+"""
+Commit-order-safe cursors over id-sequenced tables (change feed, event bus).
+
+An id is allocated when its row is inserted but becomes visible only when its
+transaction commits, so a long transaction (an inventory import, a sync batch)
+can commit a lower id after readers have moved past it. Readers therefore
+advance only through ids whose predecessors are all visible: a missing id
+stops them until it shows up, or until it cannot show up anymore because the
+insert was rolled back:
+    - SQLite has one writer at a time, so ids always commit in order.
+    - On PostgreSQL the missing id belongs to a transaction that started
+      before the next row was written; once no such transaction is open, it
+      was rolled back.
+    - Other backends, and transactions left open for longer than
+      MAX_COMMIT_WAIT, are given up on after MAX_COMMIT_WAIT seconds.
+"""
+from datetime import timedelta
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+# Without a cursor, gaps are looked for among this many of the newest ids
+LOOKBACK = 1000
+# Rows examined for gaps by one read
+SCAN_LIMIT = 10000
+# Clock difference tolerated between app servers and the database (seconds)
+CLOCK_MARGIN = 5
+# A missing id older than this is treated as rolled back (seconds)
+MAX_COMMIT_WAIT = 300
+
+
+def _gap_settled(written_at):
+    """Whether an id missing before a row written at `written_at` can no longer appear."""
+    if timezone.now() - written_at > timedelta(seconds=MAX_COMMIT_WAIT):
+        return True
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor == "sqlite":
+        return True
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM pg_stat_activity WHERE datname = current_database()"
+                " AND pid <> pg_backend_pid() AND xact_start <= %s)",
+                [written_at + timedelta(seconds=CLOCK_MARGIN)],
+            )
+            return cursor.fetchone()[0]
+    return False
+
+
+def committed_through(model, time_field, since=None):
+    """
+    (horizon, truncated) for the table of `model`: every id after `since` up
+    to `horizon` is visible or settled, so a reader may move its cursor to
+    `horizon`. `time_field` is the row's insert time. Without `since` the
+    newest LOOKBACK ids are checked. `truncated` means SCAN_LIMIT rows were
+    examined without reaching the end; read again from `horizon`.
+    """
+    rows = model.objects.all()
+    if since is None:
+        latest = rows.aggregate(latest=Max("id"))["latest"] or 0
+        since = max(latest - LOOKBACK, 0)
+
+    after = rows.filter(id__gt=since).aggregate(latest=Max("id"), total=Sum("id"))
+    latest = after["latest"]
+    if latest is None:
+        return since, False
+    # Distinct ids in (since, latest] add up to the full series only if none is missing
+    if after["total"] == (since + 1 + latest) * (latest - since) // 2:
+        return latest, False
+
+    scanned = list(rows.filter(id__gt=since).order_by("id").values_list("id", time_field)[:SCAN_LIMIT])
+    horizon = since
+    for row_id, written_at in scanned:
+        if row_id != horizon + 1 and not _gap_settled(written_at):
+            return horizon, False
+        horizon = row_id
+    return horizon, len(scanned) == SCAN_LIMIT
+
+
+def pending(model, time_field):
+    """Whether an id below the newest of `model` may still commit."""
+    latest = model.objects.aggregate(latest=Max("id"))["latest"] or 0
+    return committed_through(model, time_field, max(latest - LOOKBACK, 0))[0] < latest
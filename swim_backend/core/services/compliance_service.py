@@ -0,0 +1,98 @@
+"""
+Stored software compliance of devices.
+
+Each device keeps its compliance (Compliant / Ahead / Non-Compliant /
+No Standard) in Device.compliance_status, so the dashboard and the device
+list count and filter with indexed queries instead of comparing versions per
+row. The status is recomputed when it can change: Device.save() when the
+version or model changes, the bulk sync and import paths after their bulk
+writes, and the signal handlers below when a model's golden image or an
+image's version changes.
+"""
+import logging
+from collections import defaultdict
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from swim_backend.devices.models import Device, DeviceModel
+from swim_backend.images.models import Image
+from .change_feed import record_changes
+from .version_parser import compare_versions
+
+logger = logging.getLogger(__name__)
+
+COMPLIANT = "Compliant"
+AHEAD = "Ahead"
+NON_COMPLIANT = "Non-Compliant"
+NO_STANDARD = "No Standard"
+
+
+def compliance_status(version, golden_version):
+    """Compliance of a device running `version` against its model's golden version."""
+    if not golden_version:
+        return NO_STANDARD
+    comparison = compare_versions(version, golden_version)
+    if comparison is None or comparison < 0:
+        return NON_COMPLIANT  # Outdated or unknown
+    if comparison == 0:
+        return COMPLIANT
+    return AHEAD
+
+
+def golden_versions(model_ids):
+    """{model_id: golden version} from the default image, falling back to golden_image_version."""
+    rows = DeviceModel.objects.filter(id__in=model_ids).values_list(
+        "id", "default_image__version", "golden_image_version"
+    )
+    return {model_id: image_version or version for model_id, image_version, version in rows}
+
+
+def device_compliance(device):
+    """Compliance of an (unsaved) device instance."""
+    if not device.model_id:
+        return NO_STANDARD
+    return compliance_status(device.version, golden_versions([device.model_id]).get(device.model_id))
+
+
+def refresh_compliance(devices):
+    """
+    Recomputes compliance_status for a Device queryset. Only devices whose
+    status changed are written, with one UPDATE per status. Returns the number
+    of devices updated.
+    """
+    rows = list(devices.values_list("id", "version", "model_id", "compliance_status"))
+    golden = golden_versions({model_id for _, _, model_id, _ in rows if model_id})
+
+    changed = defaultdict(list)
+    for device_id, version, model_id, current in rows:
+        status = compliance_status(version, golden.get(model_id))
+        if status != current:
+            changed[status].append(device_id)
+
+    for status, ids in changed.items():
+        Device.objects.filter(id__in=ids).update(compliance_status=status)
+        record_changes("device", ids)
+    return sum(len(ids) for ids in changed.values())
+
+
+@receiver(post_save, sender=DeviceModel)
+def _model_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_compliance(Device.objects.filter(model=instance))
+
+
+@receiver(post_save, sender=Image)
+def _image_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_compliance(Device.objects.filter(model__default_image=instance))
+
+
+@receiver(pre_delete, sender=Image)
+def _image_deleting(sender, instance, **kwargs):
+    instance._golden_for_models = list(instance.default_for_models.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Image)
+def _image_deleted(sender, instance, **kwargs):
+    model_ids = getattr(instance, "_golden_for_models", None)
+    if model_ids:
+        refresh_compliance(Device.objects.filter(model_id__in=model_ids))
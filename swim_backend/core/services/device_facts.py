@@ -0,0 +1,134 @@
+"""
+Shared cache of facts learned from devices.
+
+Sync, readiness, verification, activation and ZTP learn overlapping facts
+(version, PID, install mode, free flash, stack members). Each fact is stored
+with the time it was observed, and every consumer states the maximum age it
+accepts; only missing or older facts cost a login or a command.
+
+Freshness rules:
+- all facts expire after DEVICE_FACTS_TTL seconds at the latest
+- all facts but the install mode are dropped when an activation starts,
+  and the install mode when it ends (setting the boot image may change it)
+- all facts are dropped when a newer `show version` shows the device
+  booted since the facts were recorded
+- free flash is dropped when an image is distributed to the device
+"""
+import re
+import time
+import logging
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Facts taken from `show version`
+SHOW_VERSION_FACTS = {
+    'hostname': 'hostname',
+    'version': 'version',
+    'chassis': 'chassis',
+    'system_image': 'system_image',
+    'install_mode': 'install_mode',
+    'uptime': 'uptime',
+    'base_mac': 'base_ethernet_mac_address',
+    'stack_members': 'stack_members',
+}
+
+# A boot time this much later than the recorded one means the device reloaded
+# (uptime has minute resolution, so small differences are noise)
+RELOAD_TOLERANCE_SECONDS = 300
+
+_UPTIME_PART = re.compile(r'(\d+)\s+(year|week|day|hour|minute|second)', re.I)
+_UPTIME_UNITS = {
+    'year': 365 * 86400,
+    'week': 7 * 86400,
+    'day': 86400,
+    'hour': 3600,
+    'minute': 60,
+    'second': 1,
+}
+
+
+def _ttl():
+    return getattr(settings, 'DEVICE_FACTS_TTL', 3600)
+
+
+def _key(device_id):
+    return f"swim:device_facts:{device_id}"
+
+
+def uptime_seconds(uptime):
+    """'1 year, 2 weeks, 3 hours' / '120 day(s), 3 hour(s)' -> seconds, or None."""
+    parts = _UPTIME_PART.findall(uptime or '')
+    if not parts:
+        return None
+    return sum(int(amount) * _UPTIME_UNITS[unit.lower()] for amount, unit in parts)
+
+
+def get_facts(device_id, names, max_age):
+    """
+    Returns {name: value} for `names` if all were observed within `max_age`
+    seconds, otherwise None (the caller should ask the device).
+    """
+    if not max_age or not device_id:
+        return None
+
+    facts = cache.get(_key(device_id)) or {}
+    now = time.time()
+    values = {}
+    for name in names:
+        fact = facts.get(name)
+        if not fact or now - fact['at'] > max_age:
+            return None
+        values[name] = fact['value']
+    return values
+
+
+def record_facts(device_id, boot_time=None, **values):
+    """Stores observed facts. A boot time later than the recorded one drops all older facts."""
+    if not device_id:
+        return
+
+    key = _key(device_id)
+    facts = cache.get(key) or {}
+    now = time.time()
+
+    recorded_boot = facts.get('boot_time', {}).get('value')
+    if boot_time and recorded_boot and boot_time - recorded_boot > RELOAD_TOLERANCE_SECONDS:
+        logger.info(f"Device {device_id} reloaded since its facts were recorded, dropping them")
+        facts = {}
+    if boot_time:
+        values['boot_time'] = boot_time
+
+    for name, value in values.items():
+        if value is not None:
+            facts[name] = {'value': value, 'at': now}
+    cache.set(key, facts, _ttl())
+
+
+def record_show_version(device_id, parsed):
+    """Records the facts found in a parsed `show version` (fast parser or genie IOS-XE shape)."""
+    info = parsed.get('version') if isinstance(parsed, dict) else None
+    if not isinstance(info, dict):
+        return
+
+    values = {name: info.get(field) for name, field in SHOW_VERSION_FACTS.items()}
+    uptime = uptime_seconds(info.get('uptime'))
+    record_facts(device_id, boot_time=time.time() - uptime if uptime is not None else None, **values)
+
+
+def invalidate_facts(device_id, names=None, keep=()):
+    """Drops the given facts (all facts if `names` is None), except those in `keep`."""
+    if not device_id:
+        return
+    if names is None and not keep:
+        cache.delete(_key(device_id))
+        return
+
+    key = _key(device_id)
+    facts = cache.get(key)
+    if facts:
+        for name in list(facts if names is None else names):
+            if name not in keep:
+                facts.pop(name, None)
+        cache.set(key, facts, _ttl())
@@ -0,0 +1,276 @@
+"""
+Fleet-wide event bus.
+
+Typed events (job status transitions, device reachability changes, scheduler
+launches, sync run completion, ZTP intake and progress) are appended to the
+Event table; the id is the bus sequence, so a subscriber that remembers the
+last id it saw reads only what happened after it.
+
+Delivery across processes: on PostgreSQL every publish also runs
+NOTIFY swim_events (delivered when the transaction commits), and one
+listener thread per process holds a LISTEN connection that wakes the waiting
+subscribers. On SQLite, or when the listener is down, waiting subscribers
+re-read the table every POLL_INTERVAL seconds instead.
+
+Event types (payloads):
+    job.status          {job, device, batch_id, status, previous}
+    device.reachability {device, hostname, reachability, previous}
+    scheduler.launch    {job, device}
+    sync.completed      {run, scope, total, succeeded, failed}
+    ztp.intake          {ztp, ip_address, platform}
+    ztp.progress        {ztp, status, total, completed, failed, skipped}
+"""
+import time
+import select
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max, Min, Q
+from django.db.models.signals import post_init, post_save
+from django.utils import timezone
+from swim_backend.core.models import Event, Job, ZTPWorkflow
+from swim_backend.devices.models import Device
+from .commit_horizon import committed_through
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "swim_events"
+# Events returned by one read; subscribers ask again when `more` is set
+MAX_EVENTS = 500
+# How often a waiting subscriber re-reads the table without LISTEN/NOTIFY (seconds)
+POLL_INTERVAL = 1.0
+# With LISTEN/NOTIFY the table is still re-read this often, in case a notification was lost (seconds)
+LISTEN_RECHECK_INTERVAL = 10.0
+RECONNECT_DELAY = 5
+PRUNE_INTERVAL = 600
+
+# Wakes subscribers waiting in this process; the generation tells them whether anything happened
+_published = threading.Condition()
+_generation = 0
+_last_prune = 0.0
+
+_listener_lock = threading.Lock()
+_listener = None
+_listening = False
+
+
+def _wake():
+    global _generation
+    with _published:
+        _generation += 1
+        _published.notify_all()
+
+
+def publish(event_type, payload):
+    """Publishes one event."""
+    publish_many(event_type, [payload])
+
+
+def publish_many(event_type, payloads):
+    """Publishes one event per payload with a single INSERT (and a single NOTIFY)."""
+    payloads = list(payloads)
+    if not payloads:
+        return
+    try:
+        with transaction.atomic():
+            Event.objects.bulk_create([Event(event_type=event_type, payload=payload) for payload in payloads])
+            connection = connections[DEFAULT_DB_ALIAS]
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, event_type])
+        transaction.on_commit(_wake)
+        _prune()
+    except Exception as e:
+        # Events are advisory: never fail the write that produced them
+        logger.error(f"[EventBus] Failed to publish {event_type}: {e}")
+
+
+def _prune():
+    """Drops events older than EVENT_BUS_RETENTION_HOURS, at most every PRUNE_INTERVAL seconds."""
+    global _last_prune
+    now = time.monotonic()
+    if now - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = now
+    hours = getattr(settings, "EVENT_BUS_RETENTION_HOURS", 24)
+    Event.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours)).delete()
+
+
+def publish_job_statuses(job_ids, status):
+    """job.status events for jobs moved to `status` by a bulk update."""
+    rows = Job.objects.filter(id__in=list(job_ids)).values_list("id", "device_id", "batch_id")
+    publish_many("job.status", [
+        {"job": job_id, "device": device_id, "batch_id": str(batch_id) if batch_id else None,
+         "status": status, "previous": None}
+        for job_id, device_id, batch_id in rows
+    ])
+
+
+def publish_sync_run(run_id):
+    """sync.completed for a finished SyncRun."""
+    from swim_backend.devices.models import SyncRun
+
+    run = SyncRun.objects.filter(id=run_id).values("id", "scope", "total", "succeeded", "failed").first()
+    if run:
+        run["run"] = run.pop("id")
+        publish("sync.completed", run)
+
+
+# Field whose transitions are published, per model saved through save()
+_TRACKED_FIELDS = {Job: "status", Device: "reachability"}
+
+
+def _remember(sender, instance, **kwargs):
+    # __dict__ so a deferred field is not loaded just for this
+    instance._bus_initial = instance.__dict__.get(_TRACKED_FIELDS[sender])
+
+
+def _job_saved(sender, instance, created, raw=False, **kwargs):
+    status = instance.__dict__.get("status")
+    previous = None if created else getattr(instance, "_bus_initial", None)
+    if raw or status is None or status == previous:
+        return
+    instance._bus_initial = status
+    publish("job.status", {
+        "job": instance.id, "device": instance.device_id,
+        "batch_id": str(instance.batch_id) if instance.batch_id else None,
+        "status": status, "previous": previous,
+    })
+
+
+def _device_saved(sender, instance, created, raw=False, **kwargs):
+    reachability = instance.__dict__.get("reachability")
+    previous = getattr(instance, "_bus_initial", None)
+    if raw or created or reachability is None or previous is None or reachability == previous:
+        return
+    instance._bus_initial = reachability
+    publish("device.reachability", {
+        "device": instance.id, "hostname": instance.hostname,
+        "reachability": reachability, "previous": previous,
+    })
+
+
+def _ztp_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        publish("ztp.progress", {
+            "ztp": instance.id, "status": instance.status, "total": instance.total_devices,
+            "completed": instance.completed_devices, "failed": instance.failed_devices,
+            "skipped": instance.skipped_devices,
+        })
+
+
+for _model in _TRACKED_FIELDS:
+    post_init.connect(_remember, sender=_model, dispatch_uid=f"event_bus_init_{_model.__name__}")
+post_save.connect(_job_saved, sender=Job, dispatch_uid="event_bus_job")
+post_save.connect(_device_saved, sender=Device, dispatch_uid="event_bus_device")
+post_save.connect(_ztp_saved, sender=ZTPWorkflow, dispatch_uid="event_bus_ztp")
+
+
+def _listen():
+    """LISTEN loop of the process-wide listener thread (PostgreSQL only)."""
+    global _listening
+    wrapper = connections[DEFAULT_DB_ALIAS]
+    while True:
+        conn = None
+        try:
+            conn = wrapper.get_new_connection(wrapper.get_connection_params())
+            if not hasattr(conn, "poll"):
+                logger.warning("[EventBus] Database driver cannot LISTEN; subscribers poll the event table")
+                return
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            _listening = True
+            logger.info(f"[EventBus] Listening on {CHANNEL}")
+            while True:
+                if select.select([conn], [], [], LISTEN_RECHECK_INTERVAL) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    del conn.notifies[:]
+                    _wake()
+        except Exception as e:
+            logger.error(f"[EventBus] LISTEN connection lost, polling until it is back: {e}")
+        finally:
+            _listening = False
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        time.sleep(RECONNECT_DELAY)
+
+
+def start_listener():
+    """Starts the LISTEN thread once per process, on PostgreSQL."""
+    global _listener
+    if connections[DEFAULT_DB_ALIAS].vendor != "postgresql":
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(target=_listen, name="event-bus-listener", daemon=True)
+            _listener.start()
+
+
+def type_filter(types):
+    """Q matching `types`; a type without a dot ("job") matches its whole category ("job.*")."""
+    query = Q()
+    for event_type in types:
+        query |= Q(event_type=event_type) if "." in event_type else Q(event_type__startswith=f"{event_type}.")
+    return query
+
+
+def latest_event_id():
+    return Event.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def committed_event_id():
+    """The newest id a subscriber can start from without missing an event still being committed."""
+    return committed_through(Event, "created_at")[0]
+
+
+def events_since(since, types=None):
+    """
+    Events after id `since` (of `types`, if given):
+    {'cursor', 'reset', 'more', 'events': [{'id', 'type', 'payload', 'created_at'}]}.
+    `reset` means events after `since` were already pruned.
+    """
+    oldest = Event.objects.aggregate(oldest=Min("id"))["oldest"]
+    # A cursor of 0 was taken on an empty bus, so nothing can have been missed
+    reset = oldest is not None and 0 < since < oldest - 1
+
+    horizon, truncated = committed_through(Event, "created_at", since)
+    events = Event.objects.filter(id__gt=since, id__lte=horizon)
+    if types:
+        events = events.filter(type_filter(types))
+    rows = list(events.order_by("id").values_list("id", "event_type", "payload", "created_at")[:MAX_EVENTS])
+
+    full = len(rows) == MAX_EVENTS
+    return {
+        "cursor": rows[-1][0] if full else horizon,
+        "reset": reset,
+        "more": full or truncated,
+        "events": [
+            {"id": event_id, "type": event_type, "payload": payload, "created_at": created_at.isoformat()}
+            for event_id, event_type, payload, created_at in rows
+        ],
+    }
+
+
+def wait_for_events(since, types, timeout):
+    """Like events_since(), but waits up to `timeout` seconds for an event to be published."""
+    start_listener()
+    deadline = time.monotonic() + timeout
+    while True:
+        with _published:
+            generation = _generation
+        result = events_since(since, types)
+        remaining = deadline - time.monotonic()
+        if result["events"] or result["reset"] or remaining <= 0:
+            return result
+        interval = LISTEN_RECHECK_INTERVAL if _listening else POLL_INTERVAL
+        with _published:
+            if generation == _generation:
+                _published.wait(min(interval, remaining))
@@ -0,0 +1,196 @@
+"""
+Persistent catalog of the images available on each file server.
+
+Directories are listed with FileSystemService and the results stored as
+FileServerEntry rows, so lookups (scan_images, file server catalog) are a
+database query. Refreshes are incremental: HTTP listings are fetched
+conditionally, and checksum sidecars are only read for new or changed files.
+Stale directories are refreshed in the background while the cached entries
+keep being served.
+"""
+import time
+import threading
+import logging
+from django.conf import settings
+from django.utils import timezone
+from swim_backend.images.models import FileServerDirectory, FileServerEntry
+from swim_backend.core.services.filesystem_service import FileSystemService, parse_sidecar
+
+logger = logging.getLogger(__name__)
+
+# Directories currently being refreshed in this process, to coalesce refreshes
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _max_age():
+    return getattr(settings, 'FILE_CATALOG_MAX_AGE', 900)
+
+
+def normalize_path(path):
+    return '/' + (path or '').strip('/')
+
+
+def is_stale(directory):
+    if not directory.scanned_at:
+        return True
+    return (timezone.now() - directory.scanned_at).total_seconds() > _max_age()
+
+
+def refresh_directory(server, path, force=False):
+    """
+    Lists `path` on `server` and brings its catalog entries up to date.
+    Returns the FileServerDirectory; listing errors are recorded on it and re-raised.
+    """
+    directory, _ = FileServerDirectory.objects.get_or_create(file_server=server, path=normalize_path(path))
+    started = time.monotonic()
+
+    try:
+        listing = FileSystemService.list_directory(
+            server, directory.path,
+            etag='' if force else directory.etag,
+            last_modified='' if force else directory.last_modified,
+        )
+    except Exception as e:
+        directory.status = 'error'
+        directory.error = str(e)
+        directory.scanned_at = timezone.now()
+        directory.save(update_fields=['status', 'error', 'scanned_at'])
+        raise
+
+    now = timezone.now()
+    if listing['not_modified']:
+        directory.entries.update(last_seen_at=now)
+    else:
+        existing = {entry.filename: entry for entry in directory.entries.all()}
+        created, updated = [], []
+
+        for filename, meta in listing['files'].items():
+            entry = existing.pop(filename, None)
+            changed = entry is None or (
+                (meta['size'], meta['modified'], meta['etag']) != (entry.size_bytes, entry.modified_at, entry.etag)
+            )
+            if entry is None:
+                entry = FileServerEntry(
+                    directory=directory, filename=filename,
+                    version=FileSystemService._extract_version(filename),
+                )
+
+            for algorithm, sidecar in meta['sidecars'].items():
+                field = f"{algorithm}_checksum"
+                if changed or force or not getattr(entry, field):
+                    setattr(entry, field, parse_sidecar(FileSystemService.read_file(server, directory.path, sidecar)))
+            for algorithm in {'md5', 'sha512'} - set(meta['sidecars']):
+                if changed:
+                    setattr(entry, f"{algorithm}_checksum", '')
+
+            entry.size_bytes = meta['size']
+            entry.modified_at = meta['modified']
+            entry.etag = meta['etag']
+            entry.last_seen_at = now
+            (created if entry.pk is None else updated).append(entry)
+
+        # A concurrent refresh of the same directory (background thread, another
+        # worker, refresh=true) may have inserted some of these; its rows stand
+        FileServerEntry.objects.bulk_create(created, ignore_conflicts=True)
+        FileServerEntry.objects.bulk_update(
+            updated, ['size_bytes', 'modified_at', 'etag', 'md5_checksum', 'sha512_checksum', 'last_seen_at']
+        )
+        # Whatever is left has disappeared from the server
+        FileServerEntry.objects.filter(id__in=[entry.id for entry in existing.values()]).delete()
+
+        directory.etag = listing['etag']
+        directory.last_modified = listing['last_modified']
+
+    directory.status = 'ok'
+    directory.error = None
+    directory.scanned_at = now
+    directory.scan_seconds = time.monotonic() - started
+    directory.save(update_fields=['status', 'error', 'scanned_at', 'scan_seconds', 'etag', 'last_modified'])
+    return directory
+
+
+def start_directory_refresh(server, path):
+    """Refresh a directory in a background thread, unless one is already running."""
+    key = (server.id, normalize_path(path))
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            refresh_directory(server, path)
+        except Exception as e:
+            logger.error(f"Catalog refresh of {server.name}:{path} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+
+
+def entry_as_file(entry, directory):
+    """Catalog entry in the shape returned by FileSystemService.list_files."""
+    return {
+        'filename': entry.filename,
+        'version': entry.version,
+        'path': f"{directory.path.strip('/')}/{entry.filename}",
+        'size': entry.size_bytes or 0,
+        'md5': entry.md5_checksum,
+        'sha512': entry.sha512_checksum,
+        'modified_at': entry.modified_at,
+    }
+
+
+def catalog_files(server, path, refresh=False):
+    """
+    Returns (directory, files) for `path` on `server` from the catalog.
+
+    A directory seen for the first time (or `refresh=True`) is listed
+    synchronously; a stale one is served from the catalog and refreshed in
+    the background.
+    """
+    directory = FileServerDirectory.objects.filter(file_server=server, path=normalize_path(path)).first()
+
+    if directory is None or directory.scanned_at is None or refresh:
+        directory = refresh_directory(server, path, force=refresh)
+    elif is_stale(directory):
+        start_directory_refresh(server, path)
+
+    return directory, [entry_as_file(entry, directory) for entry in directory.entries.all()]
+
+
+def refresh_stale_directories():
+    """Refreshes every cataloged directory older than FILE_CATALOG_MAX_AGE."""
+    for directory in FileServerDirectory.objects.select_related('file_server'):
+        if not is_stale(directory):
+            continue
+        try:
+            refresh_directory(directory.file_server, directory.path)
+        except Exception as e:
+            logger.error(f"[Catalog] Refresh of {directory} failed: {e}")
+
+
+def catalog_refresh_loop():
+    interval = getattr(settings, 'FILE_CATALOG_REFRESH_INTERVAL', 300)
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_stale_directories()
+        except Exception as e:
+            logger.error(f"[Catalog] Error refreshing file server catalog: {e}")
+
+
+_catalog_started = False
+
+def start_catalog_refresh_loop():
+    """Start periodic catalog refreshes in a background thread."""
+    global _catalog_started
+    if _catalog_started or not getattr(settings, 'FILE_CATALOG_REFRESH_INTERVAL', 300):
+        return
+    _catalog_started = True
+    t = threading.Thread(target=catalog_refresh_loop, daemon=True)
+    t.start()
+    logger.info("[Catalog] File server catalog refresh started")
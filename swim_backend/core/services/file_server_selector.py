@@ -0,0 +1,266 @@
+"""
+Measured file server selection.
+
+Candidate servers for a device are collected from the static preference
+hierarchy (device → site → region → global default) and ranked by the
+expected transfer time for the image, using the throughput actually achieved
+by previous transfers to the device's site and the latency measured by the
+periodic probes. The ranked list is used as an ordered failover chain by the
+distribution step.
+"""
+import math
+import socket
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the throughput moving average
+THROUGHPUT_SMOOTHING = 0.3
+
+# Expected-time penalty added per consecutive failed transfer (seconds)
+FAILURE_PENALTY_SECONDS = 600
+
+# Timeout for a single probe connection (seconds)
+PROBE_TIMEOUT = 5
+
+# Transfers shorter than this are dominated by connection setup and are not
+# used as throughput samples (seconds)
+MIN_SAMPLE_SECONDS = 1.0
+
+
+def _default_throughput():
+    return getattr(settings, 'FILE_SERVER_DEFAULT_THROUGHPUT_BPS', 10 * 1024 * 1024)
+
+
+def get_candidate_servers(device, pinned=None, image=None):
+    """
+    Returns the de-duplicated static candidates for a device as a list of
+    (file_server, source) tuples, in preference order.
+
+    When the image's replication is tracked, only servers holding a verified
+    replica are kept (a pinned server is always kept), and any other verified
+    replica holders are appended as extra failover candidates.
+    """
+    from swim_backend.images.models import FileServer
+    from swim_backend.core.services.replication_service import replica_holders
+
+    holders = replica_holders(image) if image is not None else None
+
+    candidates = []
+    seen = set()
+
+    def add(fs, source):
+        if not fs or fs.id in seen:
+            return
+        if holders is not None and source != "Manual Assignment" and fs.id not in holders:
+            if not (fs.serves_local_images and image.file):
+                return
+        seen.add(fs.id)
+        candidates.append((fs, source))
+
+    add(pinned, "Manual Assignment")
+    add(device.preferred_file_server, "Device Preferred")
+    if device.site:
+        add(device.site.preferred_file_server, f"Site Preferred ({device.site.name})")
+        if device.site.region:
+            add(device.site.region.preferred_file_server, f"Region Preferred ({device.site.region.name})")
+    for fs in FileServer.objects.filter(is_global_default=True):
+        add(fs, "Global Default")
+    if holders:
+        for fs in FileServer.objects.filter(id__in=holders).order_by('name'):
+            add(fs, "Verified Replica")
+
+    return candidates
+
+
+def estimate_transfer_seconds(stats_by_server, file_server, site_id, size_bytes):
+    """
+    Expected transfer time of `size_bytes` from `file_server` to a device at
+    `site_id`. Falls back from site-specific throughput to the server-wide
+    figure and finally to the configured default.
+    """
+    site_stats = stats_by_server.get((file_server.id, site_id))
+    server_stats = stats_by_server.get((file_server.id, None))
+
+    throughput = None
+    for stats in (site_stats, server_stats):
+        if stats and stats.throughput_bps:
+            throughput = stats.throughput_bps
+            break
+    if not throughput:
+        throughput = _default_throughput()
+
+    seconds = (size_bytes or 0) / throughput
+
+    if server_stats:
+        if server_stats.latency_ms:
+            seconds += server_stats.latency_ms / 1000.0
+        if not server_stats.last_probe_ok:
+            # Unreachable on the last probe - keep it only as a last resort
+            return math.inf
+
+    failure_stats = site_stats or server_stats
+    if failure_stats:
+        seconds += failure_stats.consecutive_failures * FAILURE_PENALTY_SECONDS
+
+    return seconds
+
+
+def rank_file_servers(device, image=None, pinned=None):
+    """
+    Returns the ordered failover chain for a device as a list of
+    (file_server, source, expected_seconds) tuples.
+
+    A pinned (manually assigned) server always stays first; the remaining
+    candidates are ordered by expected transfer time, keeping the static
+    preference order between servers that score the same.
+    """
+    from swim_backend.images.models import FileServerStats
+
+    candidates = get_candidate_servers(device, pinned=pinned, image=image)
+    if not candidates:
+        return []
+
+    site_id = device.site_id
+    site_filter = Q(site__isnull=True)
+    if site_id:
+        site_filter |= Q(site_id=site_id)
+    stats_by_server = {
+        (s.file_server_id, s.site_id): s
+        for s in FileServerStats.objects.filter(
+            site_filter, file_server_id__in=[fs.id for fs, _ in candidates]
+        )
+    }
+
+    size_bytes = image.size_bytes if image else 0
+    scored = [
+        (fs, source, estimate_transfer_seconds(stats_by_server, fs, site_id, size_bytes), index)
+        for index, (fs, source) in enumerate(candidates)
+    ]
+
+    head = []
+    if pinned:
+        head, scored = scored[:1], scored[1:]
+    scored.sort(key=lambda entry: (entry[2], entry[3]))
+
+    return [(fs, source, seconds) for fs, source, seconds, _ in head + scored]
+
+
+def _get_stats_for_update(file_server, site):
+    from swim_backend.images.models import FileServerStats
+
+    stats, _ = FileServerStats.objects.select_for_update().get_or_create(
+        file_server=file_server, site=site
+    )
+    return stats
+
+
+def record_transfer(file_server, site, size_bytes, seconds):
+    """Records a completed transfer as a throughput sample for (server, site)."""
+    if not file_server or not size_bytes or seconds < MIN_SAMPLE_SECONDS:
+        return
+
+    sample = size_bytes / seconds
+    try:
+        with transaction.atomic():
+            stats = _get_stats_for_update(file_server, site)
+            if stats.throughput_bps:
+                stats.throughput_bps = (
+                    THROUGHPUT_SMOOTHING * sample + (1 - THROUGHPUT_SMOOTHING) * stats.throughput_bps
+                )
+            else:
+                stats.throughput_bps = sample
+            stats.transfer_count += 1
+            stats.consecutive_failures = 0
+            stats.last_transfer_at = timezone.now()
+            stats.save()
+    except Exception as e:
+        logger.error(f"Failed to record transfer stats for {file_server}: {e}")
+
+
+def record_failure(file_server, site):
+    """Records a failed transfer for (server, site)."""
+    if not file_server:
+        return
+
+    from swim_backend.images.models import FileServerStats
+
+    try:
+        stats, _ = FileServerStats.objects.get_or_create(file_server=file_server, site=site)
+        FileServerStats.objects.filter(pk=stats.pk).update(
+            failure_count=F('failure_count') + 1,
+            consecutive_failures=F('consecutive_failures') + 1,
+            last_failure_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.error(f"Failed to record transfer failure for {file_server}: {e}")
+
+
+def probe_file_server(file_server):
+    """
+    Measures TCP connect latency to a file server and stores the result on its
+    server-wide stats row. Returns the latency in ms, or None if unreachable.
+    """
+    from swim_backend.images.models import FileServerStats
+
+    latency_ms = None
+    try:
+        start = time.monotonic()
+        with socket.create_connection((file_server.address, file_server.port), timeout=PROBE_TIMEOUT):
+            latency_ms = (time.monotonic() - start) * 1000.0
+    except OSError as e:
+        logger.warning(f"Probe failed for file server {file_server.name}: {e}")
+
+    # A concurrent probe may insert the row first: get_or_create then hits the
+    # unique_server_wide_stats constraint and returns that row instead
+    stats, _ = FileServerStats.objects.get_or_create(file_server=file_server, site=None)
+    stats.last_probe_at = timezone.now()
+    stats.last_probe_ok = latency_ms is not None
+    if latency_ms is not None:
+        stats.latency_ms = latency_ms
+    stats.save(update_fields=['last_probe_at', 'last_probe_ok', 'latency_ms'])
+
+    return latency_ms
+
+
+def probe_all_file_servers(max_workers=8):
+    """Probes every configured file server in parallel."""
+    from swim_backend.images.models import FileServer
+
+    servers = list(FileServer.objects.all())
+    if not servers:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(servers))) as executor:
+        results = executor.map(probe_file_server, servers)
+        return {fs.id: latency for fs, latency in zip(servers, results)}
+
+
+def probe_loop():
+    interval = getattr(settings, 'FILE_SERVER_PROBE_INTERVAL', 300)
+    while True:
+        try:
+            probe_all_file_servers()
+        except Exception as e:
+            logger.error(f"[Probe] Error probing file servers: {e}")
+        time.sleep(interval)
+
+
+_probe_started = False
+
+def start_probe_loop():
+    """Start periodic file server probes in a background thread."""
+    global _probe_started
+    if _probe_started or not getattr(settings, 'FILE_SERVER_PROBE_INTERVAL', 300):
+        return
+    _probe_started = True
+    t = threading.Thread(target=probe_loop, daemon=True)
+    t.start()
+    logger.info("[Probe] File server probes started")
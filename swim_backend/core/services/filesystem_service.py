@@ -1,10 +1,112 @@
 import requests
 import re
-from urllib.parse import urljoin
+import time
+import ftplib
+import posixpath
+import threading
 import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# File extensions treated as software images
+IMAGE_EXTENSIONS = ('.bin', '.iso', '.img', '.tar')
+
+# Checksum sidecar files published next to images (e.g. image.bin.md5)
+SIDECAR_EXTENSIONS = {
+    '.md5': 'md5',
+    '.md5sum': 'md5',
+    '.sha512': 'sha512',
+    '.sha512sum': 'sha512',
+}
+
+# Sidecars are small text files; anything bigger is not a checksum
+SIDECAR_MAX_BYTES = 4096
+
+# Parallel HEAD requests per HTTP directory listing
+HTTP_HEAD_WORKERS = 8
+
+
+class SFTPSessionPool:
+    """
+    Keeps idle SSH/SFTP sessions per file server so repeated listings reuse
+    an authenticated connection instead of paying the SSH handshake each time.
+    """
+
+    def __init__(self, max_idle=2, idle_timeout=300):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    def _key(self, server):
+        return (server.address, server.port, server.username, server.password)
+
+    def _connect(self, server):
+        import paramiko
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            server.address, port=server.port or 22, username=server.username,
+            password=server.password, timeout=30, allow_agent=False, look_for_keys=False
+        )
+        return client, client.open_sftp()
+
+    @contextmanager
+    def session(self, server):
+        key = self._key(server)
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle and conn is None:
+                client, sftp, idle_since = idle.pop()
+                transport = client.get_transport()
+                if transport and transport.is_active() and time.monotonic() - idle_since < self.idle_timeout:
+                    conn = (client, sftp)
+                else:
+                    client.close()
+
+        if conn is None:
+            conn = self._connect(server)
+
+        try:
+            yield conn[1]
+        except Exception:
+            conn[0].close()
+            raise
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn[0], conn[1], time.monotonic()))
+                return
+        conn[0].close()
+
+
+sftp_pool = SFTPSessionPool()
+
+
+def classify_filename(filename):
+    """Returns 'image', ('sidecar', algorithm, image filename) or None."""
+    lower = filename.lower()
+    for ext, algorithm in SIDECAR_EXTENSIONS.items():
+        if lower.endswith(ext) and lower[:-len(ext)].endswith(IMAGE_EXTENSIONS):
+            return ('sidecar', algorithm, filename[:-len(ext)])
+    if lower.endswith(IMAGE_EXTENSIONS):
+        return 'image'
+    return None
+
+
+def parse_sidecar(text):
+    """First hex token of a checksum file (`md5sum`/`sha512sum` or bare digest)."""
+    match = re.search(r'\b([0-9a-fA-F]{32}|[0-9a-fA-F]{128})\b', text or '')
+    return match.group(1).lower() if match else ''
+
+
 class FileSystemService:
     """
     Handles file listing from remote servers (HTTP, FTP, SFTP).
@@ -13,81 +115,246 @@ class FileSystemService:
     @staticmethod
     def list_files(server, path):
         """
-        Dispatches to specific protocol handler.
+        Live listing of the images in `path`, with sizes and any published
+        checksums. Prefer the catalog (file_catalog_service) for repeated lookups.
+        """
+        clean_path = path.strip('/')
+        listing = FileSystemService.list_directory(server, path)
+
+        results = []
+        for filename, meta in sorted(listing['files'].items()):
+            checksums = {
+                algorithm: parse_sidecar(FileSystemService.read_file(server, path, sidecar))
+                for algorithm, sidecar in meta['sidecars'].items()
+            }
+            results.append({
+                'filename': filename,
+                'version': FileSystemService._extract_version(filename),
+                'path': f"{clean_path}/{filename}",
+                'size': meta['size'] or 0,
+                'md5': checksums.get('md5', ''),
+                'sha512': checksums.get('sha512', ''),
+            })
+        return results
+
+    @staticmethod
+    def list_directory(server, path, etag='', last_modified=''):
+        """
+        Lists image files in `path` without reading their contents.
+
+        Returns {'not_modified', 'etag', 'last_modified', 'files'} where files maps
+        filename -> {'size', 'modified', 'etag', 'sidecars': {algorithm: filename}}.
+        `etag`/`last_modified` make HTTP listings conditional; other protocols ignore them.
         """
         protocol = server.protocol.lower()
-        
+
         if protocol in ['http', 'https']:
-            return FileSystemService._list_http(server, path)
+            return FileSystemService._list_http(server, path, etag, last_modified)
         elif protocol == 'ftp':
-            pass
-        elif protocol == 'sftp':
-            pass
-            
-        return []
+            return FileSystemService._list_ftp(server, path)
+        elif protocol in ['sftp', 'scp']:
+            return FileSystemService._list_sftp(server, path)
+
+        raise Exception(f"Listing is not supported for protocol {server.protocol}")
+
+    @staticmethod
+    def read_file(server, path, filename):
+        """Reads a small text file (checksum sidecar) from the server."""
+        protocol = server.protocol.lower()
+        remote_path = posixpath.join('/' + path.strip('/'), filename)
+
+        try:
+            if protocol in ['http', 'https']:
+                response = requests.get(
+                    FileSystemService._http_url(server, remote_path),
+                    auth=FileSystemService._http_auth(server), timeout=10
+                )
+                response.raise_for_status()
+                return response.content[:SIDECAR_MAX_BYTES].decode(errors='ignore')
+            elif protocol == 'ftp':
+                chunks = []
+                with FileSystemService._ftp(server) as ftp:
+                    ftp.retrbinary(f"RETR {remote_path}", chunks.append)
+                return b''.join(chunks)[:SIDECAR_MAX_BYTES].decode(errors='ignore')
+            elif protocol in ['sftp', 'scp']:
+                with sftp_pool.session(server) as sftp:
+                    with sftp.open(remote_path, 'rb') as f:
+                        return f.read(SIDECAR_MAX_BYTES).decode(errors='ignore')
+        except Exception as e:
+            logger.warning(f"Could not read {remote_path} from {server.name}: {e}")
+        return ''
+
+    @staticmethod
+    def _collect(entries):
+        """Groups raw (filename, size, modified, etag) entries into images and their sidecars."""
+        files = {}
+        sidecars = []
+        for filename, size, modified, etag in entries:
+            kind = classify_filename(filename)
+            if kind == 'image':
+                files[filename] = {'size': size, 'modified': modified, 'etag': etag or '', 'sidecars': {}}
+            elif kind:
+                sidecars.append((kind[1], kind[2], filename))
+        for algorithm, image_name, sidecar in sorted(sidecars):
+            if image_name in files:
+                files[image_name]['sidecars'].setdefault(algorithm, sidecar)
+        return files
+
+    @staticmethod
+    def _http_url(server, remote_path):
+        base_url = f"{server.protocol}://{server.address}"
+        if server.port:
+            base_url += f":{server.port}"
+        return f"{base_url}/{remote_path.lstrip('/')}"
 
     @staticmethod
-    def _list_http(server, path):
+    def _http_auth(server):
+        if server.username and server.password:
+            return (server.username, server.password)
+        return None
+
+    @staticmethod
+    def _list_http(server, path, etag='', last_modified=''):
         """
-        Lists files from an HTTP/S directory listing (Apache/Nginx style).
+        Lists files from an HTTP/S directory listing (Apache/Nginx style), then
+        issues HEAD requests for sizes. The listing itself is fetched
+        conditionally, so an unchanged directory costs a single 304.
         """
-        try:
-            base_url = f"{server.protocol}://{server.address}"
-            if server.port:
-                base_url += f":{server.port}"
-            
-            # Construct full URL
-            # Ensure path starts with / logic
-            clean_path = path.strip('/')
-            full_url = f"{base_url}/{clean_path}/"
-            
-            logger.info(f"Listing files from: {full_url}")
-            
-            try:
-                # Basic Auth if credentials exist
-                auth = None
-                if server.username and server.password:
-                    auth = (server.username, server.password)
+        clean_path = path.strip('/')
+        full_url = FileSystemService._http_url(server, f"{clean_path}/" if clean_path else '')
+        auth = FileSystemService._http_auth(server)
 
-                response = requests.get(full_url, auth=auth, timeout=10)
-                response.raise_for_status()
-                
-                html = response.text
-                
-                # Regex to find links strictly to files (ignoring query params, parent dir etc)
-                # Matches <a href="filename.bin"> ... </a>
-                # We filter common extensions for IOS images
-                file_pattern = r'<a\s+href="([^"?/]+\.(?:bin|iso|img|tar))">'
-                
-                matches = re.findall(file_pattern, html, re.IGNORECASE)
-                
-                results = []
-                for filename in set(matches): # Deduplicate
-                    results.append({
-                        'filename': filename,
-                        # Version extraction could be regex based on filename pattern
-                        'version': FileSystemService._extract_version(filename),
-                        'path': f"{clean_path}/{filename}",
-                        'size': 0, # Hard to get size reliably from generic HTML without complex parsing
-                        'md5': ''
-                    })
-                    
-                return results
+        logger.info(f"Listing files from: {full_url}")
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
 
+        with requests.Session() as session:
+            session.auth = auth
+            try:
+                response = session.get(full_url, headers=headers, timeout=10)
+                if response.status_code == 304:
+                    return {'not_modified': True, 'etag': etag, 'last_modified': last_modified, 'files': {}}
+                response.raise_for_status()
             except requests.exceptions.RequestException as e:
                 logger.error(f"HTTP Request failed: {e}")
                 raise Exception(f"Failed to connect to HTTP server: {str(e)}")
 
-        except Exception as e:
-            logger.error(f"Error listing HTTP files: {e}")
-            raise e
+            # Links strictly to files (ignoring query params, parent dir etc)
+            link_pattern = r'<a\s+href="([^"?/]+)"'
+            names = {
+                requests.utils.unquote(name) for name in re.findall(link_pattern, response.text, re.IGNORECASE)
+            }
+            names = [name for name in names if classify_filename(name)]
+
+            def head(name):
+                try:
+                    r = session.head(f"{full_url}{requests.utils.quote(name)}", timeout=10, allow_redirects=True)
+                    r.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"HEAD failed for {name}: {e}")
+                    return name, None, None, ''
+                size = r.headers.get('Content-Length')
+                modified = r.headers.get('Last-Modified')
+                try:
+                    modified = parsedate_to_datetime(modified) if modified else None
+                except (TypeError, ValueError):
+                    modified = None
+                return name, int(size) if size else None, modified, r.headers.get('ETag', '')
+
+            image_names = [name for name in names if classify_filename(name) == 'image']
+            sidecar_names = [(name, None, None, '') for name in names if classify_filename(name) != 'image']
+            entries = sidecar_names
+            if image_names:
+                with ThreadPoolExecutor(max_workers=min(HTTP_HEAD_WORKERS, len(image_names))) as executor:
+                    entries += list(executor.map(head, image_names))
+
+        return {
+            'not_modified': False,
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'files': FileSystemService._collect(entries),
+        }
+
+    @staticmethod
+    @contextmanager
+    def _ftp(server):
+        ftp = ftplib.FTP()
+        ftp.connect(server.address, server.port or 21, timeout=30)
+        try:
+            ftp.login(server.username or 'anonymous', server.password or '')
+            yield ftp
+        finally:
+            try:
+                ftp.quit()
+            except Exception:
+                ftp.close()
+
+    @staticmethod
+    def _list_ftp(server, path):
+        """Lists files over FTP using MLSD, falling back to NLST + SIZE."""
+        remote_dir = '/' + path.strip('/')
+        entries = []
+
+        with FileSystemService._ftp(server) as ftp:
+            try:
+                for name, facts in ftp.mlsd(remote_dir, facts=['type', 'size', 'modify']):
+                    if facts.get('type', 'file') != 'file':
+                        continue
+                    modified = None
+                    if facts.get('modify'):
+                        try:
+                            modified = datetime.strptime(facts['modify'][:14], '%Y%m%d%H%M%S').replace(
+                                tzinfo=dt_timezone.utc
+                            )
+                        except ValueError:
+                            pass
+                    size = facts.get('size')
+                    entries.append((name, int(size) if size else None, modified, ''))
+            except ftplib.error_perm:
+                # Server without MLSD support
+                ftp.voidcmd('TYPE I')
+                for name in ftp.nlst(remote_dir):
+                    name = posixpath.basename(name)
+                    size = None
+                    if classify_filename(name) == 'image':
+                        try:
+                            size = ftp.size(posixpath.join(remote_dir, name))
+                        except ftplib.error_perm:
+                            pass
+                    entries.append((name, size, None, ''))
+
+        return {'not_modified': False, 'etag': '', 'last_modified': '', 'files': FileSystemService._collect(entries)}
+
+    @staticmethod
+    def _list_sftp(server, path):
+        """Lists files over SFTP using a pooled session."""
+        import stat
+
+        remote_dir = '/' + path.strip('/')
+        with sftp_pool.session(server) as sftp:
+            entries = [
+                (
+                    attr.filename,
+                    attr.st_size,
+                    datetime.fromtimestamp(attr.st_mtime, tz=dt_timezone.utc) if attr.st_mtime else None,
+                    '',
+                )
+                for attr in sftp.listdir_attr(remote_dir)
+                if not stat.S_ISDIR(attr.st_mode or 0)
+            ]
+
+        return {'not_modified': False, 'etag': '', 'last_modified': '', 'files': FileSystemService._collect(entries)}
 
     @staticmethod
     def _extract_version(filename):
         """
         Attempts to extract version from filename using common Cisco patterns.
         """
-        # Example: cat9k_iosxe.17.09.04a.SPA.bin -> 17.9.4a
+        # Example: cat9k_iosxe.17.09.04a.SPA.bin -> 17.09.04a (as written; version_key handles ordering)
         # Simple regex for X.X.X
         match = re.search(r'(\d+\.\d+\.\w+)', filename)
         if match:
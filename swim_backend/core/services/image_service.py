@@ -0,0 +1,294 @@
+import os
+import time
+import hashlib
+import threading
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from swim_backend.images.models import (
+    Image, ImageUpload, HASH_CHUNK_SIZE, compute_file_digests, image_upload_path
+)
+
+logger = logging.getLogger(__name__)
+
+
+def verify_image(image_id):
+    """
+    Re-reads a stored image and compares it with the digests recorded at
+    upload time. Images uploaded before SHA-512 was recorded get it filled in.
+    Returns the resulting checksum status.
+    """
+    image = Image.objects.get(id=image_id)
+    if not image.file:
+        return image.checksum_status
+
+    try:
+        with image.file.storage.open(image.file.name, 'rb') as f:
+            size, md5, sha512 = compute_file_digests(iter(lambda: f.read(HASH_CHUNK_SIZE), b''))
+    except FileNotFoundError:
+        logger.error(f"Image {image.filename} is missing from storage")
+        Image.objects.filter(id=image_id).update(checksum_status='missing', checksum_verified_at=timezone.now())
+        return 'missing'
+
+    updates = {'checksum_verified_at': timezone.now()}
+    matches = size == image.size_bytes and (not image.md5_checksum or md5 == image.md5_checksum)
+    if image.sha512_checksum:
+        matches = matches and sha512 == image.sha512_checksum
+    elif matches:
+        updates['sha512_checksum'] = sha512
+
+    updates['checksum_status'] = 'verified' if matches else 'mismatch'
+    if not matches:
+        logger.error(f"Checksum mismatch for image {image.filename} (id={image_id})")
+
+    Image.objects.filter(id=image_id).update(**updates)
+    return updates['checksum_status']
+
+
+def start_image_verification(image_id):
+    """Verify an image's stored file in a background thread."""
+    def run():
+        try:
+            verify_image(image_id)
+        except Exception as e:
+            logger.error(f"Verification of image {image_id} failed: {e}")
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+
+
+# ---------------------------------------------------------------------------
+# Resumable chunked uploads
+# ---------------------------------------------------------------------------
+
+# Chunk bodies are copied to disk in blocks of this size
+UPLOAD_COPY_BLOCK = 1024 * 1024
+# Minimum interval between sweeps for abandoned uploads (seconds)
+UPLOAD_SWEEP_INTERVAL = 600
+
+
+class UploadHasher:
+    """Running MD5/SHA-512 over the contiguous prefix of an upload."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.offset = 0
+        self.md5 = hashlib.md5()
+        self.sha512 = hashlib.sha512()
+        self.touched = time.monotonic()
+
+
+# Hash state lives in the process that received the chunks; a finalize in
+# another worker (or after a restart) simply re-hashes from the start.
+_upload_hashers = {}
+_upload_hashers_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def merge_ranges(ranges, start, end):
+    """Adds [start, end) to a sorted list of disjoint ranges, merging neighbours."""
+    merged = []
+    for r_start, r_end in sorted(ranges + [[start, end]]):
+        if merged and r_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], r_end)
+        else:
+            merged.append([r_start, r_end])
+    return merged
+
+
+def contiguous_prefix(ranges):
+    """Number of bytes received without gaps from offset 0."""
+    if ranges and ranges[0][0] == 0:
+        return ranges[0][1]
+    return 0
+
+
+def missing_ranges(ranges, total_size):
+    """Byte ranges still to be uploaded, as [start, end) pairs."""
+    missing = []
+    position = 0
+    for r_start, r_end in ranges:
+        if r_start > position:
+            missing.append([position, r_start])
+        position = max(position, r_end)
+    if position < total_size:
+        missing.append([position, total_size])
+    return missing
+
+
+def expire_uploads():
+    """
+    Expires open uploads idle for longer than IMAGE_UPLOAD_TTL_HOURS: their
+    part files are deleted, and hash state this process holds for uploads
+    idle that long is dropped. Runs at most every UPLOAD_SWEEP_INTERVAL seconds.
+    """
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep < UPLOAD_SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    ttl = timedelta(hours=getattr(settings, 'IMAGE_UPLOAD_TTL_HOURS', 24))
+
+    with _upload_hashers_lock:
+        for upload_id, hasher in list(_upload_hashers.items()):
+            if now - hasher.touched > ttl.total_seconds():
+                del _upload_hashers[upload_id]
+
+    stale = ImageUpload.objects.filter(status='open', updated_at__lt=timezone.now() - ttl)
+    for upload in stale:
+        if ImageUpload.objects.filter(id=upload.id, status='open').update(status='expired', updated_at=timezone.now()):
+            if os.path.exists(upload.part_path):
+                os.remove(upload.part_path)
+            logger.info(f"Expired abandoned upload {upload.filename} ({upload.id})")
+
+
+def create_upload(filename, version, total_size, user=None, expected_md5=None, expected_sha512=None):
+    """Creates an upload session and preallocates its part file."""
+    expire_uploads()
+    upload = ImageUpload.objects.create(
+        filename=default_storage.get_valid_name(os.path.basename(filename)),
+        version=version,
+        total_size=total_size,
+        expected_md5=expected_md5 or None,
+        expected_sha512=expected_sha512 or None,
+        created_by=user if user and user.is_authenticated else None,
+    )
+    os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+    with open(upload.part_path, 'wb') as f:
+        f.truncate(total_size)
+    return upload
+
+
+def _advance_upload_hash(upload, block=False):
+    """Hashes newly contiguous bytes. Returns the hasher if this call did the work."""
+    with _upload_hashers_lock:
+        hasher = _upload_hashers.setdefault(upload.id, UploadHasher())
+        hasher.touched = time.monotonic()
+
+    if not hasher.lock.acquire(blocking=block):
+        # Another request is already hashing this upload
+        return None
+
+    try:
+        target = contiguous_prefix(upload.received_ranges)
+        if hasher.offset < target:
+            with open(upload.part_path, 'rb') as f:
+                f.seek(hasher.offset)
+                while hasher.offset < target:
+                    data = f.read(min(HASH_CHUNK_SIZE, target - hasher.offset))
+                    if not data:
+                        break
+                    hasher.md5.update(data)
+                    hasher.sha512.update(data)
+                    hasher.offset += len(data)
+            ImageUpload.objects.filter(id=upload.id).update(hashed_bytes=hasher.offset)
+        return hasher
+    finally:
+        hasher.lock.release()
+
+
+def write_upload_chunk(upload_id, offset, stream, length):
+    """
+    Streams `length` bytes from `stream` into the part file at `offset`.
+    Whatever was received is recorded even if the stream ends early, so the
+    client can resume from the reported missing ranges.
+    """
+    upload = ImageUpload.objects.get(id=upload_id)
+    if upload.status != 'open':
+        raise ValueError(f"Upload is {upload.status}")
+    if offset < 0 or length <= 0 or offset + length > upload.total_size:
+        raise ValueError(f"Chunk {offset}+{length} is outside the upload size {upload.total_size}")
+
+    written = 0
+    with open(upload.part_path, 'r+b') as f:
+        f.seek(offset)
+        while written < length:
+            data = stream.read(min(UPLOAD_COPY_BLOCK, length - written))
+            if not data:
+                break
+            f.write(data)
+            written += len(data)
+
+    if written:
+        with transaction.atomic():
+            upload = ImageUpload.objects.select_for_update().get(id=upload_id)
+            upload.received_ranges = merge_ranges(upload.received_ranges, offset, offset + written)
+            upload.received_bytes = sum(end - start for start, end in upload.received_ranges)
+            upload.save(update_fields=['received_ranges', 'received_bytes', 'updated_at'])
+        _advance_upload_hash(upload)
+
+    if written != length:
+        raise ValueError(f"Chunk truncated: received {written} of {length} bytes")
+
+    return upload
+
+
+def finalize_upload(upload_id):
+    """
+    Verifies a complete upload and turns it into an Image. The upload is
+    claimed with a conditional update, so of concurrent finalize requests
+    only one proceeds; the others get a ValueError.
+    """
+    upload = ImageUpload.objects.get(id=upload_id)
+    if upload.status != 'open':
+        raise ValueError(f"Upload is {upload.status}")
+    if missing_ranges(upload.received_ranges, upload.total_size):
+        raise ValueError(f"Upload incomplete: {upload.received_bytes} of {upload.total_size} bytes received")
+    if not ImageUpload.objects.filter(id=upload_id, status='open').update(status='finalizing'):
+        raise ValueError("Upload is already being finalized")
+
+    try:
+        hasher = _advance_upload_hash(upload, block=True)
+        md5, sha512 = hasher.md5.hexdigest(), hasher.sha512.hexdigest()
+        with _upload_hashers_lock:
+            _upload_hashers.pop(upload.id, None)
+
+        mismatch = (
+            (upload.expected_md5 and upload.expected_md5.lower() != md5)
+            or (upload.expected_sha512 and upload.expected_sha512.lower() != sha512)
+        )
+        if mismatch:
+            upload.status = 'failed'
+            upload.error = f"Checksum mismatch (md5 {md5})"
+            upload.save(update_fields=['status', 'error', 'updated_at'])
+            os.remove(upload.part_path)
+            raise ValueError(upload.error)
+
+        name = default_storage.get_available_name(image_upload_path(None, upload.filename))
+        destination = default_storage.path(name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(upload.part_path, destination)
+    except ValueError:
+        raise
+    except Exception:
+        # Nothing was moved: the client may finalize again
+        ImageUpload.objects.filter(id=upload_id, status='finalizing').update(status='open')
+        raise
+
+    # Digests are supplied with the file, so Image.save does not re-hash it
+    image = Image(
+        version=upload.version,
+        size_bytes=upload.total_size,
+        md5_checksum=md5,
+        sha512_checksum=sha512,
+    )
+    image.file.name = name
+    image.digests_supplied = True
+    image.save()
+
+    upload.status = 'complete'
+    upload.image = image
+    upload.save(update_fields=['status', 'image', 'updated_at'])
+    return image
+
+
+def abort_upload(upload):
+    """Deletes an upload session and its part file."""
+    with _upload_hashers_lock:
+        _upload_hashers.pop(upload.id, None)
+    if os.path.exists(upload.part_path):
+        os.remove(upload.part_path)
+    upload.delete()
@@ -0,0 +1,297 @@
+"""
+Bulk import of inventory records (CSV uploads, NetBox and other inventory plugins).
+
+Records are consumed from any iterable, so a CSV reader or a paged plugin
+generator is streamed in batches instead of being materialized. Existing
+devices, IPs, sites, regions and models are preloaded once into lookup maps,
+rows are validated in memory, and each batch is written with a single upsert
+in its own transaction.
+"""
+import os
+import csv
+import threading
+import logging
+from itertools import islice
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from swim_backend.devices.models import Device, DeviceModel, DeviceImportRun, Region, Site
+from .change_feed import record_changes
+from .compliance_service import refresh_compliance
+
+logger = logging.getLogger(__name__)
+
+# Fields overwritten on devices that already exist
+UPSERT_FIELDS = ['ip_address', 'username', 'password', 'platform', 'site', 'family']
+
+# Validated in memory; foreign keys are resolved from the preloaded maps instead
+_NO_CLEAN_FIELDS = ['site', 'model', 'preferred_file_server']
+
+REQUIRED_MESSAGES = {
+    'ip_address': "Missing IP Address",
+    'platform': "Missing Platform",
+    'site': "Missing Site",
+}
+
+
+def _batches(records, size):
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _ensure_named(model, names, known):
+    """Creates missing `model` rows by name and adds them to the `known` name -> id map."""
+    missing = {name for name in names if name and name not in known}
+    if not missing:
+        return
+    model.objects.bulk_create([model(name=name) for name in missing], ignore_conflicts=True)
+    known.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+
+
+def _validation_message(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+class _Importer:
+    def __init__(self, defaults, required, update_model):
+        self.defaults = defaults or {}
+        self.required = required
+        self.update_fields = UPSERT_FIELDS + (['model'] if update_model else [])
+        self.supported_models = getattr(settings, 'SUPPORTED_DEVICE_MODELS', None)
+
+        self.hostnames = set()
+        self.ip_owner = {}
+        for hostname, ip in Device.objects.values_list('hostname', 'ip_address'):
+            self.hostnames.add(hostname)
+            self.ip_owner.setdefault(ip, hostname)
+        self.sites = {}
+        self.site_regions = {}
+        for name, site_id, region_id in Site.objects.values_list('name', 'id', 'region_id'):
+            self.sites[name] = site_id
+            self.site_regions[name] = region_id
+        self.regions = dict(Region.objects.values_list('name', 'id'))
+        self.models = dict(DeviceModel.objects.values_list('name', 'id'))
+
+        self.result = {'count': 0, 'created': 0, 'updated': 0, 'errors': [], 'last_updated': None}
+
+    def error(self, dev, message):
+        self.result['errors'].append({
+            'row': dev.get('row'),
+            'hostname': dev.get('name') or '',
+            'ip_address': dev.get('ip_address') or '',
+            'error': message,
+        })
+
+    def validate(self, batch):
+        """Returns {hostname: (record, Device)} for the valid records of a batch."""
+        rows = {}
+        for dev in batch:
+            ip_addr = dev.get('ip_address')
+            hostname = dev.get('name')
+
+            if dev.get('last_updated'):
+                self.result['last_updated'] = max(self.result['last_updated'] or '', dev['last_updated'])
+
+            # Strict Validation
+            missing = next((field for field in self.required if not dev.get(field)), None)
+            if missing:
+                self.error(dev, f"Skipped {hostname or ip_addr or 'Unknown'}: {REQUIRED_MESSAGES[missing]}")
+                continue
+
+            # Hostname Fallback
+            hostname = hostname or ip_addr
+
+            model_name = dev.get('model')
+            if model_name and self.supported_models and model_name not in self.supported_models:
+                self.error(dev, f'Skipped {hostname}: Device model "{model_name}" is not supported')
+                continue
+
+            device = Device(
+                hostname=hostname,
+                ip_address=ip_addr,
+                username=dev.get('username', self.defaults.get('username', '')),
+                password=dev.get('password', self.defaults.get('password', '')),
+                platform=dev.get('platform') or 'iosxe',
+                family=dev.get('family') or dev.get('role') or 'Switch',
+            )
+            try:
+                device.clean_fields(exclude=_NO_CLEAN_FIELDS)
+            except ValidationError as e:
+                self.error(dev, f"Skipped {hostname}: {_validation_message(e)}")
+                continue
+
+            # Duplicate IP Check (IP already on a DIFFERENT device)
+            owner = self.ip_owner.get(ip_addr)
+            if owner and owner != hostname:
+                self.error(dev, f"Skipped {hostname}: IP {ip_addr} already exists on {owner}")
+                continue
+            self.ip_owner[ip_addr] = hostname
+
+            rows[hostname] = (dev, device)
+        return rows
+
+    def resolve(self, rows):
+        """Creates missing regions, sites and models, and links sites to their regions."""
+        records = [dev for dev, _ in rows.values()]
+        _ensure_named(Region, {dev.get('region') for dev in records}, self.regions)
+        _ensure_named(DeviceModel, {dev.get('model') for dev in records}, self.models)
+        _ensure_named(Site, {dev.get('site') or 'Global' for dev in records}, self.sites)
+
+        relink = {}
+        for dev in records:
+            site, region = dev.get('site') or 'Global', dev.get('region')
+            if region and self.site_regions.get(site) != self.regions[region]:
+                relink[site] = self.regions[region]
+        if relink:
+            sites = [Site(id=self.sites[name], region_id=region_id) for name, region_id in relink.items()]
+            Site.objects.bulk_update(sites, ['region'])
+            self.site_regions.update(relink)
+
+    def upsert(self, rows):
+        known = dict(self.sites), dict(self.site_regions), dict(self.regions), dict(self.models)
+        try:
+            with transaction.atomic():
+                self.resolve(rows)
+                devices = []
+                for dev, device in rows.values():
+                    device.site_id = self.sites[dev.get('site') or 'Global']
+                    device.model_id = self.models.get(dev.get('model'))
+                    devices.append(device)
+                Device.objects.bulk_create(
+                    devices, update_conflicts=True, unique_fields=['hostname'], update_fields=self.update_fields
+                )
+                written = Device.objects.filter(hostname__in=list(rows))
+                refresh_compliance(written)
+                record_changes('device', written.values_list('id', flat=True))
+        except DatabaseError:
+            # Regions, sites and models created by the rolled back transaction are gone again
+            self.sites, self.site_regions, self.regions, self.models = known
+            raise
+
+    def write(self, batch):
+        rows = self.validate(batch)
+        if not rows:
+            return
+
+        try:
+            self.upsert(rows)
+        except DatabaseError as e:
+            # A row the database still rejects skips only itself: retry the batch row by row
+            logger.warning(f"[Inventory] Batch upsert failed, writing {len(rows)} devices one by one: {e}")
+            for hostname, row in list(rows.items()):
+                try:
+                    self.upsert({hostname: row})
+                except DatabaseError as e:
+                    self.error(row[0], f"Skipped {hostname}: {e}")
+                    del rows[hostname]
+
+        created = len(rows.keys() - self.hostnames)
+        self.hostnames.update(rows)
+        self.result['created'] += created
+        self.result['updated'] += len(rows) - created
+        self.result['count'] += len(rows)
+
+
+def import_devices(records, defaults=None, required=('ip_address', 'platform'), update_model=False, on_progress=None):
+    """
+    Creates or updates devices (matched by hostname) from inventory records:
+    {'name', 'ip_address', 'platform', 'site', 'region', 'model', 'role'/'family',
+     'username', 'password', 'row', 'last_updated'}.
+
+    `defaults` supplies credentials missing from records, `required` lists the
+    fields a record must have, and `update_model` also overwrites the model of
+    existing devices. `on_progress(processed, result)` is called after each batch.
+
+    Returns {'count', 'created', 'updated', 'errors', 'last_updated'}: errors are
+    {'row', 'hostname', 'ip_address', 'error'}, and last_updated is the newest
+    `last_updated` seen, for the next delta import.
+    """
+    batch_size = getattr(settings, 'INVENTORY_IMPORT_BATCH_SIZE', 1000)
+    importer = _Importer(defaults, required, update_model)
+
+    processed = 0
+    for batch in _batches(records, batch_size):
+        importer.write(batch)
+        processed += len(batch)
+        if on_progress:
+            on_progress(processed, importer.result)
+
+    result = importer.result
+    logger.info(
+        f"[Inventory] Imported {result['count']} devices "
+        f"({result['created']} new, {result['updated']} updated, {len(result['errors'])} skipped)"
+    )
+    return result
+
+
+def csv_records(lines):
+    """Maps CSV rows (hostname, ip_address, username, password, platform, site, region, model, family) to records."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        row = {key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+        yield {
+            'row': reader.line_num,
+            'name': row.get('hostname'),
+            'ip_address': row.get('ip_address'),
+            'platform': row.get('platform'),
+            'site': row.get('site'),
+            'region': row.get('region'),
+            'model': row.get('model'),
+            'family': row.get('family'),
+            'username': row.get('username', ''),
+            'password': row.get('password', ''),
+        }
+
+
+def import_csv_file(run_id, path):
+    """Imports a CSV file saved on disk, recording progress and errors on its DeviceImportRun."""
+    run = DeviceImportRun.objects.get(id=run_id)
+
+    def progress(processed, result):
+        DeviceImportRun.objects.filter(id=run_id).update(
+            processed_rows=processed,
+            imported=result['count'],
+            skipped=len(result['errors']),
+        )
+
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            run.total_rows = max(sum(1 for _ in f) - 1, 0)
+            run.save(update_fields=['total_rows'])
+            f.seek(0)
+            result = import_devices(
+                csv_records(f), required=('ip_address', 'site'), update_model=True, on_progress=progress
+            )
+    except Exception as e:
+        logger.exception(f"[Inventory] CSV import {run_id} failed")
+        run.refresh_from_db()
+        run.status = 'failed'
+        run.error = str(e)
+    else:
+        run.status = 'completed'
+        run.processed_rows = run.total_rows
+        run.imported = result['count']
+        run.created = result['created']
+        run.updated = result['updated']
+        run.skipped = len(result['errors'])
+        run.errors = result['errors']
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+    run.completed_at = timezone.now()
+    run.save()
+    return run
+
+
+def start_csv_import(run_id, path):
+    """Runs import_csv_file in a background thread."""
+    t = threading.Thread(target=import_csv_file, args=(run_id, path), daemon=True)
+    t.start()
@@ -8,12 +8,13 @@ from swim_backend.core.models import Job
 from swim_backend.core.readiness import check_readiness
 
 from .diff_service import generate_diffs, log_update
+from .change_feed import record_changes
+from .event_bus import publish_job_statuses
+# Kept for backward compatibility: the distribution step's semaphore
+from .transfer_planner import DISTRIBUTION_SEMAPHORE  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
-# Global Semaphore for Concurrency Limits (Kept for backward compatibility or direct use)
-DISTRIBUTION_SEMAPHORE = threading.Semaphore(40)
-
 
 def update_step(job_id, step_name, status="pending"):
     """
@@ -108,6 +109,8 @@ def orchestrate_jobs(sequential_ids, parallel_ids, schedule_time=None):
     # Update status to 'scheduled' initially
     all_ids = sequential_ids + parallel_ids
     Job.objects.filter(id__in=all_ids).update(status="scheduled")
+    record_changes("job", all_ids)
+    publish_job_statuses(all_ids, "scheduled")
 
     # Wait for schedule
     if schedule_time:
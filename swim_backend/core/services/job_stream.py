@@ -0,0 +1,300 @@
+"""
+Live job streams (server-sent events).
+
+A viewer of a job, or of a batch, gets the new log text, step/status changes
+and transfer progress as they happen instead of refetching the whole job.
+
+Viewers of the same job or batch share one upstream subscription: a channel
+thread in the JobStreamHub polls the jobs (one cheap query for status, steps
+and log length; the new log text is read only when the log grew) and fans the
+updates out to every subscriber queue. The channel wakes as soon as a job is
+saved in this process (through the change feed) and at least every
+POLL_INTERVAL seconds for changes made by other processes. It stops when its
+last subscriber leaves.
+
+Log offsets are character offsets into Job.log, which only grows. Every `log`
+event carries the offset after its text as the SSE id, so a reconnecting
+EventSource resumes with Last-Event-ID (or ?offset=) without gaps or repeats.
+"""
+import json
+import queue
+import re
+import logging
+import threading
+from collections import defaultdict
+from django.db import connection
+from django.db.models.functions import Length, Substr
+from swim_backend.core.models import Job
+from .change_feed import POLL_INTERVAL, wait_for_record
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("success", "failed", "cancelled")
+# Seconds between keep-alive comments, so proxies keep idle streams open
+HEARTBEAT_INTERVAL = 15
+# Updates buffered per subscriber; a subscriber that falls further behind re-reads from the database
+QUEUE_SIZE = 1000
+
+# "Status Update: Downloaded: 1,234 bytes (0.00 MB) - [==>....] 12.5%" (DistributionStep)
+_PROGRESS = re.compile(r"Status Update:(?: Downloaded: ([\d,]+) bytes)?(?:.*?([\d.]+)%)?")
+
+
+def parse_offsets(value, job_ids=()):
+    """
+    Resume offsets from ?offset= or Last-Event-ID: "3400" for a single job
+    (applied to every id in `job_ids`) or "12:3400,13:120" for a batch.
+    Unparseable parts are ignored.
+    """
+    offsets = {}
+    for part in (value or "").split(","):
+        job_id, _, offset = part.strip().rpartition(":")
+        if not offset.isdigit():
+            continue
+        if job_id:
+            if job_id.isdigit():
+                offsets[int(job_id)] = int(offset)
+        else:
+            offsets.update({j: int(offset) for j in job_ids})
+    return offsets
+
+
+def read_states(job_filter):
+    """[(id, status, steps, log length)] of the jobs matching `job_filter`."""
+    rows = (
+        Job.objects.filter(**job_filter)
+        .annotate(log_length=Length("log"))
+        .order_by("id")
+        .values_list("id", "status", "steps", "log_length")
+    )
+    return [(job_id, status, steps, length or 0) for job_id, status, steps, length in rows]
+
+
+def read_tails(offsets):
+    """{job id: log text after offsets[job id]}, with one query per distinct offset."""
+    by_offset = defaultdict(list)
+    for job_id, offset in offsets.items():
+        by_offset[offset].append(job_id)
+    tails = {}
+    for offset, ids in by_offset.items():
+        rows = Job.objects.filter(id__in=ids).annotate(tail=Substr("log", offset + 1)).values_list("id", "tail")
+        tails.update((job_id, tail or "") for job_id, tail in rows)
+    return tails
+
+
+def read_updates(job_filter, offsets):
+    """Updates of the jobs matching `job_filter`, with the log text after `offsets`."""
+    states = read_states(job_filter)
+    grown = {job_id: offsets.get(job_id, 0) for job_id, _, _, length in states if length > offsets.get(job_id, 0)}
+    tails = read_tails(grown) if grown else {}
+    return [
+        {
+            "job": job_id, "status": status, "steps": steps, "length": length,
+            "start": grown.get(job_id, length), "text": tails.get(job_id, ""),
+        }
+        for job_id, status, steps, length in states
+    ]
+
+
+class _Channel:
+    """One upstream subscription: polls a job or a batch and fans updates out to subscribers."""
+
+    def __init__(self, hub, key, job_filter):
+        self.hub = hub
+        self.key = key
+        self.job_filter = job_filter
+        self.subscribers = []
+        self.offsets = {}
+        self.states = {}
+        self.primed = False
+        self.thread = threading.Thread(target=self.run, name=f"job-stream-{key[0]}-{key[1]}", daemon=True)
+
+    def poll(self):
+        """Reads the jobs once and broadcasts what changed since the previous poll."""
+        if not self.primed:
+            # Start from the current end of the logs: subscribers catch up on their own
+            self.offsets = {job_id: length for job_id, _, _, length in read_states(self.job_filter)}
+            self.primed = True
+        updates = [
+            update for update in read_updates(self.job_filter, self.offsets)
+            if update["length"] != self.offsets.get(update["job"])
+            or (update["status"], update["steps"]) != self.states.get(update["job"])
+        ]
+        for update in updates:
+            self.offsets[update["job"]] = update["length"]
+            self.states[update["job"]] = (update["status"], update["steps"])
+        if updates:
+            self.hub.broadcast(self, updates)
+
+    def run(self):
+        try:
+            while self.hub.has_subscribers(self):
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"Job stream {self.key} poll failed: {e}")
+                wait_for_record(POLL_INTERVAL)
+        finally:
+            connection.close()
+
+
+class Subscription:
+    def __init__(self, hub, channel):
+        self.hub = hub
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        # Set when updates were dropped because the queue was full
+        self.overflowed = False
+
+    def get(self, timeout):
+        """The next list of updates, or None after `timeout` seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class JobStreamHub:
+    """Registry of channels, one per followed job or batch."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.channels = {}
+
+    def subscribe(self, key, job_filter):
+        with self.lock:
+            channel = self.channels.get(key)
+            new = channel is None
+            if new:
+                channel = self.channels[key] = _Channel(self, key, job_filter)
+            subscription = Subscription(self, channel)
+            channel.subscribers.append(subscription)
+        if new:
+            channel.thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            channel = subscription.channel
+            if subscription in channel.subscribers:
+                channel.subscribers.remove(subscription)
+
+    def has_subscribers(self, channel):
+        """False, and the channel is dropped, once its last subscriber left."""
+        with self.lock:
+            if channel.subscribers:
+                return True
+            if self.channels.get(channel.key) is channel:
+                del self.channels[channel.key]
+            return False
+
+    def broadcast(self, channel, updates):
+        with self.lock:
+            subscribers = list(channel.subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(updates)
+            except queue.Full:
+                subscription.overflowed = True
+
+
+hub = JobStreamHub()
+
+
+def format_event(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _progress(job_id, text):
+    """Transfer progress of the last "Status Update" line in `text`, if any."""
+    progress = None
+    for line in text.splitlines():
+        match = _PROGRESS.search(line)
+        if match and (match.group(1) or match.group(2)):
+            progress = {
+                "job": job_id,
+                "bytes": int(match.group(1).replace(",", "")) if match.group(1) else None,
+                "percent": float(match.group(2)) if match.group(2) else None,
+            }
+    return progress
+
+
+def stream_events(key, job_filter, offsets=None, heartbeat=HEARTBEAT_INTERVAL):
+    """
+    SSE text for a job or batch: the log after `offsets` and the current
+    status first, then live `log`, `status` and `progress` events, and a final
+    `end` event once every job has finished. `key` names the shared channel,
+    e.g. ("job", 12) or ("batch", "<uuid>").
+    """
+    offsets = dict(offsets or {})
+    single = key[0] == "job"
+    states = {}
+
+    def event_id():
+        if single:
+            return next(iter(offsets.values()), 0)
+        return ",".join(f"{job_id}:{offset}" for job_id, offset in sorted(offsets.items()))
+
+    def apply(updates):
+        """Events for `updates`, skipping log text this stream already sent."""
+        events = []
+        # Updates whose text starts after our offset (we joined or fell behind) are re-read
+        behind = {
+            u["job"]: offsets.get(u["job"], 0) for u in updates
+            if u["start"] > offsets.get(u["job"], 0) and u["length"] > offsets.get(u["job"], 0)
+        }
+        tails = read_tails(behind) if behind else {}
+        for update in updates:
+            job_id = update["job"]
+            offset = offsets.get(job_id, 0)
+            if job_id in tails:
+                text = tails[job_id]
+            else:
+                text = update["text"][max(offset - update["start"], 0):]
+            if text:
+                offsets[job_id] = offset + len(text)
+                events.append(format_event("log", {"job": job_id, "offset": offset, "text": text}, event_id()))
+                progress = _progress(job_id, text)
+                if progress:
+                    events.append(format_event("progress", progress))
+            state = (update["status"], update["steps"])
+            if states.get(job_id) != state:
+                states[job_id] = state
+                events.append(format_event("status", {"job": job_id, "status": state[0], "steps": state[1]}))
+        return events
+
+    def finished():
+        return bool(states) and all(status in TERMINAL_STATUSES for status, _ in states.values())
+
+    yield "retry: 3000\n\n"
+    events = apply(read_updates(job_filter, offsets))
+    if finished():
+        yield from events
+        yield format_event("end", {"jobs": {job_id: status for job_id, (status, _) in states.items()}}, event_id())
+        return
+
+    subscription = hub.subscribe(key, job_filter)
+    try:
+        yield from events
+        # Catch up again after subscribing, so nothing written in between is missed
+        updates = read_updates(job_filter, offsets)
+        while True:
+            if updates is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield from apply(updates)
+                if finished():
+                    break
+            updates = subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                subscription.overflowed = False
+                updates = read_updates(job_filter, offsets)
+        yield format_event("end", {"jobs": {job_id: status for job_id, (status, _) in states.items()}}, event_id())
+    finally:
+        subscription.close()
@@ -3,6 +3,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Results per NetBox API request (NetBox caps this at MAX_PAGE_SIZE, 1000 by default)
+PAGE_SIZE = 1000
+
+
+def paginate(get, endpoint, params=None, page_size=None):
+    """Yields every result of a listing, one page at a time. `get(endpoint, params)` returns a page."""
+    params = dict(params or {}, limit=page_size or PAGE_SIZE)
+    offset = 0
+    while True:
+        data = get(endpoint, dict(params, offset=offset))
+        results = data.get('results', [])
+        yield from results
+        offset += len(results)
+        if not results or not data.get('next') or offset >= data.get('count', 0):
+            return
+
+
+def device_record(d, default_platform='iosxe', default_site='Global', default_role='Switch'):
+    """Maps a NetBox device to an inventory record (NetBox 4 renamed device_role to role)."""
+    role = d.get('role') or d.get('device_role')
+    return {
+        'name': d['name'],
+        'ip_address': d['primary_ip']['address'].split('/')[0],
+        'platform': d['platform']['name'] if d.get('platform') else default_platform,
+        'site': d['site']['name'] if d.get('site') else default_site,
+        'role': role['name'] if role else default_role,
+        'model': d['device_type']['model'] if d.get('device_type') else 'Unknown',
+        'last_updated': d.get('last_updated'),
+    }
+
+
 class NetBoxService:
     def __init__(self, url, token, ssl_verify=True):
         self.url = url.rstrip('/')
@@ -12,16 +43,13 @@ class NetBoxService:
             'Accept': 'application/json',
         }
         self.ssl_verify = ssl_verify
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = ssl_verify
 
     def _get(self, endpoint, params=None):
         try:
-            response = requests.get(
-                f"{self.url}/api/{endpoint}/", 
-                headers=self.headers, 
-                params=params, 
-                verify=self.ssl_verify,
-                timeout=10
-            )
+            response = self.session.get(f"{self.url}/api/{endpoint}/", params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -35,44 +63,33 @@ class NetBoxService:
 
     def get_sites(self):
         """Fetches all sites."""
-        data = self._get('dcim/sites', {'limit': 0})
-        return [{'id': s['id'], 'name': s['name'], 'slug': s['slug']} for s in data.get('results', [])]
+        return [{'id': s['id'], 'name': s['name'], 'slug': s['slug']} for s in paginate(self._get, 'dcim/sites')]
 
     def get_roles(self):
         """Fetches all device roles."""
-        data = self._get('dcim/device-roles', {'limit': 0})
-        return [{'id': r['id'], 'name': r['name'], 'slug': r['slug']} for r in data.get('results', [])]
+        return [{'id': r['id'], 'name': r['name'], 'slug': r['slug']} for r in paginate(self._get, 'dcim/device-roles')]
 
     def get_device_types(self):
         """Fetches all device types."""
-        data = self._get('dcim/device-types', {'limit': 0})
-        return [{'id': t['id'], 'model': t['model'], 'slug': t['slug']} for t in data.get('results', [])]
+        return [{'id': t['id'], 'model': t['model'], 'slug': t['slug']} for t in paginate(self._get, 'dcim/device-types')]
 
-    def get_devices(self, site=None, role=None, device_type=None, search=None):
+    def iter_devices(self, site=None, role=None, device_type=None, search=None, since=None):
         """
-        Fetches devices filtering by criteria.
-        Ensures device has a primary IP.
+        Yields devices matching the criteria, page by page.
+        Only devices with a primary IP are useful for SWIM.
+        `since` (ISO timestamp) limits to devices changed since then.
         """
-        params = {'limit': 0}
+        params = {'ordering': 'id'}
         if site: params['site'] = site
         if role: params['role'] = role
         if device_type: params['device_type_id'] = device_type
         if search: params['q'] = search
+        if since: params['last_updated__gte'] = since
 
-        data = self._get('dcim/devices', params)
-        results = []
-        
-        for d in data.get('results', []):
-            # Must have primary IP to be useful for SWIM
+        for d in paginate(self._get, 'dcim/devices', params):
             if d.get('primary_ip'):
-                ip = d['primary_ip']['address'].split('/')[0]
-                results.append({
-                    'name': d['name'],
-                    'ip_address': ip,
-                    'platform': d['platform']['name'] if d.get('platform') else 'Unknown',
-                    'site': d['site']['name'] if d.get('site') else 'Unknown',
-                    'role': d['device_role']['name'] if d.get('device_role') else 'Unknown',
-                    'model': d['device_type']['model'] if d.get('device_type') else 'Unknown',
-                })
-                
-        return results
+                yield device_record(d, default_platform='Unknown', default_site='Unknown', default_role='Unknown')
+
+    def get_devices(self, site=None, role=None, device_type=None, search=None):
+        """Fetches devices filtering by criteria."""
+        return list(self.iter_devices(site, role, device_type, search))
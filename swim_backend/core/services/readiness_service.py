@@ -0,0 +1,239 @@
+"""
+Fleet readiness checks.
+
+A readiness request becomes a ReadinessRun whose devices are checked on a
+bounded worker pool; each device's result is stored as a ReadinessResult as
+soon as it finishes, so callers poll the run and see results stream in.
+Results are timestamped and reused: a device checked for the same image size
+within `max_age` seconds is answered from its latest result, and the upgrade
+workflow's ReadinessStep skips devices that passed recently.
+"""
+import time
+import threading
+import logging
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from swim_backend.devices.models import Device, ReadinessResult, ReadinessRun
+
+logger = logging.getLogger(__name__)
+
+# Image size assumed when a golden image file has no Image record
+DEFAULT_IMAGE_SIZE = 500 * 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "READINESS_MAX_WORKERS", 20),
+                thread_name_prefix="readiness",
+            )
+        return _executor
+
+
+class _Image:
+    def __init__(self, size):
+        self.size_bytes = size
+
+
+class _Job:
+    """Stands in for a Job when checks run outside an upgrade workflow."""
+
+    def __init__(self, jid, img_size):
+        self.id = jid
+        self.image = _Image(img_size) if img_size else None
+        self.selected_checks = Device.objects.none()  # Empty QuerySet-like
+
+
+def readiness_target(device, image_id=None):
+    """Returns (target_version, target_image_file, target_size) for the selected or golden image."""
+    from swim_backend.images.models import Image
+
+    # Check if a specific image was selected in the wizard
+    if image_id:
+        try:
+            image = Image.objects.get(id=int(image_id))
+            if image.size_bytes:
+                return image.version, image.filename, image.size_bytes
+        except (Image.DoesNotExist, ValueError):
+            pass  # Fall through to golden image
+
+    model = device.model
+    if not model:
+        return None, None, 0
+    # First check default_image FK (set via UI)
+    if model.default_image:
+        return model.default_image.version, model.default_image.filename, model.default_image.size_bytes or 0
+    # Fall back to old golden_image fields
+    if model.golden_image_version:
+        # Prefer Explicit Size from Standard, then the Image object size
+        size = model.golden_image_size
+        if not size and model.golden_image_file:
+            image = Image.objects.filter(filename=model.golden_image_file).first()
+            size = image.size_bytes if image else DEFAULT_IMAGE_SIZE
+        return model.golden_image_version, model.golden_image_file, size or 0
+    return None, None, 0
+
+
+def ui_checks(check_results, target_version):
+    """Maps readiness strategy results to the checks shown by the UI."""
+    checks = []
+
+    # readiness strategies only report 'connection' when connecting failed
+    connection = check_results.get("connection")
+    if connection:
+        status = "Pass" if connection["status"] == "success" else "Fail"
+        checks.append({"name": "Reachability", "status": status, "message": connection["message"]})
+    else:
+        checks.append({"name": "Reachability", "status": "Pass", "message": "Device is reachable"})
+
+    for key, name, failed in [
+        ("flash_memory", "Flash Space", "Fail"),
+        ("config_register", "Config Register", "Warning"),
+        ("startup_config", "Startup Config", "Warning"),
+    ]:
+        if key in check_results:
+            c = check_results[key]
+            checks.append({
+                "name": name,
+                "status": "Pass" if c["status"] == "success" else failed,
+                "message": c["message"],
+            })
+
+    # Golden Image Check (depends on the DB model, not device state)
+    if target_version:
+        checks.append({"name": "Golden Image Defined", "status": "Pass", "message": f"Target: {target_version}"})
+    else:
+        checks.append({"name": "Golden Image Defined", "status": "Warning", "message": "No standard defined"})
+    return checks
+
+
+def fresh_result(device_id, image_size, max_age, ready_only=False):
+    """Latest result for the device and image size checked within `max_age` seconds, or None."""
+    if not max_age:
+        return None
+    results = ReadinessResult.objects.filter(
+        device_id=device_id,
+        target_image_size=image_size or 0,
+        checked_at__gte=timezone.now() - timedelta(seconds=max_age),
+    )
+    if ready_only:
+        results = results.filter(ready=True)
+    return results.order_by("-checked_at").first()
+
+
+def check_device(device, image_id=None, run=None, max_age=None):
+    """Checks one device (or reuses a result younger than `max_age`) and stores the ReadinessResult."""
+    from swim_backend.core.readiness import check_readiness
+
+    target_version, target_image_file, target_size = readiness_target(device, image_id)
+
+    previous = fresh_result(device.id, target_size, max_age)
+    if previous:
+        return ReadinessResult.objects.create(
+            run=run,
+            device=device,
+            ready=previous.ready,
+            target_version=target_version,
+            target_image_file=target_image_file,
+            target_image_size=target_size,
+            checks=previous.checks,
+            raw_results=previous.raw_results,
+            reused=True,
+            checked_at=previous.checked_at,
+        )
+
+    started = time.monotonic()
+    # Use a consistent session key for logs
+    ready, check_results = check_readiness(device, _Job(f"readiness_check_{device.id}", target_size))
+
+    return ReadinessResult.objects.create(
+        run=run,
+        device=device,
+        ready=ready,
+        target_version=target_version,
+        target_image_file=target_image_file,
+        target_image_size=target_size,
+        checks=ui_checks(check_results, target_version),
+        raw_results=check_results,
+        duration_seconds=time.monotonic() - started,
+    )
+
+
+def _run_device(run_id, device_id, image_id, max_age):
+    close_old_connections()
+    run = ReadinessRun(id=run_id)
+    ready = reused = False
+    try:
+        device = Device.objects.select_related("model__default_image").get(id=device_id)
+        result = check_device(device, image_id, run=run, max_age=max_age)
+        ready, reused = result.ready, result.reused
+    except Exception as e:
+        logger.error(f"[Readiness] Run {run_id}: check of device {device_id} failed: {e}")
+        ReadinessResult.objects.create(
+            run=run,
+            device_id=device_id,
+            checks=[{"name": "Reachability", "status": "Fail", "message": str(e)}],
+            raw_results={"error": str(e)},
+        )
+    finally:
+        ReadinessRun.objects.filter(id=run_id).update(
+            completed=F("completed") + 1,
+            ready=F("ready") + int(ready),
+            reused=F("reused") + int(reused),
+        )
+        ReadinessRun.objects.filter(id=run_id, completed__gte=F("total"), status="running").update(
+            status="completed", completed_at=timezone.now()
+        )
+        close_old_connections()
+
+
+def start_readiness_run(device_ids, image_map=None, max_age=None, user=None):
+    """
+    Queues readiness checks for `device_ids` and returns the ReadinessRun.
+    `image_map` maps device id (str) to the selected image id.
+    """
+    image_map = image_map or {}
+    device_ids = list(Device.objects.filter(id__in=device_ids).values_list("id", flat=True))
+
+    run = ReadinessRun.objects.create(
+        total=len(device_ids),
+        created_by=user if user and user.is_authenticated else None,
+    )
+    if not device_ids:
+        run.status = "completed"
+        run.completed_at = timezone.now()
+        run.save(update_fields=["status", "completed_at"])
+        return run
+
+    executor = _get_executor()
+    for device_id in device_ids:
+        executor.submit(_run_device, run.id, device_id, image_map.get(str(device_id)), max_age)
+
+    logger.info(f"[Readiness] Run {run.id}: {len(device_ids)} devices queued")
+    return run
+
+
+def result_as_dict(result):
+    """Result in the shape returned by the readiness API (one entry per device)."""
+    device = result.device
+    return {
+        "id": device.id,
+        "hostname": device.hostname,
+        "current_version": device.version,
+        "target_version": result.target_version,
+        "target_image_file": result.target_image_file,
+        "target_image_size": result.target_image_size,
+        "status": "Ready" if result.ready else "Not Ready",
+        "checks": result.checks,
+        "checked_at": result.checked_at,
+        "reused": result.reused,
+    }
@@ -0,0 +1,312 @@
+"""
+Image replication to file servers.
+
+Pushes an image to a set of file servers in parallel (bounded by
+IMAGE_REPLICATION_MAX_WORKERS), then verifies size and digest on each server
+and records the outcome in ImageReplica. Distribution only fails over to
+servers holding a verified replica of a tracked image.
+"""
+import re
+import time
+import shlex
+import hashlib
+import ftplib
+import posixpath
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.conf import settings
+from django.utils import timezone
+from swim_backend.images.models import ImageReplica, HASH_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Minimum interval between progress writes for one replica (seconds)
+PROGRESS_INTERVAL = 2
+
+
+# File names pass through shell and FTP commands on the file servers
+UNSAFE_FILENAME_RE = re.compile(r'[/\\\x00-\x1f\x7f]|^\.{1,2}$|^-')
+
+
+class ReplicationError(Exception):
+    pass
+
+
+class ProgressReader:
+    """File wrapper that reports bytes read to the replica row, throttled."""
+
+    def __init__(self, f, replica_id, length=0):
+        self._file = f
+        self._replica_id = replica_id
+        self._length = length
+        self._bytes = 0
+        self._last_report = 0
+
+    def __len__(self):
+        # Lets HTTP clients send Content-Length instead of chunked encoding
+        return self._length
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self._bytes += len(data)
+        now = time.monotonic()
+        if now - self._last_report >= PROGRESS_INTERVAL or not data:
+            self._last_report = now
+            ImageReplica.objects.filter(id=self._replica_id).update(bytes_transferred=self._bytes)
+        return data
+
+    def __iter__(self):
+        return iter(lambda: self.read(HASH_CHUNK_SIZE), b'')
+
+
+def check_filename(filename):
+    """Rejects names with path separators, control characters or a leading dash."""
+    if not filename or UNSAFE_FILENAME_RE.search(filename):
+        raise ReplicationError(f"Unsafe image filename for replication: {filename!r}")
+
+
+def remote_path_for(image, file_server):
+    check_filename(image.filename)
+    base_path = file_server.base_path or '/'
+    return posixpath.join(base_path, image.filename)
+
+
+def open_image_source(image):
+    """
+    Opens the image bytes for reading: the uploaded file, or a streamed
+    download from the image's own HTTP(S) file server for remote images.
+    """
+    if image.file:
+        return image.file.storage.open(image.file.name, 'rb')
+
+    source = image.file_server
+    if image.is_remote and source and source.protocol in ('http', 'https'):
+        path = (image.remote_path or image.filename).lstrip('/')
+        url = f"{source.protocol}://{source.address}:{source.port}/{path}"
+        auth = (source.username, source.password) if source.username and source.password else None
+        response = requests.get(url, auth=auth, stream=True, timeout=30)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return response.raw
+
+    raise ReplicationError("Image has no uploaded file or HTTP(S) source to replicate from")
+
+
+def expected_digest(image):
+    """Returns (algorithm, hex digest) preferring SHA-512."""
+    if image.sha512_checksum:
+        return 'sha512', image.sha512_checksum.lower()
+    if image.md5_checksum:
+        return 'md5', image.md5_checksum.lower()
+    return None, None
+
+
+def hash_stream(chunks, algorithm):
+    digest = hashlib.new(algorithm)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Protocol transports: each pushes the source and returns (remote_size, remote_digest)
+# ---------------------------------------------------------------------------
+
+def _push_ssh(image, file_server, remote_path, source, algorithm):
+    import paramiko
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        file_server.address, port=file_server.port, username=file_server.username,
+        password=file_server.password, timeout=30, allow_agent=False, look_for_keys=False
+    )
+    try:
+        sftp = client.open_sftp()
+        sftp.putfo(source, remote_path, confirm=False)
+        remote_size = sftp.stat(remote_path).st_size
+
+        if not algorithm:
+            return remote_size, ''
+
+        # Hash on the server itself when a *sum utility is available
+        _, stdout, _ = client.exec_command(f"{algorithm}sum {shlex.quote(remote_path)}", timeout=1800)
+        output = stdout.read().decode(errors='ignore').strip()
+        if stdout.channel.recv_exit_status() == 0 and output:
+            return remote_size, output.split()[0].lower()
+
+        # Otherwise read the replica back over SFTP
+        with sftp.open(remote_path, 'rb') as f:
+            return remote_size, hash_stream(iter(lambda: f.read(HASH_CHUNK_SIZE), b''), algorithm)
+    finally:
+        client.close()
+
+
+def _push_http(image, file_server, remote_path, source, algorithm):
+    url = f"{file_server.protocol}://{file_server.address}:{file_server.port}/{remote_path.lstrip('/')}"
+    auth = (file_server.username, file_server.password) if file_server.username and file_server.password else None
+
+    response = requests.put(url, data=source, auth=auth, timeout=(30, 3600))
+    response.raise_for_status()
+
+    head = requests.head(url, auth=auth, timeout=30)
+    head.raise_for_status()
+    remote_size = int(head.headers.get('Content-Length', 0)) or None
+
+    if not algorithm:
+        return remote_size, ''
+
+    with requests.get(url, auth=auth, stream=True, timeout=(30, 3600)) as response:
+        response.raise_for_status()
+        return remote_size, hash_stream(response.iter_content(HASH_CHUNK_SIZE), algorithm)
+
+
+def _push_ftp(image, file_server, remote_path, source, algorithm):
+    ftp = ftplib.FTP()
+    ftp.connect(file_server.address, file_server.port or 21, timeout=30)
+    try:
+        ftp.login(file_server.username or 'anonymous', file_server.password or '')
+        ftp.storbinary(f"STOR {remote_path}", source, blocksize=HASH_CHUNK_SIZE)
+        ftp.voidcmd('TYPE I')
+        remote_size = ftp.size(remote_path)
+
+        if not algorithm:
+            return remote_size, ''
+
+        # Server-side hashing extensions (XSHA512/XMD5) where supported
+        try:
+            reply = ftp.sendcmd(f"X{algorithm.upper()} {remote_path}")
+            return remote_size, reply.split()[-1].lower()
+        except ftplib.error_perm:
+            pass
+
+        digest = hashlib.new(algorithm)
+        ftp.retrbinary(f"RETR {remote_path}", digest.update, blocksize=HASH_CHUNK_SIZE)
+        return remote_size, digest.hexdigest()
+    finally:
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+
+
+TRANSPORTS = {
+    'scp': _push_ssh,
+    'sftp': _push_ssh,
+    'http': _push_http,
+    'https': _push_http,
+    'ftp': _push_ftp,
+}
+
+
+def replicate_to_server(replica_id):
+    """Pushes one replica and verifies it. Runs inside the replication pool."""
+    replica = ImageReplica.objects.select_related('image', 'file_server').get(id=replica_id)
+    image, file_server = replica.image, replica.file_server
+
+    ImageReplica.objects.filter(id=replica_id).update(
+        status='copying', started_at=timezone.now(), bytes_transferred=0, error=None
+    )
+
+    try:
+        if file_server.serves_local_images:
+            if not image.file:
+                raise ReplicationError(f"{file_server.name} serves uploaded images only")
+            # SWIM serves the uploaded file itself - nothing to copy
+            remote_size, remote_digest = image.size_bytes, expected_digest(image)[1] or ''
+        else:
+            transport = TRANSPORTS.get(file_server.protocol)
+            if not transport:
+                raise ReplicationError(f"Protocol {file_server.protocol} is not supported for replication")
+
+            algorithm, _ = expected_digest(image)
+            source = open_image_source(image)
+            try:
+                remote_size, remote_digest = transport(
+                    image, file_server, replica.remote_path, ProgressReader(source, replica_id, image.size_bytes), algorithm
+                )
+            finally:
+                source.close()
+
+        ImageReplica.objects.filter(id=replica_id).update(status='verifying')
+
+        algorithm, expected = expected_digest(image)
+        errors = []
+        if image.size_bytes and remote_size != image.size_bytes:
+            errors.append(f"size mismatch (expected {image.size_bytes}, got {remote_size})")
+        if expected and remote_digest != expected:
+            errors.append(f"{algorithm} mismatch (expected {expected}, got {remote_digest})")
+
+        ImageReplica.objects.filter(id=replica_id).update(
+            status='failed' if errors else 'verified',
+            remote_size=remote_size,
+            remote_checksum=remote_digest or '',
+            bytes_transferred=remote_size or 0,
+            error='; '.join(errors) or None,
+            completed_at=timezone.now(),
+        )
+        if errors:
+            logger.error(f"Replica of {image.filename} on {file_server.name} failed verification: {errors}")
+        else:
+            logger.info(f"Replicated {image.filename} to {file_server.name}")
+
+    except Exception as e:
+        logger.error(f"Replication of {image.filename} to {file_server.name} failed: {e}")
+        ImageReplica.objects.filter(id=replica_id).update(
+            status='failed', error=str(e), completed_at=timezone.now()
+        )
+
+
+def replicate_image(image, file_servers):
+    """
+    Queues replication of `image` to `file_servers` and starts the transfers
+    in the background. Returns the (reset) replica rows.
+    Raises ReplicationError if the image's filename is unsafe to copy.
+    """
+    replicas = []
+    for fs in file_servers:
+        replica, _ = ImageReplica.objects.update_or_create(
+            image=image, file_server=fs,
+            defaults={
+                'status': 'pending',
+                'remote_path': remote_path_for(image, fs),
+                'bytes_transferred': 0,
+                'remote_size': None,
+                'remote_checksum': '',
+                'error': None,
+                'started_at': None,
+                'completed_at': None,
+            }
+        )
+        replicas.append(replica)
+
+    replica_ids = [r.id for r in replicas]
+    max_workers = getattr(settings, 'IMAGE_REPLICATION_MAX_WORKERS', 4)
+
+    def run():
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(replica_ids)))) as executor:
+            list(executor.map(replicate_to_server, replica_ids))
+
+    if replica_ids:
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+
+    return replicas
+
+
+def replica_holders(image):
+    """
+    Returns the ids of file servers known to hold a verified copy of `image`,
+    or None if the image's replication is not tracked.
+    """
+    states = dict(ImageReplica.objects.filter(image=image).values_list('file_server_id', 'status'))
+    if not states:
+        return None
+
+    holders = {fs_id for fs_id, status in states.items() if status == 'verified'}
+    if image.file_server_id:
+        # The image's source server always holds it
+        holders.add(image.file_server_id)
+    return holders
@@ -0,0 +1,137 @@
+"""
+Fast `show version` parsing.
+
+SWIM only needs a handful of fields from `show version`: the running version,
+chassis/PID, system image, base MAC, install mode, uptime and stack members. Loading and
+running genie's parser for that is CPU heavy and holds the GIL across many
+concurrent device sessions, so the raw output is matched against a few
+precompiled patterns instead. Genie is only used when the fast path cannot
+find the version.
+
+The result keeps genie's IOS-XE shape (fields under output['version']) for
+every OS, so callers read the same keys for IOS, IOS-XE and NX-OS.
+"""
+import re
+import logging
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# How often each path was used in this process (fast / genie / failed)
+parse_stats = Counter()
+
+_IOS_VERSION = re.compile(r'^Cisco IOS Software.*?,\s+Version\s+([^\s,]+)', re.M)
+_XE_VERSION = re.compile(r'^Cisco IOS[ -]XE Software,\s+Version\s+([^\s,]+)', re.M)
+_NXOS_VERSION = re.compile(r'^\s*(?:NXOS|system):\s+version\s+(\S+)', re.M)
+_VERSION_SHORT = re.compile(r'^(\d+\.\d+)')
+
+_UPTIME = re.compile(r'^(\S+) uptime is (.+?)\s*$', re.M)
+_NXOS_UPTIME = re.compile(r'^Kernel uptime is (.+?)\s*$', re.M)
+_NXOS_HOSTNAME = re.compile(r'^\s*Device name:\s+(\S+)', re.M)
+
+_SYSTEM_IMAGE = re.compile(r'^System image file is "([^"]+)"', re.M)
+_NXOS_IMAGE = re.compile(r'^\s*(?:NXOS|system) image file is:\s+(\S+)', re.M)
+
+_CHASSIS = re.compile(r'^cisco (\S+) .*?processor', re.M | re.I)
+_NXOS_CHASSIS = re.compile(r'^\s*cisco (.+?)\s+[Cc]hassis', re.M)
+_MODEL_NUMBER = re.compile(r'^Model [Nn]umber\s*:\s*(\S+)', re.M)
+
+_BASE_MAC = re.compile(r'^Base [Ee]thernet MAC [Aa]ddress\s*:\s*(\S+)', re.M)
+
+# Rows of the stack table: "*    1 62    C9300-48P   17.09.04a   CAT9K_IOSXE   INSTALL"
+_SWITCH_TABLE = re.compile(r'^Switch\s+Ports\s+Model\s+SW Version.*\n-[- ]+\n((?:.+\n?)+)', re.M)
+_SWITCH_ROW = re.compile(r'^(\*)?\s*(\d+)\s+\d+\s+(\S+)\s+(\S+)\s+\S+(?:\s+(INSTALL|BUNDLE))?\s*$')
+
+
+def _first(pattern, text):
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+
+def _stack_members(output):
+    table = _SWITCH_TABLE.search(output)
+    if not table:
+        return []
+    members = []
+    for line in table.group(1).splitlines():
+        row = _SWITCH_ROW.match(line)
+        if not row:
+            break
+        member = {'switch': int(row.group(2)), 'model': row.group(3), 'version': row.group(4), 'active': bool(row.group(1))}
+        if row.group(5):
+            member['mode'] = row.group(5)
+        members.append(member)
+    return members
+
+
+def parse_show_version_text(output):
+    """
+    Parses raw `show version` output. Returns {'version': {...}} or None if
+    the running version could not be found.
+    """
+    if not output:
+        return None
+
+    if 'NX-OS' in output or 'Nexus Operating System' in output:
+        version = _first(_NXOS_VERSION, output)
+        if not version:
+            return None
+        chassis = _first(_NXOS_CHASSIS, output)
+        info = {
+            'os': 'NX-OS',
+            'version': version,
+            'hostname': _first(_NXOS_HOSTNAME, output),
+            'chassis': chassis.split()[-1] if chassis else None,
+            'system_image': _first(_NXOS_IMAGE, output),
+            'uptime': _first(_NXOS_UPTIME, output),
+        }
+    else:
+        version = _first(_IOS_VERSION, output) or _first(_XE_VERSION, output)
+        if not version:
+            return None
+        uptime = _UPTIME.search(output)
+        info = {
+            'os': 'IOS-XE' if _XE_VERSION.search(output) else 'IOS',
+            'version': version,
+            'hostname': uptime.group(1) if uptime else None,
+            'uptime': uptime.group(2) if uptime else None,
+            'system_image': _first(_SYSTEM_IMAGE, output),
+            'chassis': _first(_CHASSIS, output) or _first(_MODEL_NUMBER, output),
+            'base_ethernet_mac_address': _first(_BASE_MAC, output),
+        }
+        members = _stack_members(output)
+        if members:
+            info['stack_members'] = members
+        active = next((m for m in members if m['active']), None)
+        if active and active.get('mode'):
+            info['install_mode'] = active['mode']
+        elif info['os'] == 'IOS-XE' and info['system_image']:
+            info['install_mode'] = 'INSTALL' if info['system_image'].endswith('packages.conf') else 'BUNDLE'
+
+    short = _VERSION_SHORT.match(info['version'])
+    if short:
+        info['version_short'] = short.group(1)
+
+    return {'version': {key: value for key, value in info.items() if value}}
+
+
+def parse_show_version(device):
+    """
+    Runs `show version` on a connected genie device and parses it, using the
+    fast path and falling back to genie's parser on the same output.
+    """
+    output = device.execute('show version')
+
+    parsed = parse_show_version_text(output)
+    if parsed:
+        parse_stats['fast'] += 1
+        return parsed
+
+    logger.info(f"Fast show version parse failed for {device.name}, falling back to genie")
+    try:
+        parsed = device.parse('show version', output=output)
+    except Exception:
+        parse_stats['failed'] += 1
+        raise
+    parse_stats['genie'] += 1
+    return parsed
@@ -0,0 +1,78 @@
+"""
+Per-process limit on open server-sent event streams.
+
+gunicorn serves the app with threaded workers (entrypoint.sh), and every open
+stream holds one of its worker's request threads until the client goes away.
+A process refuses streams beyond SSE_MAX_STREAMS (the views answer 503 with
+Retry-After, and the UI falls back to polling), so the rest of its threads
+keep serving the API. Keep SSE_MAX_STREAMS below gunicorn's --threads.
+"""
+import threading
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+# Seconds a refused client should wait before opening a stream again
+RETRY_AFTER = 30
+
+_lock = threading.Lock()
+_open = 0
+
+
+def acquire():
+    """Takes a stream slot; False when SSE_MAX_STREAMS streams are already open in this process."""
+    global _open
+    with _lock:
+        if _open >= getattr(settings, "SSE_MAX_STREAMS", 4):
+            return False
+        _open += 1
+        return True
+
+
+def release():
+    global _open
+    with _lock:
+        _open = max(_open - 1, 0)
+
+
+def open_streams():
+    return _open
+
+
+class _SlotIterator:
+    """Iterates a stream's events and releases its slot once, when they end or the response is closed."""
+
+    def __init__(self, events):
+        self.events = events
+        self.released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.events)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if not self.released:
+            self.released = True
+            try:
+                self.events.close()
+            finally:
+                release()
+
+
+def event_stream_response(events):
+    """
+    A text/event-stream response over the `events` generator holding a stream
+    slot, or None when no slot is free.
+    """
+    if not acquire():
+        return None
+    response = StreamingHttpResponse(_SlotIterator(events), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
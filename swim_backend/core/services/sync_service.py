@@ -1,33 +1,120 @@
 import logging
 import os
+import re
+import time
 import threading
+from datetime import timedelta
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from swim_backend.core.services.genie_service import create_genie_device
-from swim_backend.devices.models import Device, DeviceModel, DeviceSyncHistory
-
+from swim_backend.core.services.show_version_parser import parse_show_version
+from swim_backend.core.services.version_parser import version_key
+from swim_backend.core.services.device_facts import get_facts, record_show_version
+from swim_backend.core.services.change_feed import record_changes
+from swim_backend.core.services.event_bus import publish_many, publish_sync_run
+from swim_backend.devices.models import Device, DeviceModel, DeviceSyncHistory, SyncClaim, SyncRun, SyncRunResult
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
 
-def sync_device_details(device_id):
+# Device fields written by a sync
+SYNC_FIELDS = [
+    "version",
+    "version_key",
+    "model",
+    "reachability",
+    "last_sync_status",
+    "last_sync_time",
+    "hostname",
+    "boot_method",
+]
+
+# Process-wide DeviceModel lookup by name, so a batch needs one query at most
+_device_models = {}
+_device_models_lock = threading.Lock()
+
+
+@receiver([post_save, post_delete], sender=DeviceModel)
+def _forget_device_model(sender, instance, **kwargs):
+    with _device_models_lock:
+        _device_models.clear()
+
+
+def get_device_models(names):
+    """Returns {name: DeviceModel} for `names`, creating models seen for the first time."""
+    names = {name for name in names if name}
+    with _device_models_lock:
+        missing = names - set(_device_models)
+
+    if missing:
+        found = {m.name: m for m in DeviceModel.objects.filter(name__in=missing)}
+        new_names = missing - set(found)
+        if new_names:
+            DeviceModel.objects.bulk_create(
+                [DeviceModel(name=name) for name in new_names], ignore_conflicts=True
+            )
+            found.update({m.name: m for m in DeviceModel.objects.filter(name__in=new_names)})
+        with _device_models_lock:
+            _device_models.update(found)
+
+    with _device_models_lock:
+        return {name: _device_models[name] for name in names if name in _device_models}
+
+
+def _sync_values(device):
+    return {
+        "hostname": device.hostname,
+        "version": device.version,
+        "model": device.model.name if device.model else None,
+        "boot_method": device.boot_method,
+        "reachability": device.reachability,
+    }
+
+
+def sync_device_details(device_id, sync_run_id=None, writer=None, max_facts_age=None):
     """
     SSH to device, run show version, pull hardware/software info.
+
+    With `max_facts_age`, facts cached within that many seconds (e.g. just
+    collected by ZTP) are used without logging in again.
+    The result is handed to `writer` (a SyncResultWriter) for batched
+    persistence, or persisted immediately when no writer is given.
+    Returns {"status": "success" | "failed", "error": str | None}.
     """
+    started = time.monotonic()
+    result = {
+        "device_id": device_id,
+        "sync_run_id": sync_run_id,
+        "status": "failed",
+        "error": None,
+        "facts": {},
+    }
+
+    cached = get_facts(device_id, ["hostname", "version", "chassis", "system_image"], max_facts_age)
+    if cached:
+        logger.info(f"[SYNC] Using cached facts for device {device_id}")
+        result["status"] = "success"
+        result["facts"] = {
+            "hostname": cached["hostname"],
+            "version": cached["version"],
+            "model": cached["chassis"],
+            "boot_method": cached["system_image"],
+        }
+        return _finish_sync(result, started, writer)
+
     try:
         device = Device.objects.get(id=device_id)
 
-        # Capture previous values for history tracking
-        previous_values = {
-            "hostname": device.hostname,
-            "version": device.version,
-            "model": device.model.name if device.model else None,
-            "boot_method": device.boot_method,
-            "reachability": device.reachability,
-        }
-
         # Mark as In Progress
-        device.last_sync_status = "In Progress"
-        device.save(update_fields=["last_sync_status"])
+        Device.objects.filter(id=device_id).update(last_sync_status="In Progress")
+        record_changes("device", [device_id])
 
         # Temporary job ID for logs
         temp_id = f"sync_{device.id}"
@@ -42,11 +129,12 @@ def sync_device_details(device_id):
         try:
             dev.connect(log_stdout=True, learn_hostname=True)
 
-            # Parse show version output with Genie
+            # Parse show version output (fast path, genie fallback)
             logger.info(
                 f"[SYNC] Connected to {device.hostname}, parsing show version..."
             )
-            output = dev.parse("show version")
+            output = parse_show_version(dev)
+            record_show_version(device_id, output)
 
             logger.info(f"[SYNC] Show version output: {output}")
 
@@ -79,67 +167,16 @@ def sync_device_details(device_id):
                 # Platform usually holds the chassis info in Genie
                 hardware_model = output.get("pid", "unknown")
 
-            # Update hostname
-            if dev.learned_hostname and dev.learned_hostname != device.hostname:
-                device.hostname = dev.learned_hostname
-
-            if boot_method:
-                device.boot_method = boot_method
-
-            # Update Device
-            if version:
-                device.version = version
-            if hardware_model:
-                mod_obj, _ = DeviceModel.objects.get_or_create(name=hardware_model)
-                device.model = mod_obj
-            device.reachability = "Reachable"
-            device.last_sync_status = "Completed"
-            device.last_sync_time = timezone.now()
-
-            # Capture new values
-            new_values = {
-                "hostname": device.hostname,
-                "version": device.version,
-                "model": device.model.name if device.model else None,
-                "boot_method": device.boot_method,
-                "reachability": device.reachability,
+            result["facts"] = {
+                "hostname": dev.learned_hostname,
+                "version": version,
+                "model": hardware_model,
+                "boot_method": boot_method,
             }
-
-            # Calculate changes
-            changes = {}
-            all_keys = set(list(previous_values.keys()) + list(new_values.keys()))
-            for key in all_keys:
-                old_val = previous_values.get(key)
-                new_val = new_values.get(key)
-                if old_val != new_val:
-                    changes[key] = {"old": old_val, "new": new_val}
-
-            # Save device without validation
-            device.save(
-                update_fields=[
-                    "version",
-                    "model",
-                    "reachability",
-                    "last_sync_status",
-                    "last_sync_time",
-                    "hostname",
-                    "boot_method",
-                ]
-            )
-
-            # Create sync history record
-            DeviceSyncHistory.objects.create(
-                device=device,
-                status="success",
-                previous_values=previous_values,
-                new_values=new_values,
-                changes=changes,
-                version_discovered=version,
-                model_discovered=hardware_model,
-            )
+            result["status"] = "success"
 
             logger.info(
-                f"[SYNC] Sync completed for {device.hostname}: version={version}, model={hardware_model}, changes={changes}"
+                f"[SYNC] Sync completed for {device.hostname}: version={version}, model={hardware_model}"
             )
             dev.disconnect()
 
@@ -149,53 +186,415 @@ def sync_device_details(device_id):
             import traceback
 
             logger.error(f"[SYNC] Traceback: {traceback.format_exc()}")
-
-            # Create failed sync history
-            DeviceSyncHistory.objects.create(
-                device=device,
-                status="failed",
-                previous_values=previous_values,
-                new_values={},
-                error_message=str(e),
-            )
-
-            device.reachability = "Unreachable"
-            device.last_sync_status = "Failed"
-            device.last_sync_time = timezone.now()
-            device.save(
-                update_fields=["reachability", "last_sync_status", "last_sync_time"]
-            )
+            result["error"] = str(e)
 
     except Exception as e:
         logger.error(f"Sync failed for {device_id}: {e}")
         import traceback
 
         logger.error(f"Traceback: {traceback.format_exc()}")
-        try:
-            d = Device.objects.get(id=device_id)
-            d.reachability = "Unreachable"
-            d.last_sync_status = "Failed"
-            d.last_sync_time = timezone.now()
-            d.save(update_fields=["reachability", "last_sync_status", "last_sync_time"])
-        except:
-            pass
+        result["error"] = str(e)
+
+    return _finish_sync(result, started, writer)
+
 
+def _finish_sync(result, started, writer):
+    result["duration"] = time.monotonic() - started
+    if writer:
+        writer.add(result)
+    else:
+        persist_sync_results([result])
+    return {"status": result["status"], "error": result["error"]}
 
-def run_sync_task(scope_type, scope_value=None):
+
+def _apply_sync_result(device, result, models_by_name):
+    """Applies one sync result to `device` in memory. Marks the result failed if rejected."""
+    facts = result["facts"]
+
+    if result["status"] == "success":
+        supported = getattr(settings, "SUPPORTED_DEVICE_MODELS", None)
+        model_name = facts.get("model")
+        if supported and model_name and model_name not in supported:
+            # Same rule as Device.clean, checked here because the batch skips full_clean
+            result["status"] = "failed"
+            result["error"] = (
+                f'Device model "{model_name}" is not supported. '
+                f'Supported models: {", ".join(supported)}'
+            )
+
+    if result["status"] == "success":
+        # Update hostname
+        if facts.get("hostname") and facts["hostname"] != device.hostname:
+            device.hostname = facts["hostname"]
+        if facts.get("boot_method"):
+            device.boot_method = facts["boot_method"]
+        if facts.get("version"):
+            device.version = facts["version"]
+            device.version_key = version_key(device.version)
+        if facts.get("model") in models_by_name:
+            device.model = models_by_name[facts["model"]]
+        device.reachability = "Reachable"
+        device.last_sync_status = "Completed"
+    else:
+        device.reachability = "Unreachable"
+        device.last_sync_status = "Failed"
+
+
+def persist_sync_results(results):
     """
-    Triggers sync for multiple devices based on scope.
+    Writes a batch of sync results: devices with one bulk_update, history
+    rows and per-run results with one bulk_create each. Values come from the
+    device session and the checks full_clean would run are done here, so
+    validation is skipped. History is only recorded for failures and for syncs
+    that changed something; every device of a run gets a SyncRunResult.
     """
-    devices = []
+    now = timezone.now()
+    devices = Device.objects.select_related("model").in_bulk(
+        [result["device_id"] for result in results]
+    )
+    models_by_name = get_device_models(
+        result["facts"].get("model") for result in results if result["status"] == "success"
+    )
+
+    # Learned hostnames already used by other devices would violate uniqueness
+    learned = {
+        result["facts"]["hostname"]: result["device_id"]
+        for result in results
+        if result["facts"].get("hostname")
+    }
+    taken = set(
+        Device.objects.filter(hostname__in=list(learned))
+        .exclude(id__in=list(learned.values()))
+        .values_list("hostname", flat=True)
+    )
+
+    updated = []
+    history = []
+    run_results = []
+    reachability_changes = []
+    for result in results:
+        device = devices.get(result["device_id"])
+        if device is None:
+            continue
+
+        if result["facts"].get("hostname") in taken:
+            result["status"] = "failed"
+            result["error"] = f'Hostname "{result["facts"]["hostname"]}" is already used by another device'
+
+        previous_values = _sync_values(device)
+        _apply_sync_result(device, result, models_by_name)
+        device.last_sync_time = now
+        updated.append(device)
+        if device.reachability != previous_values["reachability"]:
+            reachability_changes.append({
+                "device": device.id, "hostname": device.hostname,
+                "reachability": device.reachability, "previous": previous_values["reachability"],
+            })
+
+        if result.get("sync_run_id"):
+            run_results.append(
+                SyncRunResult(
+                    sync_run_id=result["sync_run_id"],
+                    device=device,
+                    status=result["status"],
+                    duration_seconds=result.get("duration"),
+                    error_message=result["error"],
+                )
+            )
+
+        if result["status"] != "success":
+            history.append(
+                DeviceSyncHistory(
+                    device=device,
+                    status="failed",
+                    previous_values=previous_values,
+                    new_values={},
+                    error_message=result["error"],
+                    sync_run_id=result.get("sync_run_id"),
+                    duration_seconds=result.get("duration"),
+                )
+            )
+            continue
+
+        new_values = _sync_values(device)
+        changes = {
+            key: {"old": previous_values[key], "new": new_values[key]}
+            for key in new_values
+            if previous_values[key] != new_values[key]
+        }
+        if changes:
+            history.append(
+                DeviceSyncHistory(
+                    device=device,
+                    status="success",
+                    previous_values=previous_values,
+                    new_values=new_values,
+                    changes=changes,
+                    version_discovered=result["facts"].get("version"),
+                    model_discovered=result["facts"].get("model"),
+                    sync_run_id=result.get("sync_run_id"),
+                    duration_seconds=result.get("duration"),
+                )
+            )
+
+    try:
+        with transaction.atomic():
+            Device.objects.bulk_update(updated, SYNC_FIELDS)
+    except IntegrityError:
+        # Two devices in the batch learned the same hostname (or a cached model
+        # was deleted underneath us) - write them one by one
+        with _device_models_lock:
+            _device_models.clear()
+        for device in updated:
+            try:
+                with transaction.atomic():
+                    device.save(update_fields=SYNC_FIELDS, skip_validation=True)
+            except IntegrityError as e:
+                logger.error(f"[SYNC] Could not save sync result for {device.hostname}: {e}")
+
+    DeviceSyncHistory.objects.bulk_create(history)
+    SyncRunResult.objects.bulk_create(run_results)
+
+    # bulk_update bypasses Device.save(), which keeps compliance current, and its signals
+    from .compliance_service import refresh_compliance
+
+    updated_ids = [device.id for device in updated]
+    refresh_compliance(Device.objects.filter(id__in=updated_ids))
+    record_changes("device", updated_ids)
+    publish_many("device.reachability", reachability_changes)
+    return results
+
+
+class SyncResultWriter:
+    """
+    Buffers sync results and persists them in batches of SYNC_WRITE_BATCH_SIZE,
+    or after SYNC_WRITE_INTERVAL seconds, whichever comes first.
+    """
+
+    def __init__(self, batch_size=None, interval=None, on_flush=None):
+        self.batch_size = batch_size or getattr(settings, "SYNC_WRITE_BATCH_SIZE", 50)
+        self.interval = interval or getattr(settings, "SYNC_WRITE_INTERVAL", 2)
+        self.on_flush = on_flush
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+    def add(self, result):
+        with self._lock:
+            self._pending.append(result)
+            full = len(self._pending) >= self.batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        if not batch:
+            return []
+
+        with self._flush_lock:
+            try:
+                persist_sync_results(batch)
+            except Exception as e:
+                logger.error(f"[SYNC] Failed to persist {len(batch)} sync results: {e}")
+                for result in batch:
+                    result["status"] = "failed"
+                    result["error"] = f"Failed to save sync result: {e}"
+
+        if self.on_flush:
+            self.on_flush(batch)
+        return batch
+
+
+def failure_reason(error):
+    """Groups similar errors: device specific addresses and numbers are masked."""
+    lines = (error or "").strip().splitlines()
+    reason = lines[0] if lines else "Unknown error"
+    reason = re.sub(r"\b\d{1,3}(\.\d{1,3}){3}(:\d+)?\b", "<ip>", reason)
+    reason = re.sub(r"\b\d+\b", "<n>", reason)
+    return reason[:200]
+
+
+class SyncEngine:
+    """
+    Runs device syncs on a bounded worker pool.
+
+    Concurrency is capped at SYNC_MAX_WORKERS devices at once and
+    SYNC_MAX_PER_SITE per site; sites are served round-robin so one large
+    site cannot starve the others. Both caps are per process: with several
+    gunicorn workers, each runs its own engine and the fleet-wide concurrency
+    is up to that many times the configured values.
+
+    A device is claimed in the database (SyncClaim) from the time it is queued
+    until its result is persisted, so a device already claimed by any process
+    is not queued again - the later run counts it as coalesced. Results are persisted in batches
+    and run progress is updated once per batch.
+    """
+
+    def __init__(self, max_workers=None, max_per_site=None):
+        self.max_workers = max_workers or getattr(settings, "SYNC_MAX_WORKERS", 50)
+        self.max_per_site = max_per_site or getattr(settings, "SYNC_MAX_PER_SITE", 10)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = OrderedDict()  # site_id -> deque of (device_id, run_id)
+        self._site_active = Counter()
+        self._failure_reasons = {}  # run_id -> Counter
+        self._progress_lock = threading.Lock()
+        self.writer = SyncResultWriter(on_flush=self._record_batch)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="device-sync"
+            )
+        return self._executor
+
+    def submit(self, devices, scope, scope_value=None, user=None):
+        """Queues `devices` (id, site_id pairs) and returns the SyncRun tracking them."""
+        run = SyncRun.objects.create(
+            scope=scope,
+            scope_value=scope_value,
+            created_by=user if user and user.is_authenticated else None,
+        )
+
+        sites = dict(devices)
+        claimed = self._claim(run, sites)
+        queued, coalesced = len(claimed), len(devices) - len(claimed)
+        with self._lock:
+            for device_id in claimed:
+                self._pending.setdefault(sites[device_id], deque()).append((device_id, run.id))
+
+        run.total = queued
+        run.coalesced = coalesced
+        if not queued:
+            run.status = "completed"
+            run.completed_at = timezone.now()
+        run.save(update_fields=["total", "coalesced", "status", "completed_at"])
+        if not queued:
+            publish_sync_run(run.id)
+
+        logger.info(f"[SYNC] Run {run.id}: {queued} devices queued, {coalesced} already syncing")
+        self._dispatch()
+        return run
+
+    def _claim(self, run, device_ids):
+        """Claims `device_ids` for `run` and returns the ids claimed; the others are claimed by another run."""
+        timeout = getattr(settings, "SYNC_CLAIM_TIMEOUT", 3600)
+        # Claims left behind by a worker that died are given up after SYNC_CLAIM_TIMEOUT
+        SyncClaim.objects.filter(claimed_at__lt=timezone.now() - timedelta(seconds=timeout)).delete()
+        SyncClaim.objects.bulk_create(
+            [SyncClaim(device_id=device_id, sync_run=run) for device_id in device_ids], ignore_conflicts=True
+        )
+        claimed = set(SyncClaim.objects.filter(sync_run=run).values_list("device_id", flat=True))
+        return [device_id for device_id in device_ids if device_id in claimed]
+
+    def _dispatch(self):
+        with self._lock:
+            progressed = True
+            while progressed:
+                progressed = False
+                for site_id in list(self._pending):
+                    queue = self._pending[site_id]
+                    if not queue:
+                        del self._pending[site_id]
+                        continue
+                    if self._site_active[site_id] >= self.max_per_site:
+                        continue
+                    device_id, run_id = queue.popleft()
+                    self._site_active[site_id] += 1
+                    self._get_executor().submit(self._run_one, device_id, site_id, run_id)
+                    progressed = True
+
+    def _run_one(self, device_id, site_id, run_id):
+        try:
+            # A claim is timed from the start of the sync, not from the time it was queued
+            SyncClaim.objects.filter(device_id=device_id, sync_run_id=run_id).update(claimed_at=timezone.now())
+            sync_device_details(device_id, sync_run_id=run_id, writer=self.writer)
+        except Exception as e:
+            logger.error(f"[SYNC] Sync worker failed for device {device_id}: {e}")
+            self.writer.add({
+                "device_id": device_id, "sync_run_id": run_id,
+                "status": "failed", "error": str(e), "facts": {},
+            })
+        finally:
+            with self._lock:
+                self._site_active[site_id] -= 1
+            self._dispatch()
+
+    def _record_batch(self, results):
+        """
+        Releases the claims of a persisted batch of results and updates run
+        progress: one DELETE and one UPDATE per run.
+        """
+        by_run = {}
+        for result in results:
+            if result.get("sync_run_id"):
+                by_run.setdefault(result["sync_run_id"], []).append(result)
+
+        with self._progress_lock:
+            for run_id, run_results in by_run.items():
+                try:
+                    # Only now can a newer sync of these devices start, so its result
+                    # is persisted after theirs and is not overwritten by them
+                    SyncClaim.objects.filter(
+                        sync_run_id=run_id, device_id__in=[r["device_id"] for r in run_results]
+                    ).delete()
+
+                    failed = [r for r in run_results if r.get("status") != "success"]
+                    updates = {
+                        "completed": F("completed") + len(run_results),
+                        "succeeded": F("succeeded") + len(run_results) - len(failed),
+                        "failed": F("failed") + len(failed),
+                    }
+                    if failed:
+                        reasons = self._failure_reasons.setdefault(run_id, Counter())
+                        reasons.update(failure_reason(r.get("error")) for r in failed)
+                        updates["failure_reasons"] = dict(reasons)
+                    SyncRun.objects.filter(id=run_id).update(**updates)
+
+                    run = SyncRun.objects.only("completed", "total").get(id=run_id)
+                    if run.completed >= run.total:
+                        SyncRun.objects.filter(id=run_id).update(status="completed", completed_at=timezone.now())
+                        self._failure_reasons.pop(run_id, None)
+                        publish_sync_run(run_id)
+                except Exception as e:
+                    logger.error(f"[SYNC] Failed to record progress for run {run_id}: {e}")
+
+    def status(self):
+        with self._lock:
+            return {
+                "queued": sum(len(q) for q in self._pending.values()),
+                "running": sum(self._site_active.values()),
+                "max_workers": self.max_workers,
+                "max_per_site": self.max_per_site,
+            }
+
+
+sync_engine = SyncEngine()
+
+
+def scope_devices(scope_type, scope_value=None):
     if scope_type == "all":
-        devices = Device.objects.all()
+        return Device.objects.all()
     elif scope_type == "site":
-        devices = Device.objects.filter(site=scope_value)
+        return Device.objects.filter(site=scope_value)
     elif scope_type == "selection":
-        devices = Device.objects.filter(id__in=scope_value)
+        return Device.objects.filter(id__in=scope_value)
+    return Device.objects.none()
 
-    for dev in devices:
-        t = threading.Thread(target=sync_device_details, args=(dev.id,))
-        t.daemon = True
-        t.start()
 
-    return len(devices)
+def run_sync_task(scope_type, scope_value=None, user=None):
+    """
+    Triggers sync for multiple devices based on scope.
+    Returns the SyncRun tracking progress.
+    """
+    devices = scope_devices(scope_type, scope_value).values_list("id", "site_id")
+    return sync_engine.submit(list(devices), scope_type, scope_value, user=user)
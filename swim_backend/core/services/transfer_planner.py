@@ -0,0 +1,325 @@
+"""
+Bandwidth-aware transfer planning.
+
+Sites (WAN links) and file servers can carry a bandwidth budget in Mbps,
+optionally overridden per time-of-day window. Before a distribution starts
+pulling an image, the planner admits it only if the expected throughput of
+all transfers on the same site link and file server stays within budget;
+otherwise it waits. A link with no active transfers always admits one, so an
+undersized budget slows a campaign down but never stalls it.
+
+Admitted transfers are ActiveTransfer rows, so budgets hold across gunicorn
+workers: admission locks the site and file server rows (select_for_update)
+while it checks and records its share. MAX_CONCURRENT_TRANSFERS is a
+per-process limit on transfer threads.
+
+The same model is used to estimate completion times for a whole campaign.
+"""
+import datetime
+import heapq
+import threading
+import logging
+from contextlib import contextmanager
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting transfer re-evaluates budgets (time-of-day windows may
+# change, and transfers in other processes end without notifying this one)
+ADMISSION_POLL_SECONDS = 15
+
+# An active transfer stops counting after this multiple of its expected
+# duration plus the margin, in case its worker died without removing it
+TRANSFER_EXPIRY_FACTOR = 3
+TRANSFER_EXPIRY_MARGIN = 600
+
+# Concurrent image transfers per process, held by the distribution step
+MAX_CONCURRENT_TRANSFERS = 40
+DISTRIBUTION_SEMAPHORE = threading.Semaphore(MAX_CONCURRENT_TRANSFERS)
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+def _parse_hhmm(value):
+    hours, minutes = value.split(':')
+    return datetime.time(int(hours), int(minutes))
+
+
+def budget_bps(capacity_mbps, schedule, at=None):
+    """
+    Effective budget in bytes/sec at local time `at`, or None for unlimited.
+
+    `schedule` is a list of windows like {"start": "08:00", "end": "18:00", "mbps": 20};
+    the first matching window overrides `capacity_mbps`. Windows may wrap midnight.
+    """
+    mbps = capacity_mbps
+    now = timezone.localtime(at or timezone.now()).time()
+
+    for window in schedule or []:
+        try:
+            start, end = _parse_hhmm(window['start']), _parse_hhmm(window['end'])
+            in_window = start <= now < end if start <= end else (now >= start or now < end)
+        except (KeyError, ValueError, AttributeError):
+            logger.warning(f"Ignoring invalid bandwidth window: {window}")
+            continue
+        if in_window:
+            mbps = window.get('mbps')
+            break
+
+    if not mbps:
+        return None
+    return float(mbps) * 1_000_000 / 8
+
+
+def link_budgets(site, file_server, at=None):
+    """Budgets (bytes/sec or None) keyed by link for a (site, file server) pair."""
+    budgets = {}
+    if site:
+        budgets[('site', site.id)] = budget_bps(site.wan_bandwidth_mbps, site.bandwidth_schedule, at)
+    if file_server:
+        budgets[('server', file_server.id)] = budget_bps(
+            file_server.bandwidth_mbps, file_server.bandwidth_schedule, at
+        )
+    return budgets
+
+
+def expected_throughput(file_server, site):
+    """Expected per-transfer throughput (bytes/sec) from measured stats, else the default."""
+    from swim_backend.images.models import FileServerStats
+    from swim_backend.core.services.file_server_selector import _default_throughput
+
+    for site_id in ([site.id] if site else []) + [None]:
+        stats = FileServerStats.objects.filter(
+            file_server=file_server, site_id=site_id
+        ).exclude(throughput_bps__isnull=True).first()
+        if stats:
+            return stats.throughput_bps
+    return _default_throughput()
+
+
+def _fits(active, links, budgets, rate):
+    """True if a transfer of `rate` on `links` stays within every budget."""
+    for link in links:
+        budget = budgets.get(link)
+        if budget is None:
+            continue
+        used = sum(t['rate'] for t in active if link in t['links'])
+        if used and used + min(rate, budget) > budget:
+            return False
+    return True
+
+
+def _links(site_id, file_server_id):
+    links = []
+    if site_id:
+        links.append(('site', site_id))
+    if file_server_id:
+        links.append(('server', file_server_id))
+    return links
+
+
+class TransferPlanner:
+    """Admission control for image transfers, shared by all processes through ActiveTransfer rows."""
+
+    def __init__(self):
+        # Wakes waiting transfers of this process when one of its transfers ends
+        self._cond = threading.Condition()
+
+    def _lock_links(self, site, file_server):
+        """Serializes admissions on the same site link or file server across processes."""
+        from swim_backend.devices.models import Site
+        from swim_backend.images.models import FileServer
+
+        if site:
+            list(Site.objects.select_for_update().filter(id=site.id).values_list('id'))
+        if file_server:
+            list(FileServer.objects.select_for_update().filter(id=file_server.id).values_list('id'))
+
+    @contextmanager
+    def admit(self, job_id, site, file_server, size_bytes, log=None, is_cancelled=None):
+        """
+        Blocks until the transfer fits within the site and file server budgets,
+        then holds its share of bandwidth for the duration of the block.
+        """
+        from swim_backend.core.models import ActiveTransfer
+
+        rate = expected_throughput(file_server, site)
+        waited = False
+
+        while True:
+            with transaction.atomic():
+                self._lock_links(site, file_server)
+                budgets = link_budgets(site, file_server)
+                links = [link for link, budget in budgets.items() if budget is not None]
+                capped = min([rate] + [budgets[link] for link in links])
+                active = self.active_transfers()
+                if _fits(active, links, budgets, rate):
+                    expected_seconds = (size_bytes or 0) / capped if capped else 0
+                    now = timezone.now()
+                    ActiveTransfer.objects.filter(job_id=job_id).delete()
+                    transfer = ActiveTransfer.objects.create(
+                        job_id=job_id, site=site, file_server=file_server,
+                        rate_bps=capped, size_bytes=size_bytes or 0,
+                        expires_at=now + datetime.timedelta(
+                            seconds=expected_seconds * TRANSFER_EXPIRY_FACTOR + TRANSFER_EXPIRY_MARGIN
+                        ),
+                    )
+                    break
+
+            if not waited and log:
+                log(
+                    f"Waiting for bandwidth: {len(active)} active transfers, "
+                    f"this one expects {capped * 8 / 1_000_000:.1f} Mbps"
+                )
+            waited = True
+            if is_cancelled and is_cancelled():
+                raise TransferCancelled()
+            with self._cond:
+                self._cond.wait(timeout=ADMISSION_POLL_SECONDS)
+
+        if waited and log:
+            log("Bandwidth budget available. Starting transfer.")
+
+        try:
+            yield
+        finally:
+            ActiveTransfer.objects.filter(id=transfer.id).delete()
+            with self._cond:
+                self._cond.notify_all()
+
+    def active_transfers(self):
+        """Transfers admitted in any process that have not ended or expired."""
+        from swim_backend.core.models import ActiveTransfer
+
+        rows = ActiveTransfer.objects.filter(expires_at__gt=timezone.now()).order_by('started_at').values(
+            'job_id', 'site_id', 'file_server_id', 'rate_bps', 'size_bytes', 'started_at'
+        )
+        return [
+            {
+                'job_id': row['job_id'],
+                'links': _links(row['site_id'], row['file_server_id']),
+                'rate': row['rate_bps'],
+                'size_bytes': row['size_bytes'],
+                'started_at': row['started_at'],
+            }
+            for row in rows
+        ]
+
+    def snapshot(self):
+        return [
+            {
+                'job_id': t['job_id'],
+                'links': [f"{kind}:{ident}" for kind, ident in t['links']],
+                'expected_mbps': round(t['rate'] * 8 / 1_000_000, 1),
+                'size_bytes': t['size_bytes'],
+                'started_at': t['started_at'].isoformat(),
+            }
+            for t in self.active_transfers()
+        ]
+
+
+transfer_planner = TransferPlanner()
+
+
+def estimate_campaign(jobs, now=None):
+    """
+    Simulates admission of `jobs` under the current budgets and returns
+    estimated start/finish times per job and for the whole campaign.
+
+    Transfers already running in any process occupy their links until their
+    expected end. Each job is assumed to use the head of its failover chain.
+    """
+    from swim_backend.core.services.file_server_selector import rank_file_servers
+
+    now = now or timezone.now()
+    clock = now
+
+    running = []  # heap of (end_time, seq, transfer)
+    seq = 0
+    for t in transfer_planner.active_transfers():
+        elapsed = (now - t['started_at']).total_seconds()
+        remaining = max(t['size_bytes'] / t['rate'] - elapsed, 0) if t['rate'] else 0
+        heapq.heappush(running, (now + datetime.timedelta(seconds=remaining), seq, t))
+        seq += 1
+
+    queue = []
+    results = {}
+    finish_times = {}
+    campaign_finish = None
+    previous_in_batch = {}
+    for job in jobs:
+        chain = rank_file_servers(job.device, image=job.image, pinned=job.file_server) if job.image else []
+        if not chain:
+            results[job.id] = {'job_id': job.id, 'device': job.device.hostname, 'error': 'No image or file server'}
+            continue
+        fs = chain[0][0]
+        after = None
+        if job.execution_mode == 'sequential' and job.batch_id:
+            # Sequential batches transfer one device after the other
+            after = previous_in_batch.get(job.batch_id)
+            previous_in_batch[job.batch_id] = job.id
+        queue.append({
+            'job': job,
+            'site': job.device.site,
+            'file_server': fs,
+            'size_bytes': job.image.size_bytes or 0,
+            'rate': expected_throughput(fs, job.device.site),
+            'earliest': max(job.distribution_time or now, now),
+            'after': after,
+        })
+
+    while queue:
+        admitted = False
+        for item in list(queue):
+            if item['earliest'] > clock or len(running) >= MAX_CONCURRENT_TRANSFERS:
+                continue
+            if item['after'] and finish_times.get(item['after'], clock + datetime.timedelta(seconds=1)) > clock:
+                continue
+            budgets = link_budgets(item['site'], item['file_server'], at=clock)
+            links = [link for link, budget in budgets.items() if budget is not None]
+            active = [entry[2] for entry in running]
+            if not _fits(active, links, budgets, item['rate']):
+                continue
+
+            rate = min([item['rate']] + [budgets[link] for link in links])
+            duration = item['size_bytes'] / rate if rate else 0
+            finish = clock + datetime.timedelta(seconds=duration)
+            heapq.heappush(running, (finish, seq, {'links': links, 'rate': rate}))
+            seq += 1
+            queue.remove(item)
+            admitted = True
+            campaign_finish = max(campaign_finish or finish, finish)
+            finish_times[item['job'].id] = finish
+
+            job = item['job']
+            results[job.id] = {
+                'job_id': job.id,
+                'device': job.device.hostname,
+                'site': item['site'].name if item['site'] else None,
+                'file_server': item['file_server'].name,
+                'size_bytes': item['size_bytes'],
+                'expected_mbps': round(rate * 8 / 1_000_000, 1),
+                'estimated_start': clock.isoformat(),
+                'estimated_finish': finish.isoformat(),
+            }
+
+        if admitted:
+            continue
+
+        # Advance to the next event: a transfer finishing or a scheduled job becoming eligible
+        next_events = [entry[0] for entry in running[:1]]
+        next_events += [item['earliest'] for item in queue if item['earliest'] > clock]
+        if not next_events:
+            break
+        clock = min(next_events)
+        while running and running[0][0] <= clock:
+            heapq.heappop(running)
+
+    return {
+        'generated_at': now.isoformat(),
+        'campaign_finish': campaign_finish.isoformat() if campaign_finish else None,
+        'jobs': [results[job.id] for job in jobs if job.id in results],
+    }
@@ -0,0 +1,175 @@
+"""
+Compact job status for automation clients (GET /api/upgrade/status/).
+
+Rows are read with values() from the job columns a status needs (never the
+log or check runs), per-job progress and current step are derived from the
+small `steps` JSON, and batch-level figures (counts by status, failure rate,
+ETA) come from an aggregate over the indexed batch_id/status columns.
+
+Each response carries a `version` fingerprint of every job's status, progress
+and current step. wait_for_status_change() holds a request until that
+fingerprint differs from the client's, every job is terminal, or the wait
+runs out; status transitions wake it through the event bus and step changes
+are picked up every STATUS_RECHECK_INTERVAL seconds.
+"""
+import time
+import hashlib
+from statistics import mean
+from django.db.models import Count
+from django.utils import timezone
+from .event_bus import latest_event_id, wait_for_events
+
+TERMINAL_STATUSES = ("success", "failed", "cancelled")
+ACTIVE_STATUSES = ("distributing", "distributed", "activating", "running")
+# How often a waiting request re-reads step progress between status events (seconds)
+STATUS_RECHECK_INTERVAL = 5.0
+
+# Progress of jobs without step tracking
+STATUS_PROGRESS = {
+    "pending": 0,
+    "scheduled": 0,
+    "distributing": 30,
+    "distributed": 50,
+    "activating": 75,
+    "success": 100,
+    "failed": 100,
+    "cancelled": 0,
+}
+
+# Job fields a client can select with ?fields=, and the columns each needs
+JOB_FIELDS = {
+    "id": ("id",),
+    "device": ("device_id",),
+    "device_hostname": ("device__hostname",),
+    "status": ("status",),
+    "progress": ("status", "steps"),
+    "current_step": ("status", "steps"),
+    "steps": ("steps",),
+    "image_filename": ("image__filename",),
+    "batch_id": ("batch_id",),
+    "distribution_time": ("distribution_time",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+DEFAULT_JOB_FIELDS = (
+    "id", "device_hostname", "status", "progress", "current_step", "image_filename", "steps",
+    "created_at", "updated_at",
+)
+
+
+def job_progress(status, steps):
+    """Percentage of steps completed, or an estimate from the status when there are no steps."""
+    if steps:
+        completed = sum(1 for s in steps if s.get("status") == "success")
+        return int((completed / len(steps)) * 100)
+    return STATUS_PROGRESS.get(status, 0)
+
+
+def current_step(status, steps):
+    if steps:
+        step = next((s for s in steps if s.get("status") in ["running", "pending"]), None)
+        return step["name"] if step else "Completed"
+    return (status or "Unknown").title()
+
+
+def job_rows(jobs, fields=DEFAULT_JOB_FIELDS):
+    """[{field: value}] for `jobs` (a queryset), reading only the columns `fields` need."""
+    columns = {"id", "status", "steps"}
+    for field in fields:
+        columns.update(JOB_FIELDS[field])
+    rows = []
+    for values in jobs.order_by("id").values(*sorted(columns)):
+        derived = {
+            "device": values.get("device_id"),
+            "device_hostname": values.get("device__hostname"),
+            "image_filename": values.get("image__filename"),
+            "batch_id": str(values["batch_id"]) if values.get("batch_id") else None,
+            "progress": job_progress(values["status"], values["steps"]),
+            "current_step": current_step(values["status"], values["steps"]),
+        }
+        rows.append({field: derived[field] if field in derived else values[field] for field in fields})
+    return rows
+
+
+def status_version(jobs):
+    """Fingerprint of the status, progress and current step of every job in `jobs`."""
+    state = [
+        (job_id, status, job_progress(status, steps), current_step(status, steps))
+        for job_id, status, steps in jobs.order_by("id").values_list("id", "status", "steps")
+    ]
+    return hashlib.md5(repr(state).encode()).hexdigest()
+
+
+def batch_summary(jobs):
+    """
+    Figures for the whole set: counts by status (one aggregate query), how
+    many are finished, the failure rate of finished jobs, mean progress and an
+    ETA in seconds from the mean duration of finished jobs (None until one
+    finishes).
+    """
+    by_status = dict(jobs.order_by().values_list("status").annotate(count=Count("id")))
+    total = sum(by_status.values())
+    finished = sum(by_status.get(s, 0) for s in TERMINAL_STATUSES)
+    succeeded, failed = by_status.get("success", 0), by_status.get("failed", 0)
+
+    rows = list(jobs.order_by().values_list(
+        "status", "steps", "execution_mode", "created_at", "updated_at", "distribution_time"
+    ))
+    progress = mean(job_progress(status, steps) for status, steps, *_ in rows) if rows else 0
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "finished": finished,
+        "all_finished": total > 0 and finished == total,
+        "failure_rate": round(failed / (succeeded + failed), 3) if succeeded + failed else None,
+        "progress": round(progress),
+        "eta_seconds": _eta_seconds(rows),
+    }
+
+
+def _started(created_at, distribution_time):
+    """When a job started (or will start): its schedule, if later than its creation."""
+    return max(created_at, distribution_time or created_at)
+
+
+def _eta_seconds(rows):
+    now = timezone.now()
+    durations = [
+        (updated_at - _started(created_at, distribution_time)).total_seconds()
+        for status, _, _, created_at, updated_at, distribution_time in rows
+        if status in ("success", "failed")
+    ]
+    if not durations:
+        return None
+    average = max(mean(durations), 0)
+
+    remaining = []
+    for status, _, mode, created_at, _, distribution_time in rows:
+        if status in TERMINAL_STATUSES:
+            continue
+        start = _started(created_at, distribution_time)
+        if status in ACTIVE_STATUSES:
+            remaining.append(max(average - (now - start).total_seconds(), 0))
+        else:
+            # Not started yet: waits for its schedule, then takes an average run
+            remaining.append(max((start - now).total_seconds(), 0) + average)
+    if not remaining:
+        return 0
+    sequential = any(mode == "sequential" for _, _, mode, *_ in rows)
+    return round(sum(remaining) if sequential else max(remaining))
+
+
+def wait_for_status_change(jobs, since, timeout):
+    """
+    Waits up to `timeout` seconds until the status_version() of `jobs`
+    differs from `since` or every job is finished. Returns the current version.
+    """
+    deadline = time.monotonic() + timeout
+    cursor = latest_event_id()
+    while True:
+        version = status_version(jobs)
+        remaining = deadline - time.monotonic()
+        if version != since or remaining <= 0 or not jobs.exclude(status__in=TERMINAL_STATUSES).exists():
+            return version
+        cursor = wait_for_events(cursor, ["job.status"], min(STATUS_RECHECK_INTERVAL, remaining))["cursor"]
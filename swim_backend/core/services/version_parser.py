@@ -0,0 +1,68 @@
+"""
+Canonical parsing and ordering of Cisco software versions.
+
+IOS-XE ("17.09.04a", "03.16.08.S"), classic IOS ("15.2(7)E3"), NX-OS
+("9.3(8)", "7.0(3)I7(9)") and IOS-XR ("7.3.2") strings are split into
+number and letter tokens: "15.2(7)E3" -> (15, 2, 7, 'e', 3). Leading zeros
+and trailing ".0" parts do not matter, and a letter suffix sorts after the
+bare release ("17.9.4" < "17.9.4a" < "17.9.5").
+
+version_key() encodes the tokens as a fixed-width, digits-only string that
+sorts like the versions themselves. It is stored on Device, Image and
+DeviceModel, so "devices older than 17.9.4a" is an indexed range query:
+    Device.objects.filter(version_key__lt=version_key("17.9.4a"))
+Being digits only, the key orders the same under every database collation.
+"""
+import re
+from functools import lru_cache
+
+_TOKEN = re.compile(r"\d+|[a-z]+")
+
+# Each token is encoded in TOKEN_WIDTH digits: a type digit (1 number, 2 letters)
+# then the number zero-padded, or up to two letters as two-digit codes
+TOKEN_WIDTH = 6
+MAX_TOKENS = 10
+KEY_LENGTH = TOKEN_WIDTH * MAX_TOKENS
+_MAX_NUMBER = 10 ** (TOKEN_WIDTH - 1) - 1
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version):
+    """
+    '17.09.04a' -> (17, 9, 4, 'a'); '15.2(7)E3' -> (15, 2, 7, 'e', 3).
+    Text before the first digit ("Version ", "Everest-") and after the first
+    space is ignored. Returns () when there is no version.
+    """
+    if not version:
+        return ()
+    text = str(version).lower()
+    start = re.search(r"\d", text)
+    if not start:
+        return ()
+    text = text[start.start():].split()[0]
+    tokens = [int(t) if t.isdigit() else t for t in _TOKEN.findall(text)]
+    # 17.9.0 is 17.9
+    while len(tokens) > 1 and tokens[-1] == 0:
+        tokens.pop()
+    return tuple(tokens)
+
+
+def _encode(token):
+    if isinstance(token, int):
+        return f"1{min(token, _MAX_NUMBER):0{TOKEN_WIDTH - 1}d}"
+    letters = "".join(f"{ord(c) - 96:02d}" for c in token[:2])
+    return f"2{letters:0<{TOKEN_WIDTH - 1}}"
+
+
+@lru_cache(maxsize=4096)
+def version_key(version):
+    """Sortable key for `version` ('' when there is none); see the module docstring."""
+    return "".join(_encode(token) for token in parse_version(version)[:MAX_TOKENS])
+
+
+def compare_versions(v1, v2):
+    """Returns -1 (v1 older), 0 (same), 1 (v1 newer), or None when either version is missing."""
+    k1, k2 = version_key(v1), version_key(v2)
+    if not k1 or not k2:
+        return None
+    return (k1 > k2) - (k1 < k2)
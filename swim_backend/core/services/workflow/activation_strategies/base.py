@@ -1,8 +1,13 @@
+from swim_backend.core.services.version_parser import version_key
+
+
 class BaseActivationStrategy:
     supported_models = []
     supported_platforms = []
     min_version = None
     max_version = None
+    # Lower priorities are tried first
+    priority = 100
     
     def __init__(self, device, job, logger):
         self.device = device
@@ -39,20 +44,10 @@ class BaseActivationStrategy:
         return True
     
     def _version_gte(self, v1, v2):
-        try:
-            p1 = [int(''.join(filter(str.isdigit, x)) or '0') for x in str(v1).replace('-', '.').split('.')]
-            p2 = [int(''.join(filter(str.isdigit, x)) or '0') for x in str(v2).replace('-', '.').split('.')]
-            return p1 >= p2
-        except:
-            return True
+        return version_key(v1) >= version_key(v2)
     
     def _version_lte(self, v1, v2):
-        try:
-            p1 = [int(''.join(filter(str.isdigit, x)) or '0') for x in str(v1).replace('-', '.').split('.')]
-            p2 = [int(''.join(filter(str.isdigit, x)) or '0') for x in str(v2).replace('-', '.').split('.')]
-            return p1 <= p2
-        except:
-            return True
+        return version_key(v1) <= version_key(v2)
     
     def get_credentials(self):
 
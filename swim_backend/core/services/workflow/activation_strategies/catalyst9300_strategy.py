@@ -1,7 +1,10 @@
 from unicon.eal.dialogs import Dialog, Statement
+from swim_backend.core.services.device_facts import get_facts
 from .base import BaseActivationStrategy
 from .registry import ActivationStrategyRegistry
 
+INSTALL_MODE_MAX_AGE = 24 * 3600
+
 
 @ActivationStrategyRegistry.register
 class Catalyst9300ActivationStrategy(BaseActivationStrategy):
@@ -12,13 +15,18 @@ class Catalyst9300ActivationStrategy(BaseActivationStrategy):
         try:
             self.log(f"Cat9K activation for {self.device.hostname}")
 
-            # Verify install mode
-            try:
-                output = genie_device.execute("show version | include Mode")
-                if "INSTALL" not in output:
+            # Verify install mode (rarely changes, so a fact from the last day will do)
+            cached = get_facts(self.device.id, ["install_mode"], INSTALL_MODE_MAX_AGE)
+            if cached:
+                if cached["install_mode"] != "INSTALL":
                     self.log("Warning: Device not in INSTALL mode")
-            except Exception as e:
-                self.log(f"Could not verify install mode: {e}")
+            else:
+                try:
+                    output = genie_device.execute("show version | include Mode")
+                    if "INSTALL" not in output:
+                        self.log("Warning: Device not in INSTALL mode")
+                except Exception as e:
+                    self.log(f"Could not verify install mode: {e}")
 
             # Configure boot parameters
             self.log("Setting boot config...")
@@ -7,6 +7,7 @@ from .registry import ActivationStrategyRegistry
 # @ActivationStrategyRegistry.register
 class DefaultActivationStrategy(BaseActivationStrategy):
     supported_platforms = ['xxxxx']
+    priority = 1000
     
     def can_handle(self, device):
         from django.conf import settings
@@ -2,15 +2,11 @@
 Readiness Strategy Registry
 
 This module provides a plugin-based architecture for device-specific readiness checks.
-Each device model/family can have its own readiness check strategy.
+Each device model/family can have its own readiness check strategy; the registry
+discovers the strategy modules of this package on first use.
 """
 
 from .base import BaseReadinessStrategy
 from .registry import ReadinessStrategyRegistry
 
-# Import strategies to register them
-from .catalyst9300_strategy import Catalyst9300ReadinessStrategy
-from .lab_device_strategy import LabDeviceReadinessStrategy
-from .default_strategy import DefaultReadinessStrategy
-
 __all__ = ["BaseReadinessStrategy", "ReadinessStrategyRegistry"]
@@ -1,15 +1,23 @@
 import logging
 import re
 from genie.conf.base.device import Device as GenieDevice
+from swim_backend.core.services.device_facts import get_facts, record_facts
+from swim_backend.core.services.version_parser import version_key
 
 logger = logging.getLogger(__name__)
 
+# Free flash changes with distributions (which drop the cached value) and with
+# manual clean-ups, which is why only a passing value is reused
+FLASH_FACTS_MAX_AGE = 300
+
 
 class BaseReadinessStrategy:
     supported_models = []
     supported_platforms = []
     min_version = None
     max_version = None
+    # Lower priorities are tried first
+    priority = 100
 
     def __init__(self, device, job, logger=None):
         self.device = device
@@ -52,32 +60,10 @@ class BaseReadinessStrategy:
         return True
 
     def _version_gte(self, v1, v2):
-        try:
-            p1 = [
-                int("".join(filter(str.isdigit, x)) or "0")
-                for x in str(v1).replace("-", ".").split(".")
-            ]
-            p2 = [
-                int("".join(filter(str.isdigit, x)) or "0")
-                for x in str(v2).replace("-", ".").split(".")
-            ]
-            return p1 >= p2
-        except:
-            return True
+        return version_key(v1) >= version_key(v2)
 
     def _version_lte(self, v1, v2):
-        try:
-            p1 = [
-                int("".join(filter(str.isdigit, x)) or "0")
-                for x in str(v1).replace("-", ".").split(".")
-            ]
-            p2 = [
-                int("".join(filter(str.isdigit, x)) or "0")
-                for x in str(v2).replace("-", ".").split(".")
-            ]
-            return p1 <= p2
-        except:
-            return True
+        return version_key(v1) <= version_key(v2)
 
     def get_credentials(self):
         from swim_backend.devices.models import GlobalCredential
@@ -126,6 +112,14 @@ class BaseReadinessStrategy:
         required_space = image_size * 2.5
         req_mb = required_space / 1024 / 1024
 
+        cached = get_facts(self.device.id, ['flash_free_bytes'], FLASH_FACTS_MAX_AGE)
+        if cached and cached['flash_free_bytes'] > required_space:
+            free_mb = cached['flash_free_bytes'] / 1024 / 1024
+            return {
+                "status": "success",
+                "message": f"Enough space: {free_mb:.2f}MB free (Need {req_mb:.2f}MB, checked recently)",
+            }
+
         # Strategy 1: Try parsing 'show file systems' (Integration of user's logic)
         try:
             output = dev.parse("show file systems")
@@ -150,6 +144,7 @@ class BaseReadinessStrategy:
                         failures.append(f"{prefix} ({current_free_mb:.2f}MB)")
             
             if flash_found:
+                record_facts(self.device.id, flash_free_bytes=int(min_free_mb * 1024 * 1024))
                 if failures:
                     return {
                         "status": "failed",
@@ -176,6 +171,7 @@ class BaseReadinessStrategy:
                 digits_clean = match_free.group(1).replace(",", "")
                 free_bytes = int(digits_clean)
                 free_mb = free_bytes / 1024 / 1024
+                record_facts(self.device.id, flash_free_bytes=free_bytes)
 
                 if free_bytes > required_space:
                     return {
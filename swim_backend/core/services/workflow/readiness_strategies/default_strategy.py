@@ -7,6 +7,8 @@ from .registry import ReadinessStrategyRegistry
 class DefaultReadinessStrategy(BaseReadinessStrategy):
     """Default strategy for all devices - fallback when no specific strategy matches"""
 
+    priority = 1000
+
     def can_handle(self, device):
         return True
 
@@ -1,15 +1,9 @@
 from swim_backend.core.services.workflow.base import BaseStep
+from swim_backend.core.services.device_facts import invalidate_facts
 from swim_backend.core.services.workflow.activation_strategies import (
     ActivationStrategyRegistry,
 )
 
-from swim_backend.core.services.workflow.activation_strategies.catalyst9300_strategy import (
-    Catalyst9300ActivationStrategy,
-)  # noqa: F401
-from swim_backend.core.services.workflow.activation_strategies.test_lab_switch import (
-    LabVirtualDeviceStrategy,
-)  # noqa: F401
-
 
 class ActivationStep(BaseStep):
     def execute(self):
@@ -53,7 +47,13 @@ class ActivationStep(BaseStep):
                 connection_timeout=60,
             )
 
-            status, message = strategy.execute(genie_device)
+            # The device is about to reload - nothing learned before is current anymore,
+            # except the install mode the strategy checks first (activation may change it)
+            invalidate_facts(device.id, keep=['install_mode'])
+            try:
+                status, message = strategy.execute(genie_device)
+            finally:
+                invalidate_facts(device.id)
             return status, message
 
         except Exception as e:
@@ -5,9 +5,8 @@ from datetime import datetime
 from genie.conf.base.device import Device as GenieDevice
 from swim_backend.core.services.workflow.base import BaseStep
 from swim_backend.core.services.diff_service import log_update
-
-# Local Semaphore for isolation
-DISTRIBUTION_SEMAPHORE = threading.Semaphore(40)
+from swim_backend.core.services.device_facts import invalidate_facts
+from swim_backend.core.services.transfer_planner import DISTRIBUTION_SEMAPHORE, MAX_CONCURRENT_TRANSFERS
 
 
 class DeviceFileDownloader:
@@ -348,32 +347,29 @@ class DeviceFileDownloader:
 class DistributeStep(BaseStep):
     def resolve_file_server(self, device):
         """
-        Resolves the best file server for a device in order:
-        1. Device Preferred
-        2. Site Preferred
-        3. Global Default
+        Resolves the best file server for a device: the head of the failover
+        chain built by resolve_file_server_chain().
         """
-        from swim_backend.images.models import FileServer
-        
-        # Device Preferred
-        if device.preferred_file_server:
-            return device.preferred_file_server, "Device Preferred"
-            
-        # Site Preferred
-        if device.site and device.site.preferred_file_server:
-            return device.site.preferred_file_server, f"Site Preferred ({device.site.name})"
+        chain = self.resolve_file_server_chain(device)
+        if chain:
+            fs, source, _ = chain[0]
+            return fs, source
 
-        # Region Preferred
-        if device.site and device.site.region and device.site.region.preferred_file_server:
-            return device.site.region.preferred_file_server, f"Region Preferred ({device.site.region.name})"
-            
-        # Global Default
-        default_fs = FileServer.objects.filter(is_global_default=True).first()
-        if default_fs:
-            return default_fs, "Global Default"
-            
         return None, "None"
 
+    def resolve_file_server_chain(self, device, image=None, pinned=None):
+        """
+        Returns the ordered failover chain of (file_server, source, expected_seconds).
+        Candidates come from the preference hierarchy (Device → Site → Region →
+        Global Default) and are ranked by measured expected transfer time.
+        """
+        from swim_backend.core.services.file_server_selector import rank_file_servers
+        return rank_file_servers(device, image=image, pinned=pinned)
+
+    def is_cancelled(self):
+        from swim_backend.core.models import Job
+        return Job.objects.filter(id=self.job_id, status='cancelled').exists()
+
     def execute(self):
         job = self.get_job()
         device = job.device
@@ -397,53 +393,68 @@ class DistributeStep(BaseStep):
              self.log("No image assigned to job. Skipping Distribution.")
              return 'failed', "No image assigned to job"
 
-        self.log("Waiting for distribution slot (Max 40 concurrent)...")
-        
-        with DISTRIBUTION_SEMAPHORE:
-            # Re-check cancellation
-            job.refresh_from_db()
-            if job.status == 'cancelled':
-                return 'failed', "Cancelled"
-                
-            self.log("Acquired slot. Starting Distribution Phase...")
-            
-            target_fs = job.file_server
-            fs_source = "Manual Assignment"
-            
-            if not target_fs:
-                target_fs, fs_source = self.resolve_file_server(device)
-                if target_fs:
-                     self.log(f"Selected File Server: {target_fs.name} ({fs_source})")
-                else:
-                     self.log("No File Server resolved. Attempting local transfer or failing if remote required.")
+        from swim_backend.core.services.file_server_selector import record_transfer, record_failure
+        from swim_backend.core.services.transfer_planner import transfer_planner, TransferCancelled
+
+        # A manually assigned server stays first; the rest of the chain is ranked by measurements
+        chain = self.resolve_file_server_chain(device, image=job.image, pinned=job.file_server)
+        if not chain:
+            self.log("Error: No File Server available to download from.")
+            return 'failed', "Transfer failed: No File Server resolved"
+
+        self.log("File Server failover chain: " + " -> ".join(
+            f"{fs.name} ({source}, est. {'unreachable' if seconds == float('inf') else f'{seconds:.0f}s'})"
+            for fs, source, seconds in chain
+        ))
+
+        # Transfer Logic (Including Smart Download checks)
+        errors = []
+        for index, (target_fs, fs_source, _) in enumerate(chain):
+            if index:
+                self.log(f"Failing over to next File Server: {target_fs.name} ({fs_source})...")
+            else:
+                self.log(f"Selected File Server: {target_fs.name} ({fs_source})")
 
-            # Transfer Logic (Including Smart Download checks)
             try:
-                self.perform_transfer(job, target_fs)
+                # Hold a share of the site / file server bandwidth budget for the transfer.
+                # Admission comes first so jobs queued behind one congested link do not
+                # occupy the distribution slots that transfers to other sites need.
+                with transfer_planner.admit(
+                    job.id, device.site, target_fs, job.image.size_bytes,
+                    log=self.log, is_cancelled=self.is_cancelled,
+                ):
+                    self.log(f"Waiting for distribution slot (Max {MAX_CONCURRENT_TRANSFERS} concurrent)...")
+                    with DISTRIBUTION_SEMAPHORE:
+                        if self.is_cancelled():
+                            return 'failed', "Cancelled"
+                        self.log("Acquired slot. Starting Distribution Phase...")
+                        transfer_seconds = self.perform_transfer(job, target_fs)
+            except TransferCancelled:
+                return 'failed', "Cancelled"
             except Exception as e:
-                self.log(f"Transfer failed from {target_fs.name if target_fs else 'Local'}: {e}")
-                
-                # Fallback Logic
-                from swim_backend.images.models import FileServer
-                default_fs = FileServer.objects.filter(is_global_default=True).first()
-                
-                if target_fs and default_fs and target_fs.id != default_fs.id:
-                    self.log(f"Falling back to Global Default Server: {default_fs.name}...")
-                    try:
-                        self.perform_transfer(job, default_fs)
-                    except Exception as e2:
-                        return 'failed', f"Fallback failed: {e2}"
-                else:
-                    return 'failed', f"Transfer failed: {e}"
-            
-            # Final MD5 Verification (redundant if perform_transfer does it, but keeping as safety or remove?)
-            # perform_transfer handles post-check verification.
-            
+                self.log(f"Transfer failed from {target_fs.name}: {e}")
+                record_failure(target_fs, device.site)
+                errors.append(f"{target_fs.name}: {e}")
+
+                job.refresh_from_db(fields=['status'])
+                if job.status == 'cancelled':
+                    return 'failed', "Cancelled"
+                continue
+
+            # Skipped downloads (file already valid on flash) are not throughput samples
+            if transfer_seconds:
+                invalidate_facts(device.id, ['flash_free_bytes'])
+                record_transfer(target_fs, device.site, job.image.size_bytes, transfer_seconds)
+
             return 'success', "Distribution Complete"
 
+        return 'failed', f"Transfer failed: {'; '.join(errors)}"
+
     def perform_transfer(self, job, file_server):
         """
         Executes the file download using DeviceFileDownloader.
+        Returns the download duration in seconds, or None if the download was
+        skipped because a valid copy already exists on the device.
         """
         if not file_server:
             self.log("Error: No File Server available to download from.")
@@ -456,6 +467,22 @@ class DistributeStep(BaseStep):
         # Removing leading/trailing slashes for clean join
         base_path = file_server.base_path.strip('/') if file_server.base_path else ''
         filename = job.image.filename
+
+        # SWIM itself serves uploaded images; mint a per-job access token for the device
+        if file_server.serves_local_images:
+            if not job.image.file:
+                raise Exception(f"{filename} has not been uploaded to SWIM, cannot serve it from {file_server.name}")
+
+            from datetime import timedelta
+            from django.conf import settings
+            from django.utils import timezone
+            from swim_backend.images.models import ImageAccessToken
+            access = ImageAccessToken.objects.create(
+                image=job.image,
+                description=f"Job {job.id} distribution to {job.device.hostname}",
+                expires_at=timezone.now() + timedelta(seconds=getattr(settings, 'IMAGE_SERVE_TOKEN_TTL', 12 * 3600)),
+            )
+            base_path = f"api/images/serve/{access.token}"
         
         # Protocol handling
         proto = file_server.protocol.lower()
@@ -533,14 +560,16 @@ class DistributeStep(BaseStep):
                 self.log("File not found on device.")
             
             if not should_download:
-                return # Success, skip download
+                return None # Success, skip download
 
             # Start Download
+            download_started = time.monotonic()
             success = downloader.download_file(
                 url=file_url,
                 total_size_bytes=expected_size,
                 destination='flash:' # Default to flash:
             )
+            download_seconds = time.monotonic() - download_started
             
             if success:
                 self.log("Transfer Step Finished Successfully.")
@@ -554,6 +583,8 @@ class DistributeStep(BaseStep):
                 else:
                     self.log("Skipping MD5 Check (No Checksum in Database).")
 
+                return download_seconds
+
             else:
                  raise Exception("Download reported failure.")
                  
@@ -1,12 +1,8 @@
+from django.conf import settings
 from swim_backend.core.services.workflow.base import BaseStep
 from swim_backend.core.readiness import check_readiness
-
-from swim_backend.core.services.workflow.readiness_strategies import (
-    ReadinessStrategyRegistry,
-)
-from swim_backend.core.services.workflow.readiness_strategies.catalyst9300_strategy import (
-    Catalyst9300ReadinessStrategy,
-)  # noqa: F401
+from swim_backend.core.services.readiness_service import fresh_result, ui_checks
+from swim_backend.devices.models import ReadinessResult
 
 
 class ReadinessStep(BaseStep):
@@ -16,7 +12,24 @@ class ReadinessStep(BaseStep):
 
         self.log(f"Running Readiness Verification for {device.hostname}...")
 
+        image_size = job.image.size_bytes if job.image else 0
+        max_age = getattr(settings, "READINESS_RESULT_MAX_AGE", 900)
+        previous = fresh_result(device.id, image_size, max_age, ready_only=True)
+        if previous:
+            self.log(f"Device passed readiness checks at {previous.checked_at:%Y-%m-%d %H:%M:%S}, not checking again.")
+            return "success", "Readiness passed (recent result)"
+
         ready, checks = check_readiness(device, job)
+        target_version = job.image.version if job.image else None
+        ReadinessResult.objects.create(
+            device=device,
+            ready=ready,
+            target_version=target_version,
+            target_image_file=job.image.filename if job.image else None,
+            target_image_size=image_size or 0,
+            checks=ui_checks(checks, target_version),
+            raw_results=checks,
+        )
 
         if ready:
             self.log("Device is READY for upgrade.")
@@ -1,4 +1,6 @@
 from swim_backend.core.services.workflow.base import BaseStep
+from swim_backend.core.services.show_version_parser import parse_show_version
+from swim_backend.core.services.device_facts import record_show_version
 from genie.conf.base.device import Device as GenieDevice
 import time
 
@@ -57,9 +59,10 @@ class VerificationStep(BaseStep):
                 connection_timeout=60
             )
             
-            # Parse version using Genie
+            # Parse version (fast path, genie fallback)
             self.log("Retrieving current version info...")
-            output = genie_device.parse('show version')
+            output = parse_show_version(genie_device)
+            record_show_version(device.id, output)
             
             current_version = None
 
@@ -0,0 +1,149 @@
+"""
+Resolution of device-specific strategies (readiness, activation).
+
+Strategy classes register with a StrategyRegistry subclass. Registries
+discover their strategies explicitly by importing every module of their
+package (plus the modules listed in their plugin setting), so registration no
+longer depends on which modules happen to be imported first; `priority`
+decides the order in which strategies are tried (lower first).
+
+Registered classes are compiled once into entries with normalized model and
+platform sets and a parsed version interval. Resolution is keyed by a device
+signature (model, platform, version) and memoized with an LRU, so resolving a
+fleet costs one compilation plus one lookup per distinct signature. Strategies
+that override can_handle() are still asked per device.
+"""
+import importlib
+import logging
+import pkgutil
+from functools import lru_cache
+from django.conf import settings
+from swim_backend.core.services.version_parser import version_key
+
+logger = logging.getLogger(__name__)
+
+# Distinct device signatures remembered per registry
+RESOLUTION_CACHE_SIZE = 4096
+
+
+def device_signature(device):
+    model = device.model.name if device.model else None
+    return (
+        model.lower() if model else None,
+        device.platform.lower() if device.platform else None,
+        device.version or "0.0.0",
+    )
+
+
+class _Entry:
+    def __init__(self, strategy_class, base_class):
+        self.strategy_class = strategy_class
+        self.models = {m.lower() for m in strategy_class.supported_models} or None
+        self.platforms = {p.lower() for p in strategy_class.supported_platforms} or None
+        self.min_version = version_key(strategy_class.min_version) if strategy_class.min_version else None
+        self.max_version = version_key(strategy_class.max_version) if strategy_class.max_version else None
+        # Strategies with their own can_handle() are asked per device
+        self.dynamic = strategy_class.can_handle is not base_class.can_handle
+
+    def matches(self, model, platform, version):
+        if self.models is not None and model not in self.models:
+            return False
+        if self.platforms is not None and platform not in self.platforms:
+            return False
+        if self.min_version and version < self.min_version:
+            return False
+        if self.max_version and version > self.max_version:
+            return False
+        return True
+
+
+class StrategyRegistry:
+    """Base for strategy registries; subclasses set `package`, `base_class` and `plugins_setting`."""
+
+    package = None
+    base_class = None
+    plugins_setting = None
+    _strategies = []
+    _entries = None
+    _discovered = False
+
+    @classmethod
+    def register(cls, strategy_class):
+        if strategy_class not in cls._strategies:
+            cls._strategies.append(strategy_class)
+            cls._invalidate()
+        return strategy_class
+
+    @classmethod
+    def discover(cls):
+        """Imports every strategy module of the package and the configured plugin modules."""
+        if cls._discovered:
+            return
+        cls._discovered = True
+
+        package = importlib.import_module(cls.package)
+        modules = [f"{cls.package}.{name}" for _, name, _ in pkgutil.iter_modules(package.__path__)]
+        plugins = list(getattr(settings, cls.plugins_setting, None) or []) if cls.plugins_setting else []
+        for module in modules + plugins:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                logger.error(f"Could not load strategy module {module}: {e}")
+
+    @classmethod
+    def _invalidate(cls):
+        cls._entries = None
+        cls._candidates.cache_clear()
+
+    @classmethod
+    def entries(cls):
+        if cls._entries is None:
+            cls.discover()
+            ordered = sorted(cls._strategies, key=lambda s: getattr(s, "priority", 100))
+            cls._entries = [_Entry(s, cls.base_class) for s in ordered]
+        return cls._entries
+
+    @classmethod
+    @lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+    def _candidates(cls, signature):
+        """Entries that may handle devices with this signature, in resolution order."""
+        model, platform, version = signature
+        version = version_key(version)
+
+        candidates = []
+        for entry in cls.entries():
+            if entry.dynamic:
+                candidates.append(entry)
+            elif entry.matches(model, platform, version):
+                candidates.append(entry)
+                break
+        return tuple(candidates)
+
+    @classmethod
+    def resolve(cls, device):
+        """The strategy class for `device`, or None."""
+        for entry in cls._candidates(device_signature(device)):
+            if not entry.dynamic or entry.strategy_class(device, None, None).can_handle(device):
+                return entry.strategy_class
+        return None
+
+    @classmethod
+    def resolve_many(cls, devices):
+        """{device.id: strategy class or None} for many devices in one pass."""
+        return {device.id: cls.resolve(device) for device in devices}
+
+    @classmethod
+    def get_strategy(cls, device, job, logger=None):
+        strategy_class = cls.resolve(device)
+        return strategy_class(device, job, logger) if strategy_class else None
+
+    @classmethod
+    def list_strategies(cls):
+        return [entry.strategy_class for entry in cls.entries()]
+
+    @classmethod
+    def clear(cls):
+        """Clear all registered strategies (mainly for testing)."""
+        cls._strategies = []
+        cls._discovered = True
+        cls._invalidate()
@@ -0,0 +1,95 @@
+from unittest import mock
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import ActivityLog, AggregateGeneration, ChangeLogEntry, Job
+
+
+class AggregateCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser("admin", "a@example.com", "pw")
+        self.client.force_authenticate(self.admin)
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1", reachability="Reachable")
+
+    def get_stats(self):
+        response = self.client.get("/api/core/dashboard/stats/")
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_repeated_stats_are_served_from_cache(self):
+        first = self.get_stats()
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        # Only the generations are read, from the database every worker shares
+        with self.assertNumQueries(4):
+            second = self.get_stats()
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+    def test_writes_invalidate_dependent_aggregates(self):
+        self.get_stats()
+        Device.objects.create(hostname="sw2", ip_address="10.0.0.2")
+        response = self.get_stats()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["network"]["devices"], 2)
+
+        job = Job.objects.create(device=self.device)
+        self.assertEqual(self.get_stats()["X-Cache"], "MISS")
+        self.get_stats()
+
+        # Log appends do not change any aggregate
+        job.log += "line\n"
+        job.save(update_fields=["log"])
+        self.assertEqual(self.get_stats()["X-Cache"], "HIT")
+
+        # Bulk status updates bypass signals but are recorded
+        self.client.post("/api/core/jobs/bulk_reschedule/", {
+            "ids": [job.id], "distribution_time": "2030-01-01T00:00:00Z",
+        }, format="json")
+        response = self.get_stats()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["analytics"]["job_status"][1], {"name": "Scheduled", "value": 1})
+
+    def test_entries_are_keyed_by_permission_scope(self):
+        self.get_stats()
+        viewer = User.objects.create_user("viewer", password="pw")
+        viewer.user_permissions.add(Permission.objects.get(codename="view_dashboard"))
+        client = APIClient()
+        client.force_authenticate(viewer)
+
+        response = client.get("/api/core/dashboard/stats/")
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["network"]["devices"], 0)
+
+    def test_activity_summary_is_cached_per_user_and_hit_rate_is_reported(self):
+        self.client.get("/api/core/activity-logs/summary/")
+        self.assertEqual(self.client.get("/api/core/activity-logs/summary/")["X-Cache"], "HIT")
+        self.client.get("/api/core/dashboard/stats/")
+
+        stats = self.client.get("/api/core/dashboard/cache_stats/").data
+        self.assertEqual(stats["activity.summary"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+        self.assertEqual(stats["dashboard.stats"]["misses"], 1)
+        self.assertIsNone(stats["reports.summary"]["hit_rate"])
+
+    def test_generations_live_in_the_database(self):
+        self.client.get("/api/core/activity-logs/summary/")
+        ActivityLog.objects.create(user=self.admin, action="login")
+        self.assertEqual(AggregateGeneration.objects.get(data_type="activitylog").generation, 1)
+        self.assertEqual(self.client.get("/api/core/activity-logs/summary/")["X-Cache"], "MISS")
+
+        # A change made by another worker is seen through the change feed, not this worker's cache
+        self.get_stats()
+        ChangeLogEntry.objects.create(object_type="device", object_id=self.device.id)
+        self.assertEqual(self.get_stats()["X-Cache"], "MISS")
+
+    def test_not_cached_while_a_change_may_be_committing(self):
+        first, in_flight, last = [Device.objects.create(hostname=f"edge{i}", ip_address=f"10.0.1.{i}") for i in range(3)]
+        ChangeLogEntry.objects.filter(object_type="device", object_id=in_flight.id).delete()
+        with mock.patch("swim_backend.core.services.commit_horizon._gap_settled", return_value=False):
+            self.get_stats()
+            self.assertEqual(self.get_stats()["X-Cache"], "MISS")
@@ -0,0 +1,103 @@
+import threading
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import ChangeLogEntry, Job
+from swim_backend.core.services.change_feed import changes_since, latest_sequence, wait_for_changes
+from swim_backend.core.services.diff_service import log_update
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+
+    def test_only_changes_after_the_cursor_are_returned(self):
+        cursor = self.client.get("/api/core/changes/").data["cursor"]
+        job = Job.objects.create(device=self.device)
+        job.status = "running"
+        job.save()
+        other = Job.objects.create(device=self.device)
+        other_id = other.id
+        other.delete()
+
+        data = self.client.get("/api/core/changes/", {"since": cursor, "types": "job"}).data
+
+        self.assertEqual([j["status"] for j in data["changes"]["job"]["updated"]], ["running"])
+        self.assertEqual(data["changes"]["job"]["deleted"], [other_id])
+        self.assertNotIn("log", data["changes"]["job"]["updated"][0])
+
+        again = self.client.get("/api/core/changes/", {"since": data["cursor"], "types": "job"}).data
+        self.assertEqual(again["changes"], {})
+        self.assertEqual(again["cursor"], data["cursor"])
+
+    def test_bulk_writes_are_recorded(self):
+        cursor = latest_sequence()
+        Job.objects.create(device=self.device)
+        self.client.post("/api/core/jobs/bulk_reschedule/", {
+            "ids": list(Job.objects.values_list("id", flat=True)),
+            "distribution_time": "2030-01-01T00:00:00Z",
+        }, format="json")
+
+        changes = changes_since(cursor, ["job", "device"])["changes"]
+        self.assertEqual(list(changes), ["job"])
+
+    def test_pruned_cursor_asks_for_a_reload(self):
+        Job.objects.create(device=self.device)
+        ChangeLogEntry.objects.filter(id__lte=latest_sequence() - 1).delete()
+        self.assertTrue(changes_since(0, ["job"])["reset"])
+
+    def test_unchanged_lists_answer_304(self):
+        Job.objects.create(device=self.device)
+        response = self.client.get("/api/core/jobs/")
+        etag = response["ETag"]
+
+        self.assertEqual(self.client.get("/api/core/jobs/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get("/api/dcim/devices/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Job.objects.create(device=self.device)
+        self.assertEqual(self.client.get("/api/core/jobs/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_log_lines_are_not_changes(self):
+        job = Job.objects.create(device=self.device)
+        etag = self.client.get("/api/core/jobs/")["ETag"]
+        cursor = latest_sequence()
+
+        log_update(job.id, "Copying image...")
+
+        self.assertEqual(latest_sequence(), cursor)
+        self.assertEqual(self.client.get("/api/core/jobs/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_cursor_waits_for_entries_still_committing(self):
+        cursor = latest_sequence()
+        first, in_flight, last = [Job.objects.create(device=self.device) for _ in range(3)]
+        # An entry with a lower id whose transaction has not committed yet
+        ChangeLogEntry.objects.filter(object_id=in_flight.id).delete()
+
+        with mock.patch("swim_backend.core.services.commit_horizon._gap_settled", return_value=False):
+            result = changes_since(cursor, ["job"])
+            self.assertEqual(result["changes"]["job"]["updated"], [first.id])
+            self.assertEqual(self.client.get("/api/core/changes/").data["cursor"], result["cursor"])
+            self.assertNotIn("ETag", self.client.get("/api/core/jobs/"))
+
+        # Rolled back after all: the cursor moves on
+        result = changes_since(result["cursor"], ["job"])
+        self.assertEqual(result["changes"]["job"]["updated"], [last.id])
+        self.assertEqual(result["cursor"], latest_sequence())
+
+
+class LongPollTests(TransactionTestCase):
+    def test_wait_returns_when_something_changes(self):
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        cursor = latest_sequence()
+        timer = threading.Timer(0.2, lambda: Job.objects.create(device=device))
+        timer.start()
+
+        result = wait_for_changes(cursor, ["job"], timeout=5)
+
+        timer.join()
+        self.assertEqual(len(result["changes"]["job"]["updated"]), 1)
+        self.assertEqual(wait_for_changes(result["cursor"], ["job"], timeout=0.1)["changes"], {})
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, DeviceModel
+from swim_backend.images.models import Image
+from swim_backend.core.services.compliance_service import refresh_compliance
+
+
+class ComplianceTests(TestCase):
+    def setUp(self):
+        self.model = DeviceModel.objects.create(name="Catalyst 9300", golden_image_version="17.9.4")
+
+    def device(self, hostname, version, model=None):
+        return Device.objects.create(
+            hostname=hostname, ip_address="10.0.0.1", version=version, model=model or self.model
+        )
+
+    def status(self, device):
+        return Device.objects.get(id=device.id).compliance_status
+
+    def test_status_is_stored_on_save(self):
+        old = self.device("old", "16.12.4")
+        self.assertEqual(self.status(old), "Non-Compliant")
+        self.assertEqual(self.status(self.device("new", "17.12.1")), "Ahead")
+        self.assertEqual(self.status(Device.objects.create(hostname="bare", ip_address="10.0.0.2")), "No Standard")
+
+        old.version = "17.09.04"
+        old.save(update_fields=["version"])
+        self.assertEqual(self.status(old), "Compliant")
+
+    def test_golden_image_changes_are_propagated(self):
+        device = self.device("sw1", "17.9.4")
+        image = Image.objects.create(filename="cat9k.17.12.1.bin", version="17.12.1")
+
+        self.model.default_image = image
+        self.model.save()
+        self.assertEqual(self.status(device), "Non-Compliant")
+
+        image.version = "17.9.4"
+        image.save()
+        self.assertEqual(self.status(device), "Compliant")
+
+        image.delete()
+        self.assertEqual(self.status(device), "Compliant")  # back to golden_image_version
+
+    def test_refresh_only_writes_changed_devices(self):
+        devices = [self.device(f"sw{i}", "17.9.4") for i in range(5)]
+        Device.objects.filter(id=devices[0].id).update(compliance_status="No Standard")
+
+        self.assertEqual(refresh_compliance(Device.objects.all()), 1)
+        self.assertEqual(self.status(devices[0]), "Compliant")
+
+    def test_list_filter_and_dashboard(self):
+        self.device("sw1", "17.9.4")
+        self.device("sw2", "16.12.4")
+        Device.objects.create(hostname="sw3", ip_address="10.0.0.3")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+        response = client.get("/api/dcim/devices/", {"compliance_status": "Compliant"})
+        hostnames = [d["hostname"] for d in response.data.get("results", response.data)]
+        self.assertEqual(hostnames, ["sw1"])
+
+        compliance = client.get("/api/core/dashboard/stats/").data["analytics"]["compliance"]
+        self.assertEqual(
+            compliance,
+            [
+                {"name": "Compliant", "value": 1},
+                {"name": "Ahead", "value": 0},
+                {"name": "Non-Compliant", "value": 2},
+            ],
+        )
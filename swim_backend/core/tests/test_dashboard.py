@@ -1,6 +1,7 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 from rest_framework.test import APIClient
-from swim_backend.devices.models import Device
+from swim_backend.devices.models import Device, Site
 from swim_backend.core.models import Job
 from django.utils import timezone
 import datetime
@@ -8,15 +9,16 @@ import datetime
 class DashboardTests(TestCase):
     def setUp(self):
         self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
         # Create some devices
-        self.dev1 = Device.objects.create(hostname="dev1", ip_address="1.1.1.1", reachability='Reachable', site='SiteA')
-        self.dev2 = Device.objects.create(hostname="dev2", ip_address="1.1.1.2", reachability='Unreachable', site='SiteB')
+        self.dev1 = Device.objects.create(hostname="dev1", ip_address="1.1.1.1", reachability='Reachable', site=Site.objects.create(name='SiteA'))
+        self.dev2 = Device.objects.create(hostname="dev2", ip_address="1.1.1.2", reachability='Unreachable', site=Site.objects.create(name='SiteB'))
         
         # Create a failed job
         Job.objects.create(device=self.dev1, status='failed')
         
     def test_stats_api(self):
-        response = self.client.get('/api/dashboard/stats/')
+        response = self.client.get('/api/core/dashboard/stats/')
         self.assertEqual(response.status_code, 200)
         data = response.data
         
@@ -0,0 +1,147 @@
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from swim_backend.devices.models import Device, DeviceModel
+from swim_backend.images.models import Image
+from swim_backend.core.models import Job
+from swim_backend.core.services import device_facts, sync_service
+from swim_backend.core.services.workflow.activation_strategies import ActivationStrategyRegistry
+from swim_backend.core.services.workflow.readiness_strategies.base import BaseReadinessStrategy
+from swim_backend.core.services.workflow.steps.activation import ActivationStep
+from swim_backend.core.services.device_facts import (
+    get_facts, invalidate_facts, record_facts, record_show_version, uptime_seconds,
+)
+
+SHOW_VERSION = {
+    'version': {
+        'hostname': 'sw1',
+        'version': '17.09.04a',
+        'chassis': 'C9300',
+        'system_image': 'flash:packages.conf',
+        'install_mode': 'INSTALL',
+        'uptime': '2 days, 3 hours, 10 minutes',
+    }
+}
+
+
+class DeviceFactsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_uptime_seconds(self):
+        self.assertEqual(uptime_seconds('1 week, 2 days, 3 hours, 4 minutes'), 9 * 86400 + 3 * 3600 + 240)
+        self.assertIsNone(uptime_seconds(''))
+
+    def test_facts_respect_max_age(self):
+        record_show_version(1, SHOW_VERSION)
+
+        self.assertEqual(get_facts(1, ['version', 'install_mode'], 60), {'version': '17.09.04a', 'install_mode': 'INSTALL'})
+        self.assertIsNone(get_facts(1, ['flash_free_bytes'], 60))
+        self.assertIsNone(get_facts(1, ['version'], None))
+
+        with mock.patch.object(device_facts.time, 'time', return_value=time.time() + 120):
+            self.assertIsNone(get_facts(1, ['version'], 60))
+            self.assertIsNotNone(get_facts(1, ['version'], 300))
+
+    def test_reload_drops_older_facts(self):
+        record_show_version(1, SHOW_VERSION)
+        record_facts(1, flash_free_bytes=10**9)
+
+        rebooted = {'version': dict(SHOW_VERSION['version'], uptime='2 minutes')}
+        record_show_version(1, rebooted)
+
+        self.assertIsNone(get_facts(1, ['flash_free_bytes'], 60))
+        self.assertIsNotNone(get_facts(1, ['version'], 60))
+
+    def test_invalidate(self):
+        record_show_version(1, SHOW_VERSION)
+        record_facts(1, flash_free_bytes=10**9)
+
+        invalidate_facts(1, ['flash_free_bytes'])
+        self.assertIsNone(get_facts(1, ['flash_free_bytes'], 60))
+        self.assertIsNotNone(get_facts(1, ['version'], 60))
+
+        invalidate_facts(1, keep=['install_mode'])
+        self.assertIsNone(get_facts(1, ['version'], 60))
+        self.assertIsNotNone(get_facts(1, ['install_mode'], 60))
+
+        invalidate_facts(1)
+        self.assertIsNone(get_facts(1, ['install_mode'], 60))
+
+
+class FlashFactsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        image = Image.objects.create(filename="img.bin", version="17.9.4a", size_bytes=100 * 1024 * 1024)
+        self.strategy = BaseReadinessStrategy(device, Job.objects.create(device=device, image=image))
+        self.dev = mock.Mock()
+        self.dev.parse.return_value = {'file_systems': {1: {'prefixes': 'flash:', 'free_size': 10**9}}}
+
+    def test_passing_free_flash_is_reused(self):
+        record_facts(self.strategy.device.id, flash_free_bytes=10**9)
+
+        self.assertEqual(self.strategy.check_flash(self.dev)['status'], 'success')
+        self.dev.parse.assert_not_called()
+
+    def test_failing_free_flash_is_read_again(self):
+        record_facts(self.strategy.device.id, flash_free_bytes=10**6)
+
+        self.assertEqual(self.strategy.check_flash(self.dev)['status'], 'success')
+        self.dev.parse.assert_called_once_with("show file systems")
+
+
+class ActivationFactsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        steps = [{"step_type": "readiness", "status": "success"}, {"step_type": "distribution", "status": "success"}]
+        self.job = Job.objects.create(device=device, steps=steps, activate_after_distribute=True)
+
+    def test_install_mode_is_known_during_activation_only(self):
+        record_show_version(self.job.device_id, SHOW_VERSION)
+        seen = {}
+
+        def execute(genie_device):
+            seen['install_mode'] = get_facts(self.job.device_id, ['install_mode'], 60)
+            seen['version'] = get_facts(self.job.device_id, ['version'], 60)
+            return 'success', 'Activated'
+
+        strategy = mock.Mock(execute=execute)
+        strategy.get_credentials.return_value = ('u', 'p', None)
+        with mock.patch.object(ActivationStrategyRegistry, 'get_strategy', return_value=strategy):
+            self.assertEqual(ActivationStep(self.job.id).execute(), ('success', 'Activated'))
+
+        self.assertEqual(seen, {'install_mode': {'install_mode': 'INSTALL'}, 'version': None})
+        self.assertIsNone(get_facts(self.job.device_id, ['install_mode'], 60))
+
+
+class SyncWithCachedFactsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sync_service._device_models.clear()
+        DeviceModel.objects.create(name="C9300")
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+
+    @mock.patch("swim_backend.core.services.sync_service.create_genie_device")
+    def test_fresh_facts_skip_the_login(self, create_genie_device):
+        record_show_version(self.device.id, SHOW_VERSION)
+
+        result = sync_service.sync_device_details(self.device.id, max_facts_age=300)
+
+        create_genie_device.assert_not_called()
+        self.assertEqual(result["status"], "success")
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.version, "17.09.04a")
+        self.assertEqual(self.device.model.name, "C9300")
+
+    @mock.patch("swim_backend.core.services.sync_service.create_genie_device")
+    def test_without_max_age_the_device_is_asked(self, create_genie_device):
+        record_show_version(self.device.id, SHOW_VERSION)
+        create_genie_device.side_effect = Exception("unreachable")
+
+        result = sync_service.sync_device_details(self.device.id)
+
+        create_genie_device.assert_called_once()
+        self.assertEqual(result["status"], "failed")
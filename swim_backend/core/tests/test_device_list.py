@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, DeviceModel, Site
+from swim_backend.images.models import Image
+
+
+class DeviceListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+        golden = Image.objects.create(filename="cat9k.17.09.04a.bin", version="17.09.04a")
+        self.models = []
+        for name in ("Catalyst 9300", "C9300"):
+            model = DeviceModel.objects.create(name=name, default_image=golden)
+            model.supported_images.add(golden, Image.objects.create(filename=f"{name}.bin", version="17.12.1"))
+            self.models.append(model)
+        self.models.append(DeviceModel.objects.create(name="Catalyst 9200", golden_image_version="17.9.4"))
+        self.sites = [Site.objects.create(name=f"Site{i}") for i in range(3)]
+
+    def add_devices(self, count):
+        start = Device.objects.count()
+        for i in range(start, start + count):
+            Device.objects.create(
+                hostname=f"sw{i:03d}",
+                ip_address=f"10.0.{i // 250}.{i % 250 + 1}",
+                model=self.models[i % len(self.models)],
+                site=self.sites[i % len(self.sites)],
+                version="17.9.4",
+            )
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/dcim/devices/")
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data["results"]
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.add_devices(6)
+        small, _ = self.list_queries()
+
+        self.add_devices(60)
+        large, results = self.list_queries()
+
+        self.assertEqual(large, small)
+        self.assertEqual(len(results), 66)
+
+    def test_golden_image_options(self):
+        self.add_devices(3)
+        _, results = self.list_queries()
+        by_host = {d["hostname"]: d["golden_image"] for d in results}
+
+        self.assertEqual(
+            [(o["version"], o["tag"]) for o in by_host["sw000"]["available_images"]],
+            [("17.09.04a", "Default"), ("17.12.1", "Supported")],
+        )
+        self.assertEqual(by_host["sw002"], {
+            "version": "17.9.4", "file": None, "is_new_model": False, "available_images": [],
+        })
+        self.assertEqual(by_host["sw000"]["id"], by_host["sw001"]["id"])
@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import Event, Job
+from swim_backend.core.services.event_bus import events_since, latest_event_id, wait_for_events
+from swim_backend.core.services.sync_service import persist_sync_results
+
+
+class EventBusTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1", reachability="Reachable")
+
+    def test_job_status_transitions_are_published(self):
+        cursor = latest_event_id()
+        job = Job.objects.create(device=self.device)
+        job.log += "no status change\n"
+        job.save(update_fields=["log"])
+        job.status = "distributing"
+        job.save()
+
+        events = events_since(cursor, ["job"])["events"]
+        self.assertEqual(
+            [(e["payload"]["status"], e["payload"]["previous"]) for e in events],
+            [("pending", None), ("distributing", "pending")],
+        )
+        self.assertEqual(events[0]["payload"]["device"], self.device.id)
+
+    def test_bulk_status_updates_are_published(self):
+        job = Job.objects.create(device=self.device)
+        cursor = latest_event_id()
+        self.client.post("/api/core/jobs/bulk_reschedule/", {
+            "ids": [job.id], "distribution_time": "2030-01-01T00:00:00Z",
+        }, format="json")
+
+        events = events_since(cursor, ["job.status"])["events"]
+        self.assertEqual([(e["payload"]["job"], e["payload"]["status"]) for e in events], [(job.id, "scheduled")])
+
+    def test_sync_publishes_reachability_changes(self):
+        other = Device.objects.create(hostname="sw2", ip_address="10.0.0.2", reachability="Unreachable")
+        cursor = latest_event_id()
+        persist_sync_results([
+            {"device_id": self.device.id, "status": "failed", "error": "timeout", "facts": {}},
+            {"device_id": other.id, "status": "failed", "error": "timeout", "facts": {}},
+        ])
+
+        events = events_since(cursor, ["device"])["events"]
+        self.assertEqual([e["payload"]["device"] for e in events], [self.device.id])
+        self.assertEqual(events[0]["payload"]["reachability"], "Unreachable")
+        self.assertEqual(events[0]["payload"]["previous"], "Reachable")
+
+    def test_events_endpoint_filters_by_type_and_cursor(self):
+        cursor = self.client.get("/api/core/events/").data["cursor"]
+        job = Job.objects.create(device=self.device)
+        self.device.reachability = "Unreachable"
+        self.device.save()
+
+        data = self.client.get("/api/core/events/", {"since": cursor, "types": "device"}).data
+        self.assertEqual([e["type"] for e in data["events"]], ["device.reachability"])
+
+        data = self.client.get("/api/core/events/", {"since": cursor}).data
+        self.assertEqual([e["type"] for e in data["events"]], ["job.status", "device.reachability"])
+        self.assertEqual(data["events"][0]["payload"]["job"], job.id)
+
+        again = self.client.get("/api/core/events/", {"since": data["cursor"]}).data
+        self.assertEqual(again["events"], [])
+        self.assertEqual(self.client.get("/api/core/events/", {"types": "bogus"}).status_code, 400)
+
+    def test_pruned_cursor_is_reset(self):
+        first, _, last = [Event.objects.create(event_type="job.status", payload={}) for _ in range(3)]
+        self.assertFalse(events_since(first.id, ["job"])["reset"])
+
+        Event.objects.filter(id__lt=last.id).delete()
+        self.assertTrue(events_since(first.id, ["job"])["reset"])
+        self.assertFalse(events_since(0, ["job"])["reset"])
+
+    def test_cursor_waits_for_events_still_committing(self):
+        cursor = latest_event_id()
+        first, in_flight, last = [Event.objects.create(event_type="job.status", payload={}) for _ in range(3)]
+        in_flight.delete()
+
+        with mock.patch("swim_backend.core.services.commit_horizon._gap_settled", return_value=False):
+            result = events_since(cursor, ["job"])
+            self.assertEqual([e["id"] for e in result["events"]], [first.id])
+            self.assertEqual(result["cursor"], first.id)
+            self.assertEqual(self.client.get("/api/core/events/").data["cursor"], first.id)
+
+        result = events_since(result["cursor"], ["job"])
+        self.assertEqual([e["id"] for e in result["events"]], [last.id])
+
+    @override_settings(SSE_MAX_STREAMS=0)
+    def test_stream_is_refused_when_no_slot_is_free(self):
+        response = self.client.get("/api/core/events/stream/", HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+
+
+class EventWaitTests(TransactionTestCase):
+    def test_wait_returns_when_an_event_is_published(self):
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        cursor = latest_event_id()
+        timer = threading.Timer(0.2, lambda: Job.objects.create(device=device))
+        timer.start()
+
+        result = wait_for_events(cursor, ["job"], timeout=5)
+
+        timer.join()
+        self.assertEqual([e["type"] for e in result["events"]], ["job.status"])
+
+    def test_stream_sends_events_after_last_event_id(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        cursor = latest_event_id()
+        job = Job.objects.create(device=device)
+
+        response = client.get(
+            "/api/core/events/stream/?types=job", HTTP_ACCEPT="text/event-stream", HTTP_LAST_EVENT_ID=str(cursor)
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks), b"retry: 3000\n\n")
+        message = next(chunks).decode()
+        response.close()
+
+        self.assertIn(f'"job": {job.id}', message)
+        self.assertTrue(message.startswith(f"id: {latest_event_id()}\n"))
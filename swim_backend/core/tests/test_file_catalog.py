@@ -0,0 +1,87 @@
+from unittest import mock
+from django.test import TestCase
+from swim_backend.images.models import FileServer, FileServerEntry
+from swim_backend.core.services.filesystem_service import FileSystemService
+from swim_backend.core.services.file_catalog_service import catalog_files, refresh_directory
+
+MD5 = "5d41402abc4b2a76b9719d911017c592"
+
+
+def listing(files, not_modified=False):
+    return {'not_modified': not_modified, 'etag': '"v1"', 'last_modified': '', 'files': files}
+
+
+class FileCatalogTests(TestCase):
+    def setUp(self):
+        self.server = FileServer.objects.create(name="http", protocol="http", address="10.0.0.1", port=80)
+        self.image = {
+            'size': 1024, 'modified': None, 'etag': '"a"',
+            'sidecars': {'md5': 'cat9k_iosxe.17.09.04a.SPA.bin.md5'},
+        }
+
+    @mock.patch.object(FileSystemService, 'read_file', return_value=f"{MD5}  cat9k_iosxe.17.09.04a.SPA.bin\n")
+    @mock.patch.object(FileSystemService, 'list_directory')
+    def test_first_lookup_lists_and_reads_sidecars(self, list_directory, read_file):
+        list_directory.return_value = listing({'cat9k_iosxe.17.09.04a.SPA.bin': self.image})
+
+        directory, files = catalog_files(self.server, "/images/")
+
+        self.assertEqual(directory.path, "/images")
+        self.assertEqual(files[0]['version'], "17.09.04a")
+        self.assertEqual(files[0]['size'], 1024)
+        self.assertEqual(files[0]['md5'], MD5)
+
+        # Fresh catalog entries are served without touching the server
+        catalog_files(self.server, "images")
+        self.assertEqual(list_directory.call_count, 1)
+
+    @mock.patch.object(FileSystemService, 'read_file', return_value=MD5)
+    @mock.patch.object(FileSystemService, 'list_directory')
+    def test_refresh_is_incremental(self, list_directory, read_file):
+        list_directory.return_value = listing({'cat9k_iosxe.17.09.04a.SPA.bin': self.image})
+        refresh_directory(self.server, "/images")
+
+        # Unchanged file: sidecar is not read again
+        list_directory.return_value = listing({'cat9k_iosxe.17.09.04a.SPA.bin': self.image})
+        refresh_directory(self.server, "/images")
+        self.assertEqual(read_file.call_count, 1)
+        self.assertEqual(list_directory.call_args.kwargs['etag'], '"v1"')
+
+        # Removed file disappears from the catalog
+        list_directory.return_value = listing({})
+        refresh_directory(self.server, "/images")
+        self.assertFalse(FileServerEntry.objects.exists())
+
+    @mock.patch.object(FileSystemService, 'list_directory')
+    def test_concurrent_refresh_does_not_conflict(self, list_directory):
+        list_directory.return_value = listing({'img.17.3.1.bin': dict(self.image, sidecars={})})
+        bulk_create = FileServerEntry.objects.bulk_create
+
+        def insert_after_another_refresh(entries, **kwargs):
+            # The other refresh of the same directory inserts its entries first
+            bulk_create([FileServerEntry(directory=entry.directory, filename=entry.filename) for entry in entries])
+            return bulk_create(entries, **kwargs)
+
+        with mock.patch.object(FileServerEntry.objects, 'bulk_create', side_effect=insert_after_another_refresh):
+            directory = refresh_directory(self.server, "/images")
+
+        self.assertEqual(directory.status, 'ok')
+        self.assertEqual(FileServerEntry.objects.count(), 1)
+
+    @mock.patch.object(FileSystemService, 'list_directory')
+    def test_not_modified_keeps_entries(self, list_directory):
+        list_directory.return_value = listing({'img.17.3.1.bin': dict(self.image, sidecars={})})
+        refresh_directory(self.server, "/images")
+
+        list_directory.return_value = listing({}, not_modified=True)
+        refresh_directory(self.server, "/images")
+        self.assertEqual(FileServerEntry.objects.count(), 1)
+
+    def test_sidecars_are_matched_to_images(self):
+        files = FileSystemService._collect([
+            ('a.17.1.1.bin', 10, None, ''),
+            ('a.17.1.1.bin.sha512', None, None, ''),
+            ('readme.txt', 5, None, ''),
+        ])
+        self.assertEqual(list(files), ['a.17.1.1.bin'])
+        self.assertEqual(files['a.17.1.1.bin']['sidecars'], {'sha512': 'a.17.1.1.bin.sha512'})
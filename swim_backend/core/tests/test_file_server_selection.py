@@ -0,0 +1,84 @@
+from unittest import mock
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from swim_backend.devices.models import Device, Site
+from swim_backend.images.models import FileServer, FileServerStats, Image, ImageReplica
+from swim_backend.core.services.file_server_selector import (
+    probe_file_server, rank_file_servers, record_failure, record_transfer,
+)
+
+
+class FileServerSelectionTests(TestCase):
+    def setUp(self):
+        self.slow = FileServer.objects.create(name="slow", protocol="http", address="10.0.0.1", port=80)
+        self.fast = FileServer.objects.create(name="fast", protocol="http", address="10.0.0.2", port=80)
+        self.default = FileServer.objects.create(
+            name="default", protocol="http", address="10.0.0.3", port=80, is_global_default=True
+        )
+        self.site = Site.objects.create(name="SiteA", preferred_file_server=self.fast)
+        self.device = Device.objects.create(
+            hostname="dev1", ip_address="1.1.1.1", site=self.site, preferred_file_server=self.slow
+        )
+        self.image = Image.objects.create(filename="img.bin", version="17.9.4a", size_bytes=1024 ** 3)
+
+    def test_static_order_without_measurements(self):
+        chain = rank_file_servers(self.device, image=self.image)
+        self.assertEqual([fs for fs, _, _ in chain], [self.slow, self.fast, self.default])
+
+    def test_ranked_by_measured_throughput(self):
+        FileServerStats.objects.create(file_server=self.slow, site=self.site, throughput_bps=1024 ** 2)
+        FileServerStats.objects.create(file_server=self.fast, site=self.site, throughput_bps=100 * 1024 ** 2)
+
+        chain = rank_file_servers(self.device, image=self.image)
+        self.assertEqual(chain[0][0], self.fast)
+        self.assertEqual(chain[-1][0], self.slow)
+
+    def test_pinned_server_stays_first(self):
+        FileServerStats.objects.create(file_server=self.fast, site=self.site, throughput_bps=100 * 1024 ** 2)
+
+        chain = rank_file_servers(self.device, image=self.image, pinned=self.default)
+        self.assertEqual(chain[0][0], self.default)
+        self.assertEqual(chain[0][1], "Manual Assignment")
+        self.assertEqual(len(chain), 3)
+
+    def test_unreachable_server_is_last_resort(self):
+        FileServerStats.objects.create(file_server=self.slow, site=None, last_probe_ok=False)
+
+        chain = rank_file_servers(self.device, image=self.image)
+        self.assertEqual(chain[-1][0], self.slow)
+
+    def test_record_transfer_smooths_throughput(self):
+        record_transfer(self.fast, self.site, 100 * 1024 ** 2, 10)
+        record_transfer(self.fast, self.site, 100 * 1024 ** 2, 20)
+
+        stats = FileServerStats.objects.get(file_server=self.fast, site=self.site)
+        self.assertEqual(stats.transfer_count, 2)
+        self.assertLess(stats.throughput_bps, 10 * 1024 ** 2)
+        self.assertGreater(stats.throughput_bps, 5 * 1024 ** 2)
+
+    def test_tracked_image_skips_servers_without_verified_replica(self):
+        ImageReplica.objects.create(image=self.image, file_server=self.fast, status='verified')
+        ImageReplica.objects.create(image=self.image, file_server=self.slow, status='failed')
+
+        chain = rank_file_servers(self.device, image=self.image)
+        self.assertEqual([fs for fs, _, _ in chain], [self.fast])
+
+    def test_verified_replicas_extend_failover_chain(self):
+        other = FileServer.objects.create(name="other", protocol="http", address="10.0.0.4", port=80)
+        ImageReplica.objects.create(image=self.image, file_server=self.fast, status='verified')
+        ImageReplica.objects.create(image=self.image, file_server=other, status='verified')
+
+        chain = rank_file_servers(self.device, image=self.image)
+        self.assertEqual([(fs, source) for fs, source, _ in chain][-1], (other, "Verified Replica"))
+
+    def test_one_server_wide_stats_row_per_server(self):
+        FileServerStats.objects.create(file_server=self.slow, site=None)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FileServerStats.objects.create(file_server=self.slow, site=None)
+
+        with mock.patch("socket.create_connection", side_effect=OSError("refused")):
+            probe_file_server(self.slow)
+        record_failure(self.slow, None)
+
+        stats = FileServerStats.objects.get(file_server=self.slow, site=None)
+        self.assertEqual((stats.last_probe_ok, stats.failure_count), (False, 1))
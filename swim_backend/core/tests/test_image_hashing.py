@@ -0,0 +1,56 @@
+import hashlib
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from swim_backend.images.models import Image
+from swim_backend.core.services.image_service import verify_image
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = b"swim" * 1000
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageHashingTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def create_image(self):
+        image = Image(version="17.9.4a")
+        image.file.save("hash.bin", ContentFile(CONTENT), save=False)
+        image.save()
+        return image
+
+    def test_digests_computed_on_upload(self):
+        image = self.create_image()
+        self.assertEqual(image.size_bytes, len(CONTENT))
+        self.assertEqual(image.md5_checksum, hashlib.md5(CONTENT).hexdigest())
+        self.assertEqual(image.sha512_checksum, hashlib.sha512(CONTENT).hexdigest())
+
+    def test_metadata_save_skips_rehash(self):
+        image = Image.objects.get(pk=self.create_image().pk)
+        with mock.patch('swim_backend.images.models.compute_file_digests') as digests:
+            image.version = "17.9.5"
+            image.save()
+        digests.assert_not_called()
+
+    def test_swapped_file_is_rehashed(self):
+        image = Image.objects.get(pk=self.create_image().pk)
+        other = b"other" * 100
+        name = image.file.storage.save("other.bin", ContentFile(other))
+
+        image.file.name = name
+        image.save()
+
+        self.assertEqual(image.size_bytes, len(other))
+        self.assertEqual(image.sha512_checksum, hashlib.sha512(other).hexdigest())
+
+    def test_verify_detects_mismatch(self):
+        image = self.create_image()
+        self.assertEqual(verify_image(image.id), 'verified')
+
+        Image.objects.filter(pk=image.pk).update(md5_checksum='0' * 32)
+        self.assertEqual(verify_image(image.id), 'mismatch')
@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from swim_backend.images.models import Image, ImageAccessToken
+from swim_backend.images.serve_views import max_connections, parse_range
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageServingTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.image = Image(version="17.9.4a")
+        self.image.file.save("test.bin", ContentFile(b"0123456789" * 10), save=False)
+        self.image.save()
+        self.token = ImageAccessToken.objects.create(image=self.image)
+        self.url = f"/api/images/serve/{self.token.token}/{self.image.filename}"
+
+    def read(self, response):
+        content = b"".join(response.streaming_content)
+        response.close()
+        return content
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(self.read(response), b"0123456789" * 10)
+
+    def test_range_download(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/100")
+        self.assertEqual(self.read(response), b"0123456789")
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=200-")
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(GUNICORN_THREADS=8, SSE_MAX_STREAMS=4, IMAGE_SERVE_RESERVED_THREADS=3)
+    def test_downloads_leave_threads_for_streams_and_the_api(self):
+        self.assertEqual(max_connections(), 1)
+
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 503)
+        self.assertEqual(second["Retry-After"], "30")
+        self.read(first)
+
+    @override_settings(GUNICORN_THREADS=64, IMAGE_SERVE_MAX_CONNECTIONS=20)
+    def test_configured_limit_applies_with_spare_threads(self):
+        self.assertEqual(max_connections(), 20)
+
+    def test_invalid_token(self):
+        response = self.client.get(f"/api/images/serve/nope/{self.image.filename}")
+        self.assertEqual(response.status_code, 404)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-", 100), (0, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=90-200", 100), (90, 99))
+        self.assertIsNone(parse_range("items=0-1", 100))
+        self.assertEqual(parse_range("bytes=100-", 100), 'invalid')
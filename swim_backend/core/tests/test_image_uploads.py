@@ -0,0 +1,106 @@
+import os
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from swim_backend.images.models import Image, ImageUpload
+from swim_backend.core.services import image_service
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = bytes(range(256)) * 64
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ChunkedUploadTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        response = self.client.post('/api/images/uploads/', {
+            'filename': 'cat9k.bin',
+            'version': '17.9.4a',
+            'total_size': len(CONTENT),
+            'expected_md5': hashlib.md5(CONTENT).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.upload_id = response.data['id']
+
+    def put_chunk(self, start, end):
+        return self.client.put(
+            f'/api/images/uploads/{self.upload_id}/chunk/?offset={start}',
+            data=CONTENT[start:end], content_type='application/octet-stream'
+        )
+
+    def test_out_of_order_chunks_assemble(self):
+        half = len(CONTENT) // 2
+        response = self.put_chunk(half, len(CONTENT))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['missing_ranges'], [[0, half]])
+        self.assertEqual(response.data['hashed_bytes'], 0)
+
+        response = self.put_chunk(0, half)
+        self.assertEqual(response.data['progress'], 100.0)
+
+        response = self.client.post(f'/api/images/uploads/{self.upload_id}/finalize/')
+        self.assertEqual(response.status_code, 201)
+
+        image = Image.objects.get(pk=response.data['id'])
+        self.assertEqual(image.size_bytes, len(CONTENT))
+        self.assertEqual(image.sha512_checksum, hashlib.sha512(CONTENT).hexdigest())
+        with image.file.open('rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertEqual(ImageUpload.objects.get(pk=self.upload_id).status, 'complete')
+
+    def test_finalize_rejects_incomplete_upload(self):
+        self.put_chunk(0, 100)
+        response = self.client.post(f'/api/images/uploads/{self.upload_id}/finalize/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_chunk_outside_upload_rejected(self):
+        response = self.client.put(
+            f'/api/images/uploads/{self.upload_id}/chunk/?offset={len(CONTENT)}',
+            data=b'x', content_type='application/octet-stream'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_second_finalize_is_rejected(self):
+        self.put_chunk(0, len(CONTENT))
+        # Another request has claimed the upload
+        ImageUpload.objects.filter(pk=self.upload_id).update(status='finalizing')
+
+        response = self.client.post(f'/api/images/uploads/{self.upload_id}/finalize/')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(os.path.exists(ImageUpload.objects.get(pk=self.upload_id).part_path))
+
+    def test_filename_is_sanitized(self):
+        response = self.client.post('/api/images/uploads/', {
+            'filename': "../cat9k 'x'.bin", 'version': '17.9.4a', 'total_size': 10,
+        }, format='json')
+        self.assertEqual(response.data['filename'], 'cat9k_x.bin')
+
+        response = self.client.post('/api/images/uploads/', {
+            'filename': '..', 'version': '17.9.4a', 'total_size': 10,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_abandoned_uploads_expire(self):
+        self.put_chunk(0, 100)
+        upload = ImageUpload.objects.get(pk=self.upload_id)
+        ImageUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        image_service._upload_hashers[upload.id].touched -= 2 * 86400
+        image_service._last_sweep = 0
+
+        image_service.expire_uploads()
+
+        self.assertEqual(ImageUpload.objects.get(pk=upload.pk).status, 'expired')
+        self.assertFalse(os.path.exists(upload.part_path))
+        self.assertNotIn(upload.id, image_service._upload_hashers)
@@ -0,0 +1,178 @@
+import os
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import TestCase
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, DeviceImportRun, Region, Site
+from swim_backend.devices.plugins.netbox import NetBoxPlugin
+from swim_backend.core.services.inventory_import_service import import_csv_file, import_devices
+
+CSV_HEADER = "hostname,ip_address,username,password,platform,site,region,model,family\n"
+
+
+def netbox_device(i, updated='2026-01-01T00:00:00Z'):
+    return {
+        'id': i,
+        'name': f"sw{i}",
+        'primary_ip': {'address': f"10.0.{i // 250}.{i % 250 + 1}/24"},
+        'platform': {'name': 'iosxe'},
+        'site': {'name': f"Site{i % 3}"},
+        'role': {'name': 'Switch'},
+        'device_type': {'model': 'C9300-48P'},
+        'last_updated': updated,
+    }
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class NetBoxPagingTests(TestCase):
+    def test_devices_are_streamed_page_by_page(self):
+        devices = [netbox_device(i) for i in range(5)]
+        calls = []
+
+        def get(url, params=None, timeout=None):
+            calls.append(dict(params))
+            page = devices[params['offset']:params['offset'] + params['limit']]
+            has_next = params['offset'] + len(page) < len(devices)
+            return FakeResponse({'count': len(devices), 'next': 'more' if has_next else None, 'results': page})
+
+        with mock.patch('swim_backend.core.services.netbox_service.PAGE_SIZE', 2), \
+                mock.patch('requests.Session.get', side_effect=get):
+            records = list(NetBoxPlugin().iter_devices({'url': 'http://nb', 'token': 't'}, {}, since='2026-01-01'))
+
+        self.assertEqual([r['name'] for r in records], [f"sw{i}" for i in range(5)])
+        self.assertEqual([c['offset'] for c in calls], [0, 2, 4])
+        self.assertEqual(calls[0]['last_updated__gte'], '2026-01-01')
+        self.assertEqual(records[0]['ip_address'], '10.0.0.1')
+
+
+class InventoryImportTests(TestCase):
+    def record(self, i, **extra):
+        return {'name': f"sw{i}", 'ip_address': f"10.1.0.{i + 1}", 'platform': 'iosxe', 'site': 'SiteA'} | extra
+
+    @override_settings(INVENTORY_IMPORT_BATCH_SIZE=10)
+    def test_creates_and_updates_in_bulk(self):
+        Device.objects.create(hostname="sw0", ip_address="10.1.0.1", platform="ios")
+
+        records = (self.record(i, last_updated=f"2026-01-0{i % 9 + 1}") for i in range(25))
+        result = import_devices(records, {'username': 'admin'})
+
+        self.assertEqual((result['count'], result['created'], result['updated']), (25, 24, 1))
+        self.assertEqual(result['last_updated'], "2026-01-09")
+        self.assertEqual(Device.objects.count(), 25)
+        self.assertEqual(Device.objects.get(hostname="sw0").platform, "iosxe")
+        self.assertEqual(Site.objects.filter(name="SiteA").count(), 1)
+
+    def test_query_count_does_not_grow_with_devices(self):
+        with self.assertNumQueries(12):
+            import_devices([self.record(i) for i in range(200)])
+
+    def test_invalid_and_conflicting_records_are_skipped(self):
+        Device.objects.create(hostname="other", ip_address="10.1.0.1")
+
+        result = import_devices([
+            self.record(0),
+            self.record(1, ip_address=None),
+            self.record(2, platform=''),
+            self.record(3),
+        ])
+
+        self.assertEqual(result['count'], 1)
+        self.assertEqual(len(result['errors']), 3)
+        self.assertIn("already exists on other", result['errors'][0]['error'])
+
+    def test_bad_values_skip_only_their_row(self):
+        result = import_devices([
+            self.record(0, ip_address='10.1.0.300'),
+            self.record(1, role='Toaster'),
+            self.record(2),
+        ])
+
+        self.assertEqual(result['count'], 1)
+        self.assertEqual([e['hostname'] for e in result['errors']], ['sw0', 'sw1'])
+
+    def test_row_rejected_by_the_database_skips_only_itself(self):
+        bulk_create = Device.objects.bulk_create
+
+        def reject_sw1(devices, **kwargs):
+            if any(device.hostname == 'sw1' for device in devices):
+                raise IntegrityError("rejected")
+            return bulk_create(devices, **kwargs)
+
+        with mock.patch.object(Device.objects, 'bulk_create', side_effect=reject_sw1):
+            result = import_devices([self.record(i) for i in range(3)])
+
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['errors'][0]['hostname'], 'sw1')
+        self.assertEqual(set(Device.objects.values_list('hostname', flat=True)), {'sw0', 'sw2'})
+
+
+class CsvImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+
+    def upload(self, rows):
+        content = (CSV_HEADER + ''.join(rows)).encode()
+        return self.client.post(
+            '/api/dcim/devices/import_csv/', {'file': SimpleUploadedFile('devices.csv', content)}, format='multipart'
+        )
+
+    def test_small_file_is_imported_in_the_request(self):
+        response = self.upload([
+            "sw1,10.2.0.1,admin,pw,iosxe,SiteA,EMEA,C9300,Switch\n",
+            "sw2,not-an-ip,admin,pw,iosxe,SiteA,,,Switch\n",
+            "sw3,10.2.0.3,admin,pw,iosxe,,,,Switch\n",
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['errors']), 2)
+        device = Device.objects.get(hostname="sw1")
+        self.assertEqual(device.model.name, "C9300")
+        self.assertEqual(device.site.region, Region.objects.get(name="EMEA"))
+
+        report = self.client.get(f"/api/dcim/devices/import_runs/{response.data['run_id']}/errors/")
+        lines = report.content.decode().splitlines()
+        self.assertEqual(lines[0], "row,hostname,ip_address,error")
+        self.assertTrue(lines[1].startswith("3,sw2,not-an-ip,"))
+
+    @override_settings(CSV_IMPORT_SYNC_MAX_BYTES=10)
+    def test_large_file_runs_in_the_background(self):
+        with mock.patch('swim_backend.core.services.inventory_import_service.start_csv_import') as start:
+            response = self.upload(["sw1,10.2.0.1,admin,pw,iosxe,SiteA,,,Switch\n"])
+
+        self.assertEqual(response.status_code, 202)
+        run_id, path = start.call_args[0]
+        import_csv_file(run_id, path)
+
+        self.assertFalse(os.path.exists(path))
+        status = self.client.get(f"/api/dcim/devices/import_runs/{run_id}/").data
+        self.assertEqual((status['status'], status['total_rows'], status['imported']), ('completed', 1, 1))
+        self.assertEqual(status['progress'], 100.0)
+
+    @override_settings(INVENTORY_IMPORT_BATCH_SIZE=100)
+    def test_progress_is_reported_per_batch(self):
+        progress = []
+        records = (
+            {'name': f"sw{i}", 'ip_address': f"10.3.0.{i + 1}", 'site': 'SiteA', 'row': i + 2} for i in range(250)
+        )
+
+        result = import_devices(
+            records, required=('ip_address', 'site'), on_progress=lambda processed, result: progress.append(processed)
+        )
+
+        self.assertEqual(progress, [100, 200, 250])
+        self.assertEqual(result['count'], 250)
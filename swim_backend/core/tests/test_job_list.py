@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import CheckRun, Job, ValidationCheck
+from swim_backend.images.models import Image
+
+
+class JobListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        self.image = Image.objects.create(filename="cat9k.bin", version="17.9.4")
+        self.check = ValidationCheck.objects.create(name="Show Version", command="show version")
+
+    def add_jobs(self, count):
+        jobs = []
+        for _ in range(count):
+            job = Job.objects.create(device=self.device, image=self.image, log="x" * 10000)
+            job.selected_checks.add(self.check)
+            CheckRun.objects.create(device=self.device, job=job, validation_check=self.check, output="done")
+            jobs.append(job)
+        return jobs
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_list_is_compact_and_constant(self):
+        self.add_jobs(3)
+        small, response = self.get("/api/core/jobs/")
+        job = response.data["results"][0]
+        self.assertEqual(job["device_hostname"], "sw1")
+        self.assertEqual(job["target_version"], "17.9.4")
+        for field in ("log", "check_runs", "selected_checks_details"):
+            self.assertNotIn(field, job)
+
+        self.add_jobs(30)
+        large, response = self.get("/api/core/jobs/")
+        self.assertEqual(large, small)
+        self.assertEqual(response.data["count"], 33)
+
+    def test_list_by_ids_and_detail(self):
+        jobs = self.add_jobs(3)
+        _, response = self.get("/api/core/jobs/", ids=f"{jobs[0].id},{jobs[2].id}")
+        self.assertEqual(sorted(j["id"] for j in response.data["results"]), [jobs[0].id, jobs[2].id])
+
+        _, response = self.get(f"/api/core/jobs/{jobs[0].id}/")
+        self.assertEqual(len(response.data["log"]), 10000)
+        self.assertEqual(response.data["check_runs"][0]["check_name"], "Show Version")
+        self.assertNotIn("output", response.data["check_runs"][0])
+
+    def test_list_reports_step_progress(self):
+        job = self.add_jobs(1)[0]
+        job.steps = [{"name": "Distribution", "status": "success"}, {"name": "Activation", "status": "running"}]
+        job.save()
+
+        _, response = self.get("/api/core/jobs/", ids=str(job.id))
+        row = response.data["results"][0]
+        self.assertEqual((row["progress"], row["current_step"]), (50, "Activation"))
+
+    def test_check_output_is_served_with_validators(self):
+        log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_dir)
+        os.makedirs(os.path.join(log_dir, "precheck"))
+        with open(os.path.join(log_dir, "precheck", "Show_Version.txt"), "w") as f:
+            f.write("Cisco IOS XE Software, Version 17.09.04a")
+        run = CheckRun.objects.create(
+            device=self.device,
+            validation_check=self.check,
+            output=f"precheck:{log_dir}:Show Version:command:show version",
+        )
+        url = f"/api/core/check-runs/{run.id}/output/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.content, b"Cisco IOS XE Software, Version 17.09.04a")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        standalone = CheckRun.objects.create(device=self.device, validation_check=self.check, output="ok")
+        self.assertEqual(self.client.get(f"/api/core/check-runs/{standalone.id}/output/").content, b"ok")
@@ -0,0 +1,123 @@
+import json
+import threading
+import uuid
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import Job
+from swim_backend.core.services.diff_service import log_update
+from swim_backend.core.services.job_stream import hub, parse_offsets, stream_events
+from swim_backend.core.services.stream_slots import open_streams
+
+
+def parse_events(text):
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith((":", "retry")))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"]), fields.get("id")))
+    return events
+
+
+class JobStreamTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        self.job = Job.objects.create(
+            device=self.device, status="success", steps=[{"name": "Distribution", "status": "success"}],
+            log="line one\nStatus Update: Downloaded: 1,024 bytes (0.00 MB) - [=>...] 50.0%\n",
+        )
+
+    def get_events(self, url, **headers):
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream", **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return parse_events(b"".join(response.streaming_content).decode())
+
+    def test_finished_job_streams_its_log_and_ends(self):
+        events = self.get_events(f"/api/core/jobs/{self.job.id}/stream/")
+
+        self.assertEqual([e[0] for e in events], ["log", "progress", "status", "end"])
+        log = events[0]
+        self.assertEqual(log[1]["text"], self.job.log)
+        self.assertEqual(log[2], str(len(self.job.log)))
+        self.assertEqual(events[1][1], {"job": self.job.id, "bytes": 1024, "percent": 50.0})
+        self.assertEqual(events[2][1]["steps"], self.job.steps)
+        self.assertEqual(events[3][1]["jobs"], {str(self.job.id): "success"})
+        self.assertEqual(hub.channels, {})
+
+    def test_resume_from_offset(self):
+        offset = len("line one\n")
+        events = self.get_events(f"/api/core/jobs/{self.job.id}/stream/?offset={offset}")
+        self.assertEqual(events[0][1]["text"], self.job.log[offset:])
+
+        events = self.get_events(f"/api/core/jobs/{self.job.id}/stream/", HTTP_LAST_EVENT_ID=str(len(self.job.log)))
+        self.assertEqual([e[0] for e in events], ["status", "end"])
+
+    def test_batch_stream(self):
+        batch_id = uuid.uuid4()
+        first = Job.objects.create(device=self.device, status="failed", batch_id=batch_id, log="a\n")
+        second = Job.objects.create(device=self.device, status="success", batch_id=batch_id, log="b\n")
+
+        events = self.get_events(f"/api/core/jobs/batch_stream/?batch_id={batch_id}&offset={first.id}:2")
+
+        logs = [e for e in events if e[0] == "log"]
+        self.assertEqual([e[1]["job"] for e in logs], [second.id])
+        self.assertEqual(logs[0][2], f"{first.id}:2,{second.id}:2")
+        self.assertEqual(events[-1][1]["jobs"], {str(first.id): "failed", str(second.id): "success"})
+
+        self.assertEqual(self.client.get("/api/core/jobs/batch_stream/?batch_id=x").status_code, 400)
+        self.assertEqual(self.client.get(f"/api/core/jobs/batch_stream/?batch_id={uuid.uuid4()}").status_code, 404)
+
+    @override_settings(SSE_MAX_STREAMS=1)
+    def test_streams_beyond_the_limit_are_refused(self):
+        url = f"/api/core/jobs/{self.job.id}/stream/"
+        first = self.client.get(url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(open_streams(), 1)
+
+        refused = self.client.get(url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(refused.status_code, 503)
+        self.assertEqual(refused["Retry-After"], "30")
+
+        # Closing the response frees the slot, even before it was read
+        first.close()
+        self.assertEqual(open_streams(), 0)
+        self.get_events(url)
+        self.assertEqual(open_streams(), 0)
+
+    def test_parse_offsets(self):
+        self.assertEqual(parse_offsets("120", [7]), {7: 120})
+        self.assertEqual(parse_offsets("7:120, 8:5,x:1,9:y"), {7: 120, 8: 5})
+        self.assertEqual(parse_offsets(None, [7]), {})
+
+
+class LiveJobStreamTests(TransactionTestCase):
+    def test_viewers_share_one_subscription(self):
+        device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        job = Job.objects.create(device=device, status="distributing", log="start\n")
+        key = ("job", job.id)
+        viewers = [stream_events(key, {"id": job.id}, heartbeat=0.2) for _ in range(2)]
+
+        for viewer in viewers:
+            self.assertEqual(next(viewer), "retry: 3000\n\n")
+            self.assertEqual([e[0] for e in parse_events(next(viewer) + next(viewer))], ["log", "status"])
+        channel = hub.channels[key]
+        self.assertEqual(len(channel.subscribers), 2)
+
+        def finish():
+            log_update(job.id, "Transfer complete")
+            Job.objects.filter(id=job.id).update(status="success")
+
+        threading.Timer(0.2, finish).start()
+        for viewer in viewers:
+            events = []
+            while not events or events[-1][0] != "end":
+                events += parse_events(next(viewer))
+            self.assertIn("Transfer complete", "".join(e[1]["text"] for e in events if e[0] == "log"))
+            self.assertEqual(events[-1][1]["jobs"], {str(job.id): "success"})
+            viewer.close()
+
+        channel.thread.join(timeout=5)
+        self.assertNotIn(key, hub.channels)
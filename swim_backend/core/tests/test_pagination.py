@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import ActivityLog, Job
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "a@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.device = Device.objects.create(hostname="sw1", ip_address="10.0.0.1")
+        self.jobs = [Job.objects.create(device=self.device) for _ in range(25)]
+
+    def walk(self, url, params):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids += [item["id"] for item in response.data["results"]]
+            url, params, pages = response.data["next"], None, pages + 1
+        return ids, pages
+
+    def test_page_numbers_stay_the_default(self):
+        response = self.client.get("/api/core/jobs/", {"page_size": 10, "page": 2})
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_cursor_walks_every_job_once_without_counting(self):
+        with CaptureQueriesContext(connection) as queries:
+            ids, pages = self.walk("/api/core/jobs/", {"pagination": "cursor", "page_size": 10})
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, [job.id for job in reversed(self.jobs)])
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in queries.captured_queries))
+
+    def test_approximate_count(self):
+        response = self.client.get("/api/core/jobs/", {"pagination": "cursor", "count": "approx"})
+        self.assertEqual(response.data["count"], 25)  # exact below the threshold
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get("/api/core/jobs/", {"count": "approx"})
+        self.assertEqual(response.data["count"], 25)
+
+    def test_devices_and_activity_logs(self):
+        for i in range(2, 6):
+            Device.objects.create(hostname=f"sw{i}", ip_address=f"10.0.0.{i}")
+        ids, pages = self.walk("/api/dcim/devices/", {"pagination": "cursor", "page_size": 2})
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(set(ids)), 5)
+
+        ActivityLog.objects.all().delete()
+        logs = [ActivityLog.objects.create(user=self.user, action="login") for _ in range(5)]
+        ids, _ = self.walk("/api/core/activity-logs/", {"pagination": "cursor", "page_size": 2})
+        self.assertEqual(ids, [log.id for log in reversed(logs)])
@@ -0,0 +1,65 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, ReadinessResult, ReadinessRun
+from swim_backend.core.services import readiness_service
+from swim_backend.core.services.readiness_service import fresh_result, start_readiness_run
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@mock.patch.object(readiness_service, "_get_executor", return_value=InlineExecutor())
+@mock.patch("swim_backend.core.readiness.check_readiness")
+class ReadinessRunTests(TestCase):
+    def setUp(self):
+        self.devices = [Device.objects.create(hostname=f"sw{i}", ip_address=f"10.0.0.{i + 1}") for i in range(3)]
+        self.ids = [d.id for d in self.devices]
+
+    def test_results_are_stored_per_device(self, check_readiness, _):
+        check_readiness.side_effect = [
+            (True, {"flash_memory": {"status": "success", "message": "ok"}}),
+            (False, {"connection": {"status": "failed", "message": "Timeout"}}),
+            Exception("boom"),
+        ]
+
+        run = ReadinessRun.objects.get(id=start_readiness_run(self.ids).id)
+
+        self.assertEqual((run.status, run.completed, run.ready), ("completed", 3, 1))
+        result = run.results.get(device=self.devices[0])
+        self.assertEqual([c["name"] for c in result.checks], ["Reachability", "Flash Space", "Golden Image Defined"])
+        self.assertEqual(run.results.get(device=self.devices[1]).checks[0]["status"], "Fail")
+        self.assertFalse(run.results.get(device=self.devices[2]).ready)
+
+    def test_fresh_results_are_reused(self, check_readiness, _):
+        check_readiness.return_value = (True, {})
+        start_readiness_run(self.ids)
+
+        run = ReadinessRun.objects.get(id=start_readiness_run(self.ids, max_age=300).id)
+
+        self.assertEqual(check_readiness.call_count, 3)
+        self.assertEqual((run.reused, run.ready), (3, 3))
+
+    def test_only_passing_results_skip_the_workflow_step(self, check_readiness, _):
+        check_readiness.return_value = (False, {})
+        start_readiness_run(self.ids[:1])
+
+        self.assertIsNotNone(fresh_result(self.ids[0], 0, 300))
+        self.assertIsNone(fresh_result(self.ids[0], 0, 300, ready_only=True))
+        self.assertIsNone(fresh_result(self.ids[0], 10**9, 300))
+
+    def test_api_returns_run_and_streams_results(self, check_readiness, _):
+        check_readiness.return_value = (True, {})
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+        response = client.post("/api/dcim/devices/check_readiness/", {"ids": self.ids}, format="json")
+        self.assertEqual(response.status_code, 202)
+
+        run = client.get(f"/api/dcim/devices/readiness_runs/{response.data['run_id']}/").data
+        self.assertEqual(run["status"], "completed")
+        self.assertEqual([r["hostname"] for r in run["results"]], ["sw0", "sw1", "sw2"])
+        self.assertEqual(ReadinessResult.objects.count(), 3)
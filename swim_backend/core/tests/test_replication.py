@@ -0,0 +1,136 @@
+import io
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, Site
+from swim_backend.images.models import FileServer, Image, ImageReplica
+from swim_backend.core.services import replication_service
+from swim_backend.core.services.file_server_selector import rank_file_servers
+from swim_backend.core.services.replication_service import _push_ssh, replica_holders, replicate_image
+
+SHA512 = "ab" * 64
+
+
+class ReplicationFilenameTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.server = FileServer.objects.create(name="fs1", address="10.0.0.9", protocol="sftp", port=22)
+
+    def test_unsafe_filenames_are_rejected(self):
+        image = Image.objects.create(filename="-rf.bin", version="17.9.4")
+
+        response = self.client.post(
+            f"/api/images/images/{image.id}/replicate/", {"file_servers": [self.server.id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImageReplica.objects.exists())
+
+    def test_remote_hash_command_quotes_the_path(self):
+        client = mock.MagicMock()
+        stdout = mock.MagicMock()
+        stdout.read.return_value = b"abc  /images/x\n"
+        stdout.channel.recv_exit_status.return_value = 0
+        client.exec_command.return_value = (None, stdout, None)
+
+        with mock.patch("paramiko.SSHClient", return_value=client):
+            _push_ssh(None, self.server, "/images/a'; reboot; '.bin", mock.MagicMock(), "sha512")
+
+        command = client.exec_command.call_args[0][0]
+        self.assertEqual(command, "sha512sum '/images/a'\"'\"'; reboot; '\"'\"'.bin'")
+
+
+class SyncExecutor:
+    """Runs the replication pool inline."""
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, items):
+        return map(fn, items)
+
+
+class InlineThread:
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+class ReplicationTests(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            filename="cat9k.bin", version="17.9.4a", size_bytes=1024, sha512_checksum=SHA512.upper()
+        )
+        self.servers = [
+            FileServer.objects.create(name=f"fs{i}", address=f"10.0.0.{i}", protocol="sftp", port=22)
+            for i in range(3)
+        ]
+        self.pushed = {}
+
+    def replicate(self, results):
+        """Replicates to every server; `results` maps server name -> (size, digest) or an exception."""
+        def transport(image, file_server, remote_path, source, algorithm):
+            self.pushed[file_server.name] = (remote_path, algorithm)
+            result = results[file_server.name]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with mock.patch.dict(replication_service.TRANSPORTS, {"sftp": transport}), \
+                mock.patch.object(replication_service, "open_image_source", return_value=io.BytesIO(b"x" * 1024)), \
+                mock.patch.object(replication_service, "ThreadPoolExecutor", SyncExecutor), \
+                mock.patch.object(replication_service.threading, "Thread", InlineThread):
+            replicate_image(self.image, self.servers)
+        return {r.file_server.name: r for r in ImageReplica.objects.select_related("file_server")}
+
+    def test_matching_size_and_digest_is_verified(self):
+        replicas = self.replicate({
+            "fs0": (1024, SHA512), "fs1": (1024, SHA512), "fs2": (1024, SHA512),
+        })
+
+        replica = replicas["fs0"]
+        self.assertEqual(replica.status, "verified")
+        self.assertEqual(replica.remote_checksum, SHA512)
+        self.assertEqual((replica.remote_size, replica.bytes_transferred), (1024, 1024))
+        self.assertIsNone(replica.error)
+        self.assertEqual(self.pushed["fs0"], ("/cat9k.bin", "sha512"))
+
+    def test_mismatches_and_transport_errors_fail(self):
+        replicas = self.replicate({
+            "fs0": (1024, SHA512),
+            "fs1": (1000, "cd" * 64),
+            "fs2": OSError("Connection refused"),
+        })
+
+        self.assertEqual(replicas["fs0"].status, "verified")
+        self.assertEqual(replicas["fs1"].status, "failed")
+        self.assertIn("size mismatch (expected 1024, got 1000)", replicas["fs1"].error)
+        self.assertIn("sha512 mismatch", replicas["fs1"].error)
+        self.assertEqual(replicas["fs2"].status, "failed")
+        self.assertEqual(replicas["fs2"].error, "Connection refused")
+        self.assertIsNotNone(replicas["fs2"].completed_at)
+
+    def test_only_verified_replicas_are_failover_candidates(self):
+        self.replicate({
+            "fs0": (1024, SHA512),
+            "fs1": (1000, SHA512),
+            "fs2": OSError("Connection refused"),
+        })
+        self.assertEqual(replica_holders(self.image), {self.servers[0].id})
+
+        site = Site.objects.create(name="SiteA", preferred_file_server=self.servers[1])
+        device = Device.objects.create(
+            hostname="sw1", ip_address="10.1.0.1", site=site, preferred_file_server=self.servers[2]
+        )
+        chain = rank_file_servers(device, image=self.image)
+        self.assertEqual([fs for fs, _, _ in chain], [self.servers[0]])
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+from django.test import SimpleTestCase
+from swim_backend.core.services.show_version_parser import parse_show_version, parse_show_version_text
+
+CORPUS = Path(__file__).parent / "fixtures" / "show_version"
+
+
+class FakeDevice:
+    name = "fake"
+
+    def __init__(self, output, genie_result=None):
+        self.output = output
+        self.genie_result = genie_result
+        self.parsed_output = None
+
+    def execute(self, command):
+        return self.output
+
+    def parse(self, command, output=None):
+        self.parsed_output = output
+        return self.genie_result
+
+
+class ShowVersionParserTests(SimpleTestCase):
+    def test_golden_corpus(self):
+        samples = sorted(CORPUS.glob("*.txt"))
+        self.assertTrue(samples)
+        for sample in samples:
+            with self.subTest(sample=sample.name):
+                expected = json.loads(sample.with_suffix(".json").read_text())
+                self.assertEqual(parse_show_version_text(sample.read_text()), expected)
+
+    def test_unrecognised_output_falls_back_to_genie(self):
+        device = FakeDevice("% Invalid input detected at '^' marker.", genie_result={"version": {"version": "1.0"}})
+
+        self.assertEqual(parse_show_version(device), {"version": {"version": "1.0"}})
+        # Genie parses the output already collected instead of running the command again
+        self.assertEqual(device.parsed_output, device.output)
+
+    def test_fast_path_skips_genie(self):
+        device = FakeDevice((CORPUS / "iosxe_c9300_install.txt").read_text())
+
+        self.assertEqual(parse_show_version(device)["version"]["chassis"], "C9300-48P")
+        self.assertIsNone(device.parsed_output)
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, DeviceModel
+from swim_backend.core.services.workflow.activation_strategies import (
+    ActivationStrategyRegistry,
+    BaseActivationStrategy,
+)
+from swim_backend.core.services.workflow.readiness_strategies import ReadinessStrategyRegistry
+from swim_backend.core.services.workflow.strategy_registry import StrategyRegistry
+
+
+class VersionedRegistry(StrategyRegistry):
+    base_class = BaseActivationStrategy
+    _strategies = []
+
+
+class OldTrainStrategy(BaseActivationStrategy):
+    supported_platforms = ["iosxe"]
+    max_version = "16.12.99"
+
+
+class NewTrainStrategy(BaseActivationStrategy):
+    supported_platforms = ["iosxe"]
+    min_version = "17.3"
+
+
+class StrategyRegistryTests(TestCase):
+    def setUp(self):
+        self.c9300 = DeviceModel.objects.create(name="Catalyst 9300")
+
+    def device(self, hostname, model=None, platform="iosxe", version=None):
+        return Device(hostname=hostname, ip_address="10.0.0.1", model=model, platform=platform, version=version)
+
+    def test_strategies_are_discovered_without_imports(self):
+        names = [s.__name__ for s in ActivationStrategyRegistry.list_strategies()]
+        self.assertIn("Catalyst9300ActivationStrategy", names)
+        self.assertIn("LabVirtualDeviceStrategy", names)
+        # The catch-all readiness strategy is tried last whatever the import order
+        self.assertEqual(ReadinessStrategyRegistry.list_strategies()[-1].__name__, "DefaultReadinessStrategy")
+
+    def test_resolution_by_model_and_platform(self):
+        switch = self.device("sw1", model=self.c9300, platform="IOSXE")
+        unknown = self.device("router1", platform="iosxr")
+
+        self.assertEqual(ActivationStrategyRegistry.resolve(switch).__name__, "Catalyst9300ActivationStrategy")
+        self.assertIsNone(ActivationStrategyRegistry.resolve(unknown))
+        self.assertEqual(ReadinessStrategyRegistry.resolve(unknown).__name__, "DefaultReadinessStrategy")
+
+    def test_version_ranges(self):
+        VersionedRegistry.clear()
+        VersionedRegistry.register(OldTrainStrategy)
+        VersionedRegistry.register(NewTrainStrategy)
+
+        self.assertIs(VersionedRegistry.resolve(self.device("a", version="16.9.4")), OldTrainStrategy)
+        self.assertIs(VersionedRegistry.resolve(self.device("bb", version="17.09.04a")), NewTrainStrategy)
+        self.assertIsNone(VersionedRegistry.resolve(self.device("ccc", version="17.1.1")))
+
+    def test_fleet_resolution_is_memoized_per_signature(self):
+        devices = [self.device(f"sw{i}", model=self.c9300) for i in range(1000)]
+        for i, device in enumerate(devices):
+            device.id = i
+        ActivationStrategyRegistry.resolve(devices[0])
+        before = StrategyRegistry._candidates.cache_info().misses
+
+        resolved = ActivationStrategyRegistry.resolve_many(devices)
+
+        self.assertEqual(StrategyRegistry._candidates.cache_info().misses, before)
+        self.assertEqual(len(resolved), 1000)
+        self.assertEqual({s.__name__ for s in resolved.values()}, {"Catalyst9300ActivationStrategy"})
+
+    def test_strategies_api(self):
+        Device.objects.create(hostname="sw1", ip_address="10.0.0.1", model=self.c9300, platform="iosxe")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+        response = client.post("/api/dcim/devices/strategies/", {}, format="json")
+
+        self.assertEqual(response.data[0]["activation_strategy"], "Catalyst9300ActivationStrategy")
+        self.assertEqual(response.data[0]["readiness_strategy"], "Catalyst9300ReadinessStrategy")
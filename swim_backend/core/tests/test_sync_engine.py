@@ -0,0 +1,165 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device, DeviceModel, DeviceSyncHistory, Site, SyncClaim, SyncRun
+from swim_backend.core.services import sync_service
+from swim_backend.core.services.sync_service import SyncEngine, failure_reason, persist_sync_results
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+
+class SyncEngineTests(TestCase):
+    def setUp(self):
+        self.site_a = Site.objects.create(name="SiteA")
+        self.site_b = Site.objects.create(name="SiteB")
+        self.devices = [
+            Device.objects.create(hostname=f"a{i}", ip_address=f"10.0.0.{i}", site=self.site_a) for i in range(3)
+        ] + [Device.objects.create(hostname="b0", ip_address="10.0.1.1", site=self.site_b)]
+        self.engine = SyncEngine(max_workers=4, max_per_site=2)
+        self.executor = FakeExecutor()
+        self.engine._executor = self.executor
+
+    def pairs(self, devices):
+        return [(d.id, d.site_id) for d in devices]
+
+    def test_per_site_limit_and_round_robin(self):
+        self.engine.submit(self.pairs(self.devices), "all")
+
+        dispatched = [args[0] for _, args in self.executor.submitted]
+        self.assertEqual(len(dispatched), 3)
+        self.assertIn(self.devices[3].id, dispatched)
+        self.assertEqual(self.engine.status()["queued"], 1)
+
+    def test_duplicate_requests_are_coalesced(self):
+        first = self.engine.submit(self.pairs(self.devices[:2]), "selection")
+        second = self.engine.submit(self.pairs(self.devices[1:3]), "selection")
+
+        self.assertEqual(first.total, 2)
+        self.assertEqual(second.total, 1)
+        self.assertEqual(second.coalesced, 1)
+
+    def test_devices_claimed_by_another_process_are_coalesced(self):
+        other = SyncEngine(max_workers=4, max_per_site=2)
+        other._executor = FakeExecutor()
+        other.submit(self.pairs(self.devices[:1]), "selection")
+
+        run = self.engine.submit(self.pairs(self.devices[:2]), "selection")
+
+        self.assertEqual((run.total, run.coalesced), (1, 1))
+        self.assertEqual(SyncClaim.objects.get(device=self.devices[1]).sync_run_id, run.id)
+
+    def test_stale_claims_are_given_up(self):
+        run = self.engine.submit(self.pairs(self.devices[:1]), "selection")
+        SyncClaim.objects.update(claimed_at=timezone.now() - timedelta(hours=2))
+
+        again = self.engine.submit(self.pairs(self.devices[:1]), "selection")
+
+        self.assertEqual(again.total, 1)
+        self.assertFalse(SyncClaim.objects.filter(sync_run=run).exists())
+
+    @mock.patch("swim_backend.core.services.sync_service.create_genie_device")
+    def test_run_progress_and_failure_reasons(self, create_genie_device):
+        create_genie_device.side_effect = [
+            Exception("Timeout connecting to 10.0.0.1:22"),
+            Exception("Timeout connecting to 10.0.0.2:22"),
+        ]
+        run = self.engine.submit(self.pairs(self.devices[:2]), "selection")
+        for fn, args in list(self.executor.submitted):
+            fn(*args)
+        self.engine.writer.flush()
+
+        run = SyncRun.objects.get(id=run.id)
+        self.assertEqual(run.status, "completed")
+        self.assertEqual(run.failed, 2)
+        self.assertEqual(run.failure_reasons, {"Timeout connecting to <ip>": 2})
+        self.assertEqual(run.results.count(), 2)
+        self.assertEqual(self.engine.status()["running"], 0)
+        self.assertFalse(SyncClaim.objects.exists())
+
+    @mock.patch("swim_backend.core.services.sync_service.create_genie_device")
+    def test_device_stays_claimed_until_its_result_is_written(self, create_genie_device):
+        create_genie_device.side_effect = Exception("unreachable")
+        self.engine.submit(self.pairs(self.devices[:1]), "selection")
+        fn, args = self.executor.submitted[0]
+        fn(*args)
+
+        # The result is still buffered, so a new sync of the device must wait for it
+        again = self.engine.submit(self.pairs(self.devices[:1]), "selection")
+        self.assertEqual(again.coalesced, 1)
+
+        self.engine.writer.flush()
+        again = self.engine.submit(self.pairs(self.devices[:1]), "selection")
+        self.assertEqual(again.total, 1)
+
+    def test_failure_reason_masks_numbers(self):
+        self.assertEqual(failure_reason("Failed after 3 retries\nTraceback"), "Failed after <n> retries")
+        self.assertEqual(failure_reason(None), "Unknown error")
+
+
+class SyncPersistenceTests(TestCase):
+    def setUp(self):
+        # Models cached by earlier tests were rolled back without delete signals
+        sync_service._device_models.clear()
+        self.devices = [
+            Device.objects.create(hostname=f"dev{i}", ip_address=f"10.0.0.{i}", version="17.3.1") for i in range(10)
+        ]
+
+    def result(self, device, **facts):
+        facts = {"hostname": device.hostname, "version": "17.9.4a", "model": "C9300", **facts}
+        return {"device_id": device.id, "status": "success", "error": None, "facts": facts, "duration": 1.0}
+
+    def test_batch_is_written_in_constant_queries(self):
+        results = [self.result(d) for d in self.devices]
+        # devices, model lookup/create/reload, hostname check, bulk update in a savepoint, history,
+        # compliance refresh, change feed entries, reachability events in a savepoint
+        with self.assertNumQueries(15):
+            persist_sync_results(results)
+
+        self.assertEqual(Device.objects.filter(version="17.9.4a", model__name="C9300").count(), 10)
+        self.assertEqual(DeviceModel.objects.filter(name="C9300").count(), 1)
+        self.assertEqual(DeviceSyncHistory.objects.count(), 10)
+
+    def test_history_only_on_change_or_failure(self):
+        persist_sync_results([self.result(self.devices[0])])
+        persist_sync_results([self.result(self.devices[0])])
+        self.assertEqual(DeviceSyncHistory.objects.filter(device=self.devices[0]).count(), 1)
+
+        persist_sync_results([{"device_id": self.devices[0].id, "status": "failed", "error": "boom", "facts": {}}])
+        self.assertEqual(DeviceSyncHistory.objects.filter(device=self.devices[0], status="failed").count(), 1)
+        self.assertEqual(Device.objects.get(id=self.devices[0].id).reachability, "Unreachable")
+
+    def test_run_details_list_unchanged_devices(self):
+        persist_sync_results([self.result(self.devices[0])])
+        run = SyncRun.objects.create(scope="selection", total=1)
+        persist_sync_results([dict(self.result(self.devices[0]), sync_run_id=run.id)])
+        self.assertFalse(run.results.exists())
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        response = client.get(f"/api/dcim/devices/sync_runs/{run.id}/", {"details": "true"})
+
+        self.assertEqual(
+            [(d["hostname"], d["status"], d["duration_seconds"]) for d in response.data["devices"]],
+            [("dev0", "success", 1.0)],
+        )
+
+    @override_settings(SUPPORTED_DEVICE_MODELS=["C9300"])
+    def test_unsupported_model_is_rejected(self):
+        results = persist_sync_results([self.result(self.devices[0], model="ISR4431")])
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertIsNone(Device.objects.get(id=self.devices[0].id).model)
+
+    def test_taken_hostname_fails_the_device(self):
+        results = persist_sync_results([self.result(self.devices[0], hostname="dev1")])
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertEqual(Device.objects.get(id=self.devices[0].id).hostname, "dev0")
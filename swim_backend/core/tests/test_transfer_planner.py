@@ -0,0 +1,104 @@
+import datetime
+import threading
+from contextlib import contextmanager
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from swim_backend.core.models import ActiveTransfer, Job
+from swim_backend.devices.models import Device, Site
+from swim_backend.images.models import FileServer, Image
+from swim_backend.core.services.transfer_planner import (
+    TransferCancelled, budget_bps, estimate_campaign, transfer_planner,
+)
+from swim_backend.core.services.workflow.steps.distribution import DistributeStep
+
+
+class TransferPlannerTests(TestCase):
+    def setUp(self):
+        self.fs = FileServer.objects.create(
+            name="fs", protocol="http", address="10.0.0.1", port=80, is_global_default=True
+        )
+        self.site = Site.objects.create(name="SiteA", wan_bandwidth_mbps=80)
+        self.image = Image.objects.create(filename="img.bin", version="17.9.4a", size_bytes=100 * 1000 ** 2)
+
+    def make_job(self, hostname, **kwargs):
+        device = Device.objects.create(hostname=hostname, ip_address=f"1.1.1.{Device.objects.count() + 1}", site=self.site)
+        return Job.objects.create(device=device, image=self.image, **kwargs)
+
+    def test_schedule_window_overrides_capacity(self):
+        schedule = [{"start": "22:00", "end": "06:00", "mbps": 800}]
+        night = timezone.make_aware(datetime.datetime(2026, 1, 1, 23, 30))
+        day = timezone.make_aware(datetime.datetime(2026, 1, 1, 12, 0))
+
+        self.assertEqual(budget_bps(80, schedule, night), 100 * 1000 ** 2)
+        self.assertEqual(budget_bps(80, schedule, day), 10 * 1000 ** 2)
+        self.assertIsNone(budget_bps(None, [], day))
+
+    def test_site_budget_serializes_transfers(self):
+        # Default throughput exceeds the 80 Mbps site link, so transfers queue one after another
+        jobs = [self.make_job("dev1"), self.make_job("dev2")]
+        now = timezone.now()
+
+        plan = estimate_campaign(jobs, now=now)
+        first, second = plan["jobs"]
+        self.assertEqual(first["estimated_start"], now.isoformat())
+        self.assertEqual(second["estimated_start"], first["estimated_finish"])
+        self.assertEqual(plan["campaign_finish"], second["estimated_finish"])
+
+    def test_unlimited_links_run_in_parallel(self):
+        self.site.wan_bandwidth_mbps = None
+        self.site.save()
+        jobs = [self.make_job("dev1"), self.make_job("dev2")]
+
+        plan = estimate_campaign(jobs)
+        self.assertEqual(plan["jobs"][0]["estimated_start"], plan["jobs"][1]["estimated_start"])
+
+    def other_process_transfer(self, job, **kwargs):
+        return ActiveTransfer.objects.create(
+            job=job, site=self.site, file_server=self.fs, rate_bps=10 * 1000 ** 2, size_bytes=self.image.size_bytes,
+            expires_at=kwargs.pop("expires_at", timezone.now() + datetime.timedelta(hours=1)),
+        )
+
+    def test_admission_is_recorded_and_released(self):
+        job = self.make_job("dev1")
+        with transfer_planner.admit(job.id, self.site, self.fs, self.image.size_bytes):
+            self.assertEqual([t["job_id"] for t in transfer_planner.snapshot()], [job.id])
+        self.assertFalse(ActiveTransfer.objects.exists())
+
+    def test_transfers_of_other_processes_count_against_the_budget(self):
+        self.other_process_transfer(self.make_job("dev1"))
+        job = self.make_job("dev2")
+
+        with self.assertRaises(TransferCancelled):
+            with transfer_planner.admit(job.id, self.site, self.fs, self.image.size_bytes, is_cancelled=lambda: True):
+                pass
+
+        plan = estimate_campaign([job], now=timezone.now())
+        self.assertGreater(plan["jobs"][0]["estimated_start"], timezone.now().isoformat())
+
+    def test_expired_transfers_no_longer_count(self):
+        self.other_process_transfer(self.make_job("dev1"), expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        job = self.make_job("dev2")
+
+        with transfer_planner.admit(job.id, self.site, self.fs, self.image.size_bytes, is_cancelled=lambda: True):
+            self.assertEqual(ActiveTransfer.objects.filter(job=job).count(), 1)
+
+    def test_distribution_slot_is_taken_after_bandwidth_admission(self):
+        job = self.make_job("sw-slot")
+        step = DistributeStep(job.id)
+        slot = threading.Semaphore(1)
+        held_at_admission = []
+
+        @contextmanager
+        def admit(*args, **kwargs):
+            free = slot.acquire(blocking=False)
+            if free:
+                slot.release()
+            held_at_admission.append(not free)
+            yield
+
+        with mock.patch.object(transfer_planner, "admit", admit), \
+                mock.patch("swim_backend.core.services.workflow.steps.distribution.DISTRIBUTION_SEMAPHORE", slot), \
+                mock.patch.object(DistributeStep, "perform_transfer", return_value=0):
+            self.assertEqual(step.execute()[0], "success")
+        self.assertEqual(held_at_admission, [False])
@@ -0,0 +1,102 @@
+import time
+import uuid
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from swim_backend.devices.models import Device
+from swim_backend.core.models import Job
+
+STEPS = [
+    {"name": "Readiness Check", "status": "success"},
+    {"name": "Distribution", "status": "success"},
+    {"name": "Activation", "status": "running"},
+    {"name": "Post-Checks", "status": "pending"},
+]
+
+
+class UpgradeStatusTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+        self.batch = uuid.uuid4()
+        self.jobs = []
+        for i, status in enumerate(["activating", "success", "failed", "success"]):
+            device = Device.objects.create(hostname=f"sw{i}", ip_address=f"10.0.0.{i}")
+            self.jobs.append(Job.objects.create(
+                device=device, batch_id=self.batch, status=status, log="x" * 1000,
+                steps=STEPS if status == "activating" else [],
+            ))
+
+    def get_status(self, **params):
+        return self.client.get("/api/upgrade/status/", {"batch_id": str(self.batch), **params})
+
+    def test_jobs_are_lean_rows_with_progress(self):
+        response = self.get_status()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 4)
+        job = response.data["jobs"][0]
+        self.assertNotIn("log", job)
+        self.assertEqual(job["device_hostname"], "sw0")
+        self.assertEqual((job["progress"], job["current_step"]), (50, "Activation"))
+        self.assertEqual(response.data["jobs"][1]["current_step"], "Success")
+
+    def test_fields_selects_job_columns(self):
+        response = self.get_status(fields="id,status")
+        self.assertEqual(response.data["jobs"][0], {"id": self.jobs[0].id, "status": "activating"})
+
+        response = self.get_status(fields="id,log")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("log", response.data["message"])
+
+    def test_summary_aggregates_the_batch(self):
+        response = self.get_status(jobs="false")
+
+        self.assertNotIn("jobs", response.data)
+        summary = response.data["summary"]
+        self.assertEqual(summary["by_status"], {"activating": 1, "success": 2, "failed": 1})
+        self.assertEqual(summary["finished"], 3)
+        self.assertFalse(summary["all_finished"])
+        self.assertEqual(summary["failure_rate"], 0.333)
+        self.assertEqual(summary["progress"], 88)
+
+    def test_eta_comes_from_finished_job_durations(self):
+        now = timezone.now()
+        Job.objects.filter(status__in=["success", "failed"]).update(created_at=now - timedelta(minutes=10))
+        Job.objects.filter(status="activating").update(created_at=now - timedelta(minutes=4))
+
+        eta = self.get_status().data["summary"]["eta_seconds"]
+        self.assertAlmostEqual(eta, 360, delta=5)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get("/api/upgrade/status/").status_code, 400)
+        self.assertEqual(self.client.get("/api/upgrade/status/", {"job_ids": "1,a"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/upgrade/status/", {"batch_id": "nope"}).status_code, 400)
+        self.assertEqual(self.get_status(wait="soon").status_code, 400)
+
+    def test_wait_returns_at_once_when_version_differs(self):
+        started = time.monotonic()
+        response = self.get_status(wait=5, since="stale")
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(response.data["version"], self.get_status().data["version"])
+
+    def test_wait_returns_at_once_when_all_jobs_finished(self):
+        Job.objects.filter(status="activating").update(status="success")
+        version = self.get_status().data["version"]
+
+        started = time.monotonic()
+        response = self.get_status(wait=5, since=version)
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(response.data["summary"]["all_finished"])
+
+    def test_version_changes_with_step_progress(self):
+        version = self.get_status().data["version"]
+        job = self.jobs[0]
+        job.steps = [dict(step, status="success") for step in STEPS]
+        job.save()
+
+        self.assertNotEqual(self.get_status().data["version"], version)
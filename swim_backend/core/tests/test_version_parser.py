@@ -0,0 +1,89 @@
+from django.test import TestCase
+from swim_backend.devices.models import Device, DeviceModel
+from swim_backend.images.models import Image
+from swim_backend.core.services.version_parser import compare_versions, parse_version, version_key
+
+# Real release strings, oldest first within each platform
+IOS_XE = [
+    "03.06.08E", "03.16.05.S", "03.16.08.S", "16.3.1", "Denali-16.3.5b", "16.6.4", "Everest 16.6.7",
+    "16.9.3", "16.9.8", "16.12.1", "16.12.1s", "16.12.4", "16.12.5b", "16.12.10", "16.12.10a",
+    "17.1.1", "17.3.1", "17.03.01a", "17.3.4c", "17.6.1", "17.06.05", "17.9.1", "17.09.03m3",
+    "17.9.4", "17.09.04a", "17.9.5", "17.12.1", "17.12.04", "17.15.1",
+]
+IOS = [
+    "12.2(25)SEE4", "12.2(55)SE", "12.2(55)SE10", "12.2(55)SE12", "15.0(2)SE", "15.0(2)SE11",
+    "15.0(2)SE12", "15.2(2)E", "15.2(4)E10", "15.2(7)E3", "15.2(7)E10", "15.4(3)M", "15.9(3)M7",
+]
+NX_OS = [
+    "6.0(2)U6(10)", "7.0(3)I7(6)", "7.0(3)I7(9)", "7.0(3)I7(10)", "9.2(1)", "9.3(5)", "9.3(8)",
+    "9.3(10)", "9.3(13)", "10.1(2)", "10.2(3)", "10.2(3)F", "10.3(4a)", "10.4(3)",
+]
+IOS_XR = ["6.5.3", "6.6.3", "7.0.2", "7.3.2", "7.5.2", "7.9.21", "7.11.1", "24.1.1"]
+
+SAME = [
+    ("17.09.04a", "17.9.4a"),
+    ("17.9.4", "17.09.04"),
+    ("17.9", "17.9.0"),
+    ("16.12.04", "Version 16.12.04"),
+    ("Everest 16.6.7", "16.6.7"),
+    ("17.3.4c", "17.03.04C"),
+    ("15.2(7)E3", "15.2(7)e3"),
+]
+
+
+class VersionParserTests(TestCase):
+    def test_corpus_is_ordered(self):
+        for corpus in (IOS_XE, IOS, NX_OS, IOS_XR):
+            keys = [version_key(v) for v in corpus]
+            self.assertEqual(keys, sorted(keys), corpus)
+            self.assertEqual(len(set(keys)), len(keys), corpus)
+            for older, newer in zip(corpus, corpus[1:]):
+                self.assertEqual(compare_versions(older, newer), -1, (older, newer))
+
+    def test_equivalent_spellings(self):
+        for v1, v2 in SAME:
+            self.assertEqual(version_key(v1), version_key(v2), (v1, v2))
+            self.assertEqual(compare_versions(v1, v2), 0)
+
+    def test_tokens(self):
+        self.assertEqual(parse_version("17.09.04a"), (17, 9, 4, "a"))
+        self.assertEqual(parse_version("15.2(7)E3"), (15, 2, 7, "e", 3))
+        self.assertEqual(parse_version("7.0(3)I7(9)"), (7, 0, 3, "i", 7, 9))
+        self.assertEqual(parse_version("Version 17.9.4 [Cupertino]"), (17, 9, 4))
+
+    def test_missing_versions(self):
+        for missing in (None, "", "unknown", "N/A"):
+            self.assertEqual(version_key(missing), "")
+        self.assertIsNone(compare_versions(None, "17.9.4"))
+
+    def test_keys_are_digits_only(self):
+        for version in IOS_XE + IOS + NX_OS + IOS_XR:
+            self.assertTrue(version_key(version).isdigit(), version)
+
+    def test_keys_are_stored_and_queried(self):
+        model = DeviceModel.objects.create(name="Catalyst 9300", golden_image_version="17.09.04a")
+        for i, version in enumerate(["16.12.10a", "17.9.4", "17.09.04a", "17.12.1", None]):
+            Device.objects.create(hostname=f"sw{i}", ip_address=f"10.0.0.{i + 1}", version=version)
+        Image.objects.create(filename="cat9k_iosxe.17.12.01.SPA.bin", version="17.12.1")
+
+        older = Device.objects.filter(version_key__lt=model.golden_image_version_key).exclude(version_key="")
+        self.assertEqual(sorted(older.values_list("hostname", flat=True)), ["sw0", "sw1"])
+        self.assertEqual(Image.objects.get().version_key, version_key("17.12.01"))
+
+        device = Device.objects.get(hostname="sw0")
+        device.version = "17.15.1"
+        device.save(update_fields=["version"])
+        self.assertEqual(Device.objects.get(id=device.id).version_key, version_key("17.15.1"))
+
+    def test_range_filters(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        for i, version in enumerate(["16.12.4", "17.9.4", "17.9.4a", None]):
+            Device.objects.create(hostname=f"sw{i}", ip_address=f"10.0.0.{i + 1}", version=version)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+        response = client.get("/api/dcim/devices/", {"version__lt": "17.9.4a"})
+        hostnames = [d["hostname"] for d in response.data.get("results", response.data)]
+        self.assertEqual(hostnames, ["sw0", "sw1"])
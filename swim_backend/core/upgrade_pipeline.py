@@ -427,6 +427,34 @@ def trigger_upgrade_pipeline(request):
             description="Batch UUID to get all jobs in a batch",
             required=False,
         ),
+        OpenApiParameter(
+            name="fields",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated job fields to return (e.g., "id,status,progress")',
+            required=False,
+        ),
+        OpenApiParameter(
+            name="jobs",
+            type=OpenApiTypes.BOOL,
+            location=OpenApiParameter.QUERY,
+            description="Set to false to return only the batch summary",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="wait",
+            type=OpenApiTypes.NUMBER,
+            location=OpenApiParameter.QUERY,
+            description="Seconds to wait until something changes or all jobs finish",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="since",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description="`version` of the previous response; with `wait`, return once it changes",
+            required=False,
+        ),
     ],
     responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
     description="Get status and progress of upgrade jobs by job IDs or batch ID",
@@ -441,83 +469,98 @@ def get_upgrade_status(request):
     or
     GET /api/upgrade/status/?batch_id=uuid
 
+    Optional: fields=id,status,progress (job fields to return), jobs=false
+    (summary only), wait=30&since=<version> (hold the request until the
+    status changes from `version` or every job has finished).
+
     Response:
     {
+        "count": 1,
+        "version": "5d41402abc4b2a76b9719d911017c592",
+        "summary": {
+            "total": 1,
+            "by_status": {"activating": 1},
+            "finished": 0,
+            "all_finished": false,
+            "failure_rate": null,
+            "progress": 66,
+            "eta_seconds": null
+        },
         "jobs": [
             {
-                "job_id": 101,
+                "id": 101,
                 "device_hostname": "switch-01",
-                "status": "success",
-                "progress": 100,
-                "current_step": "Post-Checks",
+                "status": "activating",
+                "progress": 66,
+                "current_step": "Activation",
+                "image_filename": "cat9k_iosxe.17.09.04a.SPA.bin",
+                "steps": [...],
                 "created_at": "2026-02-02T12:00:00Z",
                 "updated_at": "2026-02-02T12:15:00Z"
             }
         ]
     }
     """
-    from swim_backend.core.views import JobSerializer
+    import uuid
+    from django.conf import settings
+    from swim_backend.core.services.upgrade_status import (
+        DEFAULT_JOB_FIELDS,
+        JOB_FIELDS,
+        batch_summary,
+        job_rows,
+        status_version,
+        wait_for_status_change,
+    )
 
     job_ids_param = request.query_params.get("job_ids")
     batch_id_param = request.query_params.get("batch_id")
 
-    if job_ids_param:
-        # Get specific jobs
-        job_ids = [int(id.strip()) for id in job_ids_param.split(",")]
-        jobs = Job.objects.filter(id__in=job_ids).order_by("id")
-    elif batch_id_param:
-        # Get all jobs in a batch
-        jobs = Job.objects.filter(batch_id=batch_id_param).order_by("id")
-    else:
+    try:
+        if job_ids_param:
+            # Get specific jobs
+            job_ids = [int(id.strip()) for id in job_ids_param.split(",") if id.strip()]
+            jobs = Job.objects.filter(id__in=job_ids)
+        elif batch_id_param:
+            # Get all jobs in a batch
+            jobs = Job.objects.filter(batch_id=uuid.UUID(batch_id_param))
+        else:
+            return Response(
+                {
+                    "error": "Missing parameters",
+                    "message": "Please provide either job_ids or batch_id",
+                },
+                status=400,
+            )
+        wait = min(float(request.query_params.get("wait", 0)), getattr(settings, "CHANGE_FEED_MAX_WAIT", 25))
+    except ValueError:
         return Response(
             {
-                "error": "Missing parameters",
-                "message": "Please provide either job_ids or batch_id",
+                "error": "Invalid parameters",
+                "message": "job_ids must be integers, batch_id a UUID and wait a number of seconds",
             },
             status=400,
         )
 
-    serializer = JobSerializer(jobs, many=True)
-
-    # Add progress calculation
-    jobs_data = []
-    for job_data in serializer.data:
-        # Calculate progress based on steps
-        steps = job_data.get("steps", [])
-        if steps:
-            completed = sum(1 for s in steps if s.get("status") == "success")
-            progress = int((completed / len(steps)) * 100) if steps else 0
-        else:
-            # Fallback to status-based progress
-            status = job_data.get("status", "pending")
-            progress_map = {
-                "pending": 0,
-                "scheduled": 0,
-                "distributing": 30,
-                "distributed": 50,
-                "activating": 75,
-                "success": 100,
-                "failed": 100,
-                "cancelled": 0,
-            }
-            progress = progress_map.get(status, 0)
-
-        job_data["progress"] = progress
-
-        # Get current step
-        if steps:
-            current_step = next(
-                (s for s in steps if s.get("status") in ["running", "pending"]), None
-            )
-            job_data["current_step"] = (
-                current_step["name"] if current_step else "Completed"
-            )
-        else:
-            job_data["current_step"] = job_data.get("status", "Unknown").title()
+    fields = request.query_params.get("fields")
+    fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DEFAULT_JOB_FIELDS)
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown:
+        return Response(
+            {
+                "error": "Invalid parameters",
+                "message": f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(JOB_FIELDS)}",
+            },
+            status=400,
+        )
 
-        jobs_data.append(job_data)
+    since = request.query_params.get("since")
+    version = wait_for_status_change(jobs, since, wait) if wait > 0 else status_version(jobs)
 
-    return Response({"count": len(jobs_data), "jobs": jobs_data})
+    summary = batch_summary(jobs)
+    body = {"count": summary["total"], "version": version, "summary": summary}
+    if request.query_params.get("jobs", "true").lower() != "false":
+        body["jobs"] = job_rows(jobs, fields)
+    return Response(body)
 
 
 @extend_schema(
@@ -554,8 +597,14 @@ def cancel_upgrade(request):
             status=400,
         )
 
+    from swim_backend.core.services.change_feed import record_changes
+    from swim_backend.core.services.event_bus import publish_job_statuses
+
     jobs = Job.objects.filter(id__in=job_ids, status__in=["pending", "scheduled"])
-    cancelled_count = jobs.update(status="cancelled")
+    cancelled_ids = list(jobs.values_list("id", flat=True))
+    cancelled_count = Job.objects.filter(id__in=cancelled_ids).update(status="cancelled")
+    record_changes("job", cancelled_ids)
+    publish_job_statuses(cancelled_ids, "cancelled")
 
     return Response(
         {"status": "success", "cancelled": cancelled_count, "job_ids": job_ids}
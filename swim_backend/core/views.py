@@ -2,6 +2,7 @@ from rest_framework import serializers, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission, SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
 from .models import (
     Job,
     GoldenImage,
@@ -13,6 +14,9 @@ from .models import (
 )
 from swim_backend.devices.models import Device, Site, DeviceModel
 from .logic import run_swim_job, log_update
+from .pagination import KeysetPagination
+from .renderers import EventStreamRenderer
+from .change_feed_views import ChangeFeedETagMixin
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
 import threading
@@ -70,7 +74,36 @@ class GoldenImageViewSet(viewsets.ModelViewSet):
     serializer_class = GoldenImageSerializer
 
 
-class CheckRunSerializer(serializers.ModelSerializer):
+def check_output_file(run):
+    """
+    Path of the file holding a workflow check's output, or None when the output
+    is stored on the CheckRun itself (standalone checks).
+    Workflow checks store "precheck:path:name:category:command".
+    """
+    import os
+
+    output_str = run.output or ""
+    if not output_str.startswith(("precheck:", "postcheck:")):
+        return None
+    parts = output_str.split(":", 5)
+    if len(parts) < 5:
+        return None
+    phase, log_dir, check_name, category, command = parts[:5]
+
+    # Build filename based on check type
+    if category == "genie":
+        # Genie format: {feature}_{os}_{hostname}_ops.txt
+        filename = f"{command}_iosxe_{run.device.hostname}_ops.txt"
+    else:
+        # Command format: sanitized check name
+        safe_name = "".join(c if c.isalnum() else "_" for c in check_name)
+        filename = f"{safe_name}.txt"
+    return os.path.join(log_dir, phase, filename)
+
+
+class JobCheckRunSerializer(serializers.ModelSerializer):
+    """Check runs of a job; the output itself is loaded from CheckRunViewSet.output"""
+
     check_name = serializers.CharField(source="validation_check.name", read_only=True)
     check_type = serializers.CharField(
         source="validation_check.check_type", read_only=True
@@ -79,7 +112,6 @@ class CheckRunSerializer(serializers.ModelSerializer):
         source="validation_check.command", read_only=True
     )
     device_hostname = serializers.CharField(source="device.hostname", read_only=True)
-    output = serializers.SerializerMethodField()
     phase = serializers.SerializerMethodField()
 
     class Meta:
@@ -87,7 +119,6 @@ class CheckRunSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "status",
-            "output",
             "created_at",
             "check_name",
             "check_type",
@@ -105,46 +136,6 @@ class CheckRunSerializer(serializers.ModelSerializer):
             return "post"
         return "both"
 
-    def get_output(self, obj):
-        """Read actual file content from disk"""
-        import os
-
-        output_str = obj.output or ""
-
-        # Check if output contains file path info (format: "precheck:path:name:category:command")
-        if output_str.startswith(("precheck:", "postcheck:")):
-            try:
-                parts = output_str.split(":", 5)
-                if len(parts) >= 5:
-                    phase = parts[0]  # precheck or postcheck
-                    log_dir = parts[1]
-                    check_name = parts[2]
-                    category = parts[3]
-                    command = parts[4]
-
-                    # Build filename based on check type
-                    if category == "genie":
-                        # Genie format: {feature}_{os}_{hostname}_ops.txt
-                        device = obj.device
-                        filename = f"{command}_iosxe_{device.hostname}_ops.txt"
-                    else:
-                        # Command format: sanitized check name
-                        safe_name = "".join(
-                            c if c.isalnum() else "_" for c in check_name
-                        )
-                        filename = f"{safe_name}.txt"
-
-                    file_path = os.path.join(log_dir, phase, filename)
-
-                    if os.path.exists(file_path):
-                        with open(file_path, "r") as f:
-                            return f.read()
-            except Exception as e:
-                return f"Error reading check file: {e}"
-
-        # Fallback to stored output
-        return output_str
-
 
 class WorkflowStepSerializer(serializers.ModelSerializer):
     class Meta:
@@ -246,7 +237,7 @@ class JobSerializer(serializers.ModelSerializer):
     target_image = serializers.CharField(source="image.filename", read_only=True) 
 
     workflow_name = serializers.CharField(source="workflow.name", read_only=True)
-    check_runs = CheckRunSerializer(many=True, read_only=True)
+    check_runs = JobCheckRunSerializer(many=True, read_only=True)
 
     # Enhanced Details
     file_server_name = serializers.CharField(source="file_server.name", read_only=True)
@@ -272,6 +263,62 @@ class JobSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class JobListSerializer(serializers.ModelSerializer):
+    """
+    Compact job for lists and status polling: no log, check runs or selected
+    checks (those come with the job detail).
+    """
+
+    device_hostname = serializers.CharField(source="device.hostname", read_only=True)
+    image_filename = serializers.CharField(source="image.filename", read_only=True)
+    target_version = serializers.CharField(source="image.version", read_only=True)
+    target_image = serializers.CharField(source="image.filename", read_only=True)
+    workflow_name = serializers.CharField(source="workflow.name", read_only=True)
+    file_server_name = serializers.CharField(source="file_server.name", read_only=True)
+    progress = serializers.SerializerMethodField()
+    current_step = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "device",
+            "device_hostname",
+            "image",
+            "image_filename",
+            "target_version",
+            "target_image",
+            "file_server",
+            "file_server_name",
+            "workflow",
+            "workflow_name",
+            "status",
+            "task_name",
+            "execution_mode",
+            "batch_id",
+            "distribution_time",
+            "activation_time",
+            "activate_after_distribute",
+            "cleanup_flash",
+            "steps",
+            "progress",
+            "current_step",
+            "remarks",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_progress(self, obj):
+        from swim_backend.core.services.upgrade_status import job_progress
+
+        return job_progress(obj.status, obj.steps)
+
+    def get_current_step(self, obj):
+        from swim_backend.core.services.upgrade_status import current_step
+
+        return current_step(obj.status, obj.steps)
+
+
 class BulkCreateJobSerializer(serializers.Serializer):
     """Serializer for bulk job creation"""
 
@@ -318,9 +365,34 @@ class BulkRescheduleSerializer(serializers.Serializer):
     distribution_time = serializers.DateTimeField(help_text="New distribution time")
 
 
-class JobViewSet(viewsets.ModelViewSet):
-    queryset = Job.objects.all().order_by("-created_at")
+class JobViewSet(ChangeFeedETagMixin, viewsets.ModelViewSet):
+    queryset = Job.objects.all().order_by("-created_at", "-id")
     serializer_class = JobSerializer
+    pagination_class = KeysetPagination
+    etag_types = ("job", "device", "image")
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return JobListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related(
+            "device", "image", "workflow", "file_server"
+        )
+        if self.action == "list":
+            # Pollers only need status: skip the log and allow ?ids=1,2,3
+            queryset = queryset.defer("log")
+            ids = self.request.query_params.get("ids")
+            if ids:
+                queryset = queryset.filter(
+                    id__in=[i for i in ids.split(",") if i.strip().isdigit()]
+                )
+        elif self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                "check_runs__validation_check", "check_runs__device", "selected_checks"
+            )
+        return queryset
 
     def perform_create(self, serializer):
         job = serializer.save()
@@ -443,6 +515,39 @@ class JobViewSet(viewsets.ModelViewSet):
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
+    @action(detail=False, methods=["get"])
+    def transfer_plan(self, request):
+        """
+        Estimated transfer start/finish per job and for the whole campaign,
+        given site and file server bandwidth budgets.
+        Query Params: batch_id=<uuid> (default: all jobs not yet finished)
+        """
+        from swim_backend.core.services.transfer_planner import estimate_campaign, transfer_planner
+
+        jobs = Job.objects.filter(
+            status__in=["pending", "scheduled", "running"], image__isnull=False
+        ).select_related(
+            "device__site", "device__preferred_file_server", "device__site__preferred_file_server",
+            "device__site__region__preferred_file_server", "image", "file_server",
+        ).order_by("distribution_time", "id")
+
+        batch_id = request.query_params.get("batch_id")
+        if batch_id:
+            jobs = jobs.filter(batch_id=batch_id)
+
+        # Jobs already past distribution do not need a transfer slot
+        jobs = [
+            job for job in jobs
+            if not any(
+                s.get("step_type") == "distribution" and s.get("status") == "success"
+                for s in (job.steps or [])
+            )
+        ]
+
+        plan = estimate_campaign(jobs)
+        plan["active_transfers"] = transfer_planner.snapshot()
+        return Response(plan)
+
     @action(detail=False, methods=["post"], serializer_class=BulkCreateJobSerializer)
     def bulk_create(self, request):
         """
@@ -598,8 +703,13 @@ class JobViewSet(viewsets.ModelViewSet):
         if not job_ids or not new_time:
             return Response({"error": "ids and distribution_time required"}, status=400)
 
+        from .services.change_feed import record_changes
+        from .services.event_bus import publish_job_statuses
+
         jobs = Job.objects.filter(id__in=job_ids)
         updated_count = jobs.update(distribution_time=new_time, status="scheduled")
+        record_changes("job", jobs.values_list("id", flat=True))
+        publish_job_statuses(jobs.values_list("id", flat=True), "scheduled")
 
         # Log the update for each job
         for job in jobs:
@@ -607,6 +717,51 @@ class JobViewSet(viewsets.ModelViewSet):
 
         return Response({"status": "rescheduled", "count": updated_count})
 
+    @action(detail=True, methods=["get"], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def stream(self, request, pk=None):
+        """
+        Server-sent events for one job: `log` (new log text; the event id is
+        the log offset after it), `status` (status and steps), `progress`
+        (image transfer) and a final `end`. Resume with ?offset=N or the
+        Last-Event-ID header.
+        """
+        from .services.job_stream import parse_offsets
+
+        job = self.get_object()
+        resume = request.headers.get("Last-Event-ID") or request.query_params.get("offset")
+        return self._event_stream(("job", job.id), {"id": job.id}, parse_offsets(resume, [job.id]))
+
+    @action(detail=False, methods=["get"], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def batch_stream(self, request):
+        """
+        Server-sent events for every job of ?batch_id=<uuid>, as for a single
+        job. Event ids and ?offset= are "<job id>:<offset>,..." lists.
+        """
+        import uuid
+        from .services.job_stream import parse_offsets
+
+        try:
+            batch_id = uuid.UUID(request.query_params.get("batch_id", ""))
+        except ValueError:
+            return Response({"error": "batch_id must be a UUID"}, status=400)
+        if not Job.objects.filter(batch_id=batch_id).exists():
+            return Response({"error": "Batch not found"}, status=404)
+
+        resume = request.headers.get("Last-Event-ID") or request.query_params.get("offset")
+        return self._event_stream(("batch", str(batch_id)), {"batch_id": batch_id}, parse_offsets(resume))
+
+    def _event_stream(self, key, job_filter, offsets):
+        from .services.job_stream import stream_events
+        from .services.stream_slots import RETRY_AFTER, event_stream_response
+
+        response = event_stream_response(stream_events(key, job_filter, offsets))
+        if response is None:
+            return Response(
+                {"error": "Too many open streams, poll the job instead"},
+                status=503, headers={"Retry-After": str(RETRY_AFTER)},
+            )
+        return response
+
 
 class ValidationCheckSerializer(serializers.ModelSerializer):
     class Meta:
@@ -661,13 +816,55 @@ class RunChecksSerializer(serializers.Serializer):
     )
 
 
-class CheckRunViewSet(viewsets.ModelViewSet):
+class CheckRunViewSet(ChangeFeedETagMixin, viewsets.ModelViewSet):
     """
     API for managing standalone check executions.
     """
 
-    queryset = CheckRun.objects.all().order_by("-created_at")
+    queryset = CheckRun.objects.all().order_by("-created_at", "-id")
     serializer_class = CheckRunSerializer
+    pagination_class = KeysetPagination
+    etag_types = ("checkrun", "device")
+
+    @action(detail=True, methods=["get"])
+    def output(self, request, pk=None):
+        """
+        Output of one check as text/plain. Responses carry an ETag and
+        Last-Modified, so pollers revalidate with If-None-Match and get a 304
+        instead of the file again.
+        """
+        import os
+        import hashlib
+        from django.http import HttpResponse, HttpResponseNotModified
+        from django.utils.http import http_date, quote_etag
+
+        run = self.get_object()
+        path = check_output_file(run)
+
+        if path is None:
+            content = run.output or ""
+            etag = hashlib.md5(content.encode()).hexdigest()
+            modified = run.created_at.timestamp()
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            modified = stat.st_mtime
+            content = None
+        else:
+            return HttpResponse("Output file not found.", status=404, content_type="text/plain")
+
+        etag = quote_etag(etag)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            if content is None:
+                with open(path, "r", errors="replace") as f:
+                    content = f.read()
+            response = HttpResponse(content, content_type="text/plain; charset=utf-8")
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(modified)
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     @action(detail=False, methods=["post"], serializer_class=RunReadinessSerializer)
     def run_readiness(self, request):
@@ -777,10 +974,7 @@ class DashboardViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
-        from swim_backend.devices.models import Device
-        from .models import Job
-        from django.utils import timezone
-        import datetime
+        from .services.aggregate_cache import cached_aggregate
 
         # Check user permissions before showing data
         can_view_devices = request.user.is_superuser or request.user.has_perm(
@@ -790,6 +984,23 @@ class DashboardViewSet(viewsets.ViewSet):
             "core.view_job"
         )
 
+        # Users with the same permissions see the same figures and share the cache entry
+        data, hit = cached_aggregate(
+            "dashboard.stats",
+            f"devices={can_view_devices},jobs={can_view_jobs}",
+            lambda: self._compute_stats(can_view_devices, can_view_jobs),
+        )
+        response = Response(data)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def _compute_stats(self, can_view_devices, can_view_jobs):
+        from swim_backend.devices.models import Device
+        from .models import Job
+        from django.db.models import Count, Q
+        from django.utils import timezone
+        import datetime
+
         # Initialize default values
         total_devices = 0
         site_count = 0
@@ -799,21 +1010,22 @@ class DashboardViewSet(viewsets.ViewSet):
         devices_per_model = []
         devices_per_version = []
         compliant_count = 0
+        ahead_count = 0
         non_compliant_count = 0
 
         # Get device data if user has permission
         if can_view_devices:
-            total_devices = Device.objects.count()
+            totals = Device.objects.aggregate(
+                total=Count("id"),
+                reachable=Count("id", filter=Q(reachability="Reachable")),
+                unreachable=Count("id", filter=Q(reachability="Unreachable")),
+            )
+            total_devices = totals["total"]
+            reachable_count = totals["reachable"]
+            unreachable_count = totals["unreachable"]
             sites_qs = Device.objects.values("site").distinct()
             site_count = sites_qs.count()
 
-            reachable_count = Device.objects.filter(reachability="Reachable").count()
-            unreachable_count = Device.objects.filter(
-                reachability="Unreachable"
-            ).count()
-
-            from django.db.models import Count
-
             # Aggregations for Graphs
             devices_per_site = list(
                 Device.objects.values("site__name")
@@ -831,60 +1043,17 @@ class DashboardViewSet(viewsets.ViewSet):
                 .order_by("-value")
             )
 
-            # Check which devices are running the right IOS version
-            compliant_count = 0  # Running golden image
-            ahead_count = 0  # Running newer than standard
-            non_compliant_count = 0  # Outdated or no standard set
-
-            def compare_versions(v1, v2):
-                """Compare IOS version strings. Returns: -1 (older), 0 (same), 1 (newer)"""
-                if not v1 or not v2:
-                    return None
-                try:
-                    p1 = str(v1).replace("-", ".").split(".")
-                    p2 = str(v2).replace("-", ".").split(".")
-                    for i in range(max(len(p1), len(p2))):
-                        val1 = p1[i] if i < len(p1) else "0"
-                        val2 = p2[i] if i < len(p2) else "0"
-                        # Try to compare as integers
-                        try:
-                            n1 = int("".join(filter(str.isdigit, val1)) or "0")
-                            n2 = int("".join(filter(str.isdigit, val2)) or "0")
-                            if n1 > n2:
-                                return 1
-                            elif n1 < n2:
-                                return -1
-                        except ValueError:
-                            if val1 > val2:
-                                return 1
-                            elif val1 < val2:
-                                return -1
-                    return 0
-                except:
-                    return None
-
-            for dev in Device.objects.all():
-                if not dev.model:
-                    non_compliant_count += 1  # No model
-                    continue
-
-                # Get golden version from either default_image or golden_image_version
-                golden_version = None
-                if dev.model.default_image:
-                    golden_version = dev.model.default_image.version
-                elif dev.model.golden_image_version:
-                    golden_version = dev.model.golden_image_version
-
-                if not golden_version:
-                    non_compliant_count += 1  # No Standard
-                else:
-                    comparison = compare_versions(dev.version, golden_version)
-                    if comparison is None or comparison < 0:
-                        non_compliant_count += 1  # Outdated or unparseable
-                    elif comparison == 0:
-                        compliant_count += 1  # Up to Date
-                    else:  # comparison > 0
-                        ahead_count += 1  # Ahead
+            # Compliance is stored per device; "No Standard" counts as non-compliant
+            compliance = dict(
+                Device.objects.values_list("compliance_status")
+                .annotate(value=Count("id"))
+                .order_by()
+            )
+            compliant_count = compliance.get("Compliant", 0)
+            ahead_count = compliance.get("Ahead", 0)
+            non_compliant_count = compliance.get("Non-Compliant", 0) + compliance.get(
+                "No Standard", 0
+            )
 
         # Calculate health percentage
         health_percentage = 0
@@ -900,78 +1069,75 @@ class DashboardViewSet(viewsets.ViewSet):
 
         if can_view_jobs:
             last_24h = timezone.now() - datetime.timedelta(days=1)
-            critical_issues = Job.objects.filter(
-                status="failed", created_at__gte=last_24h
-            ).count()
-
-            # Job Status Breakdown
-            jobs_running = Job.objects.filter(
-                status__in=["running", "distributing", "activating"]
-            ).count()
-            jobs_scheduled = Job.objects.filter(
-                status__in=["scheduled", "pending"]
-            ).count()
-            jobs_failed = Job.objects.filter(status="failed").count()
-            jobs_success = Job.objects.filter(
-                status__in=["success", "distributed"]
-            ).count()
+            # Job Status Breakdown, in one scan
+            counts = Job.objects.aggregate(
+                critical=Count("id", filter=Q(status="failed", created_at__gte=last_24h)),
+                running=Count("id", filter=Q(status__in=["running", "distributing", "activating"])),
+                scheduled=Count("id", filter=Q(status__in=["scheduled", "pending"])),
+                failed=Count("id", filter=Q(status="failed")),
+                success=Count("id", filter=Q(status__in=["success", "distributed"])),
+            )
+            critical_issues = counts["critical"]
+            jobs_running = counts["running"]
+            jobs_scheduled = counts["scheduled"]
+            jobs_failed = counts["failed"]
+            jobs_success = counts["success"]
+
+        ztp_counts = ZTPWorkflow.objects.aggregate(
+            active=Count("id", filter=Q(status="active")),
+            paused=Count("id", filter=Q(status="paused")),
+        )
 
-        return Response(
-            {
-                "health": {
-                    "percentage": health_percentage,
-                    "reachable": reachable_count,
-                    "unreachable": unreachable_count,
-                },
-                "issues": {"critical": critical_issues, "warning": 0},
-                "network": {
-                    "sites": site_count,
-                    "devices": total_devices,
-                    "unprovisioned": 0,
-                    "unclaimed": 0,
-                },
-                "analytics": {
-                    "by_site": [
-                        {"name": d["site__name"] or "Unknown", "value": d["value"]}
-                        for d in devices_per_site
-                    ],
-                    "by_model": [
-                        {"name": d["model__name"] or "Unknown", "value": d["value"]}
-                        for d in devices_per_model
-                    ],
-                    "by_version": [
-                        {"name": d["version"] or "Unknown", "value": d["value"]}
-                        for d in devices_per_version
-                    ],
-                    "compliance": [
-                        {"name": "Compliant", "value": compliant_count},
-                        {"name": "Ahead", "value": ahead_count},
-                        {"name": "Non-Compliant", "value": non_compliant_count},
-                    ],
-                    "job_status": [
-                        {"name": "Running", "value": jobs_running},
-                        {"name": "Scheduled", "value": jobs_scheduled},
-                        {"name": "Failed", "value": jobs_failed},
-                        {"name": "Success", "value": jobs_success},
-                    ],
-                },
-                "ztp": {
-                    "active_workflows": ZTPWorkflow.objects.filter(
-                        status="active"
-                    ).count(),
-                    "paused_workflows": ZTPWorkflow.objects.filter(
-                        status="paused"
-                    ).count(),
-                    "total_provisioned_today": ZTPWorkflow.objects.filter(
-                        devices_provisioned__jobs__created_at__gte=timezone.now().replace(
-                            hour=0, minute=0, second=0
-                        )
+        return {
+            "health": {
+                "percentage": health_percentage,
+                "reachable": reachable_count,
+                "unreachable": unreachable_count,
+            },
+            "issues": {"critical": critical_issues, "warning": 0},
+            "network": {
+                "sites": site_count,
+                "devices": total_devices,
+                "unprovisioned": 0,
+                "unclaimed": 0,
+            },
+            "analytics": {
+                "by_site": [
+                    {"name": d["site__name"] or "Unknown", "value": d["value"]}
+                    for d in devices_per_site
+                ],
+                "by_model": [
+                    {"name": d["model__name"] or "Unknown", "value": d["value"]}
+                    for d in devices_per_model
+                ],
+                "by_version": [
+                    {"name": d["version"] or "Unknown", "value": d["value"]}
+                    for d in devices_per_version
+                ],
+                "compliance": [
+                    {"name": "Compliant", "value": compliant_count},
+                    {"name": "Ahead", "value": ahead_count},
+                    {"name": "Non-Compliant", "value": non_compliant_count},
+                ],
+                "job_status": [
+                    {"name": "Running", "value": jobs_running},
+                    {"name": "Scheduled", "value": jobs_scheduled},
+                    {"name": "Failed", "value": jobs_failed},
+                    {"name": "Success", "value": jobs_success},
+                ],
+            },
+            "ztp": {
+                "active_workflows": ztp_counts["active"],
+                "paused_workflows": ztp_counts["paused"],
+                "total_provisioned_today": ZTPWorkflow.objects.filter(
+                    devices_provisioned__jobs__created_at__gte=timezone.now().replace(
+                        hour=0, minute=0, second=0
                     )
-                    .distinct()
-                    .count(),
-                },
-            }
-        )
+                )
+                .distinct()
+                .count(),
+            },
+        }
 
     @action(detail=False, methods=["get"])
     def supported_models(self, request):
@@ -990,19 +1156,33 @@ class DashboardViewSet(viewsets.ViewSet):
         """Get devices that are NOT in supported models list"""
         from django.conf import settings
         from swim_backend.devices.models import Device
+        from .services.aggregate_cache import cached_aggregate
 
         supported = settings.SUPPORTED_DEVICE_MODELS
-        unsupported = Device.objects.exclude(model__name__in=supported).values(
-            "id", "hostname", "model__name"
-        )
 
-        return Response(
-            {
+        def compute():
+            unsupported = list(
+                Device.objects.exclude(model__name__in=supported).values(
+                    "id", "hostname", "model__name"
+                )
+            )
+            return {
                 "supported_count": len(supported),
-                "unsupported_devices": list(unsupported),
+                "unsupported_devices": unsupported,
                 "unsupported_count": len(unsupported),
             }
-        )
+
+        data, hit = cached_aggregate("dashboard.device_compliance", "all", compute)
+        response = Response(data)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    @action(detail=False, methods=["get"])
+    def cache_stats(self, request):
+        """Hit rate of the aggregate cache, per endpoint"""
+        from .services.aggregate_cache import cache_stats
+
+        return Response(cache_stats())
 
 
 # ============================================================================
@@ -1137,6 +1317,10 @@ class ZTPProvisionDeviceSerializer(serializers.Serializer):
     )
 
 
+# ZTP syncs a device right after reading its show version; facts this recent are reused
+ZTP_FACTS_MAX_AGE = 300
+
+
 def run_ztp_provisioning(ztp_id, ip_address, username, password, secret, platform, family, site_id, hostname_override, user_id, remarks):
     """
     Background task to handle ZTP provisioning:
@@ -1148,6 +1332,8 @@ def run_ztp_provisioning(ztp_id, ip_address, username, password, secret, platfor
     """
     from swim_backend.devices.models import Device, DeviceModel, Site
     from swim_backend.core.services.genie_service import create_genie_device
+    from swim_backend.core.services.show_version_parser import parse_show_version
+    from swim_backend.core.services.device_facts import record_show_version
     from swim_backend.core.services.sync_service import sync_device_details
     from swim_backend.core.models import ZTPWorkflow, Job
     from swim_backend.images.models import FileServer
@@ -1191,7 +1377,7 @@ def run_ztp_provisioning(ztp_id, ip_address, username, password, secret, platfor
         )
 
         # Pull MAC from show version output
-        output = dev.parse("show version")
+        output = parse_show_version(dev)
         mac_address = None
 
         if isinstance(output, dict):
@@ -1266,7 +1452,9 @@ def run_ztp_provisioning(ztp_id, ip_address, username, password, secret, platfor
 
         try:
             # Pull full device details - model, version, hardware info
-            sync_device_details(device.id)
+            # (reuses the show version collected above instead of logging in again)
+            record_show_version(device.id, output)
+            sync_device_details(device.id, max_facts_age=ZTP_FACTS_MAX_AGE)
             device.refresh_from_db()
             log_update(
                 f"ztp_{ztp_id}",
@@ -1454,6 +1642,10 @@ class ZTPWorkflowViewSet(viewsets.ModelViewSet):
         if not all([ip_address, platform]):
             return Response({"error": "Missing required fields: ip_address, platform"}, status=400)
 
+        from .services.event_bus import publish
+
+        publish("ztp.intake", {"ztp": ztp.id, "ip_address": ip_address, "platform": platform})
+
         # Spawn background processing
         import threading
         t = threading.Thread(
@@ -1512,6 +1704,8 @@ class ZTPWorkflowViewSet(viewsets.ModelViewSet):
 
         from swim_backend.devices.models import Device, DeviceModel
         from swim_backend.core.services.genie_service import create_genie_device
+        from swim_backend.core.services.show_version_parser import parse_show_version
+        from swim_backend.core.services.device_facts import record_show_version
 
         try:
             log_update(f"ztp_{pk}", f"Connecting to {ip_address}...")
@@ -1535,7 +1729,7 @@ class ZTPWorkflowViewSet(viewsets.ModelViewSet):
             )
 
             # Pull MAC from show version output
-            output = dev.parse("show version")
+            output = parse_show_version(dev)
             mac_address = None
 
             if isinstance(output, dict):
@@ -1628,7 +1822,9 @@ class ZTPWorkflowViewSet(viewsets.ModelViewSet):
 
         try:
             # Pull full device details - model, version, hardware info
-            sync_device_details(device.id)
+            # (reuses the show version collected above instead of logging in again)
+            record_show_version(device.id, output)
+            sync_device_details(device.id, max_facts_age=ZTP_FACTS_MAX_AGE)
             device.refresh_from_db()
             log_update(
                 f"ztp_{pk}",
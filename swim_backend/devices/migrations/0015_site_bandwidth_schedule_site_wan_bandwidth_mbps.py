@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0014_devicesynchistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='site',
+            name='bandwidth_schedule',
+            field=models.JSONField(blank=True, default=list, help_text='Time-of-day overrides, e.g. [{"start": "08:00", "end": "18:00", "mbps": 20}]'),
+        ),
+        migrations.AddField(
+            model_name='site',
+            name='wan_bandwidth_mbps',
+            field=models.FloatField(blank=True, help_text='Budget for image transfers (Mbps), empty for unlimited', null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0017_device_import_run'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadinessRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('ready', models.IntegerField(default=0)),
+                ('reused', models.IntegerField(default=0, help_text='Devices answered from a recent result instead of being checked again')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadinessResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ready', models.BooleanField(default=False)),
+                ('target_version', models.CharField(blank=True, max_length=50, null=True)),
+                ('target_image_file', models.CharField(blank=True, max_length=255, null=True)),
+                ('target_image_size', models.BigIntegerField(default=0)),
+                ('checks', models.JSONField(blank=True, default=list, help_text='Checks as shown in the UI')),
+                ('raw_results', models.JSONField(blank=True, default=dict, help_text='Results of the readiness strategy')),
+                ('reused', models.BooleanField(default=False)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='readiness_results', to='devices.device')),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='devices.readinessrun')),
+            ],
+            options={
+                'ordering': ['-checked_at'],
+                'indexes': [models.Index(fields=['device', '-checked_at'], name='devices_rea_device__a89946_idx')],
+            },
+        ),
+    ]
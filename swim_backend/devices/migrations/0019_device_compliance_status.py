@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:36
+
+from django.db import migrations, models
+
+
+def backfill_compliance(apps, schema_editor):
+    from swim_backend.core.services.compliance_service import compliance_status
+
+    Device = apps.get_model('devices', 'Device')
+    DeviceModel = apps.get_model('devices', 'DeviceModel')
+    golden = {
+        model_id: image_version or version
+        for model_id, image_version, version in DeviceModel.objects.values_list(
+            'id', 'default_image__version', 'golden_image_version'
+        )
+    }
+    by_status = {}
+    for device_id, version, model_id in Device.objects.values_list('id', 'version', 'model_id'):
+        by_status.setdefault(compliance_status(version, golden.get(model_id)), []).append(device_id)
+    for status, ids in by_status.items():
+        Device.objects.filter(id__in=ids).update(compliance_status=status)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0018_readiness_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='compliance_status',
+            field=models.CharField(choices=[('Compliant', 'Compliant'), ('Ahead', 'Ahead'), ('Non-Compliant', 'Non-Compliant'), ('No Standard', 'No Standard')], db_index=True, default='No Standard', max_length=20),
+        ),
+        migrations.RunPython(backfill_compliance, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+def backfill_version_keys(apps, schema_editor):
+    from swim_backend.core.services.version_parser import version_key
+
+    for model_name, field in [('Device', 'version'), ('DeviceModel', 'golden_image_version')]:
+        model = apps.get_model('devices', model_name)
+        for version in model.objects.values_list(field, flat=True).distinct():
+            if version:
+                model.objects.filter(**{field: version}).update(**{f'{field}_key': version_key(version)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0019_device_compliance_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='version_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.AddField(
+            model_name='devicemodel',
+            name='golden_image_version_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.RunPython(backfill_version_keys, migrations.RunPython.noop),
+    ]
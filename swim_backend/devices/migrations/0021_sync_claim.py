@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0020_version_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncClaim',
+            fields=[
+                ('device', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sync_claim', serialize=False, to='devices.device')),
+                ('claimed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sync_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='claims', to='devices.syncrun')),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0021_sync_claim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRunResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failed', 'Failed')], max_length=20)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_run_results', to='devices.device')),
+                ('sync_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_results', to='devices.syncrun')),
+            ],
+            options={
+                'ordering': ['finished_at', 'id'],
+            },
+        ),
+    ]
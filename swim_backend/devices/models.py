@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.utils import timezone
+from swim_backend.core.services.version_parser import KEY_LENGTH, version_key
 
 
 class Region(models.Model):
@@ -41,6 +43,16 @@ class Site(models.Model):
         Region, on_delete=models.SET_NULL, null=True, blank=True, related_name="sites"
     )
 
+    # WAN bandwidth budget for image transfers into this site
+    wan_bandwidth_mbps = models.FloatField(
+        null=True, blank=True, help_text="Budget for image transfers (Mbps), empty for unlimited"
+    )
+    bandwidth_schedule = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Time-of-day overrides, e.g. [{"start": "08:00", "end": "18:00", "mbps": 20}]',
+    )
+
     def __str__(self):
         return self.name
 
@@ -51,6 +63,10 @@ class DeviceModel(models.Model):
 
     # Golden Image Standards
     golden_image_version = models.CharField(max_length=50, blank=True, null=True)
+    # Sortable form of golden_image_version (see core.services.version_parser)
+    golden_image_version_key = models.CharField(
+        max_length=KEY_LENGTH, blank=True, default="", db_index=True, editable=False
+    )
     golden_image_file = models.CharField(max_length=255, blank=True, null=True)
     golden_image_size = models.BigIntegerField(
         null=True, blank=True, help_text="Size in bytes"
@@ -86,6 +102,13 @@ class DeviceModel(models.Model):
         help_text="List of allowed images",
     )
 
+    def save(self, *args, **kwargs):
+        self.golden_image_version_key = version_key(self.golden_image_version)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "golden_image_version" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"golden_image_version_key"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -109,6 +132,10 @@ class Device(models.Model):
         related_name="devices",
     )
     version = models.CharField(max_length=50, blank=True, null=True)
+    # Sortable form of version, for range queries (see core.services.version_parser)
+    version_key = models.CharField(
+        max_length=KEY_LENGTH, blank=True, default="", db_index=True, editable=False
+    )
 
     # New fields for Feature Parity
     FAMILY_CHOICES = [
@@ -156,6 +183,18 @@ class Device(models.Model):
     )
     last_sync_time = models.DateTimeField(null=True, blank=True)
 
+    # Software compliance against the model's golden image, kept up to date by
+    # core.services.compliance_service
+    COMPLIANCE_CHOICES = [
+        ("Compliant", "Compliant"),
+        ("Ahead", "Ahead"),
+        ("Non-Compliant", "Non-Compliant"),
+        ("No Standard", "No Standard"),
+    ]
+    compliance_status = models.CharField(
+        max_length=20, choices=COMPLIANCE_CHOICES, default="No Standard", db_index=True
+    )
+
     site = models.ForeignKey(
         Site, on_delete=models.SET_NULL, null=True, blank=True, related_name="devices"
     )
@@ -186,15 +225,121 @@ class Device(models.Model):
                         }
                     )
 
-    def save(self, *args, **kwargs):
-        """Override save to call full_clean for validation"""
-        self.full_clean()
+    def save(self, *args, skip_validation=False, **kwargs):
+        """
+        Override save to call full_clean for validation.
+        Internal writes of already validated data can pass skip_validation=True.
+        Compliance is recomputed whenever the version or model may have changed.
+        """
+        if not skip_validation:
+            self.full_clean()
+
+        update_fields = kwargs.get("update_fields")
+        self.version_key = version_key(self.version)
+        if update_fields is not None and "version" in update_fields:
+            update_fields = kwargs["update_fields"] = set(update_fields) | {"version_key"}
+
+        if update_fields is None or {"version", "model", "model_id"} & set(update_fields):
+            from swim_backend.core.services.compliance_service import device_compliance
+
+            self.compliance_status = device_compliance(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"compliance_status"}
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.hostname
 
 
+class DeviceImportRun(models.Model):
+    """One CSV device import, run in the background, with its progress and error report"""
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    filename = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    imported = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    skipped = models.IntegerField(default=0)
+    errors = models.JSONField(
+        default=list, blank=True, help_text="Skipped rows: [{row, hostname, ip_address, error}]"
+    )
+    error = models.TextField(blank=True, null=True, help_text="Why the import failed as a whole")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Import {self.filename} ({self.processed_rows}/{self.total_rows})"
+
+
+class ReadinessRun(models.Model):
+    """One readiness check request across a set of devices"""
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    ready = models.IntegerField(default=0)
+    reused = models.IntegerField(
+        default=0, help_text="Devices answered from a recent result instead of being checked again"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Readiness ({self.completed}/{self.total})"
+
+
+class ReadinessResult(models.Model):
+    """Readiness of one device for a target image, as observed at checked_at"""
+
+    run = models.ForeignKey(
+        ReadinessRun, on_delete=models.CASCADE, null=True, blank=True, related_name="results"
+    )
+    device = models.ForeignKey(
+        Device, on_delete=models.CASCADE, related_name="readiness_results"
+    )
+    ready = models.BooleanField(default=False)
+    target_version = models.CharField(max_length=50, blank=True, null=True)
+    target_image_file = models.CharField(max_length=255, blank=True, null=True)
+    target_image_size = models.BigIntegerField(default=0)
+    checks = models.JSONField(default=list, blank=True, help_text="Checks as shown in the UI")
+    raw_results = models.JSONField(default=dict, blank=True, help_text="Results of the readiness strategy")
+    reused = models.BooleanField(default=False)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    checked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-checked_at"]
+        indexes = [models.Index(fields=["device", "-checked_at"])]
+
+    def __str__(self):
+        return f"{self.device.hostname} {'Ready' if self.ready else 'Not Ready'} at {self.checked_at}"
+
+
 class DeviceSyncHistory(models.Model):
     """Track all sync operations for a device"""
 
@@ -215,9 +360,75 @@ class DeviceSyncHistory(models.Model):
     error_message = models.TextField(blank=True, null=True)
     version_discovered = models.CharField(max_length=100, blank=True, null=True)
     model_discovered = models.CharField(max_length=100, blank=True, null=True)
+    sync_run = models.ForeignKey(
+        "SyncRun", on_delete=models.SET_NULL, null=True, blank=True, related_name="results"
+    )
+    duration_seconds = models.FloatField(null=True, blank=True)
 
     class Meta:
         ordering = ["-timestamp"]
 
     def __str__(self):
         return f"{self.device.hostname} - {self.timestamp} ({self.status})"
+
+
+class SyncRun(models.Model):
+    """One fleet sync request and its aggregated progress"""
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+    ]
+
+    scope = models.CharField(max_length=20)
+    scope_value = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    succeeded = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    coalesced = models.IntegerField(
+        default=0, help_text="Devices skipped because they were already queued by another run"
+    )
+    failure_reasons = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Sync {self.scope} ({self.completed}/{self.total})"
+
+
+class SyncRunResult(models.Model):
+    """Outcome of one device in a sync run; written for every device, changed or not"""
+
+    sync_run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="device_results")
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name="sync_run_results")
+    status = models.CharField(max_length=20, choices=[("success", "Success"), ("failed", "Failed")])
+    duration_seconds = models.FloatField(null=True, blank=True)
+    error_message = models.TextField(blank=True, null=True)
+    finished_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["finished_at", "id"]
+
+    def __str__(self):
+        return f"{self.device_id} in sync {self.sync_run_id}: {self.status}"
+
+
+class SyncClaim(models.Model):
+    """A device queued or syncing for a run, in any worker process"""
+
+    device = models.OneToOneField(
+        Device, on_delete=models.CASCADE, primary_key=True, related_name="sync_claim"
+    )
+    sync_run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="claims")
+    claimed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.device_id} claimed by sync {self.sync_run_id}"
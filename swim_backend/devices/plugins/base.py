@@ -40,3 +40,12 @@ class BaseInventoryPlugin(ABC):
         Returns list of dicts: [{'name': '...', 'ip': '...', ...}]
         """
         pass
+
+    def iter_devices(self, config, filters, since=None):
+        """
+        Yield devices matching filters, in the format of preview_devices.
+        `since` (ISO timestamp) restricts to devices changed since then, and
+        records may carry 'last_updated' for the next delta import.
+        Plugins with paged APIs should override this to stream pages.
+        """
+        yield from self.preview_devices(config, filters)
@@ -1,6 +1,7 @@
 import requests
 import logging
 import re
+from swim_backend.core.services.netbox_service import device_record, paginate
 from .base import BaseInventoryPlugin
 from .registry import PluginRegistry
 
@@ -26,35 +27,28 @@ class NetBoxPlugin(BaseInventoryPlugin):
     def get_filter_metadata(self, config):
         client = self._get_client(config)
         return {
-            "sites": [{'id': s['id'], 'name': s['name'], 'slug': s['slug']} for s in client.get('dcim/sites', {'limit': 0}).get('results', [])],
-            "roles": [{'id': r['id'], 'name': r['name'], 'slug': r['slug']} for r in client.get('dcim/device-roles', {'limit': 0}).get('results', [])],
-            "types": [{'id': t['id'], 'model': t['model'], 'slug': t['slug']} for t in client.get('dcim/device-types', {'limit': 0}).get('results', [])]
+            "sites": [{'id': s['id'], 'name': s['name'], 'slug': s['slug']} for s in paginate(client.get, 'dcim/sites')],
+            "roles": [{'id': r['id'], 'name': r['name'], 'slug': r['slug']} for r in paginate(client.get, 'dcim/device-roles')],
+            "types": [{'id': t['id'], 'model': t['model'], 'slug': t['slug']} for t in paginate(client.get, 'dcim/device-types')]
         }
 
     def preview_devices(self, config, filters):
+        return list(self.iter_devices(config, filters))
+
+    def iter_devices(self, config, filters, since=None):
         client = self._get_client(config)
-        params = {'limit': 0}
-        
+        params = {'ordering': 'id'}
+
         if filters.get('site'): params['site'] = filters['site']
         if filters.get('role'): params['role'] = filters['role']
         if filters.get('device_type'): params['device_type_id'] = filters['device_type']
         if filters.get('search'): params['q'] = filters['search']
+        if since: params['last_updated__gte'] = since
 
-        data = client.get('dcim/devices', params)
-        results = []
-        
-        for d in data.get('results', []):
+        for d in paginate(client.get, 'dcim/devices', params):
             if d.get('primary_ip'):
-                ip = d['primary_ip']['address'].split('/')[0]
-                results.append({
-                    'name': d['name'],
-                    'ip_address': ip,
-                    'platform': d['platform']['name'] if d.get('platform') else 'iosxe',
-                    'site': d['site']['name'] if d.get('site') else 'Global',
-                    'role': d['device_role']['name'] if d.get('device_role') else 'Switch',
-                    'model': d['device_type']['model'] if d.get('device_type') else 'Unknown',
-                })
-        return results
+                yield device_record(d)
+
 
 class _NetBoxClient:
     def __init__(self, url, token, version='v1', api_key=''):
@@ -88,9 +82,13 @@ class _NetBoxClient:
                  
             self.headers = {'Authorization': f'{prefix} {cleaned_token}', 'Accept': 'application/json'}
 
+        # One keep-alive session for all pages of a listing
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
     def get(self, endpoint, params=None):
         try:
-            r = requests.get(f"{self.url}/api/{endpoint}/", headers=self.headers, params=params, timeout=10)
+            r = self.session.get(f"{self.url}/api/{endpoint}/", params=params, timeout=30)
             r.raise_for_status()
             return r.json()
         except Exception as e:
@@ -7,9 +7,12 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
 from .models import Device, Site, DeviceModel, Region, GlobalCredential
 import csv
-import io
 import os
+from django.conf import settings
 from .plugins.registry import PluginRegistry
+from swim_backend.core.filters import VersionKeyFilter
+from swim_backend.core.pagination import DevicePagination
+from swim_backend.core.change_feed_views import ChangeFeedETagMixin
 from swim_backend.core.services.sync_service import run_sync_task
 
 # Pull Image details from images app
@@ -31,6 +34,7 @@ class DeviceFilter(django_filters.FilterSet):
     site = django_filters.NumberFilter(field_name="site__id")
     site__name = django_filters.CharFilter(field_name="site__name", lookup_expr="exact")
     device_model = django_filters.NumberFilter(field_name="model__id")
+    compliance_status = django_filters.ChoiceFilter(choices=Device.COMPLIANCE_CHOICES)
 
     # Additional filters: case-insensitive exact match (__ie)
     hostname__ie = django_filters.CharFilter(
@@ -66,6 +70,12 @@ class DeviceFilter(django_filters.FilterSet):
     version__ic = django_filters.CharFilter(
         field_name="version", lookup_expr="icontains"
     )
+
+    # Version ranges, compared in SQL on the indexed version key
+    version__lt = VersionKeyFilter(field_name="version_key", lookup_expr="lt")
+    version__lte = VersionKeyFilter(field_name="version_key", lookup_expr="lte")
+    version__gt = VersionKeyFilter(field_name="version_key", lookup_expr="gt")
+    version__gte = VersionKeyFilter(field_name="version_key", lookup_expr="gte")
     site__name__ic = django_filters.CharFilter(
         field_name="site__name", lookup_expr="icontains"
     )
@@ -85,6 +95,7 @@ class DeviceFilter(django_filters.FilterSet):
             "site",
             "site__name",
             "device_model",
+            "compliance_status",
         ]
 
 
@@ -228,83 +239,41 @@ class DeviceSerializer(serializers.ModelSerializer):
         source="model.id", read_only=True, allow_null=True
     )
 
-    compliance_status = serializers.SerializerMethodField()
     golden_image = serializers.SerializerMethodField()
 
     class Meta:
         model = Device
         fields = "__all__"
-
-    def get_compliance_status(self, obj):
-        if not obj.model:
-            return "No Standard"
-
-        # Get golden version from either the new default_image or old golden_image_version field
-        golden_version = None
-        if obj.model.default_image:
-            golden_version = obj.model.default_image.version
-        elif obj.model.golden_image_version:
-            golden_version = obj.model.golden_image_version
-
-        if not golden_version:
-            return "No Standard"
-
-        # Version comparison to match dashboard logic
-        def compare_versions(v1, v2):
-            """Returns: -1 (v1 < v2), 0 (equal), 1 (v1 > v2), None (error)"""
-            if not v1 or not v2:
-                return None
-            try:
-                p1 = str(v1).replace("-", ".").split(".")
-                p2 = str(v2).replace("-", ".").split(".")
-                for i in range(max(len(p1), len(p2))):
-                    val1 = p1[i] if i < len(p1) else "0"
-                    val2 = p2[i] if i < len(p2) else "0"
-                    try:
-                        n1 = int("".join(filter(str.isdigit, val1)) or "0")
-                        n2 = int("".join(filter(str.isdigit, val2)) or "0")
-                        if n1 > n2:
-                            return 1
-                        elif n1 < n2:
-                            return -1
-                    except ValueError:
-                        if val1 > val2:
-                            return 1
-                        elif val1 < val2:
-                            return -1
-                return 0
-            except:
-                return None
-
-        comparison = compare_versions(obj.version, golden_version)
-        if comparison is None or comparison < 0:
-            return "Non-Compliant"  # Outdated or unparseable
-        elif comparison == 0:
-            return "Compliant"  # Up to Date
-        else:  # comparison > 0
-            return "Ahead"  # Newer than golden
+        read_only_fields = ["compliance_status"]
 
     def get_golden_image(self, obj):
         if not obj.model:
             return None
 
+        # A page of devices shares a handful of models; build each model's options once
+        golden_images = self.context.setdefault("golden_images", {})
+        if obj.model_id not in golden_images:
+            golden_images[obj.model_id] = self._golden_image(obj.model)
+        return golden_images[obj.model_id]
+
+    def _golden_image(self, model):
         # Prefer new model
-        if obj.model.default_image:
+        default_image = model.default_image
+        if default_image:
             # Build list of options
-            options = []
-            if obj.model.default_image:
-                options.append(
-                    {
-                        "id": obj.model.default_image.id,
-                        "version": obj.model.default_image.version,
-                        "file": obj.model.default_image.filename,
-                        "tag": "Default",
-                    }
-                )
+            options = [
+                {
+                    "id": default_image.id,
+                    "version": default_image.version,
+                    "file": default_image.filename,
+                    "tag": "Default",
+                }
+            ]
 
-            for img in obj.model.supported_images.all():
+            # supported_images is prefetched by DeviceViewSet
+            for img in model.supported_images.all():
                 # Avoid dupes
-                if obj.model.default_image and img.id == obj.model.default_image.id:
+                if img.id == default_image.id:
                     continue
                 options.append(
                     {
@@ -316,19 +285,19 @@ class DeviceSerializer(serializers.ModelSerializer):
                 )
 
             return {
-                "id": obj.model.default_image.id,
-                "version": obj.model.default_image.version,
-                "file": obj.model.default_image.filename,
-                "size": obj.model.default_image.size_bytes,
-                "md5": obj.model.default_image.md5_checksum,
+                "id": default_image.id,
+                "version": default_image.version,
+                "file": default_image.filename,
+                "size": default_image.size_bytes,
+                "md5": default_image.md5_checksum,
                 "is_new_model": True,
                 "available_images": options,
             }
 
         # Fallback
         return {
-            "version": obj.model.golden_image_version,
-            "file": obj.model.golden_image_file,
+            "version": model.golden_image_version,
+            "file": model.golden_image_file,
             "is_new_model": False,
             "available_images": [],
         }
@@ -350,7 +319,7 @@ class DeviceModelViewSet(viewsets.ModelViewSet):
         "golden_image_path",
         "golden_image_md5",
     ]
-    ordering_fields = ["name", "vendor", "golden_image_version"]
+    ordering_fields = ["name", "vendor", "golden_image_version", "golden_image_version_key"]
     ordering = ["name"]
     # Removed lookup_field to use default 'pk' (ID-based lookups)
     # lookup_value_regex removed as it's no longer needed
@@ -394,7 +363,8 @@ class DeviceModelViewSet(viewsets.ModelViewSet):
     def scan_images(self, request, *args, **kwargs):
         """
         Scans the configured path for this model on its default file server.
-        Returns a list of potential image files.
+        Returns a list of potential image files from the file server catalog.
+        Query Params: refresh=true to re-list the server now
         """
         model = self.get_object()
         path = request.query_params.get("path") or model.golden_image_path
@@ -415,14 +385,23 @@ class DeviceModelViewSet(viewsets.ModelViewSet):
                 status=400,
             )
 
-        from swim_backend.core.services.filesystem_service import FileSystemService
+        from swim_backend.core.services.file_catalog_service import catalog_files, is_stale
 
+        refresh = request.query_params.get("refresh", "").lower() in ("1", "true", "yes")
         try:
-            files = FileSystemService.list_files(server, path)
-            return Response({"files": files})
+            directory, files = catalog_files(server, path, refresh=refresh)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
+        return Response(
+            {
+                "files": files,
+                "scanned_at": directory.scanned_at,
+                "stale": is_stale(directory),
+                "error": directory.error,
+            }
+        )
+
     @action(detail=False, methods=["delete"])
     def cleanup_unused(self, request):
         """
@@ -481,6 +460,11 @@ class DeviceReadinessCheckSerializer(serializers.Serializer):
         default=dict,
         help_text="Map of device ID to image ID {deviceId: imageId}",
     )
+    max_age = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="Reuse results of devices checked within this many seconds",
+    )
 
 
 class DeviceDistributeImageSerializer(serializers.Serializer):
@@ -537,16 +521,25 @@ class DevicePluginActionSerializer(serializers.Serializer):
         required=False, default=dict, help_text="Filters for preview action"
     )
     devices = serializers.ListField(
-        required=False, default=list, help_text="Devices for import action"
+        required=False, default=list, help_text="Devices for import action (omit to import every device matching filters)"
     )
     defaults = serializers.DictField(
         required=False, default=dict, help_text="Default values for import"
     )
+    since = serializers.CharField(
+        required=False,
+        help_text="Import only devices changed since this timestamp (last_updated of the previous import)",
+    )
 
 
-class DeviceViewSet(viewsets.ModelViewSet):
-    queryset = Device.objects.all()
+class DeviceViewSet(ChangeFeedETagMixin, viewsets.ModelViewSet):
+    # Everything DeviceSerializer reads, so a page costs the same queries at any size
+    queryset = Device.objects.select_related("site", "model__default_image").prefetch_related(
+        "model__supported_images"
+    )
     serializer_class = DeviceSerializer
+    pagination_class = DevicePagination
+    etag_types = ("device", "devicemodel", "site", "image")
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -573,6 +566,8 @@ class DeviceViewSet(viewsets.ModelViewSet):
         "family",
         "reachability",
         "last_sync_time",
+        "compliance_status",
+        "version_key",
     ]
     ordering = ["hostname"]
 
@@ -594,8 +589,59 @@ class DeviceViewSet(viewsets.ModelViewSet):
         if scope_type == "site":
             scope_value = request.data.get("site")
 
-        count = run_sync_task(scope_type, scope_value)
-        return Response({"status": "started", "count": count})
+        run = run_sync_task(scope_type, scope_value, user=request.user)
+        return Response(
+            {
+                "status": "started",
+                "count": run.total + run.coalesced,
+                "run_id": run.id,
+                "coalesced": run.coalesced,
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path=r"sync_runs/(?P<run_id>\d+)")
+    def sync_run(self, request, run_id=None):
+        """
+        Progress of a sync run started by the sync action.
+        Query Params: details=true to include per-device results
+        """
+        from swim_backend.devices.models import SyncRun
+        from swim_backend.core.services.sync_service import sync_engine
+
+        try:
+            run = SyncRun.objects.get(id=run_id)
+        except SyncRun.DoesNotExist:
+            return Response({"error": "Sync run not found"}, status=404)
+
+        data = {
+            "id": run.id,
+            "scope": run.scope,
+            "status": run.status,
+            "total": run.total,
+            "completed": run.completed,
+            "succeeded": run.succeeded,
+            "failed": run.failed,
+            "coalesced": run.coalesced,
+            "progress": round(run.completed * 100 / run.total, 1) if run.total else 100.0,
+            "failure_reasons": run.failure_reasons,
+            "started_at": run.started_at,
+            "completed_at": run.completed_at,
+            "engine": sync_engine.status(),
+        }
+
+        if request.query_params.get("details", "").lower() in ("1", "true", "yes"):
+            data["devices"] = [
+                {
+                    "device_id": r.device_id,
+                    "hostname": r.device.hostname,
+                    "status": r.status,
+                    "duration_seconds": r.duration_seconds,
+                    "error_message": r.error_message,
+                }
+                for r in run.device_results.select_related("device")
+            ]
+
+        return Response(data)
 
     @action(
         detail=False, methods=["post"], serializer_class=DeviceReadinessCheckSerializer
@@ -611,170 +657,74 @@ class DeviceViewSet(viewsets.ModelViewSet):
                 status=403,
             )
 
-        from swim_backend.core.readiness import check_readiness
-        from swim_backend.images.models import Image
+        from swim_backend.core.services.readiness_service import start_readiness_run
 
-        device_ids = request.data.get("ids", [])
-        image_map = request.data.get("image_map", {})  # { deviceId: imageId }
-        devices = Device.objects.filter(id__in=device_ids)
-        results = []
-
-        # Helper class to mimic Job object for readiness function
-        class MockImage:
-            def __init__(self, size):
-                self.size_bytes = size
-
-        class MockJob:
-            def __init__(self, jid, img_size):
-                self.id = jid
-                self.image = MockImage(img_size) if img_size else None
-                self.selected_checks = Device.objects.none()  # Empty QuerySet-like
-
-        for dev in devices:
-            # Determine Target Image Size and Info
-            target_size = 0
-            golden_version = None
-            target_image_file = None
-
-            # Check if a specific image was selected in step 3
-            selected_image_id = image_map.get(str(dev.id))
-            if selected_image_id:
-                # Use the selected image from step 3
-                try:
-                    selected_img = Image.objects.get(id=int(selected_image_id))
-                    target_size = selected_img.size_bytes
-                    golden_version = selected_img.version
-                    target_image_file = selected_img.filename
-                except (Image.DoesNotExist, ValueError):
-                    pass  # Fall through to golden image
-
-            # Fall back to golden image if no selection or selected image not found
-            if not target_size and dev.model:
-                # First check new default_image FK (set via UI)
-                if dev.model.default_image:
-                    golden_version = dev.model.default_image.version
-                    target_image_file = dev.model.default_image.filename
-                    target_size = dev.model.default_image.size_bytes
-                # Fall back to old golden_image fields
-                elif dev.model.golden_image_version:
-                    golden_version = dev.model.golden_image_version
-                    target_image_file = dev.model.golden_image_file
-                    # Prefer Explicit Size from Standard
-                    if dev.model.golden_image_size:
-                        target_size = dev.model.golden_image_size
-                    # Fallback to Image Object Size
-                    elif dev.model.golden_image_file:
-                        img = Image.objects.filter(
-                            filename=dev.model.golden_image_file
-                        ).first()
-                        if img:
-                            target_size = img.size_bytes
-                        else:
-                            # Default fallback if image record missing but file defined (e.g. 500MB)
-                            target_size = 500 * 1024 * 1024
-
-            # Run Real Checks
-            # Use a consistent session key for logs
-            session_id = f"readiness_check_{dev.id}"
-            mock_job = MockJob(session_id, target_size)
-
-            ready, check_results = check_readiness(dev, mock_job)
-
-            # Map Results to UI Format
-            ui_checks = []
-
-            # Map 'connection' -> Reachability
-            if "connection" in check_results:
-                c = check_results["connection"]
-                status = "Pass" if c["status"] == "success" else "Fail"
-                ui_checks.append(
-                    {"name": "Reachability", "status": status, "message": c["message"]}
-                )
-            else:
-                # If no connection key, assume it passed connected phase if we got results, or implicit pass?
-                # Actually check_readiness returns connection failure explicitly if it fails.
-                # If key missing, implies connection was fine?
-                # Assume explicit keys in new readiness.py
-                # Actually readiness.py ONLY adds 'connection' on failure.
-                # Connected successfully, adding Pass.
-                pass
-
-            # Logic: If readiness.py returned, connection succeeded unless it returned early.
-            if not any(c["name"] == "Reachability" for c in ui_checks):
-                ui_checks.append(
-                    {
-                        "name": "Reachability",
-                        "status": "Pass",
-                        "message": "Device is reachable",
-                    }
-                )
-
-            # Map 'flash_memory'
-            if "flash_memory" in check_results:
-                c = check_results["flash_memory"]
-                status = "Pass" if c["status"] == "success" else "Fail"
-                ui_checks.append(
-                    {"name": "Flash Space", "status": status, "message": c["message"]}
-                )
-
-            # Map 'config_register'
-            if "config_register" in check_results:
-                c = check_results["config_register"]
-                status = "Pass" if c["status"] == "success" else "Warning"  # or Fail
-                ui_checks.append(
-                    {
-                        "name": "Config Register",
-                        "status": status,
-                        "message": c["message"],
-                    }
-                )
-
-            # Map 'startup_config'
-            if "startup_config" in check_results:
-                c = check_results["startup_config"]
-                status = "Pass" if c["status"] == "success" else "Warning"
-                ui_checks.append(
-                    {
-                        "name": "Startup Config",
-                        "status": status,
-                        "message": c["message"],
-                    }
-                )
+        run = start_readiness_run(
+            request.data.get("ids", []),
+            image_map=request.data.get("image_map", {}),  # { deviceId: imageId }
+            max_age=request.data.get("max_age"),
+            user=request.user,
+        )
+        return Response({"status": "started", "run_id": run.id, "count": run.total}, status=202)
 
-            # Golden Image Check (Logic remains in View as it depends on DB model, not device state)
-            if golden_version:
-                ui_checks.append(
-                    {
-                        "name": "Golden Image Defined",
-                        "status": "Pass",
-                        "message": f"Target: {golden_version}",
-                    }
-                )
-            else:
-                ui_checks.append(
-                    {
-                        "name": "Golden Image Defined",
-                        "status": "Warning",
-                        "message": "No standard defined",
-                    }
-                )
+    @action(detail=False, methods=["post"])
+    def strategies(self, request):
+        """
+        Resolves the readiness and activation strategy of many devices at once.
+        Body: {"ids": [...]} (all devices when omitted)
+        """
+        from swim_backend.core.services.workflow.activation_strategies import ActivationStrategyRegistry
+        from swim_backend.core.services.workflow.readiness_strategies import ReadinessStrategyRegistry
 
-            status_str = "Ready" if ready else "Not Ready"
+        devices = Device.objects.select_related("model")
+        if request.data.get("ids") is not None:
+            devices = devices.filter(id__in=request.data["ids"])
+        devices = list(devices)
 
-            results.append(
+        readiness = ReadinessStrategyRegistry.resolve_many(devices)
+        activation = ActivationStrategyRegistry.resolve_many(devices)
+        return Response(
+            [
                 {
-                    "id": dev.id,
-                    "hostname": dev.hostname,
-                    "current_version": dev.version,
-                    "target_version": golden_version,
-                    "target_image_file": target_image_file,
-                    "target_image_size": target_size,
-                    "status": status_str,
-                    "checks": ui_checks,
+                    "id": d.id,
+                    "hostname": d.hostname,
+                    "readiness_strategy": readiness[d.id].__name__ if readiness[d.id] else None,
+                    "activation_strategy": activation[d.id].__name__ if activation[d.id] else None,
                 }
-            )
+                for d in devices
+            ]
+        )
 
-        return Response(results)
+    @action(detail=False, methods=["get"], url_path=r"readiness_runs/(?P<run_id>\d+)")
+    def readiness_run(self, request, run_id=None):
+        """
+        Progress of a readiness run started by check_readiness, with the
+        results of the devices checked so far.
+        """
+        from swim_backend.devices.models import ReadinessRun
+        from swim_backend.core.services.readiness_service import result_as_dict
+
+        try:
+            run = ReadinessRun.objects.get(id=run_id)
+        except ReadinessRun.DoesNotExist:
+            return Response({"error": "Readiness run not found"}, status=404)
+
+        return Response(
+            {
+                "id": run.id,
+                "status": run.status,
+                "total": run.total,
+                "completed": run.completed,
+                "ready": run.ready,
+                "reused": run.reused,
+                "progress": round(run.completed * 100 / run.total, 1) if run.total else 100.0,
+                "started_at": run.started_at,
+                "completed_at": run.completed_at,
+                "results": [
+                    result_as_dict(r) for r in run.results.select_related("device").order_by("device__hostname")
+                ],
+            }
+        )
 
     @action(detail=True, methods=["get"])
     def sync_history(self, request, pk=None):
@@ -1186,72 +1136,18 @@ class DeviceViewSet(viewsets.ModelViewSet):
                 return Response({"devices": plugin.preview_devices(config, filters)})
 
             elif action_type == "import":
-                devices = request.data.get("devices", [])
-                defaults = request.data.get("defaults", {})
-                success_count = 0
-                errors = []
-
-                for dev in devices:
-                    try:
-                        # Strict Validation
-                        ip_addr = dev.get("ip_address")
-                        hostname = dev.get("name")
-                        platform = dev.get("platform")
-
-                        if not ip_addr:
-                            errors.append(
-                                f"Skipped {hostname or 'Unknown'}: Missing IP Address"
-                            )
-                            continue
-
-                        if not platform:
-                            errors.append(
-                                f"Skipped {hostname or ip_addr}: Missing Platform"
-                            )
-                            continue
-
-                        # Hostname Fallback
-                        if not hostname:
-                            hostname = ip_addr
-
-                        # Duplicate IP Check
-                        # Check if IP exists on a DIFFERENT device
-                        existing_with_ip = Device.objects.filter(
-                            ip_address=ip_addr
-                        ).first()
-                        if existing_with_ip and existing_with_ip.hostname != hostname:
-                            errors.append(
-                                f"Skipped {hostname}: IP {ip_addr} already exists on {existing_with_ip.hostname}"
-                            )
-                            continue
-
-                        # Site Handling
-                        site_name = dev.get("site", "Global")
-                        site_obj, _ = Site.objects.get_or_create(name=site_name)
-
-                        # Device Update/Create
-                        Device.objects.update_or_create(
-                            hostname=hostname,
-                            defaults={
-                                "ip_address": ip_addr,
-                                "username": defaults.get("username", ""),
-                                "password": defaults.get("password", ""),
-                                "platform": platform,
-                                "site": site_obj,
-                                "family": dev.get("family")
-                                or dev.get("role", "Switch"),
-                            },
-                        )
-                        success_count += 1
-
-                    except Exception as e:
-                        errors.append(
-                            f"Error importing {dev.get('name', 'Unknown')}: {str(e)}"
-                        )
-
-                return Response(
-                    {"status": "imported", "count": success_count, "errors": errors}
-                )
+                from swim_backend.core.services.inventory_import_service import import_devices
+
+                # Import the devices picked from a preview, or stream everything matching filters
+                if "devices" in request.data:
+                    records = request.data.get("devices", [])
+                else:
+                    records = plugin.iter_devices(
+                        config, request.data.get("filters", {}), since=request.data.get("since")
+                    )
+                result = import_devices(records, request.data.get("defaults", {}))
+                result["errors"] = [e["error"] for e in result["errors"]]
+                return Response({"status": "imported", **result})
 
         except Exception as e:
             return Response({"error": str(e)}, status=400)
@@ -1261,102 +1157,87 @@ class DeviceViewSet(viewsets.ModelViewSet):
         """
         Bulk import devices from CSV.
         Expected columns: hostname, ip_address, username, password, platform, site
+        Optional columns: region, model, family
+
+        Files up to CSV_IMPORT_SYNC_MAX_BYTES are imported within the request;
+        larger ones run in the background (poll import_runs/<run_id>).
         """
+        import tempfile
+        from swim_backend.devices.models import DeviceImportRun
+        from swim_backend.core.services.inventory_import_service import import_csv_file, start_csv_import
+
         file = request.FILES.get("file")
         if not file:
             return Response({"error": "No file uploaded"}, status=400)
 
-        decoded_file = file.read().decode("utf-8")
-        io_string = io.StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
+        # Keep the upload on disk: it is read after the request has finished
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+            for chunk in file.chunks():
+                tmp.write(chunk)
 
-        created_count = 0
-        errors = []
+        run = DeviceImportRun.objects.create(
+            filename=file.name[:255],
+            created_by=request.user if request.user.is_authenticated else None,
+        )
 
-        for row in reader:
-            try:
-                # Validation (Strict: IP and Site required)
-                ip_addr = row.get("ip_address")
-                site_name = row.get("site")
+        if file.size > getattr(settings, "CSV_IMPORT_SYNC_MAX_BYTES", 1024 * 1024):
+            start_csv_import(run.id, tmp.name)
+            return Response({"status": "started", "run_id": run.id}, status=202)
 
-                if not ip_addr or not site_name:
-                    errors.append(
-                        f"Row skipped: Missing IP or Site (IP={ip_addr}, Site={site_name})"
-                    )
-                    continue
+        run = import_csv_file(run.id, tmp.name)
+        if run.status == "failed":
+            return Response({"error": run.error, "run_id": run.id}, status=400)
+        return Response(
+            {
+                "status": "imported",
+                "run_id": run.id,
+                "count": run.imported,
+                "errors": [e["error"] for e in run.errors],
+            }
+        )
 
-                # Check for duplicate IP
-                if Device.objects.filter(ip_address=ip_addr).exists():
-                    # Check if we are updating the same device (by hostname)?
-                    # The prompt says "check if there is no duplication in ip address value in existing devices"
-                    # Usually update_or_create on hostname allows IP change, but if hostname is different and IP exists, it's a conflict.
-                    # However, if we use update_or_create on hostname, and the matching hostname has this IP, it's fine.
-                    # But if a DIFFERENT hostname has this IP, it's a duplicate.
-                    # For safety based on no duplication, skip if IP exists and doesn't match hostname.
-
-                    # Actually, standard behavior for "import" often implies "create new".
-                    # If I use update_or_create by hostname, I might overwrite.
-                    # But if IP exists on *another* device, that's bad.
-                    # Check strict IP uniqueness.
-
-                    # Edge case: If updating an existing device, IP might match itself.
-                    # We use hostname as lookup key.
-                    hostname = row.get("hostname") or ip_addr
-
-                    existing_with_ip = Device.objects.filter(ip_address=ip_addr).first()
-                    if existing_with_ip and existing_with_ip.hostname != hostname:
-                        errors.append(
-                            f"Row skipped: IP {ip_addr} already exists on device {existing_with_ip.hostname}"
-                        )
-                        continue
-
-                # Hostname Fallback
-                hostname = row.get("hostname")
-                if not hostname:
-                    hostname = ip_addr
-
-                # Region Handling (Optional)
-                region_name = row.get("region")
-                region_obj = None
-                if region_name:
-                    from .models import Region
-
-                    region_obj, _ = Region.objects.get_or_create(name=region_name)
-
-                # Site Handling (Link to Region if provided)
-                site_defaults = {}
-                if region_obj:
-                    site_defaults["region"] = region_obj
-
-                site_obj, _ = Site.objects.update_or_create(
-                    name=site_name, defaults=site_defaults
-                )
+    @action(detail=False, methods=["get"], url_path=r"import_runs/(?P<run_id>\d+)")
+    def import_run(self, request, run_id=None):
+        """Progress of a CSV import started by import_csv."""
+        from swim_backend.devices.models import DeviceImportRun
 
-                # Model Handling (Optional)
-                model_name = row.get("model")
-                model_obj = None
-                if model_name:
-                    model_obj, _ = DeviceModel.objects.get_or_create(name=model_name)
-
-                # Device Creation/Update
-                Device.objects.update_or_create(
-                    hostname=hostname,
-                    defaults={
-                        "ip_address": ip_addr,
-                        "username": row.get("username", ""),
-                        "password": row.get("password", ""),
-                        "platform": row.get("platform", "iosxe"),
-                        "site": site_obj,
-                        "model": model_obj,
-                        "family": row.get("family", "Switch"),
-                    },
-                )
-                created_count += 1
-            except Exception as e:
-                errors.append(
-                    f"Row {row.get('hostname') or row.get('ip_address')}: {str(e)}"
-                )
+        try:
+            run = DeviceImportRun.objects.get(id=run_id)
+        except DeviceImportRun.DoesNotExist:
+            return Response({"error": "Import run not found"}, status=404)
 
         return Response(
-            {"status": "imported", "count": created_count, "errors": errors}
+            {
+                "id": run.id,
+                "filename": run.filename,
+                "status": run.status,
+                "total_rows": run.total_rows,
+                "processed_rows": run.processed_rows,
+                "progress": round(run.processed_rows * 100 / run.total_rows, 1) if run.total_rows else 0.0,
+                "imported": run.imported,
+                "created": run.created,
+                "updated": run.updated,
+                "skipped": run.skipped,
+                "error": run.error,
+                "started_at": run.started_at,
+                "completed_at": run.completed_at,
+            }
         )
+
+    @action(detail=False, methods=["get"], url_path=r"import_runs/(?P<run_id>\d+)/errors")
+    def import_run_errors(self, request, run_id=None):
+        """Downloads the rows skipped by a CSV import as CSV (row, hostname, ip_address, error)."""
+        from django.http import HttpResponse
+        from swim_backend.devices.models import DeviceImportRun
+
+        try:
+            run = DeviceImportRun.objects.get(id=run_id)
+        except DeviceImportRun.DoesNotExist:
+            return Response({"error": "Import run not found"}, status=404)
+
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="import_{run.id}_errors.csv"'
+        writer = csv.DictWriter(response, fieldnames=["row", "hostname", "ip_address", "error"])
+        writer.writeheader()
+        writer.writerows(run.errors)
+        return response
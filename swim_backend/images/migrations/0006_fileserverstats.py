@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0014_devicesynchistory'),
+        ('images', '0005_remove_filename_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileServerStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('throughput_bps', models.FloatField(blank=True, help_text='Smoothed achieved throughput in bytes/sec', null=True)),
+                ('transfer_count', models.IntegerField(default=0)),
+                ('failure_count', models.IntegerField(default=0)),
+                ('consecutive_failures', models.IntegerField(default=0)),
+                ('last_transfer_at', models.DateTimeField(blank=True, null=True)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('latency_ms', models.FloatField(blank=True, help_text='Last TCP connect latency', null=True)),
+                ('last_probe_at', models.DateTimeField(blank=True, null=True)),
+                ('last_probe_ok', models.BooleanField(default=True)),
+                ('file_server', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='images.fileserver')),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='file_server_stats', to='devices.site')),
+            ],
+            options={
+                'unique_together': {('file_server', 'site')},
+            },
+        ),
+    ]
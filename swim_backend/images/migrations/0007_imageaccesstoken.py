@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:08
+
+import django.db.models.deletion
+import swim_backend.images.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0006_fileserverstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileserver',
+            name='serves_local_images',
+            field=models.BooleanField(default=False, help_text='This server is SWIM itself: devices pull uploaded images from SWIM using per-image access tokens'),
+        ),
+        migrations.CreateModel(
+            name='ImageAccessToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(default=swim_backend.images.models.generate_access_token, editable=False, max_length=64, unique=True)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(blank=True, help_text='Leave empty for no expiry', null=True)),
+                ('last_used_at', models.DateTimeField(blank=True, null=True)),
+                ('use_count', models.IntegerField(default=0)),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_tokens', to='images.image')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0007_imageaccesstoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='checksum_status',
+            field=models.CharField(choices=[('unverified', 'Unverified'), ('verified', 'Verified'), ('mismatch', 'Mismatch'), ('missing', 'File Missing')], default='unverified', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='checksum_verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='sha512_checksum',
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:11
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0008_image_sha512_checksum'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('version', models.CharField(max_length=50)),
+                ('total_size', models.BigIntegerField()),
+                ('expected_md5', models.CharField(blank=True, max_length=32, null=True)),
+                ('expected_sha512', models.CharField(blank=True, max_length=128, null=True)),
+                ('received_ranges', models.JSONField(blank=True, default=list)),
+                ('received_bytes', models.BigIntegerField(default=0)),
+                ('hashed_bytes', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('complete', 'Complete'), ('failed', 'Failed')], default='open', max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploads', to='images.image')),
+            ],
+        ),
+    ]
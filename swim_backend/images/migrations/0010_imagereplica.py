@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0009_imageupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageReplica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('copying', 'Copying'), ('verifying', 'Verifying'), ('verified', 'Verified'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('remote_path', models.CharField(blank=True, max_length=500)),
+                ('bytes_transferred', models.BigIntegerField(default=0)),
+                ('remote_size', models.BigIntegerField(blank=True, null=True)),
+                ('remote_checksum', models.CharField(blank=True, help_text='Digest computed on the server', max_length=128)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file_server', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='replicas', to='images.fileserver')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='replicas', to='images.image')),
+            ],
+            options={
+                'unique_together': {('image', 'file_server')},
+            },
+        ),
+    ]
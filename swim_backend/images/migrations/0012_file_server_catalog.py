@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0011_fileserver_bandwidth_mbps_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileServerDirectory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500)),
+                ('status', models.CharField(choices=[('ok', 'OK'), ('error', 'Error')], default='ok', max_length=10)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('scanned_at', models.DateTimeField(blank=True, null=True)),
+                ('scan_seconds', models.FloatField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('file_server', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_directories', to='images.fileserver')),
+            ],
+            options={
+                'unique_together': {('file_server', 'path')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FileServerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=255)),
+                ('version', models.CharField(blank=True, max_length=50)),
+                ('size_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('modified_at', models.DateTimeField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('md5_checksum', models.CharField(blank=True, max_length=32)),
+                ('sha512_checksum', models.CharField(blank=True, max_length=128)),
+                ('first_seen_at', models.DateTimeField(auto_now_add=True)),
+                ('last_seen_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('directory', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='images.fileserverdirectory')),
+            ],
+            options={
+                'ordering': ['filename'],
+                'unique_together': {('directory', 'filename')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+def backfill_version_keys(apps, schema_editor):
+    from swim_backend.core.services.version_parser import version_key
+
+    Image = apps.get_model('images', 'Image')
+    for version in Image.objects.values_list('version', flat=True).distinct():
+        Image.objects.filter(version=version).update(version_key=version_key(version))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0012_file_server_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='version_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=60),
+        ),
+        migrations.RunPython(backfill_version_keys, migrations.RunPython.noop),
+    ]
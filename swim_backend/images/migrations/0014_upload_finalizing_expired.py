@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0013_version_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imageupload',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('finalizing', 'Finalizing'), ('complete', 'Complete'), ('failed', 'Failed'), ('expired', 'Expired')], default='open', max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:37
+
+from django.db import migrations, models
+
+
+def drop_duplicate_server_wide_stats(apps, schema_editor):
+    FileServerStats = apps.get_model('images', 'FileServerStats')
+    seen = set()
+    for stats in FileServerStats.objects.filter(site__isnull=True).order_by('id'):
+        if stats.file_server_id in seen:
+            stats.delete()
+        seen.add(stats.file_server_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0021_sync_claim'),
+        ('images', '0014_upload_finalizing_expired'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_server_wide_stats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='fileserverstats',
+            constraint=models.UniqueConstraint(condition=models.Q(('site__isnull', True)), fields=('file_server',), name='unique_server_wide_stats'),
+        ),
+    ]
@@ -1,6 +1,11 @@
 from django.db import models
+from django.conf import settings
+from django.utils import timezone
 import os
+import uuid
 import hashlib
+import secrets
+from swim_backend.core.services.version_parser import KEY_LENGTH, version_key
 
 # ... existing code ...
 
@@ -18,6 +23,17 @@ class FileServer(models.Model):
     
     city = models.CharField(max_length=100, blank=True, help_text="For regional mapping")
     is_global_default = models.BooleanField(default=False, help_text="Fallback server if regional one fails")
+    bandwidth_mbps = models.FloatField(
+        null=True, blank=True, help_text="Budget for outgoing image transfers (Mbps), empty for unlimited"
+    )
+    bandwidth_schedule = models.JSONField(
+        default=list, blank=True,
+        help_text='Time-of-day overrides, e.g. [{"start": "08:00", "end": "18:00", "mbps": 200}]'
+    )
+    serves_local_images = models.BooleanField(
+        default=False,
+        help_text="This server is SWIM itself: devices pull uploaded images from SWIM using per-image access tokens"
+    )
     
     def __str__(self):
         return f"{self.name} ({self.protocol}://{self.address})"
@@ -25,12 +41,41 @@ class FileServer(models.Model):
 def image_upload_path(instance, filename):
     return f'images/{filename}'
 
+# Images are hashed in fixed-size chunks so multi-GB bundles never sit in memory
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+def compute_file_digests(chunks):
+    """
+    Computes size, MD5 and SHA-512 in a single pass over an iterable of byte
+    chunks. Returns (size_bytes, md5_hex, sha512_hex).
+    """
+    md5 = hashlib.md5()
+    sha512 = hashlib.sha512()
+    size = 0
+    for chunk in chunks:
+        md5.update(chunk)
+        sha512.update(chunk)
+        size += len(chunk)
+    return size, md5.hexdigest(), sha512.hexdigest()
+
 class Image(models.Model):
+    CHECKSUM_STATUS_CHOICES = [
+        ('unverified', 'Unverified'),
+        ('verified', 'Verified'),
+        ('mismatch', 'Mismatch'),
+        ('missing', 'File Missing'),
+    ]
+
     filename = models.CharField(max_length=255)  # Removed unique=True - same filename allowed for different models
     version = models.CharField(max_length=50)
+    # Sortable form of version, for range queries (see core.services.version_parser)
+    version_key = models.CharField(max_length=KEY_LENGTH, blank=True, default='', db_index=True, editable=False)
     file = models.FileField(upload_to=image_upload_path, blank=True, null=True)
     size_bytes = models.BigIntegerField(default=0)
     md5_checksum = models.CharField(max_length=32, blank=True, null=True)
+    sha512_checksum = models.CharField(max_length=128, blank=True, null=True)
+    checksum_status = models.CharField(max_length=20, choices=CHECKSUM_STATUS_CHOICES, default='unverified')
+    checksum_verified_at = models.DateTimeField(null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     # Remote Image Fields
@@ -38,20 +83,238 @@ class Image(models.Model):
     file_server = models.ForeignKey('FileServer', on_delete=models.SET_NULL, null=True, blank=True)
     remote_path = models.CharField(max_length=255, blank=True, null=True)
 
+    # Set by a caller that assigns a stored file together with its size and
+    # digests (e.g. a finalized chunked upload), so the next save trusts them
+    digests_supplied = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored file so later saves can tell whether it changed
+        instance._loaded_file_name = instance.__dict__.get('file')
+        return instance
+
+    def file_changed(self):
+        """True if the file was (re)uploaded or replaced since this instance was loaded."""
+        if not self.file:
+            return False
+        if not self.file._committed:
+            # New upload, not yet written to storage
+            return True
+        if self.file.name != getattr(self, '_loaded_file_name', None):
+            # File swapped programmatically: the digests on the instance describe the old file
+            return not self.digests_supplied
+        return False
+
     def save(self, *args, **kwargs):
-        # Calculate size and MD5 before saving if file is present
+        # Hash only when the file changes; metadata edits never re-read the image
+        if self.file_changed():
+            self.size_bytes, self.md5_checksum, self.sha512_checksum = compute_file_digests(
+                self.file.chunks(chunk_size=HASH_CHUNK_SIZE)
+            )
+            self.checksum_status = 'unverified'
+            self.checksum_verified_at = None
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {
+                    'size_bytes', 'md5_checksum', 'sha512_checksum', 'checksum_status', 'checksum_verified_at', 'filename'
+                }
+
         if self.file:
-            self.file.open('rb')
-            content = self.file.read()
-            self.size_bytes = len(content)
-            self.md5_checksum = hashlib.md5(content).hexdigest()
             self.filename = os.path.basename(self.file.name)
         elif self.is_remote and not self.filename:
              # For remote images, ensure filename is set if not provided (usually checking remote_path)
              if self.remote_path:
                  self.filename = os.path.basename(self.remote_path)
                  
+        self.version_key = version_key(self.version)
+        if kwargs.get('update_fields') is not None and 'version' in kwargs['update_fields']:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'version_key'}
+
         super().save(*args, **kwargs)
+        self.digests_supplied = False
+        if self.file:
+            self._loaded_file_name = self.file.name
+
+    def __str__(self):
+        return self.filename
+
+
+class ImageUpload(models.Model):
+    """
+    Resumable chunked upload session. Chunks are written at their offsets
+    into a preallocated part file; finalizing moves it into MEDIA_ROOT and
+    creates the Image.
+    """
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('finalizing', 'Finalizing'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    version = models.CharField(max_length=50)
+    total_size = models.BigIntegerField()
+    # Optional client-side digests, checked on finalize
+    expected_md5 = models.CharField(max_length=32, blank=True, null=True)
+    expected_sha512 = models.CharField(max_length=128, blank=True, null=True)
+
+    # Sorted, merged [start, end) byte ranges written so far
+    received_ranges = models.JSONField(default=list, blank=True)
+    received_bytes = models.BigIntegerField(default=0)
+    hashed_bytes = models.BigIntegerField(default=0)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    error = models.TextField(blank=True, null=True)
+    image = models.ForeignKey(Image, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', f'{self.id}.part')
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.received_bytes}/{self.total_size})"
+
+
+class ImageReplica(models.Model):
+    """Replication state of an image on a file server."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('copying', 'Copying'),
+        ('verifying', 'Verifying'),
+        ('verified', 'Verified'),
+        ('failed', 'Failed'),
+    ]
+
+    image = models.ForeignKey(Image, on_delete=models.CASCADE, related_name='replicas')
+    file_server = models.ForeignKey(FileServer, on_delete=models.CASCADE, related_name='replicas')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    remote_path = models.CharField(max_length=500, blank=True)
+    bytes_transferred = models.BigIntegerField(default=0)
+    remote_size = models.BigIntegerField(null=True, blank=True)
+    remote_checksum = models.CharField(max_length=128, blank=True, help_text="Digest computed on the server")
+    error = models.TextField(blank=True, null=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('image', 'file_server')
+
+    def __str__(self):
+        return f"{self.image.filename} on {self.file_server.name} ({self.status})"
+
+
+def generate_access_token():
+    return secrets.token_urlsafe(24)
+
+class ImageAccessToken(models.Model):
+    """
+    Grants devices unauthenticated HTTP(S) access to a single uploaded image.
+    The token is part of the download URL because device `copy` commands
+    cannot send credentials headers.
+    """
+    image = models.ForeignKey(Image, on_delete=models.CASCADE, related_name='access_tokens')
+    token = models.CharField(max_length=64, unique=True, default=generate_access_token, editable=False)
+    description = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True, help_text="Leave empty for no expiry")
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    use_count = models.IntegerField(default=0)
+
+    @property
+    def is_valid(self):
+        return self.expires_at is None or self.expires_at > timezone.now()
+
+    def __str__(self):
+        return f"Token for {self.image.filename}"
+
+
+class FileServerStats(models.Model):
+    """
+    Measured performance of a file server as seen from a site.
+
+    Rows with a site carry the throughput achieved by real transfers to devices
+    at that site. The row without a site holds the server-wide probe results
+    (latency measured from SWIM) and aggregates transfers from devices that
+    have no site.
+    """
+    file_server = models.ForeignKey(FileServer, on_delete=models.CASCADE, related_name='stats')
+    site = models.ForeignKey(
+        'devices.Site', on_delete=models.CASCADE, null=True, blank=True, related_name='file_server_stats'
+    )
+
+    # Transfer measurements (exponentially weighted moving average)
+    throughput_bps = models.FloatField(null=True, blank=True, help_text="Smoothed achieved throughput in bytes/sec")
+    transfer_count = models.IntegerField(default=0)
+    failure_count = models.IntegerField(default=0)
+    consecutive_failures = models.IntegerField(default=0)
+    last_transfer_at = models.DateTimeField(null=True, blank=True)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+
+    # Probe measurements
+    latency_ms = models.FloatField(null=True, blank=True, help_text="Last TCP connect latency")
+    last_probe_at = models.DateTimeField(null=True, blank=True)
+    last_probe_ok = models.BooleanField(default=True)
+
+    class Meta:
+        unique_together = ('file_server', 'site')
+        constraints = [
+            # unique_together does not cover the row without a site (NULLs never collide)
+            models.UniqueConstraint(
+                fields=['file_server'], condition=models.Q(site__isnull=True), name='unique_server_wide_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.file_server.name} @ {self.site.name if self.site_id else 'all sites'}"
+
+
+class FileServerDirectory(models.Model):
+    """
+    A directory on a file server tracked by the image catalog, with the
+    validators needed to refresh it incrementally.
+    """
+    STATUS_CHOICES = [('ok', 'OK'), ('error', 'Error')]
+
+    file_server = models.ForeignKey(FileServer, on_delete=models.CASCADE, related_name='catalog_directories')
+    path = models.CharField(max_length=500)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ok')
+    error = models.TextField(null=True, blank=True)
+    scanned_at = models.DateTimeField(null=True, blank=True)
+    scan_seconds = models.FloatField(null=True, blank=True)
+    # HTTP listing validators for conditional requests
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        unique_together = ('file_server', 'path')
+
+    def __str__(self):
+        return f"{self.file_server.name}:{self.path}"
+
+
+class FileServerEntry(models.Model):
+    """An image file found on a file server, as of the last catalog refresh."""
+    directory = models.ForeignKey(FileServerDirectory, on_delete=models.CASCADE, related_name='entries')
+    filename = models.CharField(max_length=255)
+    version = models.CharField(max_length=50, blank=True)
+    size_bytes = models.BigIntegerField(null=True, blank=True)
+    modified_at = models.DateTimeField(null=True, blank=True)
+    etag = models.CharField(max_length=255, blank=True)
+    md5_checksum = models.CharField(max_length=32, blank=True)
+    sha512_checksum = models.CharField(max_length=128, blank=True)
+    first_seen_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('directory', 'filename')
+        ordering = ['filename']
 
     def __str__(self):
         return self.filename
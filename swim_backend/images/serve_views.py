@@ -0,0 +1,195 @@
+"""
+Built-in image serving for device pulls.
+
+Devices download uploaded images straight from SWIM with
+`copy http(s)://<swim>/api/images/serve/<token>/<filename> flash:`.
+The file object is handed to the WSGI server's file wrapper, so gunicorn
+serves it with sendfile() (zero-copy) whenever the connection is not TLS.
+Single byte ranges are supported so interrupted copies can resume.
+"""
+import os
+import re
+import threading
+import logging
+from django.conf import settings
+from django.db.models import F
+from django.http import FileResponse, HttpResponse, Http404
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+from .models import ImageAccessToken
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def max_connections():
+    """
+    Concurrent downloads allowed per process: IMAGE_SERVE_MAX_CONNECTIONS, but
+    never so many that live streams and the API run out of gunicorn threads.
+    """
+    spare_threads = (
+        getattr(settings, 'GUNICORN_THREADS', 16)
+        - getattr(settings, 'SSE_MAX_STREAMS', 4)
+        - getattr(settings, 'IMAGE_SERVE_RESERVED_THREADS', 4)
+    )
+    return max(min(getattr(settings, 'IMAGE_SERVE_MAX_CONNECTIONS', 20), spare_threads), 1)
+
+
+class ConnectionSlots:
+    """Non-blocking per-process limit on concurrent downloads, overall and per image."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = 0
+        self._per_image = {}
+
+    def acquire(self, image_id):
+        max_total = max_connections()
+        max_per_image = getattr(settings, 'IMAGE_SERVE_MAX_CONNECTIONS_PER_IMAGE', 10)
+        with self._lock:
+            if self._total >= max_total or self._per_image.get(image_id, 0) >= max_per_image:
+                return False
+            self._total += 1
+            self._per_image[image_id] = self._per_image.get(image_id, 0) + 1
+            return True
+
+    def release(self, image_id):
+        with self._lock:
+            self._total -= 1
+            self._per_image[image_id] -= 1
+            if not self._per_image[image_id]:
+                del self._per_image[image_id]
+
+    def snapshot(self):
+        with self._lock:
+            return {'total': self._total, 'per_image': dict(self._per_image)}
+
+
+serve_slots = ConnectionSlots()
+
+
+class BoundedFile:
+    """
+    File wrapper that stops reading after `length` bytes and releases the
+    connection slot when closed.
+
+    fileno() is exposed so the WSGI file wrapper can still use sendfile();
+    gunicorn starts at the current file offset and sends Content-Length bytes.
+    """
+
+    def __init__(self, f, length, on_close):
+        self._file = f
+        self._remaining = length
+        self._on_close = on_close
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        if self._on_close:
+            on_close, self._on_close = self._on_close, None
+            on_close()
+        self._file.close()
+
+
+def parse_range(header, size):
+    """
+    Parses a single-range `Range` header. Returns (start, end) inclusive,
+    None when the header should be ignored, or 'invalid' when unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return 'invalid'
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_image(request, token, filename):
+    """Serve an uploaded image to a device using a per-image access token."""
+    access = ImageAccessToken.objects.select_related('image').filter(token=token).first()
+    if not access or not access.is_valid:
+        raise Http404("Invalid or expired token")
+
+    image = access.image
+    if not image.file or filename != image.filename:
+        raise Http404("Image not found")
+
+    path = image.file.path
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        raise Http404("Image file missing")
+
+    etag = f'"{image.md5_checksum}"' if image.md5_checksum else None
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header:
+        if_range = request.headers.get('If-Range')
+        if not if_range or if_range == etag:
+            byte_range = parse_range(range_header, size)
+        if byte_range == 'invalid':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    start, end = byte_range if byte_range else (0, size - 1)
+    length = end - start + 1 if size else 0
+
+    if request.method == 'HEAD':
+        response = HttpResponse(status=206 if byte_range else 200, content_type='application/octet-stream')
+    else:
+        if not serve_slots.acquire(image.id):
+            response = HttpResponse("Too many concurrent downloads", status=503, content_type='text/plain')
+            response['Retry-After'] = '30'
+            return response
+
+        try:
+            f = open(path, 'rb')
+            f.seek(start)
+        except OSError:
+            serve_slots.release(image.id)
+            raise Http404("Image file missing")
+
+        response = FileResponse(
+            BoundedFile(f, length, on_close=lambda: serve_slots.release(image.id)),
+            status=206 if byte_range else 200,
+            content_type='application/octet-stream',
+        )
+        ImageAccessToken.objects.filter(pk=access.pk).update(
+            use_count=F('use_count') + 1, last_used_at=timezone.now()
+        )
+        logger.info(f"Serving {image.filename} bytes {start}-{end}/{size} to {request.META.get('REMOTE_ADDR')}")
+
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if etag:
+        response['ETag'] = etag
+    return response
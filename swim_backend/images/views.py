@@ -1,9 +1,13 @@
-from rest_framework import viewsets, serializers
+from rest_framework import viewsets, serializers, mixins
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters import rest_framework as django_filters
 import os
-from .models import Image, FileServer
+from swim_backend.core.filters import VersionKeyFilter
+from swim_backend.core.permissions import DjangoModelPermissionsWithView
+from .models import Image, FileServer, FileServerStats, ImageAccessToken, ImageUpload, ImageReplica
 
 class FileServerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,17 +26,255 @@ class FileServerSerializer(serializers.ModelSerializer):
         
         return data
 
+class FileServerStatsSerializer(serializers.ModelSerializer):
+    site_name = serializers.CharField(source='site.name', read_only=True, default=None)
+
+    class Meta:
+        model = FileServerStats
+        fields = '__all__'
+
 class ImageSerializer(serializers.ModelSerializer):
     file_server_details = FileServerSerializer(source='file_server', read_only=True)
     
     class Meta:
         model = Image
         fields = '__all__'
-        read_only_fields = ('uploaded_at',)
+        read_only_fields = ('uploaded_at', 'checksum_status', 'checksum_verified_at')
+
+class ImageReplicaSerializer(serializers.ModelSerializer):
+    file_server_name = serializers.CharField(source='file_server.name', read_only=True)
+
+    class Meta:
+        model = ImageReplica
+        fields = '__all__'
+
+class ImageAccessTokenSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImageAccessToken
+        fields = ['id', 'token', 'url', 'description', 'created_at', 'expires_at', 'last_used_at', 'use_count']
+
+    def get_url(self, obj):
+        from django.urls import reverse
+        path = reverse('images-serve', args=[obj.token, obj.image.filename])
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
+
+class ImageFilter(django_filters.FilterSet):
+    version__lt = VersionKeyFilter(field_name='version_key', lookup_expr='lt')
+    version__lte = VersionKeyFilter(field_name='version_key', lookup_expr='lte')
+    version__gt = VersionKeyFilter(field_name='version_key', lookup_expr='gt')
+    version__gte = VersionKeyFilter(field_name='version_key', lookup_expr='gte')
+
+    class Meta:
+        model = Image
+        fields = ['version', 'filename', 'is_remote', 'file_server']
 
 class ImageViewSet(viewsets.ModelViewSet):
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ImageFilter
+
+    @action(detail=True, methods=['get'])
+    def replicas(self, request, pk=None):
+        """Replication state of this image on each file server."""
+        image = self.get_object()
+        replicas = image.replicas.select_related('file_server').order_by('file_server__name')
+        return Response(ImageReplicaSerializer(replicas, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def replicate(self, request, pk=None):
+        """
+        Push this image to file servers in parallel and verify each copy.
+        Body: {"file_servers": [ids]} or {"file_servers": "all"} for every
+        server other than the image's own source.
+        """
+        from swim_backend.core.services.replication_service import ReplicationError, replicate_image
+
+        image = self.get_object()
+        targets = request.data.get('file_servers')
+        if targets == 'all':
+            servers = FileServer.objects.exclude(id=image.file_server_id)
+        elif isinstance(targets, list) and targets:
+            servers = FileServer.objects.filter(id__in=targets)
+        else:
+            return Response({"error": "file_servers must be a list of ids or 'all'"}, status=400)
+
+        try:
+            replicas = replicate_image(image, list(servers))
+        except ReplicationError as e:
+            return Response({"error": str(e)}, status=400)
+        return Response(ImageReplicaSerializer(replicas, many=True).data, status=202)
+
+    @action(detail=True, methods=['post'])
+    def verify(self, request, pk=None):
+        """Re-hash the stored file in the background and compare with the recorded checksums."""
+        image = self.get_object()
+        if not image.file:
+            return Response({"error": "Image has no uploaded file to verify"}, status=400)
+
+        from swim_backend.core.services.image_service import start_image_verification
+        start_image_verification(image.id)
+        return Response({"status": "started"}, status=202)
+
+    @action(detail=True, methods=['get', 'post'])
+    def tokens(self, request, pk=None):
+        """
+        List or create access tokens that let devices download this image
+        directly from SWIM. POST accepts optional `description` and
+        `expires_in` (seconds).
+        """
+        image = self.get_object()
+
+        if request.method == 'GET':
+            tokens = image.access_tokens.order_by('-created_at')
+            return Response(ImageAccessTokenSerializer(tokens, many=True, context={'request': request}).data)
+
+        if not image.file:
+            return Response({"error": "Image has no uploaded file to serve"}, status=400)
+
+        expires_at = None
+        expires_in = request.data.get('expires_in')
+        if expires_in:
+            from datetime import timedelta
+            from django.utils import timezone
+            try:
+                expires_at = timezone.now() + timedelta(seconds=int(expires_in))
+            except (TypeError, ValueError):
+                return Response({"error": "expires_in must be a number of seconds"}, status=400)
+
+        token = ImageAccessToken.objects.create(
+            image=image,
+            description=request.data.get('description', ''),
+            expires_at=expires_at,
+        )
+        return Response(ImageAccessTokenSerializer(token, context={'request': request}).data, status=201)
+
+class ImageUploadSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    missing_ranges = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImageUpload
+        fields = '__all__'
+        read_only_fields = (
+            'received_ranges', 'received_bytes', 'hashed_bytes', 'status', 'error', 'image',
+            'created_by', 'created_at', 'updated_at'
+        )
+
+    def get_progress(self, obj):
+        return round(obj.received_bytes / obj.total_size * 100, 1) if obj.total_size else 100.0
+
+    def get_missing_ranges(self, obj):
+        from swim_backend.core.services.image_service import missing_ranges
+        return missing_ranges(obj.received_ranges, obj.total_size)
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("total_size must be positive")
+        return value
+
+    def validate_filename(self, value):
+        from django.core.exceptions import SuspiciousFileOperation
+        from django.core.files.storage import default_storage
+        try:
+            return default_storage.get_valid_name(os.path.basename(value))
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError("filename is not a valid file name")
+
+class ImageUploadPermission(DjangoModelPermissionsWithView):
+    """Upload sessions are governed by the Image model permissions."""
+    perms_map = {
+        'GET': ['images.view_image'],
+        'OPTIONS': [],
+        'HEAD': ['images.view_image'],
+        'POST': ['images.add_image'],
+        'PUT': ['images.add_image'],
+        'PATCH': ['images.add_image'],
+        'DELETE': ['images.add_image'],
+    }
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return request.user.has_perms(self.perms_map.get(request.method, []))
+
+class ImageUploadViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable chunked uploads.
+
+    1. POST /uploads/ with filename, version, total_size (optional expected_md5/expected_sha512)
+    2. PUT /uploads/<id>/chunk/?offset=N with the raw chunk bytes as body (chunks may be sent in parallel)
+    3. GET /uploads/<id>/ for progress and the missing ranges to resume
+    4. POST /uploads/<id>/finalize/ to verify and create the Image
+    """
+    queryset = ImageUpload.objects.all().order_by('-created_at')
+    serializer_class = ImageUploadSerializer
+    permission_classes = [ImageUploadPermission]
+
+    def create(self, request, *args, **kwargs):
+        from swim_backend.core.services.image_service import create_upload
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        upload = create_upload(
+            filename=data['filename'],
+            version=data['version'],
+            total_size=data['total_size'],
+            user=request.user,
+            expected_md5=data.get('expected_md5'),
+            expected_sha512=data.get('expected_sha512'),
+        )
+        return Response(self.get_serializer(upload).data, status=201)
+
+    def destroy(self, request, pk=None):
+        """Abort an upload and delete its partial data."""
+        from swim_backend.core.services.image_service import abort_upload
+        abort_upload(self.get_object())
+        return Response(status=204)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """Write the request body at ?offset=N (or the start of a Content-Range header)."""
+        from swim_backend.core.services.image_service import write_upload_chunk
+
+        upload = self.get_object()
+
+        offset = request.query_params.get('offset')
+        content_range = request.headers.get('Content-Range', '')
+        if offset is None and content_range.startswith('bytes '):
+            offset = content_range[len('bytes '):].split('-', 1)[0]
+        try:
+            offset = int(offset)
+            length = int(request.headers.get('Content-Length') or 0)
+        except (TypeError, ValueError):
+            return Response({"error": "offset query parameter or Content-Range header is required"}, status=400)
+        if not length:
+            return Response({"error": "Content-Length is required"}, status=411)
+
+        try:
+            # Body is streamed to disk; request.data is never parsed
+            upload = write_upload_chunk(upload.id, offset, request.stream, length)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Verify the assembled file and create the Image."""
+        from swim_backend.core.services.image_service import finalize_upload
+
+        upload = self.get_object()
+        try:
+            image = finalize_upload(upload.id)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(ImageSerializer(image, context={'request': request}).data, status=201)
 
 class FileServerViewSet(viewsets.ModelViewSet):
     queryset = FileServer.objects.all()
@@ -106,7 +348,50 @@ class FileServerViewSet(viewsets.ModelViewSet):
         
         # Return standard list response
         return super().list(request, *args, **kwargs)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Measured throughput per site and last probe results for this server."""
+        server = self.get_object()
+        stats = server.stats.select_related('site').order_by('site__name')
+        return Response(FileServerStatsSerializer(stats, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def probe(self, request, pk=None):
+        """Probe this server now instead of waiting for the periodic probe."""
+        from swim_backend.core.services.file_server_selector import probe_file_server
+        server = self.get_object()
+        latency_ms = probe_file_server(server)
+        return Response({
+            "reachable": latency_ms is not None,
+            "latency_ms": latency_ms,
+        })
     
+    @action(detail=True, methods=['get'])
+    def catalog(self, request, pk=None):
+        """
+        Images available on this server, from the catalog.
+        Query Params: path=<dir> (default: base path), refresh=true to re-list now
+        """
+        from swim_backend.core.services.file_catalog_service import catalog_files, is_stale
+        server = self.get_object()
+        path = request.query_params.get('path') or server.base_path
+        refresh = request.query_params.get('refresh', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            directory, files = catalog_files(server, path, refresh=refresh)
+        except Exception as e:
+            return Response({"error": str(e)}, status=502)
+
+        return Response({
+            "path": directory.path,
+            "scanned_at": directory.scanned_at,
+            "scan_seconds": directory.scan_seconds,
+            "stale": is_stale(directory),
+            "error": directory.error,
+            "files": files,
+        })
+
     def get_permissions(self):
         """
         Allow viewing file servers for all authenticated users (needed to display names).
@@ -256,6 +256,16 @@ if DATABASE_URL.startswith("postgresql://"):
             }
         }
 
+# Cache shared by the application (device facts, ...). The default is per
+# process; point CACHE_BACKEND/CACHE_LOCATION at a shared cache (e.g. redis)
+# when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -552,3 +562,138 @@ def _parse_supported_models(env_value):
 
 
 SUPPORTED_DEVICE_MODELS = _parse_supported_models(os.getenv("SUPPORTED_DEVICE_MODELS"))
+
+# ============================================================================
+# SWIM - File Server Selection
+# ============================================================================
+# Throughput assumed for servers that have no measurements yet (bytes/sec)
+FILE_SERVER_DEFAULT_THROUGHPUT_BPS = int(
+    os.getenv("FILE_SERVER_DEFAULT_THROUGHPUT_BPS", str(10 * 1024 * 1024))
+)
+# Interval between background reachability/latency probes (seconds, 0 disables)
+FILE_SERVER_PROBE_INTERVAL = int(os.getenv("FILE_SERVER_PROBE_INTERVAL", "300"))
+
+# ============================================================================
+# SWIM - Built-in Image Serving
+# ============================================================================
+# Limits on concurrent image downloads served by SWIM itself (per worker process).
+# Each download holds a gunicorn thread for the whole transfer, so the total is
+# also capped at GUNICORN_THREADS - SSE_MAX_STREAMS - IMAGE_SERVE_RESERVED_THREADS
+# (see Live Streams); further downloads get 503 and devices retry.
+IMAGE_SERVE_MAX_CONNECTIONS = int(os.getenv("IMAGE_SERVE_MAX_CONNECTIONS", "20"))
+IMAGE_SERVE_MAX_CONNECTIONS_PER_IMAGE = int(
+    os.getenv("IMAGE_SERVE_MAX_CONNECTIONS_PER_IMAGE", "10")
+)
+# Threads per worker never given to downloads: API requests and change-feed/status long-polls
+IMAGE_SERVE_RESERVED_THREADS = int(os.getenv("IMAGE_SERVE_RESERVED_THREADS", "4"))
+# Lifetime of access tokens minted automatically for distribution jobs (seconds)
+IMAGE_SERVE_TOKEN_TTL = int(os.getenv("IMAGE_SERVE_TOKEN_TTL", str(12 * 3600)))
+
+# ============================================================================
+# SWIM - Chunked Image Uploads
+# ============================================================================
+# Open uploads idle for longer than this are expired and their part files deleted (hours)
+IMAGE_UPLOAD_TTL_HOURS = int(os.getenv("IMAGE_UPLOAD_TTL_HOURS", "24"))
+
+# ============================================================================
+# SWIM - Image Replication
+# ============================================================================
+# Number of file servers an image is pushed to in parallel
+IMAGE_REPLICATION_MAX_WORKERS = int(os.getenv("IMAGE_REPLICATION_MAX_WORKERS", "4"))
+
+# ============================================================================
+# SWIM - File Server Catalog
+# ============================================================================
+# Age after which a cataloged directory is re-listed in the background (seconds)
+FILE_CATALOG_MAX_AGE = int(os.getenv("FILE_CATALOG_MAX_AGE", "900"))
+# Interval between background catalog refresh passes (seconds, 0 disables)
+FILE_CATALOG_REFRESH_INTERVAL = int(os.getenv("FILE_CATALOG_REFRESH_INTERVAL", "300"))
+
+# ============================================================================
+# SWIM - Device Sync
+# ============================================================================
+# Concurrency caps: devices synced at once, and per site. Both apply per
+# process, so with N gunicorn workers up to N times as many devices sync at once
+SYNC_MAX_WORKERS = int(os.getenv("SYNC_MAX_WORKERS", "50"))
+SYNC_MAX_PER_SITE = int(os.getenv("SYNC_MAX_PER_SITE", "10"))
+# A device claimed this long ago by a run that never finished it (its worker
+# died) may be queued by another run again (seconds)
+SYNC_CLAIM_TIMEOUT = int(os.getenv("SYNC_CLAIM_TIMEOUT", "3600"))
+# Sync results are written in batches of this size, or after this many seconds
+SYNC_WRITE_BATCH_SIZE = int(os.getenv("SYNC_WRITE_BATCH_SIZE", "50"))
+SYNC_WRITE_INTERVAL = float(os.getenv("SYNC_WRITE_INTERVAL", "2"))
+
+# ============================================================================
+# SWIM - Device Facts
+# ============================================================================
+# Upper bound on how long facts learned from a device are kept (seconds).
+# Facts live in the default cache, which is per process unless CACHE_BACKEND
+# points at a shared cache: with several gunicorn workers the other workers do
+# not see facts dropped by a distribution or activation, so use a shared
+# CACHE_BACKEND (e.g. redis) or set DEVICE_FACTS_TTL=0 to disable reuse.
+DEVICE_FACTS_TTL = int(os.getenv("DEVICE_FACTS_TTL", "3600"))
+
+# ============================================================================
+# SWIM - Inventory Import
+# ============================================================================
+# Devices written per upsert statement when importing from inventory plugins
+INVENTORY_IMPORT_BATCH_SIZE = int(os.getenv("INVENTORY_IMPORT_BATCH_SIZE", "1000"))
+# CSV uploads larger than this are imported in the background (bytes)
+CSV_IMPORT_SYNC_MAX_BYTES = int(os.getenv("CSV_IMPORT_SYNC_MAX_BYTES", str(1024 * 1024)))
+
+# ============================================================================
+# SWIM - Readiness Checks
+# ============================================================================
+# Devices checked concurrently by readiness runs
+READINESS_MAX_WORKERS = int(os.getenv("READINESS_MAX_WORKERS", "20"))
+# Upgrade jobs skip the readiness step for devices that passed this recently (seconds, 0 disables)
+READINESS_RESULT_MAX_AGE = int(os.getenv("READINESS_RESULT_MAX_AGE", "900"))
+
+# ============================================================================
+# SWIM - Device Strategies
+# ============================================================================
+# Extra modules registering readiness/activation strategies (comma separated)
+READINESS_STRATEGY_MODULES = [m.strip() for m in os.getenv("READINESS_STRATEGY_MODULES", "").split(",") if m.strip()]
+ACTIVATION_STRATEGY_MODULES = [m.strip() for m in os.getenv("ACTIVATION_STRATEGY_MODULES", "").split(",") if m.strip()]
+
+# ============================================================================
+# SWIM - Pagination
+# ============================================================================
+# With ?count=approx, planner estimates below this are replaced by an exact COUNT(*)
+APPROXIMATE_COUNT_THRESHOLD = int(os.getenv("APPROXIMATE_COUNT_THRESHOLD", "10000"))
+
+# ============================================================================
+# SWIM - Change Feed
+# ============================================================================
+# Longest a change-feed long-poll (?wait=) is held open (seconds)
+CHANGE_FEED_MAX_WAIT = float(os.getenv("CHANGE_FEED_MAX_WAIT", "25"))
+# Change entries older than this are pruned; clients behind them reload their lists (hours)
+CHANGE_FEED_RETENTION_HOURS = int(os.getenv("CHANGE_FEED_RETENTION_HOURS", "24"))
+
+# ============================================================================
+# SWIM - Live Streams
+# ============================================================================
+# Request threads per gunicorn worker (entrypoint.sh starts gunicorn with the same
+# variable). Live streams, image downloads and long-polls each hold one while open:
+# up to SSE_MAX_STREAMS streams, at most GUNICORN_THREADS - SSE_MAX_STREAMS -
+# IMAGE_SERVE_RESERVED_THREADS downloads, and the rest serve the API.
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "16"))
+# Server-sent event streams open at once per gunicorn worker; each holds a worker
+# thread, so keep this below GUNICORN_THREADS. Further streams get 503 and clients poll.
+SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", "4"))
+
+
+# ============================================================================
+# SWIM - Event Bus
+# ============================================================================
+# Events older than this are pruned; subscribers behind them get a reset (hours)
+EVENT_BUS_RETENTION_HOURS = int(os.getenv("EVENT_BUS_RETENTION_HOURS", "24"))
+
+
+# ============================================================================
+# SWIM - Aggregate Cache
+# ============================================================================
+# Longest a cached dashboard/report aggregate is served (seconds, 0 disables).
+# Writes invalidate entries sooner, in every worker; this bounds drift of
+# time-window figures such as "failed in the last 24h".
+AGGREGATE_CACHE_TTL = int(os.getenv("AGGREGATE_CACHE_TTL", "60"))
@@ -4,6 +4,7 @@ import axios from 'axios';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell, Legend } from 'recharts';
 import { Network, Activity, Clock, PieChart as PieIcon, BarChart as BarIcon, CheckCircle, Zap, Play, Pause } from 'lucide-react';
 import { useAuth } from './context/AuthContext';
+import { useEvents } from './hooks/useEvents';
 
 const COLORS = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6'];
 
@@ -56,10 +57,11 @@ const Dashboard = () => {
         }
         
         fetchData();
-        const interval = setInterval(fetchData, 5000);
-        return () => clearInterval(interval);
     }, [user, navigate]);
 
+    // Reload when jobs, devices or ZTP change instead of polling
+    useEvents(['job', 'device', 'sync', 'ztp'], fetchData);
+
     return (
         <div className="space-y-8">
             <h1 className="text-2xl font-bold text-gray-800">Network Overview</h1>
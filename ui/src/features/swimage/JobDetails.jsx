@@ -17,9 +17,26 @@ const JobDetails = () => {
     const [selectedChecksCollapsed, setSelectedChecksCollapsed] = useState(true);
     const [checksReportsCollapsed, setChecksReportsCollapsed] = useState(true);
 
-    const downloadCheck = (run) => {
+    // Check outputs are not part of the job payload; load them when asked for
+    const fetchCheckOutput = async (run) => {
+        if (run.output !== undefined) return run.output;
+        try {
+            const res = await axios.get(`/api/core/check-runs/${run.id}/output/`, { responseType: 'text' });
+            return res.data;
+        } catch (error) {
+            console.error("Failed to fetch check output", error);
+            return "";
+        }
+    };
+
+    const previewRun = async (run) => {
+        setPreviewCheck({ ...run, output: await fetchCheckOutput(run) });
+    };
+
+    const downloadCheck = async (run) => {
+        const output = await fetchCheckOutput(run);
         const element = document.createElement("a");
-        const file = new Blob([run.output], { type: 'text/plain' });
+        const file = new Blob([output], { type: 'text/plain' });
         element.href = URL.createObjectURL(file);
         element.download = `${run.check_name.replace(/\s+/g, '_')}_${run.id}_report.txt`;
         document.body.appendChild(element);
@@ -50,16 +67,53 @@ const JobDetails = () => {
         }
     };
 
-    // Auto-refresh logs if job is running
+    // Load the job once, then follow new log lines and step changes over server-sent events
     useEffect(() => {
-        fetchJobDetails();
-        const interval = setInterval(() => {
-            if (job && ['running', 'distributing', 'activating'].includes(job.status)) {
+        let source = null;
+        let poller = null;
+        let closed = false;
+
+        // The server refuses streams when its stream slots are taken: refetch instead
+        const poll = () => {
+            poller = setInterval(async () => {
+                const data = await fetchJobDetails();
+                if (data && ['success', 'failed', 'cancelled'].includes(data.status)) clearInterval(poller);
+            }, 5000);
+        };
+
+        const follow = (offset) => {
+            source = new EventSource(`/api/core/jobs/${id}/stream/?offset=${offset}`, { withCredentials: true });
+            source.addEventListener('log', (e) => {
+                const { text } = JSON.parse(e.data);
+                setLogs(prev => [...prev, ...text.split('\n').filter(l => l.trim())]);
+            });
+            source.addEventListener('status', (e) => {
+                const { status, steps } = JSON.parse(e.data);
+                setJob(prev => prev && { ...prev, status, steps });
+            });
+            source.addEventListener('end', () => {
+                source.close();
+                // Reload once for the final check runs and timestamps
                 fetchJobDetails();
+            });
+            source.onerror = () => {
+                // CLOSED means the stream was refused (not a dropped connection, which reconnects)
+                if (source.readyState === EventSource.CLOSED && !closed) poll();
+            };
+        };
+
+        fetchJobDetails().then((data) => {
+            if (data && !closed && !['success', 'failed', 'cancelled'].includes(data.status)) {
+                // Offsets count characters, not UTF-16 code units
+                follow([...(data.log || '')].length);
             }
-        }, 5000);
-        return () => clearInterval(interval);
-    }, [id, job?.status]); // Re-run if ID changes or status changes
+        });
+        return () => {
+            closed = true;
+            if (source) source.close();
+            clearInterval(poller);
+        };
+    }, [id]);
 
     const fetchJobDetails = async () => {
         try {
@@ -72,9 +126,11 @@ const JobDetails = () => {
                 setLogs(lines);
             }
             setLoading(false);
+            return res.data;
         } catch (error) {
             console.error("Failed to fetch job", error);
             setLoading(false);
+            return null;
         }
     };
 
@@ -317,7 +373,7 @@ const JobDetails = () => {
 
                                             <div className="flex justify-end space-x-2 pt-2 border-t border-gray-200">
                                                 <button
-                                                    onClick={() => setPreviewCheck(run)}
+                                                    onClick={() => previewRun(run)}
                                                     className="flex items-center space-x-1 text-xs text-gray-500 hover:text-blue-600 font-medium"
                                                 >
                                                     <FileText size={12} /> <span>Preview</span>
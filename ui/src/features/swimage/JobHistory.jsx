@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { Search, RefreshCw, Activity, CheckCircle, XCircle, Clock, ChevronRight, RotateCw, Filter, PlayCircle, StopCircle, MinusCircle, FileText, XOctagon, Calendar } from 'lucide-react';
+import { useEvents } from '../../hooks/useEvents';
 
 const Jobs = () => {
     const navigate = useNavigate();
@@ -41,10 +42,11 @@ const Jobs = () => {
 
     useEffect(() => {
         fetchJobs();
-        const interval = setInterval(fetchJobs, 5000);
-        return () => clearInterval(interval);
     }, [search]); // Re-fetch when search changes (debounce could be added for optimization)
 
+    // Reload when a job changes status instead of polling
+    useEvents(['job'], fetchJobs);
+
     const fetchJobs = async () => {
         try {
             const res = await axios.get('/api/core/jobs/', {
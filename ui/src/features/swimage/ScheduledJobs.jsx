@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { Search, RefreshCw, Calendar, Clock, CheckCircle, List, ArrowRight, PlayCircle, StopCircle, Trash2 } from 'lucide-react';
 import ConfirmModal from '../inventory/ConfirmModal';
+import { useEvents } from '../../hooks/useEvents';
 
 const ScheduledJobs = () => {
     const navigate = useNavigate();
@@ -19,10 +20,11 @@ const ScheduledJobs = () => {
 
     useEffect(() => {
         fetchScheduledJobs();
-        const interval = setInterval(fetchScheduledJobs, 10000);
-        return () => clearInterval(interval);
     }, [search]);
 
+    // Reload when jobs are scheduled, launched or cancelled instead of polling
+    useEvents(['job', 'scheduler'], fetchScheduledJobs);
+
     const fetchScheduledJobs = async () => {
         try {
             const res = await axios.get('/api/core/jobs/', {
@@ -113,11 +113,18 @@ const UpgradeWizard = () => {
     const runChecks = async () => {
         setChecking(true);
         try {
+            // Checks run in the background; results stream in as devices finish
             const res = await axios.post('/api/dcim/devices/check_readiness/', {
                 ids: selectedDevices,
-                image_map: imageSelection
+                image_map: imageSelection,
+                max_age: 300
             });
-            setReadinessResults(res.data);
+            let run;
+            do {
+                await new Promise(resolve => setTimeout(resolve, 2000));
+                run = (await axios.get(`/api/dcim/devices/readiness_runs/${res.data.run_id}/`)).data;
+                setReadinessResults(run.results);
+            } while (run.status === 'running');
         } catch (error) {
             console.error("Check failed", error);
             alert("Failed to run readiness checks.");
@@ -1052,9 +1059,8 @@ const JobList = ({ jobMap, devices, selectedIds, onToggleSelect, onRetry, onRemo
                 const idsToFetch = Object.values(jobMap);
                 if (idsToFetch.length === 0) return;
 
-                // Ideally fetch specifics, but mock polling all
-                // We could POST to /api/core/jobs/bulk_get/ or just filter client side
-                const res = await axios.get('/api/core/jobs/');
+                // Compact list of just these jobs (no logs)
+                const res = await axios.get('/api/core/jobs/', { params: { ids: idsToFetch.join(',') } });
                 const allJobs = res.data.results || res.data;
 
                 const newJobsMap = {};
@@ -1098,6 +1104,15 @@ const JobList = ({ jobMap, devices, selectedIds, onToggleSelect, onRetry, onRemo
 
 const JobRow = ({ device, job, isSelected, onToggle, onRetry, onRemove }) => {
     const [expanded, setExpanded] = useState(false);
+    const [log, setLog] = useState('');
+
+    // The job list carries no logs; load this job's log while it is expanded
+    useEffect(() => {
+        if (!expanded || !job) return;
+        axios.get(`/api/core/jobs/${job.id}/`)
+            .then(res => setLog(res.data.log || ''))
+            .catch(e => console.error(e));
+    }, [expanded, job?.id, job?.status, job?.steps?.length]);
 
     // Status Logic
     const status = job ? job.status : 'pending';
@@ -1105,19 +1120,12 @@ const JobRow = ({ device, job, isSelected, onToggle, onRetry, onRemove }) => {
     const isSuccess = ['success', 'distributed'].includes(status);
     const isFailed = status === 'failed';
 
-    // Logs
-    const logLines = (job?.log || '').split('\n').filter(Boolean);
-    const lastLog = logLines[logLines.length - 1] || 'Waiting...';
+    // Latest log line while expanded, otherwise the current step from the job list
+    const logLines = log.split('\n').filter(Boolean);
+    const lastLog = (expanded && logLines[logLines.length - 1]) || job?.current_step || 'Waiting...';
 
-    // Percent
-    let percent = 0;
-    if (job) {
-        const percentMatch = lastLog.match(/(\d+)%/);
-        if (percentMatch) percent = parseInt(percentMatch[1]);
-        else if (isSuccess) percent = 100;
-        else if (isFailed) percent = 100;
-        else if (status === 'distributing') percent = 10;
-    }
+    // Percent of steps completed (status estimate for jobs without steps)
+    const percent = !job ? 0 : (isSuccess || isFailed) ? 100 : (job.progress || 0);
 
     return (
         <div className={`border rounded-lg overflow-hidden transition-all duration-200 ${isSelected ? 'border-blue-200 bg-white' : 'border-gray-200 bg-gray-50 opacity-75'}`}>
@@ -1220,7 +1228,7 @@ const JobRow = ({ device, job, isSelected, onToggle, onRetry, onRemove }) => {
                     </div>
                     {/* Logs view */}
                     <div className="mt-2 font-mono text-gray-500 bg-white border border-gray-200 p-2 rounded max-h-32 overflow-y-auto whitespace-pre-line">
-                        {job.log}
+                        {log}
                     </div>
                 </div>
             )}
@@ -1237,10 +1245,7 @@ const JobSummaryTable = ({ jobIds }) => {
         const fetchJobs = async () => {
             if (!jobIds || jobIds.length === 0) return;
             try {
-                // Fetch all and filter (mock API limitation) or fetch individually
-                // Ideally API supports bulk get. 
-                // We'll simplisticly fetch list and filter client side for now as per other patterns.
-                const res = await axios.get('/api/core/jobs/');
+                const res = await axios.get('/api/core/jobs/', { params: { ids: jobIds.join(',') } });
                 const all = res.data.results || res.data;
                 const relevant = all.filter(j => jobIds.includes(j.id));
                 setJobs(relevant);
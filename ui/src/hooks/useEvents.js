@@ -0,0 +1,75 @@
+import { useEffect, useRef } from 'react';
+
+// One EventSource on the fleet event bus, shared by every component that listens
+let source = null;
+const listeners = new Set();
+
+// When the server refuses the stream (all its stream slots are taken), listeners
+// are asked to reload every POLL_MS and the stream is retried after RETRY_MS
+const POLL_MS = 15000;
+const RETRY_MS = 60000;
+let poller = null;
+let retry = null;
+
+const matches = (types, event) =>
+    types.some(t => event.type === t || event.type.startsWith(`${t}.`));
+
+const connect = () => {
+    const es = new EventSource('/api/core/events/stream/', { withCredentials: true });
+    source = es;
+    source.onmessage = (e) => {
+        const event = JSON.parse(e.data);
+        listeners.forEach(l => matches(l.types, event) && l.notify(event));
+    };
+    // Events were missed: everyone reloads
+    source.addEventListener('reset', () => listeners.forEach(l => l.notify(null)));
+    source.onerror = () => {
+        // CLOSED means the stream was refused; dropped connections reconnect on their own
+        if (es.readyState !== EventSource.CLOSED || source !== es) return;
+        source = null;
+        poller = setInterval(() => listeners.forEach(l => l.notify(null)), POLL_MS);
+        retry = setTimeout(() => {
+            clearInterval(poller);
+            poller = retry = null;
+            if (listeners.size) connect();
+        }, RETRY_MS);
+    };
+};
+
+const disconnect = () => {
+    if (source) source.close();
+    clearInterval(poller);
+    clearTimeout(retry);
+    source = poller = retry = null;
+};
+
+/**
+ * Calls `onEvent(event)` for bus events of `types` (e.g. ['job', 'device.reachability']),
+ * at most once per `debounceMs` with the last event, so a burst triggers one reload.
+ * `event` is null after a reset, or on each poll while the server refuses the stream.
+ * Replaces interval polling of dashboards and lists.
+ */
+export const useEvents = (types, onEvent, debounceMs = 500) => {
+    const callback = useRef(onEvent);
+    callback.current = onEvent;
+    const key = types.join(',');
+
+    useEffect(() => {
+        let timer = null;
+        const listener = {
+            types: key.split(','),
+            notify: (event) => {
+                clearTimeout(timer);
+                timer = setTimeout(() => callback.current(event), debounceMs);
+            },
+        };
+        listeners.add(listener);
+        if (!source && !retry) connect();
+
+        return () => {
+            clearTimeout(timer);
+            listeners.delete(listener);
+            if (listeners.size === 0) disconnect();
+        };
+    }, [key, debounceMs]);
+};
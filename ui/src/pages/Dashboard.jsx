@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { Activity, AlertTriangle, Box, Wifi, Shield, Zap, Globe, Server, Layers, Clock, CheckCircle, XCircle, FileText, Download, ChevronDown, ChevronUp, Play, X } from 'lucide-react';
 import { PieChart, Pie, Cell, ResponsiveContainer } from 'recharts';
+import { useEvents } from '../hooks/useEvents';
 
 const Card = ({ title, children, className = "" }) => (
     <div className={`bg-white p-6 rounded-lg border border-gray-200 shadow-sm flex flex-col ${className}`}>
@@ -39,10 +40,11 @@ const Dashboard = () => {
 
     useEffect(() => {
         fetchAll();
-        const interval = setInterval(fetchAll, 5000); // Poll every 5s
-        return () => clearInterval(interval);
     }, []);
 
+    // Reload on job, device and ZTP events instead of polling
+    useEvents(['job', 'device', 'sync', 'ztp'], fetchAll);
+
     const handleCancelJob = async (jobId) => {
         if (!confirm("Are you sure you want to cancel this scheduled job?")) return;
         try {